@@ -0,0 +1,43 @@
+"""add_admin_keyset_indexes
+
+Revision ID: 3e9a7f1c5d2b
+Revises: 8c4d1e6a2b3f
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '3e9a7f1c5d2b'
+down_revision = '8c4d1e6a2b3f'
+branch_labels = None
+depends_on = None
+
+# Admin lists page on (created_at, id) newest first
+INDEXES = {
+    'quizzes': 'ix_quizzes_created_id',
+    'myths_facts': 'ix_myths_facts_created_id',
+    'myth_fact_collections': 'ix_myth_fact_collections_created_id',
+    'media': 'ix_media_created_id',
+}
+
+
+def upgrade() -> None:
+    """Add (created_at, id) indexes used by admin keyset pagination"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table, index_name in INDEXES.items():
+        if table not in tables:
+            continue
+        existing_indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        if index_name not in existing_indexes:
+            op.create_index(index_name, table, ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Remove admin keyset pagination indexes"""
+    for table, index_name in INDEXES.items():
+        op.drop_index(index_name, table_name=table)
@@ -0,0 +1,38 @@
+"""add_media_info_to_videos
+
+Revision ID: 5b7e2c9d4f1a
+Revises: 89d10e22c218
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c9d4f1a'
+down_revision = '89d10e22c218'
+branch_labels = None
+depends_on = None
+
+TABLES = ('series_videos', 'general_knowledge_videos')
+
+
+def upgrade() -> None:
+    """Add media_info JSON column filled by the media metadata worker"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table in TABLES:
+        if table not in tables:
+            continue
+        existing_columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'media_info' not in existing_columns:
+            op.add_column(table, sa.Column('media_info', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove media_info columns"""
+    for table in TABLES:
+        op.drop_column(table, 'media_info')
@@ -0,0 +1,37 @@
+"""add_user_recommendations_lookup_index
+
+Revision ID: 5b8e2d9c4a17
+Revises: 7d2c4b8e1f6a
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2d9c4a17'
+down_revision = '7d2c4b8e1f6a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index precomputed recommendations for per-user top-K reads"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if 'user_recommendations' not in inspector.get_table_names():
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('user_recommendations')}
+    if 'ix_user_recommendations_lookup' not in existing:
+        op.create_index(
+            'ix_user_recommendations_lookup',
+            'user_recommendations',
+            ['user_id', 'recommendation_type', 'relevance_score'],
+        )
+
+
+def downgrade() -> None:
+    """Drop the recommendation lookup index"""
+    op.drop_index('ix_user_recommendations_lookup', table_name='user_recommendations')
@@ -0,0 +1,50 @@
+"""add_email_outbox
+
+Revision ID: 7d2c4b8e1f6a
+Revises: 3e9a7f1c5d2b
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7d2c4b8e1f6a'
+down_revision = '3e9a7f1c5d2b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the durable outbound email outbox"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if 'email_outbox' in inspector.get_table_names():
+        return
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('to_address', sa.String(255), nullable=False),
+        sa.Column('subject', sa.String(500), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=True),
+        sa.Column('text_body', sa.Text(), nullable=True),
+        sa.Column('tag', sa.String(100), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_message_id', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_email_outbox_status_due', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    """Drop the email outbox"""
+    op.drop_index('ix_email_outbox_status_due', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,38 @@
+"""add_streaming_to_videos
+
+Revision ID: 8c4d1e6a2b3f
+Revises: 5b7e2c9d4f1a
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '8c4d1e6a2b3f'
+down_revision = '5b7e2c9d4f1a'
+branch_labels = None
+depends_on = None
+
+TABLES = ('series_videos', 'general_knowledge_videos')
+
+
+def upgrade() -> None:
+    """Add streaming JSON column holding the HLS packaging manifest"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table in TABLES:
+        if table not in tables:
+            continue
+        existing_columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'streaming' not in existing_columns:
+            op.add_column(table, sa.Column('streaming', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove streaming columns"""
+    for table in TABLES:
+        op.drop_column(table, 'streaming')
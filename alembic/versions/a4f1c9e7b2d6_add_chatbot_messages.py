@@ -0,0 +1,83 @@
+"""add_chatbot_messages
+
+Revision ID: a4f1c9e7b2d6
+Revises: 5b8e2d9c4a17
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a4f1c9e7b2d6'
+down_revision = '5b8e2d9c4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Move chatbot transcripts into an append-only messages table"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'chatbot_conversations' not in tables:
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('chatbot_conversations')]
+    if 'message_count' not in columns:
+        op.add_column(
+            'chatbot_conversations',
+            sa.Column('message_count', sa.Integer(), nullable=False, server_default='0')
+        )
+
+    if 'chatbot_messages' in tables:
+        return
+
+    op.create_table(
+        'chatbot_messages',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            'conversation_id', postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('chatbot_conversations.id', ondelete='CASCADE'), nullable=False
+        ),
+        sa.Column('role', sa.String(20), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('sources', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        'ix_chatbot_messages_conversation_created',
+        'chatbot_messages',
+        ['conversation_id', 'created_at', 'id'],
+    )
+
+    # Copy the JSON transcripts, keeping their order even when timestamps tie
+    op.execute("""
+        INSERT INTO chatbot_messages (id, conversation_id, role, content, created_at)
+        SELECT
+            gen_random_uuid(),
+            c.id,
+            COALESCE(m.value->>'role', 'user'),
+            COALESCE(m.value->>'content', m.value->>'message', ''),
+            COALESCE((m.value->>'timestamp')::timestamp AT TIME ZONE 'UTC', c.started_at, NOW())
+                + m.ordinality * INTERVAL '1 microsecond'
+        FROM chatbot_conversations c
+        CROSS JOIN LATERAL json_array_elements(c.messages::json)
+            WITH ORDINALITY AS m(value, ordinality)
+        WHERE json_typeof(c.messages::json) = 'array'
+    """)
+    op.execute("""
+        UPDATE chatbot_conversations
+        SET message_count = json_array_length(messages::json)
+        WHERE json_typeof(messages::json) = 'array'
+    """)
+
+
+def downgrade() -> None:
+    """Drop the messages table; legacy JSON transcripts are left in place"""
+    op.drop_index('ix_chatbot_messages_conversation_created', table_name='chatbot_messages')
+    op.drop_table('chatbot_messages')
+    op.drop_column('chatbot_conversations', 'message_count')
@@ -1,7 +1,15 @@
 """
 Admin Panel Module
+
+``admin_router`` is resolved on first access so importing a single admin
+module (or the templates) does not import every admin route.
 """
 
-from .routes.main import router as admin_router
+__all__ = ["admin_router"]
+
 
-__all__ = ["admin_router"]  
\ No newline at end of file
+def __getattr__(name):
+    if name == "admin_router":
+        from .routes.main import router as admin_router
+        return admin_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,7 +9,7 @@ from sqlalchemy import select, func, desc, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
-from app.db.database import get_db_session
+from app.db.database import get_read_db_session
 from app.models.video_series import VideoSeries, SeriesVideo
 from app.models.video_channel import VideoChannel, GeneralKnowledgeVideo
 from app.models.video_engagement import VideoComment, VideoLike
@@ -52,7 +52,7 @@ async def analytics_dashboard(
         else:  # all-time
             start_date = datetime(2000, 1, 1)
         
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             # Get top videos by views
             series_views = await session.execute(
                 select(
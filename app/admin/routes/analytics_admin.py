@@ -11,7 +11,7 @@ import structlog
 from datetime import datetime, timedelta, date
 import json
 
-from app.db.database import get_db_session
+from app.db.database import get_read_db_session
 from app.models.user import User
 from app.models.quiz_extended import Quiz, UserQuizResult
 from app.models.content import Content
@@ -30,7 +30,7 @@ async def advanced_analytics_page(request: Request):
         return RedirectResponse(url="/admin/login", status_code=302)
     
     try:
-        async with get_db_session() as db:
+        async with get_read_db_session() as db:
             # User Engagement Metrics
             total_users_result = await db.execute(select(func.count(User.id)))
             total_users = total_users_result.scalar() or 0
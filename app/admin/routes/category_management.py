@@ -26,6 +26,7 @@ from app.models.myth_fact import MythFact
 from app.models.site_setting import SiteSetting
 from app.admin.templates.base import create_html_page
 from app.db.database import get_db
+from app.services.admin_listing import invalidate_category_options
 import logging
 from typing import Optional
 from uuid import UUID
@@ -471,6 +472,7 @@ async def create_category(
         
         db.add(new_category)
         await db.commit()
+        await invalidate_category_options()
         await db.refresh(new_category)
         
         logger.info(f"Category created: {name} (ID: {new_category.id})")
@@ -535,6 +537,7 @@ async def update_category(
         category.mvf_enabled = mvf_enabled
         
         await db.commit()
+        await invalidate_category_options()
         
         logger.info(f"Category updated: {name} (ID: {categoryId})")
         return JSONResponse({"success": True})
@@ -580,6 +583,7 @@ async def delete_category(
         
         await db.delete(category)
         await db.commit()
+        await invalidate_category_options()
         
         logger.info(f"Category deleted: {category.name} (ID: {category_id})")
         return JSONResponse({"success": True})
@@ -5,7 +5,7 @@ Provides comprehensive collection CRUD operations and analytics
 
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from sqlalchemy import select, func, desc, and_, or_
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from uuid import UUID, uuid4
@@ -19,6 +19,8 @@ from app.models.category import Category
 from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.db.database import get_db_session
+from app.services.admin_listing import paginate, facet_counts
+from app.services.collection_availability import invalidate_collection_catalog
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,7 +29,8 @@ router = APIRouter()
 @router.get("/collections", response_class=HTMLResponse)
 async def collection_list(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[str] = Query(None, description="Cursor of the last row on the previous page"),
+    before: Optional[str] = Query(None, description="Cursor of the first row on the next page"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -73,39 +76,32 @@ async def collection_list(
             if filters:
                 query = query.where(and_(*filters))
             
-            # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_count = (await db.execute(count_query)).scalar()
+            # Keyset pagination with a cached total
+            listing = await paginate(db, query, MythFactCollection, limit, after=after, before=before)
+            collections = listing.items
+            total_count = listing.total
+            active_counts = await facet_counts(db, MythFactCollection, MythFactCollection.is_active)
             
-            # Apply pagination and ordering
-            collections_query = query.order_by(desc(MythFactCollection.created_at)).offset((page - 1) * limit).limit(limit)
-            result = await db.execute(collections_query)
-            collections = result.scalars().all()
+            # Get statistics for the page in two grouped queries
+            collection_ids = [collection.id for collection in collections]
+            content_counts = dict((await db.execute(
+                select(CollectionMythFact.collection_id, func.count())
+                .where(CollectionMythFact.collection_id.in_(collection_ids))
+                .group_by(CollectionMythFact.collection_id)
+            )).all()) if collection_ids else {}
+            progress_counts = dict((await db.execute(
+                select(UserCollectionProgress.collection_id, func.count())
+                .where(UserCollectionProgress.collection_id.in_(collection_ids))
+                .group_by(UserCollectionProgress.collection_id)
+            )).all()) if collection_ids else {}
             
-            # Calculate pagination info
-            total_pages = (total_count + limit - 1) // limit
-            has_prev = page > 1
-            has_next = page < total_pages
-            
-            # Get statistics for each collection
-            collection_stats = {}
-            for collection in collections:
-                # Get myth/fact count
-                content_count_query = select(func.count()).select_from(
-                    select(CollectionMythFact).where(CollectionMythFact.collection_id == collection.id).subquery()
-                )
-                content_count = (await db.execute(content_count_query)).scalar()
-                
-                # Get user progress count
-                progress_count_query = select(func.count()).select_from(
-                    select(UserCollectionProgress).where(UserCollectionProgress.collection_id == collection.id).subquery()
-                )
-                progress_count = (await db.execute(progress_count_query)).scalar()
-                
-                collection_stats[str(collection.id)] = {
-                    'content_count': content_count,
-                    'user_progress_count': progress_count
+            collection_stats = {
+                str(collection_id): {
+                    'content_count': content_counts.get(collection_id, 0),
+                    'user_progress_count': progress_counts.get(collection_id, 0)
                 }
+                for collection_id in collection_ids
+            }
 
     except Exception as e:
         logger.error(f"Error fetching collections: {e}")
@@ -176,12 +172,13 @@ async def collection_list(
 
     # Generate pagination HTML
     pagination_html = ""
-    if total_pages > 1:
+    if listing.has_prev or listing.has_next:
+        filter_params = {"search": search, "category": category, "difficulty": difficulty, "active_only": active_only}
         pagination_html = f"""
         <div style="display: flex; justify-content: center; align-items: center; gap: 0.5rem; margin-top: 2rem;">
-            {"" if not has_prev else f'<a href="/admin/collections?page={page-1}&search={search or ""}&category={category or ""}&difficulty={difficulty or ""}" style="padding: 0.5rem 1rem; background: #007bff; color: white; text-decoration: none; border-radius: 0.25rem;">Previous</a>'}
-            <span style="color: #6c757d;">Page {page} of {total_pages}</span>
-            {"" if not has_next else f'<a href="/admin/collections?page={page+1}&search={search or ""}&category={category or ""}&difficulty={difficulty or ""}" style="padding: 0.5rem 1rem; background: #007bff; color: white; text-decoration: none; border-radius: 0.25rem;">Next</a>'}
+            {"" if not listing.has_prev else f'<a href="/admin/collections{listing.href(filter_params, "prev")}" style="padding: 0.5rem 1rem; background: #007bff; color: white; text-decoration: none; border-radius: 0.25rem;">Previous</a>'}
+            <span style="color: #6c757d;">Showing {len(collections)} of {total_count}</span>
+            {"" if not listing.has_next else f'<a href="/admin/collections{listing.href(filter_params, "next")}" style="padding: 0.5rem 1rem; background: #007bff; color: white; text-decoration: none; border-radius: 0.25rem;">Next</a>'}
         </div>
         """
 
@@ -259,7 +256,7 @@ async def collection_list(
             </div>
             <div style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); color: white; padding: 1.5rem; border-radius: 0.5rem;">
                 <h3 style="margin: 0 0 0.5rem 0;">Active Collections</h3>
-                <div style="font-size: 2rem; font-weight: bold;">{len([c for c in collections if c.is_active])}</div>
+                <div style="font-size: 2rem; font-weight: bold;">{active_counts.get(True, 0)}</div>
             </div>
         </div>
     </div>
@@ -424,6 +421,7 @@ async def collection_create(
             
             db.add(collection)
             await db.commit()
+            await invalidate_collection_catalog()
             
             return RedirectResponse(url="/admin/collections", status_code=302)
             
@@ -457,6 +455,7 @@ async def collection_delete(request: Request, collection_id: UUID):
             # Delete collection
             await db.delete(collection)
             await db.commit()
+            await invalidate_collection_catalog()
             
             return JSONResponse({"success": True})
             
@@ -518,6 +518,10 @@ async def perform_data_reset(db: AsyncSession) -> Dict[str, Any]:
             result = await db.execute(delete_stmt)
             await db.commit()
             operations_log.append(f"Deleted {result.rowcount} daily activity records")
+            
+            from app.services.daily_activity_counters import daily_activity_counters
+            await daily_activity_counters.reset()
+            operations_log.append("Cleared live daily activity counters")
         except Exception as e:
             error_msg = f"Failed to delete daily activities: {e}"
             errors_log.append(error_msg)
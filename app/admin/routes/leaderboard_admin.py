@@ -14,6 +14,7 @@ from app.db.database import get_db_session
 from app.models.user import User
 from app.models.quiz import UserQuizResult
 from app.models.site_setting import SiteSetting
+from app.services.settings_service import settings_registry
 from app.admin.templates.base import create_html_page
 from app.api.leaderboards import get_current_week_start, get_current_month_start
 
@@ -785,6 +786,7 @@ async def update_leaderboard_settings(request: Request):
                     updated_count += 1
             
             await db.commit()
+            await settings_registry.publish_change()
             
             return JSONResponse(
                 status_code=200,
@@ -5,10 +5,10 @@ Main admin router that combines all admin routes
 """
 
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.admin.templates.base import create_html_page
+from app.admin.templates.base import create_html_page, get_admin_asset, ADMIN_ASSET_MAX_AGE
 from app.admin.routes.blog import router as blog_router
 from app.admin.routes.case_study import router as case_study_router
 from app.admin.routes.conservation import router as conservation_router
@@ -58,6 +58,19 @@ router.include_router(videos_router, tags=["Admin - Videos"])
 router.include_router(video_analytics_router, tags=["Admin - Video Analytics"])
 
 
+@router.get("/assets/{filename}")
+async def admin_asset(filename: str):
+    """Compiled admin CSS/JS; fingerprinted names make them safe to cache forever"""
+    asset = get_admin_asset(filename)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    body, media_type = asset
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"Cache-Control": f"public, max-age={ADMIN_ASSET_MAX_AGE}, immutable"}
+    )
+
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Admin login page"""
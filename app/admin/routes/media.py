@@ -2,7 +2,7 @@
 Media management admin routes - Clean template-based version with dynamic functionality
 """
 
-from fastapi import APIRouter, Request, Form, UploadFile, File, HTTPException
+from fastapi import APIRouter, Request, Form, UploadFile, File, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func
@@ -18,6 +18,7 @@ from app.models.content import Content
 from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.services.file_upload import file_upload_service
+from app.services.admin_listing import paginate, facet_counts
 from app.api.endpoints.media import get_media_type_from_mimetype, create_thumbnail
 from app.core.config import settings
 from PIL import Image
@@ -231,10 +232,15 @@ async def upload_media_file_admin(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @router.get("/library", response_class=HTMLResponse)
-async def media_library_page(request: Request, page: int = 1, limit: int = 20):
+async def media_library_page(
+    request: Request,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
     """Media library page"""
     
-    print(f"🔍 Media library route called - Page: {page}, Limit: {limit}")
+    print(f"🔍 Media library route called - After: {after}, Before: {before}, Limit: {limit}")
     
     # Check authentication
     if not request.session.get("authenticated"):
@@ -242,19 +248,13 @@ async def media_library_page(request: Request, page: int = 1, limit: int = 20):
     
     # Get media from database and render server-side for reliability
     async with get_db_session() as db:
-        skip = (page - 1) * limit
-        
-        print(f"📊 Fetching media from database - Skip: {skip}, Limit: {limit}")
-        
-        # Get total count
-        result = await db.execute(select(func.count(Media.id)))
-        total_count = result.scalar()
+        print(f"📊 Fetching media from database - Limit: {limit}")
         
-        # Get media items
-        result = await db.execute(
-            select(Media).order_by(desc(Media.created_at)).offset(skip).limit(limit)
-        )
-        media_items = result.scalars().all()
+        # Keyset pagination keeps deep pages as cheap as the first one
+        listing = await paginate(db, select(Media), Media, limit, after=after, before=before)
+        media_items = listing.items
+        total_count = listing.total
+        type_counts = await facet_counts(db, Media, Media.media_type)
         
         print(f"✅ Database query completed - Total: {total_count}, Retrieved: {len(media_items)}")
     
@@ -313,33 +313,30 @@ async def media_library_page(request: Request, page: int = 1, limit: int = 20):
         """
     
     # Generate pagination
-    total_pages = (total_count + limit - 1) // limit if total_count > 0 else 1
     pagination_html = ""
-    if total_pages > 1:
+    if listing.has_prev or listing.has_next:
         pagination_html = '<div style="display: flex; justify-content: center; margin-top: 2rem; gap: 0.5rem;">'
         
         # Previous page
-        if page > 1:
-            pagination_html += f'<a href="/admin/media/library?page={page - 1}" style="padding: 0.5rem 1rem; background: #f8f9fa; border: 1px solid #dee2e6; text-decoration: none; color: #007bff; border-radius: 4px;">‹ Previous</a>'
-        
-        # Page numbers
-        for p in range(max(1, page - 2), min(total_pages + 1, page + 3)):
-            if p == page:
-                pagination_html += f'<span style="padding: 0.5rem 1rem; background: #007bff; color: white; border-radius: 4px;">{p}</span>'
-            else:
-                pagination_html += f'<a href="/admin/media/library?page={p}" style="padding: 0.5rem 1rem; background: #f8f9fa; border: 1px solid #dee2e6; text-decoration: none; color: #007bff; border-radius: 4px;">{p}</a>'
+        if listing.has_prev:
+            pagination_html += f'<a href="/admin/media/library{listing.href({}, "prev")}" style="padding: 0.5rem 1rem; background: #f8f9fa; border: 1px solid #dee2e6; text-decoration: none; color: #007bff; border-radius: 4px;">‹ Previous</a>'
         
         # Next page
-        if page < total_pages:
-            pagination_html += f'<a href="/admin/media/library?page={page + 1}" style="padding: 0.5rem 1rem; background: #f8f9fa; border: 1px solid #dee2e6; text-decoration: none; color: #007bff; border-radius: 4px;">Next ›</a>'
+        if listing.has_next:
+            pagination_html += f'<a href="/admin/media/library{listing.href({}, "next")}" style="padding: 0.5rem 1rem; background: #f8f9fa; border: 1px solid #dee2e6; text-decoration: none; color: #007bff; border-radius: 4px;">Next ›</a>'
         
         pagination_html += '</div>'
     
+    type_summary = ", ".join(
+        f"{count} {str(getattr(media_type, 'value', media_type)).lower()}"
+        for media_type, count in sorted(type_counts.items(), key=lambda item: -item[1])
+    )
+    
     # Create the complete page content
     library_content = f"""
         <div class="page-header">
             <h1 class="page-title">Media Library</h1>
-            <p class="page-subtitle">Browse and manage your uploaded media files ({total_count} total)</p>
+            <p class="page-subtitle">Browse and manage your uploaded media files ({total_count} total{": " + type_summary if type_summary else ""})</p>
         </div>
         
         <div style="margin-bottom: 2rem;">
@@ -359,7 +356,7 @@ async def media_library_page(request: Request, page: int = 1, limit: int = 20):
         <div style="margin-top: 2rem; padding: 1rem; background: #f8f9fa; border: 1px solid #dee2e6; border-radius: 4px; font-family: monospace; font-size: 0.875rem;">
             <h4>Debug Info:</h4>
             <p><strong>Total Media Items:</strong> {len(media_items) if media_items else 0}</p>
-            <p><strong>Current Page:</strong> {page}</p>
+            <p><strong>Cursor:</strong> {after or before or "first page"}</p>
             <p><strong>Items Per Page:</strong> {limit}</p>
             <p><strong>Total Count:</strong> {total_count}</p>
             {f'<p><strong>Sample Media ID:</strong> {media_items[0].id if media_items else "None"}</p>' if media_items else ''}
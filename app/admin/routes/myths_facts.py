@@ -4,7 +4,7 @@ Myths vs Facts management routes for admin panel
 
 from fastapi import APIRouter, Request, Form, File, UploadFile, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from sqlalchemy import select, func, desc, and_, or_
+from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from uuid import UUID, uuid4
@@ -17,6 +17,8 @@ from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.admin.templates.editor import get_quill_editor_html, get_quill_editor_js, get_upload_handlers_js
 from app.db.database import get_db_session
+from app.services.admin_listing import paginate, facet_counts, category_options as load_category_options
+from app.services.collection_availability import invalidate_collection_catalog
 from app.services.file_upload import file_upload_service
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,8 @@ router = APIRouter()
 @router.get("/myths-facts", response_class=HTMLResponse)
 async def myths_facts_list(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[str] = Query(None, description="Cursor of the last row on the previous page"),
+    before: Optional[str] = Query(None, description="Cursor of the first row on the next page"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
@@ -75,27 +78,14 @@ async def myths_facts_list(
             if filters:
                 query = query.where(and_(*filters))
             
-            # Get total count for pagination
-            count_query = select(func.count(MythFact.id))
-            if filters:
-                count_query = count_query.where(and_(*filters))
-            
-            total_result = await db.execute(count_query)
-            total = total_result.scalar()
-            
-            # Apply pagination and ordering
-            offset = (page - 1) * limit
-            query = query.order_by(desc(MythFact.created_at)).offset(offset).limit(limit)
+            # Keyset pagination with a cached total
+            listing = await paginate(db, query, MythFact, limit, after=after, before=before)
+            myths_facts = listing.items
+            total = listing.total
             
-            # Execute query
-            result = await db.execute(query)
-            myths_facts = result.scalars().all()
-            
-            # Get categories for filter dropdown
-            categories_result = await db.execute(
-                select(Category).where(Category.is_active == True).order_by(Category.name)
-            )
-            categories = categories_result.scalars().all()
+            # Cached dropdown options and facet counts
+            categories = await load_category_options(db)
+            category_counts = await facet_counts(db, MythFact, MythFact.category_id)
             
     except Exception as e:
         logger.error(f"Error loading myths vs facts list: {e}")
@@ -107,16 +97,11 @@ async def myths_facts_list(
             )
         )
     
-    # Calculate pagination info
-    total_pages = (total + limit - 1) // limit if total > 0 else 0
-    has_prev = page > 1
-    has_next = page < total_pages
-    
     # Generate category options for filter
     category_options = '<option value="">All Categories</option>'
     for category in categories:
         selected = "selected" if category_id == str(category.id) else ""
-        category_options += f'<option value="{category.id}" {selected}>{category.name}</option>'
+        category_options += f'<option value="{category.id}" {selected}>{category.name} ({category_counts.get(category.id, 0)})</option>'
     
     # Generate table rows
     table_rows = ""
@@ -159,30 +144,21 @@ async def myths_facts_list(
     
     # Generate pagination controls
     pagination_html = ""
-    if total_pages > 1:
+    if listing.has_prev or listing.has_next:
+        filter_params = {"search": search, "category_id": category_id, "featured_only": featured_only}
         pagination_html = f"""
         <div class="pagination-container">
             <div class="pagination-info">
-                Showing {offset + 1}-{min(offset + limit, total)} of {total} entries
+                Showing {len(myths_facts)} of {total} entries
             </div>
             <div class="pagination">
         """
         
-        # Previous button
-        if has_prev:
-            pagination_html += f'<a href="?page={page-1}&limit={limit}&search={search or ""}&category_id={category_id or ""}&featured_only={featured_only}" class="btn btn-sm btn-secondary">Previous</a>'
-        
-        # Page numbers
-        start_page = max(1, page - 2)
-        end_page = min(total_pages, page + 2)
-        
-        for p in range(start_page, end_page + 1):
-            active_class = "btn-primary" if p == page else "btn-secondary"
-            pagination_html += f'<a href="?page={p}&limit={limit}&search={search or ""}&category_id={category_id or ""}&featured_only={featured_only}" class="btn btn-sm {active_class}">{p}</a>'
+        if listing.has_prev:
+            pagination_html += f'<a href="{listing.href(filter_params, "prev")}" class="btn btn-sm btn-secondary">Previous</a>'
         
-        # Next button
-        if has_next:
-            pagination_html += f'<a href="?page={page+1}&limit={limit}&search={search or ""}&category_id={category_id or ""}&featured_only={featured_only}" class="btn btn-sm btn-secondary">Next</a>'
+        if listing.has_next:
+            pagination_html += f'<a href="{listing.href(filter_params, "next")}" class="btn btn-sm btn-secondary">Next</a>'
         
         pagination_html += """
             </div>
@@ -1703,6 +1679,7 @@ async def delete_myth_fact(request: Request, myth_fact_id: str):
             # Delete the myth fact (hard delete)
             await db.delete(myth_fact)
             await db.commit()
+            await invalidate_collection_catalog()
             
             logger.info(f"Deleted myth vs fact: {myth_fact_title} (ID: {myth_fact_id})")
             
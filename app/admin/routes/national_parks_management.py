@@ -18,6 +18,7 @@ from app.db.database import get_db
 from app.models.national_park import NationalPark
 from app.models.user import User
 from app.services.notification_service import NotificationService
+from app.services.park_read_model import park_read_model
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/admin/templates")
@@ -224,6 +225,7 @@ async def approve_media_admin(
         
         print(f"DEBUG: Committing changes...")
         await db.commit()
+        await park_read_model.invalidate()
         print(f"DEBUG: Commit successful!")
         
         # Create notification for the uploader if media was approved
@@ -338,6 +340,7 @@ async def delete_media_admin(
             park.video_urls = media_list
         
         await db.commit()
+        await park_read_model.invalidate()
         
         # Redirect back to media management page
         return RedirectResponse(
@@ -17,7 +17,9 @@ from app.models.category import Category
 from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.db.database import get_db_session
+from app.services.admin_listing import paginate, category_options as load_category_options
 from app.services.file_upload import file_upload_service
+from app.services.media_probe import media_metadata_worker
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -376,6 +378,9 @@ async def create_podcast(
             await db.commit()
             await db.refresh(podcast)
             
+            # Duration and codec info are filled in by the media metadata worker
+            media_metadata_worker.enqueue("media", podcast.id, podcast.file_url, audio_upload_result["file_hash"])
+            
             # Redirect to podcast list with success message
             return RedirectResponse(
                 url=f"/admin/podcasts/list?upload_success=true&podcast_id={podcast.id}",
@@ -740,7 +745,8 @@ async def delete_podcast(request: Request, podcast_id: str):
 @router.get("/list", response_class=HTMLResponse)
 async def podcast_list(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[str] = Query(None, description="Cursor of the last row on the previous page"),
+    before: Optional[str] = Query(None, description="Cursor of the first row on the next page"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
     category_id: Optional[str] = Query(None, description="Filter by category")
@@ -783,27 +789,13 @@ async def podcast_list(
             if filters:
                 query = query.where(and_(*filters))
             
-            # Get total count for pagination
-            count_query = select(func.count(Media.id)).where(Media.media_type == 'PODCAST')
-            if filters:
-                count_query = count_query.where(and_(*filters))
-            
-            total_result = await db.execute(count_query)
-            total = total_result.scalar()
-            
-            # Apply pagination and ordering
-            offset = (page - 1) * limit
-            query = query.order_by(desc(Media.created_at)).offset(offset).limit(limit)
-            
-            # Execute query
-            result = await db.execute(query)
-            podcasts = result.scalars().all()
+            # Keyset pagination with a cached total
+            listing = await paginate(db, query, Media, limit, after=after, before=before)
+            podcasts = listing.items
+            total = listing.total
             
-            # Get categories for filter dropdown
-            categories_result = await db.execute(
-                select(Category).where(Category.is_active == True).order_by(Category.name)
-            )
-            categories = categories_result.scalars().all()
+            # Cached categories for the filter dropdown
+            categories = await load_category_options(db)
             
     except Exception as e:
         logger.error(f"Error loading podcast list: {e}")
@@ -826,16 +818,12 @@ async def podcast_list(
             i += 1
         return f"{size_bytes:.1f} {size_names[i]}"
     
-    # Calculate pagination info
-    total_pages = (total + limit - 1) // limit if total > 0 else 0
-    has_prev = page > 1
-    has_next = page < total_pages
-    
     # Generate category options for filter
     category_options = '<option value="">All Categories</option>'
     for category in categories:
         selected = "selected" if category_id == str(category.id) else ""
         category_options += f'<option value="{category.id}" {selected}>{category.name}</option>'
+    category_names = {category.id: category.name for category in categories}
     
     # Generate table rows
     table_rows = ""
@@ -845,11 +833,7 @@ async def podcast_list(
         if podcast.file_metadata and podcast.file_metadata.get("category_id"):
             try:
                 category_uuid = UUID(podcast.file_metadata["category_id"])
-                # Find category name from loaded categories
-                for cat in categories:
-                    if cat.id == category_uuid:
-                        category_name = cat.name
-                        break
+                category_name = category_names.get(category_uuid, category_name)
             except (ValueError, TypeError):
                 pass
         
@@ -898,30 +882,21 @@ async def podcast_list(
     
     # Generate pagination controls
     pagination_html = ""
-    if total_pages > 1:
+    if listing.has_prev or listing.has_next:
+        filter_params = {"search": search, "category_id": category_id}
         pagination_html = f"""
         <div class="pagination-container">
             <div class="pagination-info">
-                Showing {offset + 1}-{min(offset + limit, total)} of {total} entries
+                Showing {len(podcasts)} of {total} entries
             </div>
             <div class="pagination">
         """
         
-        # Previous button
-        if has_prev:
-            pagination_html += f'<a href="?page={page-1}&limit={limit}&search={search or ""}&category_id={category_id or ""}" class="btn btn-sm btn-secondary">Previous</a>'
-        
-        # Page numbers
-        start_page = max(1, page - 2)
-        end_page = min(total_pages, page + 2)
-        
-        for p in range(start_page, end_page + 1):
-            active_class = "btn-primary" if p == page else "btn-secondary"
-            pagination_html += f'<a href="?page={p}&limit={limit}&search={search or ""}&category_id={category_id or ""}" class="btn btn-sm {active_class}">{p}</a>'
+        if listing.has_prev:
+            pagination_html += f'<a href="{listing.href(filter_params, "prev")}" class="btn btn-sm btn-secondary">Previous</a>'
         
-        # Next button
-        if has_next:
-            pagination_html += f'<a href="?page={page+1}&limit={limit}&search={search or ""}&category_id={category_id or ""}" class="btn btn-sm btn-secondary">Next</a>'
+        if listing.has_next:
+            pagination_html += f'<a href="{listing.href(filter_params, "next")}" class="btn btn-sm btn-secondary">Next</a>'
         
         pagination_html += """
             </div>
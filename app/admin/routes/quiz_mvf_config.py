@@ -12,7 +12,7 @@ import logging
 import json
 
 from app.models.site_setting import SiteSetting
-from app.models.site_setting import SiteSetting
+from app.services.settings_service import settings_registry
 from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.db.database import get_db_session
@@ -470,6 +470,7 @@ async def update_mvf_config(
                 db.add(setting)
             
             await db.commit()
+            await settings_registry.publish_change()
             
             return JSONResponse(content={
                 "success": True,
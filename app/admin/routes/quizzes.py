@@ -18,6 +18,7 @@ from app.models.user import User
 from app.admin.templates.base import create_html_page
 from app.admin.templates.editor import get_quill_editor_html, get_quill_editor_js, get_upload_handlers_js
 from app.db.database import get_db_session
+from app.services.admin_listing import paginate, facet_counts, category_options as load_category_options
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -26,7 +27,8 @@ router = APIRouter()
 @router.get("/quizzes", response_class=HTMLResponse)
 async def quiz_list(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[str] = Query(None, description="Cursor of the last row on the previous page"),
+    before: Optional[str] = Query(None, description="Cursor of the first row on the next page"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
@@ -79,27 +81,15 @@ async def quiz_list(
             if filters:
                 query = query.where(and_(*filters))
             
-            # Get total count for pagination
-            count_query = select(func.count(Quiz.id))
-            if filters:
-                count_query = count_query.where(and_(*filters))
-            
-            total_result = await db.execute(count_query)
-            total = total_result.scalar()
+            # Keyset pagination with a cached total
+            listing = await paginate(db, query, Quiz, limit, after=after, before=before)
+            quizzes = listing.items
+            total = listing.total
             
-            # Apply pagination and ordering
-            offset = (page - 1) * limit
-            query = query.order_by(desc(Quiz.created_at)).offset(offset).limit(limit)
-            
-            # Execute query
-            result = await db.execute(query)
-            quizzes = result.scalars().all()
-            
-            # Get categories for filter dropdown
-            categories_result = await db.execute(
-                select(Category).where(Category.is_active == True).order_by(Category.name)
-            )
-            categories = categories_result.scalars().all()
+            # Cached dropdown options and facet counts
+            categories = await load_category_options(db)
+            category_counts = await facet_counts(db, Quiz, Quiz.category_id)
+            difficulty_counts = await facet_counts(db, Quiz, Quiz.difficulty_level)
             
     except Exception as e:
         logger.error(f"Error loading quiz list: {e}")
@@ -111,23 +101,18 @@ async def quiz_list(
             )
         )
     
-    # Calculate pagination info
-    total_pages = (total + limit - 1) // limit if total > 0 else 0
-    has_prev = page > 1
-    has_next = page < total_pages
-    
     # Generate category options for filter
     category_options = '<option value="">All Categories</option>'
     for category in categories:
         selected = "selected" if category_id == str(category.id) else ""
-        category_options += f'<option value="{category.id}" {selected}>{category.name}</option>'
+        category_options += f'<option value="{category.id}" {selected}>{category.name} ({category_counts.get(category.id, 0)})</option>'
     
     # Generate difficulty options
     difficulty_options = '<option value="">All Difficulties</option>'
     for diff_level in [1, 2, 3]:
         diff_name = {1: "Easy", 2: "Medium", 3: "Hard"}[diff_level]
         selected = "selected" if difficulty == diff_level else ""
-        difficulty_options += f'<option value="{diff_level}" {selected}>{diff_name}</option>'
+        difficulty_options += f'<option value="{diff_level}" {selected}>{diff_name} ({difficulty_counts.get(diff_level, 0)})</option>'
     
     # Generate table rows
     table_rows = ""
@@ -198,30 +183,21 @@ async def quiz_list(
     
     # Generate pagination controls
     pagination_html = ""
-    if total_pages > 1:
+    if listing.has_prev or listing.has_next:
+        filter_params = {"search": search, "category_id": category_id, "difficulty": difficulty, "active_only": active_only}
         pagination_html = f"""
         <div class="pagination-container">
             <div class="pagination-info">
-                Showing {offset + 1}-{min(offset + limit, total)} of {total} entries
+                Showing {len(quizzes)} of {total} entries
             </div>
             <div class="pagination">
         """
         
-        # Previous button
-        if has_prev:
-            pagination_html += f'<a href="?page={page-1}&limit={limit}&search={search or ""}&category_id={category_id or ""}&difficulty={difficulty or ""}&active_only={active_only}" class="btn btn-sm btn-secondary">Previous</a>'
-        
-        # Page numbers
-        start_page = max(1, page - 2)
-        end_page = min(total_pages, page + 2)
-        
-        for p in range(start_page, end_page + 1):
-            active_class = "btn-primary" if p == page else "btn-secondary"
-            pagination_html += f'<a href="?page={p}&limit={limit}&search={search or ""}&category_id={category_id or ""}&difficulty={difficulty or ""}&active_only={active_only}" class="btn btn-sm {active_class}">{p}</a>'
+        if listing.has_prev:
+            pagination_html += f'<a href="{listing.href(filter_params, "prev")}" class="btn btn-sm btn-secondary">Previous</a>'
         
-        # Next button
-        if has_next:
-            pagination_html += f'<a href="?page={page+1}&limit={limit}&search={search or ""}&category_id={category_id or ""}&difficulty={difficulty or ""}&active_only={active_only}" class="btn btn-sm btn-secondary">Next</a>'
+        if listing.has_next:
+            pagination_html += f'<a href="{listing.href(filter_params, "next")}" class="btn btn-sm btn-secondary">Next</a>'
         
         pagination_html += """
             </div>
@@ -11,6 +11,7 @@ import structlog
 
 from app.db.database import get_db_session
 from app.models.site_setting import SiteSetting
+from app.services.settings_service import settings_registry
 from app.admin.templates.base import create_html_page
 
 logger = structlog.get_logger()
@@ -245,6 +246,8 @@ async def update_settings(request: Request):
             
             await db.commit()
         
+        await settings_registry.publish_change()
+        
         return JSONResponse(
             status_code=200,
             content={
@@ -10,7 +10,7 @@ from sqlalchemy.orm import selectinload
 from uuid import UUID
 from datetime import datetime, timedelta
 
-from app.db.database import get_db_session
+from app.db.database import get_read_db_session
 from app.models.video_series import VideoSeries, SeriesVideo
 from app.models.video_channel import VideoChannel, GeneralKnowledgeVideo
 from app.models.video_engagement import VideoComment, VideoLike, VideoCommentLike
@@ -29,7 +29,7 @@ async def video_stats_page(request: Request, slug: str):
         return RedirectResponse(url="/admin/login", status_code=302)
     
     try:
-        async with get_db_session() as session:
+        async with get_read_db_session() as session:
             # Try to find in series first
             series_result = await session.execute(
                 select(SeriesVideo, VideoSeries)
@@ -22,6 +22,8 @@ from app.models.video_channel import GeneralKnowledgeVideo
 from app.models.video_tag import VideoTag
 from app.admin.templates.base import create_html_page
 from app.services.file_upload import file_upload_service
+from app.services.media_probe import media_metadata_worker
+from app.services.video_packaging import video_packaging_worker
 import json
 
 router = APIRouter()
@@ -2925,6 +2927,9 @@ async def update_series(
         video_tags_json = form_data.get("video_tags", "{}")
         video_tags_dict = json.loads(video_tags_json)
         
+        # Probes run after commit so the worker sees the rows
+        probe_jobs = []
+        
         async with get_db_session() as session:
             # Get series
             series_result = await session.execute(
@@ -2998,8 +3003,12 @@ async def update_series(
                         
                         video.video_url = upload_result["file_url"]  # e.g., "videos/abc.mp4"
                         
-                        # Extract video duration
+                        # Duration is backfilled by the media metadata worker; the
+                        # old HLS package describes the replaced file
                         video.duration = upload_result.get("duration")
+                        video.media_info = None
+                        video.streaming = None
+                        probe_jobs.append((video.id, video.video_url, upload_result["file_hash"]))
                     
                     # Check if new thumbnail uploaded
                     video_thumbnail = form_data.get(f"video_{pos}_thumbnail")
@@ -3071,6 +3080,7 @@ async def update_series(
                         views=0
                     )
                     session.add(new_video)
+                    probe_jobs.append((new_video.id, video_url, upload_result["file_hash"]))
             
             # Update series total videos count
             total_videos_result = await session.execute(
@@ -3108,6 +3118,10 @@ async def update_series(
             
             await session.commit()
             
+            for video_id, file_url, file_hash in probe_jobs:
+                media_metadata_worker.enqueue("series_video", video_id, file_url, file_hash)
+                video_packaging_worker.enqueue("series_video", video_id, file_url)
+            
             return JSONResponse(content={
                 "status": True,
                 "message": f"Series '{title}' updated successfully!"
@@ -3823,6 +3837,7 @@ async def submit_video_series(
             
             # Process each video
             videos_created = []
+            probe_jobs = []
             all_used_tags = set()  # Track all tags used for auto-save
             
             for i in range(1, num_videos + 1):
@@ -3883,6 +3898,7 @@ async def submit_video_series(
                 )
                 session.add(series_video)
                 videos_created.append(video_title)
+                probe_jobs.append((series_video.id, series_video.video_url))
             
             # Auto-save new custom tags to database
             if all_used_tags:
@@ -3913,6 +3929,10 @@ async def submit_video_series(
             
             await session.commit()
             
+            for video_id, file_url in probe_jobs:
+                media_metadata_worker.enqueue("series_video", video_id, file_url)
+                video_packaging_worker.enqueue("series_video", video_id, file_url)
+            
             return JSONResponse(content={
                 "status": True,
                 "message": f"Series '{title}' created successfully with {len(videos_created)} videos!",
@@ -4001,6 +4021,9 @@ async def upload_video(
         await db.commit()
         await db.refresh(media)
         
+        media_metadata_worker.enqueue("media", media.id, media.file_url)
+        video_packaging_worker.enqueue("media", media.id, media.file_url)
+        
         return {
             "success": True,
             "message": "Video uploaded successfully",
@@ -5296,6 +5319,9 @@ async def submit_general_knowledge_video(
                 channel.total_videos += 1
             
             await session.commit()
+            
+            media_metadata_worker.enqueue("gk_video", video.id, video_url, upload_result["file_hash"])
+            video_packaging_worker.enqueue("gk_video", video.id, video_url)
         
         return JSONResponse(content={
             "status": True,
@@ -5927,6 +5953,7 @@ async def update_general_knowledge_video(
                 video.publish_date = datetime.fromisoformat(publish_date_val) if publish_date_val else None
             
             # Update video file if provided
+            replaced_file_hash = None
             if video_file and video_file.filename:
                 upload_result = await file_upload_service.upload_file(
                     file=video_file,
@@ -5936,6 +5963,10 @@ async def update_general_knowledge_video(
                 
                 video.video_url = upload_result["file_url"]  # e.g., "videos/abc.mp4"
                 video.duration = upload_result.get("duration", 0)
+                # Probe and package the new file; drop results for the old one
+                video.media_info = None
+                video.streaming = None
+                replaced_file_hash = upload_result["file_hash"]
             
             # Update thumbnail if provided
             if thumbnail_file and thumbnail_file.filename:
@@ -5963,6 +5994,10 @@ async def update_general_knowledge_video(
             
             await session.commit()
             
+            if replaced_file_hash is not None:
+                media_metadata_worker.enqueue("gk_video", video.id, video.video_url, replaced_file_hash)
+                video_packaging_worker.enqueue("gk_video", video.id, video.video_url)
+            
             return JSONResponse(content={
                 "status": True,
                 "message": "Video updated successfully!",
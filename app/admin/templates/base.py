@@ -1,43 +1,98 @@
 """
 Base HTML templates for admin panel
+
+The admin CSS and JavaScript are compiled once into fingerprinted assets served
+from /admin/assets with immutable cache headers, and the page layout is split
+around the content so each request only joins the title, sidebar and content.
 """
 
-def create_html_page(title: str, content: str, active_page: str = "") -> str:
-    """Create a complete HTML page with admin layout"""
-    return f"""
+import hashlib
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+ADMIN_ASSET_PREFIX = "/admin/assets"
+ADMIN_ASSET_MAX_AGE = 365 * 24 * 3600
+
+_ASSET_TYPES = {
+    "css": "text/css; charset=utf-8",
+    "js": "application/javascript; charset=utf-8",
+}
+
+
+@lru_cache(maxsize=1)
+def compile_admin_shell() -> Dict[str, Tuple[bytes, str]]:
+    """
+    Build the fingerprinted admin CSS/JS once per process
+
+    Returns a mapping of asset filename (e.g. "admin.3f2a9c1b0d.css") to its
+    body and media type. Filenames change whenever the content changes, so
+    they can be cached forever by the browser.
+    """
+    assets = {}
+    for ext, source in (("css", get_admin_css()), ("js", get_admin_js())):
+        body = source.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:10]
+        assets[f"admin.{digest}.{ext}"] = (body, _ASSET_TYPES[ext])
+    return assets
+
+
+def get_admin_asset(filename: str) -> Optional[Tuple[bytes, str]]:
+    """Body and media type for a compiled admin asset, or None if unknown"""
+    return compile_admin_shell().get(filename)
+
+
+def admin_asset_url(ext: str) -> str:
+    """Public URL of the compiled admin asset with the given extension"""
+    for filename in compile_admin_shell():
+        if filename.endswith(f".{ext}"):
+            return f"{ADMIN_ASSET_PREFIX}/{filename}"
+    raise KeyError(ext)
+
+
+@lru_cache(maxsize=1)
+def _layout() -> Tuple[str, str, str, str]:
+    """Static layout fragments around the title, sidebar and content"""
+    head = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
->
-    <title>{title} - Junglore Admin</title>
+    <title>"""
+    before_sidebar = f""" - Junglore Admin</title>
     <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
     <link href="https://cdn.quilljs.com/1.3.6/quill.snow.css" rel="stylesheet">
     <link href="/static/css/admin-file-upload.css" rel="stylesheet">
-    <style>
-        {get_admin_css()}
-    </style>
+    <link href="{admin_asset_url('css')}" rel="stylesheet">
 </head>
 <body>
     <div class="admin-layout">
-        {get_sidebar(active_page)}
+        """
+    before_content = """
         <main class="main-content">
-            {content}
+            """
+    tail = f"""
         </main>
     </div>
     
     <script src="https://cdn.quilljs.com/1.3.6/quill.min.js"></script>
     <script src="/static/js/admin-file-upload.js"></script>
-    <script>
-        {get_admin_js()}
-    </script>
+    <script src="{admin_asset_url('js')}"></script>
 </body>
 </html>
 """
+    return head, before_sidebar, before_content, tail
+
+
+def create_html_page(title: str, content: str, active_page: str = "") -> str:
+    """Create a complete HTML page with admin layout"""
+    head, before_sidebar, before_content, tail = _layout()
+    return "".join((head, title, before_sidebar, get_sidebar(active_page), before_content, content, tail))
+
 
+@lru_cache(maxsize=64)
 def get_sidebar(active_page: str = "") -> str:
-    """Generate modern sidebar navigation"""
+    """Generate modern sidebar navigation (cached per active page)"""
     return f"""
     <button class="mobile-menu-btn" id="mobile-menu-btn">
         <i class="fas fa-bars"></i>
@@ -11,6 +11,7 @@ from uuid import UUID
 
 from app.db.database import get_db
 from app.models.myth_fact_collection import MythFactCollection
+from app.services.collection_availability import invalidate_collection_catalog
 
 router = APIRouter(prefix="/admin/collections", tags=["Admin Collections"])
 
@@ -165,6 +166,7 @@ async def bulk_add_cards_to_collection(
             })
         
         await db.commit()
+        await invalidate_collection_catalog()
         
         return {
             "message": f"Bulk add completed",
@@ -209,6 +211,7 @@ async def clone_collection(
         
         db.add(new_collection)
         await db.commit()
+        await invalidate_collection_catalog()
         await db.refresh(new_collection)
         
         return {
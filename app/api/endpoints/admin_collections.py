@@ -28,6 +28,7 @@ from app.models.myth_fact_collection import MythFactCollection, CollectionMythFa
 from app.models.myth_fact import MythFact
 from app.models.user import User
 from app.models.category import Category
+from app.services.collection_availability import invalidate_collection_catalog
 from app.schemas.collection_schemas import (
     CollectionCreate, CollectionResponse, CollectionUpdate, CollectionWithCards
 )
@@ -51,6 +52,7 @@ async def admin_create_collection(
         
         db.add(new_collection)
         await db.commit()
+        await invalidate_collection_catalog()
         await db.refresh(new_collection)
         
         return CollectionResponse.from_orm(new_collection)
@@ -403,6 +405,7 @@ async def bulk_add_cards_to_collection(
         collection.updated_at = datetime.utcnow()
         
         await db.commit()
+        await invalidate_collection_catalog()
         
         return {
             "message": "Cards added to collection successfully",
@@ -476,6 +479,7 @@ async def clone_collection(
             new_collection.cards_count = len(card_assignments)
         
         await db.commit()
+        await invalidate_collection_catalog()
         await db.refresh(new_collection)
         
         return {
@@ -24,6 +24,7 @@ from app.core.security import get_current_user
 from app.services.anti_gaming_service import anti_gaming_service
 from app.services.currency_service import currency_service
 from app.services.leaderboard_service import leaderboard_service
+from app.services.settings_service import settings_registry
 
 router = APIRouter()
 
@@ -515,6 +516,7 @@ async def update_system_settings(
                     updated_settings.append(f"{db_key}: {value}")
         
         await db.commit()
+        await settings_registry.publish_change()
         
         return {
             "message": "System settings updated successfully",
@@ -21,6 +21,7 @@ from app.models.animal_profile import (
 )
 from app.models.user import User
 from app.models.category import Category
+from app.models.recommendation import UserRecommendation, RecommendationTypeEnum
 from app.core.security import get_current_user, get_current_user_optional
 from app.schemas.animal_profile import (
     AnimalProfileCreate,
@@ -139,47 +140,34 @@ async def get_animal_recommendations(
 ):
     """Get personalized animal recommendations for user"""
     
-    # For now, implement simple recommendation based on user's favorite categories
-    # and previously viewed animals (can be enhanced with ML later)
-    
-    # Get user's interactions to understand preferences
-    user_interactions = await db.execute(
-        select(UserAnimalInteraction)
-        .options(selectinload(UserAnimalInteraction.animal_profile))
-        .where(UserAnimalInteraction.user_id == user_id)
-        .order_by(desc(UserAnimalInteraction.last_viewed_at))
-        .limit(20)
-    )
-    interactions = user_interactions.scalars().all()
-    
-    # Get categories from viewed animals
-    viewed_categories = []
-    for interaction in interactions:
-        if interaction.animal_profile.category_id:
-            viewed_categories.append(interaction.animal_profile.category_id)
-    
-    # Get animals from similar categories that user hasn't viewed
-    viewed_animal_ids = [i.animal_profile_id for i in interactions]
-    
-    query = select(AnimalProfile).where(
-        and_(
-            AnimalProfile.is_active == True,
-            ~AnimalProfile.id.in_(viewed_animal_ids)  # Exclude already viewed
+    # Precomputed by the recommendation engine; one indexed read per request
+    result = await db.execute(
+        select(AnimalProfile)
+        .join(UserRecommendation, UserRecommendation.item_id == AnimalProfile.id)
+        .where(
+            and_(
+                UserRecommendation.user_id == user_id,
+                UserRecommendation.recommendation_type == RecommendationTypeEnum.ANIMAL_PROFILE,
+                UserRecommendation.is_dismissed == False,
+                UserRecommendation.expires_at > func.now(),
+                AnimalProfile.is_active == True
+            )
         )
+        .order_by(desc(UserRecommendation.relevance_score))
+        .limit(limit)
     )
-    
-    if viewed_categories:
-        query = query.where(AnimalProfile.category_id.in_(viewed_categories))
-    
-    # Prioritize featured and popular animals
-    query = query.order_by(
-        desc(AnimalProfile.is_featured),
-        desc(AnimalProfile.view_count)
-    ).limit(limit)
-    
-    result = await db.execute(query)
     recommendations = result.scalars().all()
     
+    if not recommendations:
+        # Users without computed rows yet get featured and popular animals
+        result = await db.execute(
+            select(AnimalProfile)
+            .where(AnimalProfile.is_active == True)
+            .order_by(desc(AnimalProfile.is_featured), desc(AnimalProfile.view_count))
+            .limit(limit)
+        )
+        recommendations = result.scalars().all()
+    
     return [AnimalProfileListResponse(
         id=profile.id,
         common_name=profile.common_name,
@@ -18,7 +18,7 @@ from app.core.config import settings
 from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token
 from app.api.deps import get_current_user, oauth2_scheme
 from app.core.logging_config import get_logger
-from app.db.database import get_db, get_db_with_retry
+from app.db.database import DatabaseRetryRoute, get_db, get_db_with_retry
 from app.models.user import User
 from app.models.temp_user import TempUserRegistration
 from app.services.email_service import email_service
@@ -31,7 +31,7 @@ from app.schemas.auth import (
 )
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=DatabaseRetryRoute)
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -15,6 +15,7 @@ from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.core.security import get_current_user
 from app.models.user import User
+from app.services.admin_listing import invalidate_category_options
 
 router = APIRouter()
 
@@ -152,6 +153,7 @@ async def create_category(
         
         db.add(category)
         await db.commit()
+        await invalidate_category_options()
         await db.refresh(category)
         
         return category
@@ -230,6 +232,7 @@ async def update_category(
             setattr(category, field, value)
         
         await db.commit()
+        await invalidate_category_options()
         await db.refresh(category)
         
         return category
@@ -283,6 +286,7 @@ async def delete_category(
         
         await db.delete(category)
         await db.commit()
+        await invalidate_category_options()
         
         return {"message": "Category deleted successfully"}
         
@@ -5,15 +5,17 @@ Handles chatbot conversations and AI interactions
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update, tuple_
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.db.database import get_db
-from app.models.chatbot import ChatbotConversation
+from app.models.chatbot import ChatbotConversation, ChatbotMessage
 from app.models.user import User
 from app.core.security import get_current_user, get_current_user_optional
+from app.services.admin_listing import encode_cursor, decode_cursor
+from app.services.chatbot_retrieval import chatbot_retrieval, ChatAnswer
 
 router = APIRouter()
 
@@ -45,7 +47,7 @@ async def get_conversations(
             {
                 "id": str(conv.id),
                 "title": f"Conversation {conv.started_at.strftime('%Y-%m-%d %H:%M')}",
-                "message_count": len(conv.messages) if conv.messages else 0,
+                "message_count": conv.message_count,
                 "started_at": conv.started_at.isoformat(),
                 "last_message_at": conv.last_message_at.isoformat()
             }
@@ -73,37 +75,26 @@ async def create_conversation(
                 detail="Message cannot be empty"
             )
         
-        # Simple chatbot response logic (placeholder)
-        bot_response = generate_wildlife_response(user_message)
-        
-        # Create conversation record
-        messages = [
-            {
-                "role": "user",
-                "content": user_message,
-                "timestamp": datetime.utcnow().isoformat()
-            },
-            {
-                "role": "assistant",
-                "content": bot_response,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        ]
+        answer = chatbot_retrieval.answer(user_message)
         
         conversation = ChatbotConversation(
             user_id=current_user.id if current_user else None,
-            messages=messages
+            messages=[],
+            message_count=0,
+            started_at=datetime.now(timezone.utc)
         )
-        
         db.add(conversation)
+        await db.flush()
+        
+        await _append_exchange(db, conversation, user_message, answer)
         await db.commit()
-        await db.refresh(conversation)
         
         return {
             "id": str(conversation.id),
             "user_message": user_message,
-            "bot_response": bot_response,
-            "created_at": conversation.created_at.isoformat()
+            "bot_response": answer.text,
+            "sources": answer.sources,
+            "created_at": conversation.started_at.isoformat()
         }
         
     except HTTPException:
@@ -118,10 +109,12 @@ async def create_conversation(
 @router.get("/{conversation_id}")
 async def get_conversation(
     conversation_id: UUID,
+    limit: int = Query(50, ge=1, le=200, description="Number of messages to return"),
+    before: Optional[str] = Query(None, description="Cursor for older messages"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user_optional)
 ):
-    """Get specific conversation by ID"""
+    """Get a conversation with its latest messages; page back with `before`"""
     try:
         query = select(ChatbotConversation).where(ChatbotConversation.id == conversation_id)
         
@@ -138,9 +131,21 @@ async def get_conversation(
                 detail="Conversation not found"
             )
         
+        query = select(ChatbotMessage).where(ChatbotMessage.conversation_id == conversation_id)
+        position = decode_cursor(before)
+        if position:
+            query = query.where(tuple_(ChatbotMessage.created_at, ChatbotMessage.id) < position)
+        result = await db.execute(
+            query.order_by(desc(ChatbotMessage.created_at), desc(ChatbotMessage.id)).limit(limit + 1)
+        )
+        rows = result.scalars().all()
+        page = list(rows[:limit])[::-1]
+        
         return {
             "id": str(conversation.id),
-            "messages": conversation.messages or [],
+            "messages": [_message_dict(message) for message in page],
+            "message_count": conversation.message_count,
+            "older_cursor": encode_cursor(page[0].created_at, page[0].id) if len(rows) > limit else None,
             "started_at": conversation.started_at.isoformat(),
             "last_message_at": conversation.last_message_at.isoformat()
         }
@@ -183,30 +188,15 @@ async def add_message_to_conversation(
                 detail="Conversation not found"
             )
         
-        # Generate bot response
-        bot_response = generate_wildlife_response(user_message)
-        
-        # Add messages to conversation
-        messages = conversation.messages or []
-        messages.extend([
-            {
-                "role": "user",
-                "content": user_message,
-                "timestamp": datetime.utcnow().isoformat()
-            },
-            {
-                "role": "assistant",
-                "content": bot_response,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        ])
-        
-        conversation.messages = messages
+        # Answer from the retrieval index and append; earlier messages are never loaded
+        answer = chatbot_retrieval.answer(user_message)
+        await _append_exchange(db, conversation, user_message, answer)
         await db.commit()
         
         return {
             "user_message": user_message,
-            "bot_response": bot_response,
+            "bot_response": answer.text,
+            "sources": answer.sources,
             "last_message_at": conversation.last_message_at.isoformat()
         }
         
@@ -219,37 +209,48 @@ async def add_message_to_conversation(
             detail=f"Failed to add message: {str(e)}"
         )
 
-def generate_wildlife_response(user_message: str) -> str:
-    """Generate a simple wildlife-themed chatbot response"""
-    message_lower = user_message.lower()
-    
-    # Simple keyword-based responses
-    if any(word in message_lower for word in ["tiger", "tigers"]):
-        return "Tigers are magnificent apex predators! Did you know that tigers are excellent swimmers and can leap horizontally up to 33 feet? There are currently 6 subspecies of tigers remaining in the wild. Would you like to learn more about tiger conservation efforts?"
-    
-    elif any(word in message_lower for word in ["elephant", "elephants"]):
-        return "Elephants are incredible creatures with complex social structures! They have excellent memories and can recognize hundreds of individuals. African elephants are the largest land mammals on Earth. Are you interested in learning about elephant conservation programs?"
-    
-    elif any(word in message_lower for word in ["lion", "lions"]):
-        return "Lions are known as the 'King of the Jungle' though they actually live in grasslands and savannas! They're the only cats that live in social groups called prides. A lion's roar can be heard up to 5 miles away. What would you like to know about lions?"
-    
-    elif any(word in message_lower for word in ["conservation", "protect", "save"]):
-        return "Wildlife conservation is crucial for maintaining biodiversity and ecosystem balance. There are many ways to help: supporting conservation organizations, reducing plastic use, choosing sustainable products, and spreading awareness. Which conservation topic interests you most?"
-    
-    elif any(word in message_lower for word in ["forest", "jungle", "rainforest"]):
-        return "Forests are the lungs of our planet! Tropical rainforests contain over half of the world's plant and animal species despite covering only 6% of Earth's surface. They play a vital role in climate regulation and carbon storage. Would you like to learn about forest conservation?"
-    
-    elif any(word in message_lower for word in ["bird", "birds"]):
-        return "Birds are fascinating creatures! There are over 10,000 bird species worldwide. They play crucial roles as pollinators, seed dispersers, and pest controllers. Many bird species are excellent indicators of ecosystem health. Are you interested in birdwatching or bird conservation?"
-    
-    elif any(word in message_lower for word in ["ocean", "marine", "sea"]):
-        return "Our oceans are home to incredible biodiversity! Marine ecosystems support countless species and provide essential services like climate regulation and oxygen production. Ocean conservation is critical as marine life faces threats from pollution, overfishing, and climate change. What marine topic interests you?"
-    
-    elif any(word in message_lower for word in ["hello", "hi", "hey"]):
-        return "Hello! Welcome to Junglore's wildlife chatbot! 🌿 I'm here to help you learn about wildlife, conservation, and our amazing natural world. You can ask me about different animals, conservation efforts, or any wildlife-related topics. What would you like to explore today?"
-    
-    elif any(word in message_lower for word in ["help", "what can you do"]):
-        return "I can help you with information about: 🦁 Wildlife and animals, 🌱 Conservation efforts, 🌍 Ecosystems and habitats, 📚 Educational content about nature, 🔍 Finding specific wildlife information. Just ask me about any animal or conservation topic you're curious about!"
+async def _append_exchange(
+    db: AsyncSession,
+    conversation: ChatbotConversation,
+    user_message: str,
+    answer: ChatAnswer
+):
+    """Append a user message and its answer without touching earlier messages"""
+    asked_at = datetime.now(timezone.utc)
+    # Distinct timestamps keep the pair in order under (created_at, id) paging
+    answered_at = asked_at + timedelta(microseconds=1)
     
-    else:
-        return "That's an interesting question about wildlife! While I'd love to provide more specific information, I'm still learning. For detailed information about wildlife and conservation, I recommend exploring our educational content or contacting our wildlife experts. Is there a specific animal or conservation topic you'd like to know more about?"
\ No newline at end of file
+    db.add_all([
+        ChatbotMessage(
+            conversation_id=conversation.id,
+            role="user",
+            content=user_message,
+            created_at=asked_at
+        ),
+        ChatbotMessage(
+            conversation_id=conversation.id,
+            role="assistant",
+            content=answer.text,
+            sources=answer.sources or None,
+            created_at=answered_at
+        ),
+    ])
+    await db.execute(
+        update(ChatbotConversation)
+        .where(ChatbotConversation.id == conversation.id)
+        .values(
+            message_count=ChatbotConversation.message_count + 2,
+            last_message_at=answered_at
+        )
+    )
+    conversation.last_message_at = answered_at
+
+
+def _message_dict(message: ChatbotMessage) -> dict:
+    return {
+        "id": str(message.id),
+        "role": message.role,
+        "content": message.content,
+        "sources": message.sources or [],
+        "timestamp": message.created_at.isoformat()
+    }
@@ -7,6 +7,7 @@ the existing myths_facts system and support daily repeatability.
 Features:
 - List available collections for users
 - Track user progress with daily limits
+- Resolve availability for all collections in one query
 - Integration with existing reward system
 
 Author: Junglore Development Team
@@ -18,12 +19,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, text
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 
 from app.db.database import get_db
 from app.models.myth_fact_collection import MythFactCollection, CollectionMythFact, UserCollectionProgress
 from app.models.myth_fact import MythFact
 from app.models.user import User
+from app.services.collection_availability import resolve_availability
 from app.schemas.collection_schemas import (
     CollectionResponse, UserCollectionProgressResponse
 )
@@ -107,41 +109,16 @@ async def get_available_collections_for_user(
 ):
     """Get collections available for a user to play based on repeatability rules."""
     try:
-        # Get all active collections
-        collections_query = select(MythFactCollection).where(
-            MythFactCollection.is_active == True
-        )
-        collections_result = await db.execute(collections_query)
-        all_collections = collections_result.scalars().all()
-        
-        available_collections = []
-        played_today = []
+        availability = await resolve_availability(db, user_id, target_date)
         
-        for collection in all_collections:
-            # Check if user can play this collection
-            can_play = await _can_user_play_collection(
-                db, user_id, collection.id, target_date, collection.repeatability
-            )
-            
-            collection_info = {
-                "id": collection.id,
-                "name": collection.name,
-                "description": collection.description,
-                "cards_count": collection.cards_count,
-                "repeatability": collection.repeatability,
-                "category_id": collection.category_id
-            }
-            
-            if can_play:
-                available_collections.append(collection_info)
-            else:
-                played_today.append(collection_info)
+        available_collections = [a.to_dict() for a in availability if a.can_play]
+        played_today = [a.to_dict() for a in availability if not a.can_play]
         
         return {
             "available_collections": available_collections,
             "played_today": played_today,
             "date": target_date,
-            "total_collections": len(all_collections)
+            "total_collections": len(availability)
         }
     
     except Exception as e:
@@ -311,55 +288,3 @@ async def complete_collection(
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to complete collection: {str(e)}")
 
-
-async def _can_user_play_collection(
-    db: AsyncSession,
-    user_id: UUID,
-    collection_id: UUID,
-    target_date: date,
-    repeatability: str
-) -> bool:
-    """Check if a user can play a collection based on repeatability rules."""
-    try:
-        if repeatability == "unlimited":
-            return True
-        
-        # Check if user has played this collection on the target date
-        progress_query = select(UserCollectionProgress).where(
-            and_(
-                UserCollectionProgress.user_id == user_id,
-                UserCollectionProgress.collection_id == collection_id,
-                UserCollectionProgress.play_date == target_date
-            )
-        )
-        
-        if repeatability == "daily":
-            # Daily: Can't play if already played today
-            result = await db.execute(progress_query)
-            existing_progress = result.scalar_one_or_none()
-            return existing_progress is None
-        
-        elif repeatability == "weekly":
-            # Weekly: Can't play if already played this week
-            days_since_monday = target_date.weekday()
-            week_start = target_date - timedelta(days=days_since_monday)
-            week_end = week_start + timedelta(days=6)
-            
-            weekly_progress_query = select(UserCollectionProgress).where(
-                and_(
-                    UserCollectionProgress.user_id == user_id,
-                    UserCollectionProgress.collection_id == collection_id,
-                    UserCollectionProgress.play_date >= week_start,
-                    UserCollectionProgress.play_date <= week_end
-                )
-            )
-            
-            result = await db.execute(weekly_progress_query)
-            existing_progress = result.scalar_one_or_none()
-            return existing_progress is None
-        
-        return True
-        
-    except Exception:
-        # Default to allowing play if there's an error
-        return True
\ No newline at end of file
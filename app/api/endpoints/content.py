@@ -13,11 +13,13 @@ from datetime import datetime
 import re
 from slugify import slugify
 
+from app.core.responses import FastJSONResponse
 from app.db.database import get_db
 from app.models.content import Content, ContentTypeEnum, ContentStatusEnum
 from app.models.user import User
 from app.models.category import Category
 from app.core.security import get_current_user, get_current_user_optional
+from app.services.media_urls import media_url_service
 from app.schemas.content import (
     ContentCreate,
     ContentUpdate,
@@ -680,7 +682,7 @@ async def get_blogs_for_frontend(
         )
         total = count_result.scalar()
         
-        return {
+        return FastJSONResponse({
             "blogs": [
                 {
                     "id": str(blog.id),
@@ -710,7 +712,7 @@ async def get_blogs_for_frontend(
                 "total": total,
                 "pages": (total + limit - 1) // limit
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -747,15 +749,15 @@ async def get_casestudies_for_frontend(
         )
         total = count_result.scalar()
         
-        return {
+        return FastJSONResponse({
             "casestudies": [
                 {
                     "id": str(study.id),
                     "title": study.title,
                     "excerpt": study.excerpt,
                     "content": study.content,
-                    "featured_image": study.featured_image,
-                    "banner": study.banner,
+                    "featured_image": media_url_service.direct_url(study.featured_image),
+                    "banner": media_url_service.direct_url(study.banner),
                     "author_name": study.author_name,
                     "author": {
                         "id": str(study.author.id),
@@ -780,7 +782,7 @@ async def get_casestudies_for_frontend(
                 "total": total,
                 "pages": (total + limit - 1) // limit
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -817,15 +819,15 @@ async def get_conservation_for_frontend(
         )
         total = count_result.scalar()
         
-        return {
+        return FastJSONResponse({
             "conservation": [
                 {
                     "id": str(item.id),
                     "title": item.title,
                     "excerpt": item.excerpt,
                     "content": item.content,
-                    "featured_image": item.featured_image,
-                    "banner": item.banner,
+                    "featured_image": media_url_service.direct_url(item.featured_image),
+                    "banner": media_url_service.direct_url(item.banner),
                     "author_name": item.author_name,
                     "author": {
                         "id": str(item.author.id),
@@ -850,7 +852,7 @@ async def get_conservation_for_frontend(
                 "total": total,
                 "pages": (total + limit - 1) // limit
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -887,15 +889,15 @@ async def get_dailyupdates_for_frontend(
         )
         total = count_result.scalar()
         
-        return {
+        return FastJSONResponse({
             "updates": [
                 {
                     "id": str(update.id),
                     "title": update.title,
                     "excerpt": update.excerpt,
                     "content": update.content,
-                    "featured_image": update.featured_image,
-                    "banner": update.banner,
+                    "featured_image": media_url_service.direct_url(update.featured_image),
+                    "banner": media_url_service.direct_url(update.banner),
                     "author_name": update.author_name,
                     "author": {
                         "id": str(update.author.id),
@@ -921,7 +923,7 @@ async def get_dailyupdates_for_frontend(
                 "total": total,
                 "pages": (total + limit - 1) // limit
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
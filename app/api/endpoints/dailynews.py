@@ -10,7 +10,6 @@ from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-import aiofiles
 import os
 from pathlib import Path
 from uuid import uuid4
@@ -27,6 +26,8 @@ from app.models.content import Content, ContentTypeEnum, ContentStatusEnum
 from app.models.category import Category
 from app.models.user import User
 from app.core.security import get_current_user, get_current_user_optional
+from app.core.exceptions import FileSizeError
+from app.services.file_upload import file_upload_service
 from app.schemas.content import (
     ContentCreate,
     ContentUpdate,
@@ -62,14 +63,6 @@ async def save_uploaded_file(file: UploadFile, file_type: str) -> str:
     if not file:
         return None
         
-    # Validate file size
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB"
-        )
-    
     # Validate file type
     if not is_allowed_file_type(file.content_type):
         raise HTTPException(
@@ -86,9 +79,15 @@ async def save_uploaded_file(file: UploadFile, file_type: str) -> str:
     unique_filename = f"{uuid4()}{file_extension}"
     file_path = type_dir / unique_filename
     
-    # Save file
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(content)
+    # Stream file to disk, enforcing the size limit as it arrives; shares the
+    # upload service's concurrency limit
+    try:
+        await file_upload_service.stream_to_path(file, file_path, MAX_FILE_SIZE)
+    except FileSizeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
     
     return f"{file_type}s/{unique_filename}"
 
@@ -14,7 +14,7 @@ from pathlib import Path
 import boto3
 from botocore.exceptions import ClientError
 
-from app.db.database import get_db, get_db_with_retry
+from app.db.database import DatabaseRetryRoute, get_db, get_db_with_retry
 from app.core.config import settings
 from app.core.deps import get_current_user, get_optional_user
 from app.models.user import User
@@ -37,7 +37,7 @@ from app.schemas.discussion import (
     CategorySummary
 )
 
-router = APIRouter()
+router = APIRouter(route_class=DatabaseRetryRoute)
 
 
 # ============================================================================
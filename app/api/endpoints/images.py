@@ -0,0 +1,67 @@
+"""
+On-demand image resizing
+
+GET /img/{key}?w=640&fmt=webp renders the variant on first request. The URL
+only names the source, so responses are revalidated against their ETag;
+URLs carrying the source version (``&v=``, see
+``ImageDerivativeService.versioned_url``) are content-addressed and cached
+as immutable.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse
+
+from app.services.image_derivatives import (
+    DerivativeError,
+    image_derivative_service,
+    negotiate_format,
+)
+from app.services.media_urls import media_url_service
+
+router = APIRouter()
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+
+@router.get("/img/{key:path}")
+async def get_image(
+    key: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="Target width in pixels"),
+    fmt: Optional[str] = Query(None, description="jpeg, webp or avif; negotiated from Accept when omitted"),
+    v: Optional[str] = Query(None, description="Source version; makes the URL cacheable forever")
+):
+    """Serve a resized image variant, generating it lazily"""
+    try:
+        output_format = negotiate_format(fmt, request.headers.get("accept", ""))
+        resolved = await image_derivative_service.resolve(key, w, output_format)
+    except DerivativeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # A stale ?v= still gets the current image, just not cached forever
+    immutable = v is not None and v == resolved.version
+    etag = f'"{resolved.digest}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE if immutable else REVALIDATE}
+    if not fmt:
+        headers["Vary"] = "Accept"
+
+    # Answer revalidations before looking up or rendering the variant
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        derivative = await image_derivative_service.fetch(resolved)
+    except DerivativeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if derivative.object_key:
+        url = media_url_service.public_url(derivative.object_key)
+        if url is None:
+            url, max_age = media_url_service.presigned_url(derivative.object_key)
+            headers["Cache-Control"] = f"private, max-age={max_age}" if immutable else "private, no-cache"
+        return RedirectResponse(url=url, status_code=307, headers=headers)
+
+    return FileResponse(derivative.path, media_type=derivative.content_type, headers=headers)
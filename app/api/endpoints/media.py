@@ -15,11 +15,13 @@ import mimetypes
 from PIL import Image
 import io
 
-from app.db.database import get_db, get_db_with_retry
+from app.db.database import DatabaseRetryRoute, get_db, get_db_with_retry
 from app.models.media import Media, MediaTypeEnum as ModelMediaTypeEnum
 from app.models.content import Content
 from app.models.user import User
 from app.core.security import get_current_user, get_current_user_optional
+from app.services.image_optimization import image_optimizer
+from app.services.media_probe import media_metadata_worker
 from app.schemas.media import (
     MediaCreate,
     MediaUpdate,
@@ -31,7 +33,7 @@ from app.schemas.media import (
     MediaTypeEnum
 )
 
-router = APIRouter()
+router = APIRouter(route_class=DatabaseRetryRoute)
 
 # Configuration for file uploads
 UPLOAD_DIR = Path("uploads")
@@ -74,16 +76,14 @@ async def create_thumbnail(file_path: Path, media_type: MediaTypeEnum) -> Option
         thumbnail_dir = UPLOAD_DIR / "thumbnails"
         thumbnail_dir.mkdir(exist_ok=True)
         
-        # Generate thumbnail filename
-        thumbnail_name = f"thumb_{file_path.stem}.jpg"
-        thumbnail_path = thumbnail_dir / thumbnail_name
-        
-        # Create thumbnail using Pillow
-        with Image.open(file_path) as img:
-            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
-            img.save(thumbnail_path, "JPEG", quality=85)
+        # Resize in the image engine's process pool, off the event loop
+        thumbnail_path = await image_optimizer.create_thumbnail(
+            file_path, thumbnail_dir, f"thumb_{file_path.stem}"
+        )
+        if not thumbnail_path:
+            return None
         
-        return f"/uploads/thumbnails/{thumbnail_name}"
+        return f"/uploads/thumbnails/{thumbnail_path.name}"
     except Exception as e:
         print(f"Failed to create thumbnail: {e}")
         return None
@@ -392,6 +392,9 @@ async def upload_media_file(
         await db.commit()
         await db.refresh(media)
         
+        if media_type != MediaTypeEnum.IMAGE:
+            media_metadata_worker.enqueue("media", media.id, media.file_url, upload_result["file_hash"])
+        
         return MediaUploadResponse(
             id=media.id,
             file_url=media.file_url,
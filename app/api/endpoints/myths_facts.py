@@ -36,10 +36,11 @@ from typing import List, Optional
 from uuid import UUID
 import structlog
 
-from app.db.database import get_db, get_db_with_retry
+from app.db.database import DatabaseRetryRoute, get_db, get_db_with_retry
 from app.models.myth_fact import MythFact
 from app.models.user import User
 from app.models.category import Category
+from app.core.responses import FastJSONResponse
 from app.core.security import get_current_user
 from app.schemas.myth_fact import (
     MythFactCreate,
@@ -53,9 +54,11 @@ from app.schemas.myth_fact import (
 )
 from app.services.rewards_service import rewards_service
 from app.services.anti_gaming_service import anti_gaming_service
+from app.services.daily_activity_counters import daily_activity_counters
+from app.services.media_urls import media_url_service
 
 logger = structlog.get_logger()
-router = APIRouter()
+router = APIRouter(route_class=DatabaseRetryRoute)
 
 
 @router.get("/", response_model=MythFactListResponse)
@@ -510,27 +513,27 @@ async def get_myths_for_frontend(
         # Transform response
         response_items = []
         for myth in myths:
-            response_items.append(MythFactResponse(
-                id=myth.id,
-                title=myth.title,
-                myth_statement=myth.myth_content,
-                fact_explanation=myth.fact_content,
-                category=myth.category.name if myth.category else None,
-                image_url=myth.image_url,
-                created_at=myth.created_at,
-                is_featured=myth.is_featured,
-                type=myth.type  # ✅ Include card type
-            ))
-        
-        return MythFactListResponse(
-            items=response_items,
-            pagination={
+            response_items.append({
+                "id": myth.id,
+                "title": myth.title,
+                "myth_statement": myth.myth_content,
+                "fact_explanation": myth.fact_content,
+                "category": myth.category.name if myth.category else None,
+                "image_url": media_url_service.direct_url(myth.image_url),
+                "created_at": myth.created_at,
+                "is_featured": myth.is_featured,
+                "type": myth.type  # ✅ Include card type
+            })
+        
+        return FastJSONResponse({
+            "items": response_items,
+            "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
                 "pages": (total + limit - 1) // limit if total > 0 else 0,
             }
-        )
+        })
         
     except SQLAlchemyError as e:
         logger.error("Database error in get_myths_for_frontend", error=str(e))
@@ -598,7 +601,7 @@ async def get_random_seven_myths(
                 title=myth.title,
                 myth_statement=myth.myth_content,
                 fact_explanation=myth.fact_content,
-                image_url=myth.image_url,
+                image_url=media_url_service.direct_url(myth.image_url),
                 is_featured=myth.is_featured,
                 type=myth.type  # ✅ NEW: Include card type to control frontend display
             ))
@@ -780,6 +783,8 @@ async def complete_myths_facts_game(
                         }
                     )
                 
+                await daily_activity_counters.increment(db, current_user.id, "myths_facts_games")
+                
                 reward_result = {
                     "points_earned": total_points,
                     "credits_earned": total_credits,
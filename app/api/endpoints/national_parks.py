@@ -4,6 +4,7 @@ Handles CRUD operations for national parks
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
@@ -27,6 +28,7 @@ from app.schemas.national_park import (
 from app.core.security import get_current_user
 from app.models.user import User
 from app.core.config import settings
+from app.services.park_read_model import park_read_model, project_park
 
 router = APIRouter()
 
@@ -42,61 +44,27 @@ async def get_national_parks(
 ):
     """Get all national parks with optional filtering (Public access)"""
     try:
-        query = select(NationalPark)
-        
-        # Apply filters
-        if is_active is not None:
-            query = query.where(NationalPark.is_active == is_active)
-        
-        if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                NationalPark.name.ilike(search_term) | 
-                NationalPark.state.ilike(search_term)
-            )
-        
-        # Apply pagination and ordering
-        query = query.offset(skip).limit(limit).order_by(NationalPark.name)
-        
-        result = await db.execute(query)
-        parks = result.scalars().all()
-        
-        # Filter media based on include_unapproved flag
-        filtered_parks = []
-        for park in parks:
-            if include_unapproved:
-                # Admin view - show all media regardless of approval status
-                all_media = [item["url"] if isinstance(item, dict) else item for item in (park.media_urls or [])]
-                all_videos = [item["url"] if isinstance(item, dict) else item for item in (park.video_urls or [])]
-            else:
-                # Public view - only show approved media
-                all_media = [item["url"] if isinstance(item, dict) else item for item in (park.media_urls or []) if (isinstance(item, dict) and item.get("approved", False)) or isinstance(item, str)]
-                all_videos = [item["url"] if isinstance(item, dict) else item for item in (park.video_urls or []) if (isinstance(item, dict) and item.get("approved", False)) or isinstance(item, str)]
-            
-            # Add /uploads/ prefix for presigned URL generation
-            media_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_media]
-            videos_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_videos]
+        if include_unapproved:
+            # Admin view - show all media regardless of approval status
+            query = select(NationalPark)
+            if is_active is not None:
+                query = query.where(NationalPark.is_active == is_active)
+            if search:
+                search_term = f"%{search}%"
+                query = query.where(
+                    NationalPark.name.ilike(search_term) | 
+                    NationalPark.state.ilike(search_term)
+                )
+            query = query.offset(skip).limit(limit).order_by(NationalPark.name)
             
-            park_dict = {
-                "id": park.id,
-                "name": park.name,
-                "state": park.state,
-                "slug": park.slug,
-                "description": park.description,
-                "biodiversity": park.biodiversity,
-                "conservation": park.conservation,
-                "media_urls": media_with_prefix,
-                "video_urls": videos_with_prefix,
-                "banner_media_url": f"/uploads/{park.banner_media_url}" if park.banner_media_url and not park.banner_media_url.startswith('/uploads/') else park.banner_media_url,
-                "expedition_slugs": park.expedition_slugs or [],
-                "banner_media_type": park.banner_media_type,
-                "is_active": park.is_active,
-                "created_at": park.created_at,
-                "updated_at": park.updated_at
-            }
-            filtered_parks.append(park_dict)
+            result = await db.execute(query)
+            return [project_park(park, approved_only=False) for park in result.scalars().all()]
         
-        return filtered_parks
+        # Public view - served from the approved-media read model; ETags and
+        # 304s come from ConditionalGetMiddleware
+        snapshot = await park_read_model.snapshot(db)
+        parks = park_read_model.select(snapshot, search=search, is_active=is_active, skip=skip, limit=limit)
+        return JSONResponse(content=parks)
         
     except Exception as e:
         raise HTTPException(
@@ -112,10 +80,8 @@ async def get_national_park_by_id(
 ):
     """Get specific national park by ID (Public access)"""
     try:
-        result = await db.execute(
-            select(NationalPark).where(NationalPark.id == park_id)
-        )
-        park = result.scalar_one_or_none()
+        snapshot = await park_read_model.snapshot(db)
+        park = park_read_model.find(snapshot, park_id)
         
         if not park:
             raise HTTPException(
@@ -123,33 +89,7 @@ async def get_national_park_by_id(
                 detail="National park not found"
             )
         
-        # Filter to only show approved media for public access
-        approved_media = [item["url"] if isinstance(item, dict) else item for item in (park.media_urls or []) if (isinstance(item, dict) and item.get("approved", False)) or isinstance(item, str)]
-        approved_videos = [item["url"] if isinstance(item, dict) else item for item in (park.video_urls or []) if (isinstance(item, dict) and item.get("approved", False)) or isinstance(item, str)]
-        
-        # Add /uploads/ prefix for presigned URL generation
-        media_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in approved_media]
-        videos_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in approved_videos]
-        
-        park_dict = {
-            "id": park.id,
-            "name": park.name,
-            "state": park.state,
-            "slug": park.slug,
-            "description": park.description,
-            "biodiversity": park.biodiversity,
-            "conservation": park.conservation,
-            "media_urls": media_with_prefix,
-            "video_urls": videos_with_prefix,
-            "banner_media_url": f"/uploads/{park.banner_media_url}" if park.banner_media_url and not park.banner_media_url.startswith('/uploads/') else park.banner_media_url,
-            "expedition_slugs": park.expedition_slugs or [],
-            "banner_media_type": park.banner_media_type,
-            "is_active": park.is_active,
-            "created_at": park.created_at,
-            "updated_at": park.updated_at
-        }
-        
-        return park_dict
+        return JSONResponse(content=park)
         
     except HTTPException:
         raise
@@ -221,32 +161,11 @@ async def create_national_park(
         
         db.add(new_park)
         await db.commit()
+        await park_read_model.invalidate()
         await db.refresh(new_park)
         
         # Don't filter by approval for CREATE response - admin should see what they just created
-        all_media = new_park.media_urls or []
-        all_videos = new_park.video_urls or []
-        
-        media_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_media]
-        videos_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_videos]
-        
-        return {
-            "id": new_park.id,
-            "name": new_park.name,
-            "state": new_park.state,
-            "slug": new_park.slug,
-            "description": new_park.description,
-            "biodiversity": new_park.biodiversity,
-            "conservation": new_park.conservation,
-            "media_urls": media_with_prefix,
-            "video_urls": videos_with_prefix,
-            "banner_media_url": f"/uploads/{new_park.banner_media_url}" if new_park.banner_media_url and not new_park.banner_media_url.startswith('/uploads/') else new_park.banner_media_url,
-            "expedition_slugs": new_park.expedition_slugs or [],
-            "banner_media_type": new_park.banner_media_type,
-            "is_active": new_park.is_active,
-            "created_at": new_park.created_at,
-            "updated_at": new_park.updated_at
-        }
+        return project_park(new_park, approved_only=False)
         
     except HTTPException:
         raise
@@ -310,32 +229,11 @@ async def update_national_park(
             setattr(park, field, value)
         
         await db.commit()
+        await park_read_model.invalidate()
         await db.refresh(park)
         
         # Don't filter by approval for UPDATE response - admin should see what they just updated
-        all_media = park.media_urls or []
-        all_videos = park.video_urls or []
-        
-        media_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_media]
-        videos_with_prefix = [f"/uploads/{url}" if not url.startswith('/uploads/') else url for url in all_videos]
-        
-        return {
-            "id": park.id,
-            "name": park.name,
-            "state": park.state,
-            "slug": park.slug,
-            "description": park.description,
-            "biodiversity": park.biodiversity,
-            "conservation": park.conservation,
-            "media_urls": media_with_prefix,
-            "video_urls": videos_with_prefix,
-            "banner_media_url": f"/uploads/{park.banner_media_url}" if park.banner_media_url and not park.banner_media_url.startswith('/uploads/') else park.banner_media_url,
-            "expedition_slugs": park.expedition_slugs or [],
-            "banner_media_type": park.banner_media_type,
-            "is_active": park.is_active,
-            "created_at": park.created_at,
-            "updated_at": park.updated_at
-        }
+        return project_park(park, approved_only=False)
         
     except HTTPException:
         raise
@@ -374,6 +272,7 @@ async def delete_national_park(
         
         await db.delete(park)
         await db.commit()
+        await park_read_model.invalidate()
         
         return None
         
@@ -414,6 +313,7 @@ async def toggle_park_active_status(
         
         park.is_active = not park.is_active
         await db.commit()
+        await park_read_model.invalidate()
         await db.refresh(park)
         
         return park
@@ -539,6 +439,7 @@ async def upload_park_media(
             park.video_urls = current_urls + uploaded_urls
         
         await db.commit()
+        await park_read_model.invalidate()
         await db.refresh(park)
         
         return {
@@ -640,6 +541,7 @@ async def delete_park_media(
             park.video_urls = media_list
         
         await db.commit()
+        await park_read_model.invalidate()
         
         return None
         
@@ -2,20 +2,33 @@
 Notifications API Endpoints
 """
 
+import asyncio
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from datetime import datetime
 
 from app.api.deps import get_db, get_current_user
+from app.db.database import get_db_session
 from app.models.user import User
 from app.services.notification_service import NotificationService
+from app.services.notification_events import (
+    notification_events, format_sse, STREAM_TICKET_TTL_SECONDS
+)
 
 
 router = APIRouter()
 
+# EventSource cannot send headers, so the stream also accepts a one-off ?ticket=
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+STREAM_KEEPALIVE_SECONDS = 20
+
 
 # ============================================================================
 # SCHEMAS
@@ -51,6 +64,12 @@ class UnreadCountResponse(BaseModel):
     unread_count: int
 
 
+class StreamTicketResponse(BaseModel):
+    """Single-use ticket for opening a notification stream"""
+    ticket: str
+    expires_in: int
+
+
 class MarkAsReadRequest(BaseModel):
     """Request to mark notification(s) as read"""
     notification_ids: Optional[List[str]] = None
@@ -127,6 +146,77 @@ async def get_unread_count(
     return UnreadCountResponse(unread_count=count)
 
 
+@router.post("/stream-ticket", response_model=StreamTicketResponse)
+async def create_stream_ticket(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Issue a ticket for `/stream`
+    
+    EventSource cannot set an Authorization header. Pass the ticket as
+    `?ticket=` instead of the JWT, which would be written to access logs.
+    A ticket opens one stream and expires after a minute.
+    """
+    ticket = await notification_events.issue_stream_ticket(current_user.id)
+    return StreamTicketResponse(ticket=ticket, expires_in=STREAM_TICKET_TTL_SECONDS)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="Ticket from POST /stream-ticket"),
+    bearer_token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    """
+    Server-Sent Events stream of new notifications and unread count changes
+    
+    Sends the current unread count on connect, then `notification` and
+    `unread_count` events as they happen. Replaces polling `/unread-count`.
+    Authenticate with the Authorization header or a `ticket` from
+    `POST /stream-ticket`.
+    """
+    if not bearer_token and not ticket:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Short-lived session: the stream itself never holds a DB connection
+    async with get_db_session() as db:
+        if bearer_token:
+            user = await get_current_user(token=bearer_token, db=db)
+        else:
+            user = None
+            ticket_user_id = await notification_events.redeem_stream_ticket(ticket)
+            if ticket_user_id is not None:
+                result = await db.execute(
+                    select(User).where(User.id == ticket_user_id, User.is_active == True)
+                )
+                user = result.scalar_one_or_none()
+            if user is None:
+                raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+        user_id = user.id
+        unread_count = await NotificationService.get_unread_count(db, user_id)
+    
+    async def events():
+        queue = notification_events.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            yield format_sse({"type": "unread_count", "unread_count": unread_count})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            notification_events.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/mark-as-read", response_model=BulkActionResponse)
 async def mark_notifications_as_read(
     request: MarkAsReadRequest,
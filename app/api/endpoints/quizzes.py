@@ -5,14 +5,14 @@ Handles wildlife quizzes and user results
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc, text
+from sqlalchemy import select, and_, desc, text
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta, timezone, time
 import logging
 
-from app.db.database import get_db, get_db_with_retry
+from app.db.database import DatabaseRetryRoute, get_db, get_db_with_retry
 from app.models.quiz_extended import Quiz, UserQuizResult
 from app.models.user import User
 from app.models.category import Category
@@ -30,9 +30,10 @@ from app.schemas.quiz import (
 from app.services.rewards_service import rewards_service
 from app.services.anti_gaming_service import anti_gaming_service
 from app.services.credits_service import CreditsService
+from app.services.daily_activity_counters import daily_activity_counters
 from app.core.config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=DatabaseRetryRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -320,33 +321,6 @@ async def submit_quiz(
     settings_service = SettingsService(db)
     security_settings = await settings_service.get_security_settings()
     
-    # Check daily quiz attempts limit (skip in development mode for testing)
-    if settings.ENVIRONMENT != "development":
-        max_daily_attempts = security_settings.get('max_quiz_attempts_per_day', 10)
-        
-        # Count today's quiz attempts (different quizzes completed)
-        today = datetime.utcnow().date()
-        tomorrow = today + timedelta(days=1)
-        
-        daily_attempts_result = await db.execute(
-            select(func.count(func.distinct(UserQuizResult.quiz_id)))
-            .where(
-                and_(
-                    UserQuizResult.user_id == current_user.id,
-                    UserQuizResult.completed_at >= today,
-                    UserQuizResult.completed_at < tomorrow
-                )
-            )
-        )
-        
-        daily_attempts = daily_attempts_result.scalar() or 0
-        
-        if daily_attempts >= max_daily_attempts:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"You have reached the daily quiz limit of {max_daily_attempts} different quizzes. Come back tomorrow!"
-            )
-    
     # Check 5-minute cooldown between quiz attempts (skip in development mode)
     if settings.ENVIRONMENT != "development":
         min_time_between_attempts = security_settings.get('min_time_between_attempts', 300)  # 5 minutes default
@@ -394,6 +368,20 @@ async def submit_quiz(
             detail="Too many answers provided"
         )
     
+    # Count this quiz towards today's limit of different quizzes with one atomic
+    # check-and-add (limit not enforced in development mode for testing). The
+    # attempt is given back if the submission does not commit.
+    max_daily_attempts = security_settings.get('max_quiz_attempts_per_day', 10)
+    attempt_allowed, _ = await daily_activity_counters.consume_member(
+        db, current_user.id, "quiz_attempts", quiz_id,
+        max_daily_attempts if settings.ENVIRONMENT != "development" else None
+    )
+    if not attempt_allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"You have reached the daily quiz limit of {max_daily_attempts} different quizzes. Come back tomorrow!"
+        )
+    
     # Calculate score
     score = 0
     max_score = 0
@@ -840,18 +828,8 @@ async def check_quiz_availability(
         if settings.ENVIRONMENT != "development":
             max_daily_attempts = security_settings.get('max_daily_quiz_attempts', 5)
             
-            daily_attempts_result = await db.execute(
-                select(func.count(func.distinct(UserQuizResult.quiz_id)))
-                .where(
-                    and_(
-                        UserQuizResult.user_id == current_user.id,
-                        UserQuizResult.completed_at >= today,
-                        UserQuizResult.completed_at < tomorrow
-                    )
-                )
-            )
-            
-            daily_attempts = daily_attempts_result.scalar() or 0
+            daily_counters = await daily_activity_counters.get(db, current_user.id)
+            daily_attempts = daily_counters["quiz_attempts"]
             
             if daily_attempts >= max_daily_attempts:
                 return {
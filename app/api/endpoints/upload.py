@@ -15,8 +15,8 @@ import structlog
 import boto3
 from botocore.exceptions import ClientError
 
-# Import video duration utility
-from app.utils.video_utils import get_video_duration
+# Background ffprobe; parks videos only warm its fingerprint cache
+from app.services.media_probe import media_metadata_worker
 # Import file upload service for R2 presigned URLs
 from app.services.file_upload import file_upload_service
 
@@ -145,7 +145,6 @@ async def upload_video_file(
     """
     Upload a video file for national parks
     Returns the file path that can be accessed via /uploads/videos/{filename}
-    Also extracts and returns the video duration (in seconds).
     """
     # Validate file extension
     ext = get_file_extension(file.filename)
@@ -197,9 +196,6 @@ async def upload_video_file(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to upload to R2: {str(e)}"
             )
-        
-        # For R2, we can't extract duration easily, return None or 0
-        duration = None
     else:
         # Save to local disk
         file_path = VIDEOS_DIR / unique_filename
@@ -211,16 +207,16 @@ async def upload_video_file(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save file: {str(e)}"
             )
-        
-        # Extract video duration (in seconds) - only for local files
-        duration = get_video_duration(str(file_path))
+
+    # ffprobe runs in the metadata worker, not on the request; parks keep the
+    # URL in park.video_urls, so no catalog row is created for the upload
+    media_metadata_worker.enqueue(None, None, f"/uploads/{file_key}")
 
     # Return relative path (frontend will add /uploads/ prefix)
     return {
         "filename": unique_filename,
         "url": file_key,  # Relative path: "videos/{uuid}.mp4"
-        "original_filename": file.filename,
-        "duration": duration
+        "original_filename": file.filename
     }
 
 
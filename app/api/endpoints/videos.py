@@ -7,11 +7,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, func
 from typing import List, Optional
-from app.db.database import get_db
+from app.core.responses import FastJSONResponse
+from app.db.database import get_db, get_read_db
 from app.models.video_series import VideoSeries, SeriesVideo
 from app.models.video_channel import VideoChannel, GeneralKnowledgeVideo
 from app.models.video_progress import VideoWatchProgress
 from app.models.video_engagement import VideoLike, VideoComment, VideoCommentLike
+from app.services.media_urls import media_url_service
+from app.services.video_packaging import public_manifest
 from pydantic import BaseModel
 import json
 
@@ -29,7 +32,7 @@ async def get_all_videos(
     search: Optional[str] = Query(None, description="Search in title, subtitle, description"),
     category: Optional[str] = Query(None, description="Filter by tag category"),
     user_id: Optional[str] = Header(None, alias="X-User-ID"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all videos (series videos + channel videos) for frontend display
@@ -81,8 +84,8 @@ async def get_all_videos(
                 "title": video.title,
                 "subtitle": video.subtitle,
                 "description": video.description,
-                "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                "video_url": media_url_service.url_for(video.video_url),
                 "duration": video.duration,
                 "views": video.views or 0,
                 "tags": tags,
@@ -128,8 +131,8 @@ async def get_all_videos(
                 "title": video.title,
                 "subtitle": video.subtitle,
                 "description": video.description,
-                "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                "video_url": media_url_service.url_for(video.video_url),
                 "duration": video.duration,
                 "views": video.views or 0,
                 "tags": tags,
@@ -166,10 +169,10 @@ async def get_all_videos(
                     if category in [tag.lower() for tag in v["tags"]]
                 ]
         
-        return {
+        return FastJSONResponse({
             "videos": videos_list,
             "total": len(videos_list)
-        }
+        })
     
     except Exception as e:
         import traceback
@@ -179,7 +182,7 @@ async def get_all_videos(
 
 @router.get("/categories")
 async def get_video_categories(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all unique tags from videos for dynamic category generation
@@ -311,8 +314,8 @@ async def get_featured_series(
                 "title": video.title,
                 "subtitle": video.subtitle,
                 "description": video.description,
-                "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                "video_url": media_url_service.url_for(video.video_url),
                 "duration": video.duration,
                 "views": video.views or 0,
                 "slug": video.slug,
@@ -328,7 +331,7 @@ async def get_featured_series(
                 "title": series.title,
                 "subtitle": series.subtitle,
                 "description": series.description,
-                "thumbnail_url": f"/uploads/{series.thumbnail_url}" if series.thumbnail_url else None,
+                "thumbnail_url": media_url_service.url_for(series.thumbnail_url),
                 "slug": series.slug,
                 "total_videos": series.total_videos,
                 "total_views": series.total_views,
@@ -472,8 +475,8 @@ async def get_recent_watched_videos(
                         "title": video_info.title,
                         "subtitle": video_info.subtitle,
                         "description": video_info.description,
-                        "thumbnail_url": f"/uploads/{video_info.thumbnail_url}" if video_info.thumbnail_url else None,
-                        "video_url": f"/uploads/{video_info.video_url}" if video_info.video_url else None,
+                        "thumbnail_url": media_url_service.url_for(video_info.thumbnail_url),
+                        "video_url": media_url_service.url_for(video_info.video_url),
                         "duration": video_info.duration,
                         "views": video_info.views or 0,
                         "slug": video_info.slug,
@@ -517,8 +520,8 @@ async def get_recent_watched_videos(
                     "title": video.title,
                     "subtitle": video.subtitle,
                     "description": video.description,
-                    "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                    "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                    "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                    "video_url": media_url_service.url_for(video.video_url),
                     "duration": video.duration,
                     "views": video.views or 0,
                     "slug": video.slug,
@@ -584,8 +587,8 @@ async def get_video_by_slug(
                 "title": video.title,
                 "subtitle": video.subtitle,
                 "description": video.description,
-                "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                "video_url": media_url_service.url_for(video.video_url),
                 "duration": video.duration,
                 "views": video.views or 0,
                 "tags": tags,
@@ -597,7 +600,8 @@ async def get_video_by_slug(
                 "total_episodes": series.total_videos,
                 "is_published": True,
                 "slug": video.slug,
-                "created_at": video.created_at.isoformat() if video.created_at else None
+                "created_at": video.created_at.isoformat() if video.created_at else None,
+                "streaming": public_manifest(video.streaming)
             }
             
             # Get all videos in this series for series navigation
@@ -618,8 +622,8 @@ async def get_video_by_slug(
                     "id": str(sv.id),
                     "title": sv.title,
                     "subtitle": sv.subtitle,
-                    "thumbnail_url": f"/uploads/{sv.thumbnail_url}" if sv.thumbnail_url else None,
-                    "video_url": f"/uploads/{sv.video_url}" if sv.video_url else None,
+                    "thumbnail_url": media_url_service.url_for(sv.thumbnail_url),
+                    "video_url": media_url_service.url_for(sv.video_url),
                     "duration": sv.duration,
                     "views": sv.views or 0,
                     "position": sv.position,
@@ -654,7 +658,7 @@ async def get_video_by_slug(
                                 "id": str(rv.id),
                                 "title": rv.title,
                                 "subtitle": rv.subtitle,
-                                "thumbnail_url": f"/uploads/{rv.thumbnail_url}" if rv.thumbnail_url else None,
+                                "thumbnail_url": media_url_service.url_for(rv.thumbnail_url),
                                 "duration": rv.duration,
                                 "views": rv.views or 0,
                                 "tags": rv_tags,
@@ -689,7 +693,7 @@ async def get_video_by_slug(
                                 "id": str(rv.id),
                                 "title": rv.title,
                                 "subtitle": rv.subtitle,
-                                "thumbnail_url": f"/uploads/{rv.thumbnail_url}" if rv.thumbnail_url else None,
+                                "thumbnail_url": media_url_service.url_for(rv.thumbnail_url),
                                 "duration": rv.duration,
                                 "views": rv.views or 0,
                                 "tags": rv_tags,
@@ -731,8 +735,8 @@ async def get_video_by_slug(
                     "title": video.title,
                     "subtitle": video.subtitle,
                     "description": video.description,
-                    "thumbnail_url": f"/uploads/{video.thumbnail_url}" if video.thumbnail_url else None,
-                    "video_url": f"/uploads/{video.video_url}" if video.video_url else None,
+                    "thumbnail_url": media_url_service.url_for(video.thumbnail_url),
+                    "video_url": media_url_service.url_for(video.video_url),
                     "duration": video.duration,
                     "views": video.views or 0,
                     "tags": tags,
@@ -742,7 +746,8 @@ async def get_video_by_slug(
                     "channel_name": channel.name,
                     "is_published": True,
                     "slug": video.slug,
-                    "created_at": video.created_at.isoformat() if video.created_at else None
+                    "created_at": video.created_at.isoformat() if video.created_at else None,
+                    "streaming": public_manifest(video.streaming)
                 }
                 
                 # Get related videos from same channel
@@ -765,7 +770,7 @@ async def get_video_by_slug(
                         "id": str(rv.id),
                         "title": rv.title,
                         "subtitle": rv.subtitle,
-                        "thumbnail_url": f"/uploads/{rv.thumbnail_url}" if rv.thumbnail_url else None,
+                        "thumbnail_url": media_url_service.url_for(rv.thumbnail_url),
                         "duration": rv.duration,
                         "views": rv.views or 0,
                         "tags": rv_tags,
@@ -800,7 +805,7 @@ async def get_video_by_slug(
                                     "id": str(rv.id),
                                     "title": rv.title,
                                     "subtitle": rv.subtitle,
-                                    "thumbnail_url": f"/uploads/{rv.thumbnail_url}" if rv.thumbnail_url else None,
+                                    "thumbnail_url": media_url_service.url_for(rv.thumbnail_url),
                                     "duration": rv.duration,
                                     "views": rv.views or 0,
                                     "tags": rv_tags,
@@ -834,7 +839,7 @@ async def get_video_by_slug(
                                     "id": str(rv.id),
                                     "title": rv.title,
                                     "subtitle": rv.subtitle,
-                                    "thumbnail_url": f"/uploads/{rv.thumbnail_url}" if rv.thumbnail_url else None,
+                                    "thumbnail_url": media_url_service.url_for(rv.thumbnail_url),
                                     "duration": rv.duration,
                                     "views": rv.views or 0,
                                     "tags": rv_tags,
@@ -10,7 +10,8 @@ from typing import Optional, List
 import logging
 from datetime import datetime, timedelta
 
-from ..db.database import get_db
+from ..db.database import get_read_db
+from ..core.responses import FastJSONResponse
 from ..core.security import get_current_user, get_current_user_optional
 from ..models.user import User
 from ..models.quiz_extended import Quiz, UserQuizResult
@@ -21,8 +22,7 @@ from ..schemas.leaderboard import (
     LeaderboardRankingResponse,
     LeaderboardStatsResponse,
     GeneralLeaderboardStatsResponse,
-    UserRankingResponse,
-    LeaderboardParticipantResponse
+    UserRankingResponse
 )
 from ..utils.date_utils import get_current_week_start, get_current_month_start
 
@@ -39,7 +39,7 @@ async def get_weekly_leaderboard(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get the weekly leaderboard rankings based on POINTS earned from quizzes
@@ -105,17 +105,17 @@ async def get_weekly_leaderboard(
             elif not leaderboard_settings['show_real_names']:
                 full_name = None
             
-            participant = LeaderboardParticipantResponse(
-                user_id=score_data.user_id,
-                username=display_name,
-                full_name=full_name,
-                avatar_url=avatar_url,
-                rank=rank,
-                score=int(score_data.total_points or 0),
-                quizzes_completed=score_data.quizzes_completed,
-                average_score=round(float(score_data.average_score or 0), 1),
-                is_current_user=bool(current_user and score_data.user_id == current_user.id)
-            )
+            participant = {
+                "user_id": score_data.user_id,
+                "username": display_name,
+                "full_name": full_name,
+                "avatar_url": avatar_url,
+                "rank": rank,
+                "score": int(score_data.total_points or 0),
+                "quizzes_completed": score_data.quizzes_completed,
+                "average_score": round(float(score_data.average_score or 0), 1),
+                "is_current_user": bool(current_user and score_data.user_id == current_user.id)
+            }
             participants.append(participant)
             
             if current_user and score_data.user_id == current_user.id:
@@ -129,13 +129,13 @@ async def get_weekly_leaderboard(
         total_participants_result = await db.execute(total_count_query)
         total_participants = total_participants_result.scalar() or 0
         
-        return LeaderboardRankingResponse(
-            type="weekly",
-            period_start=current_week_start,
-            participants=participants,
-            total_participants=total_participants,
-            current_user_rank=current_user_rank
-        )
+        return FastJSONResponse({
+            "type": "weekly",
+            "period_start": current_week_start,
+            "participants": participants,
+            "total_participants": total_participants,
+            "current_user_rank": current_user_rank
+        })
         
     except Exception as e:
         logger.error(f"Error getting weekly leaderboard: {str(e)}")
@@ -147,7 +147,7 @@ async def get_monthly_leaderboard(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get the monthly leaderboard rankings based on POINTS earned from quizzes
@@ -212,17 +212,17 @@ async def get_monthly_leaderboard(
             elif not leaderboard_settings['show_real_names']:
                 full_name = None
             
-            participant = LeaderboardParticipantResponse(
-                user_id=score_data.user_id,
-                username=display_name,
-                full_name=full_name,
-                avatar_url=avatar_url,
-                rank=rank,
-                score=int(score_data.total_points or 0),
-                quizzes_completed=int(score_data.quizzes_completed or 0),
-                average_score=float(score_data.average_score or 0),
-                is_current_user=bool(current_user and score_data.user_id == current_user.id)
-            )
+            participant = {
+                "user_id": score_data.user_id,
+                "username": display_name,
+                "full_name": full_name,
+                "avatar_url": avatar_url,
+                "rank": rank,
+                "score": int(score_data.total_points or 0),
+                "quizzes_completed": int(score_data.quizzes_completed or 0),
+                "average_score": float(score_data.average_score or 0),
+                "is_current_user": bool(current_user and score_data.user_id == current_user.id)
+            }
             participants.append(participant)
             
             if current_user and score_data.user_id == current_user.id:
@@ -236,13 +236,13 @@ async def get_monthly_leaderboard(
         )
         total_participants = total_participants_result.scalar() or 0
         
-        return LeaderboardRankingResponse(
-            type="monthly",
-            period_start=current_month_start,
-            participants=participants,
-            total_participants=total_participants,
-            current_user_rank=current_user_rank
-        )
+        return FastJSONResponse({
+            "type": "monthly",
+            "period_start": current_month_start,
+            "participants": participants,
+            "total_participants": total_participants,
+            "current_user_rank": current_user_rank
+        })
         
     except Exception as e:
         logger.error(f"Error getting monthly leaderboard: {str(e)}")
@@ -254,7 +254,7 @@ async def get_alltime_leaderboard(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get the all-time leaderboard rankings based on POINTS earned from quizzes
@@ -311,17 +311,17 @@ async def get_alltime_leaderboard(
             elif not leaderboard_settings['show_real_names']:
                 full_name = None
             
-            participant = LeaderboardParticipantResponse(
-                user_id=score_data.user_id,
-                username=display_name,
-                full_name=full_name,
-                avatar_url=avatar_url,
-                rank=rank,
-                score=int(score_data.total_points or 0),
-                quizzes_completed=score_data.quizzes_completed,
-                average_score=round(float(score_data.average_score or 0), 1),
-                is_current_user=bool(current_user and score_data.user_id == current_user.id)
-            )
+            participant = {
+                "user_id": score_data.user_id,
+                "username": display_name,
+                "full_name": full_name,
+                "avatar_url": avatar_url,
+                "rank": rank,
+                "score": int(score_data.total_points or 0),
+                "quizzes_completed": score_data.quizzes_completed,
+                "average_score": round(float(score_data.average_score or 0), 1),
+                "is_current_user": bool(current_user and score_data.user_id == current_user.id)
+            }
             participants.append(participant)
             
             if current_user and score_data.user_id == current_user.id:
@@ -333,13 +333,13 @@ async def get_alltime_leaderboard(
         )
         total_participants = total_participants_result.scalar() or 0
         
-        return LeaderboardRankingResponse(
-            type="alltime",
-            period_start=None,
-            participants=participants,
-            total_participants=total_participants,
-            current_user_rank=current_user_rank
-        )
+        return FastJSONResponse({
+            "type": "alltime",
+            "period_start": None,
+            "participants": participants,
+            "total_participants": total_participants,
+            "current_user_rank": current_user_rank
+        })
         
     except Exception as e:
         logger.error(f"Error getting all-time leaderboard: {str(e)}")
@@ -349,7 +349,7 @@ async def get_alltime_leaderboard(
 @router.get("/stats", response_model=GeneralLeaderboardStatsResponse)
 async def get_leaderboard_stats(
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get general leaderboard statistics
@@ -381,7 +381,7 @@ async def get_leaderboard_stats(
 @router.get("/user-ranking", response_model=UserRankingResponse)
 async def get_user_ranking(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get current user's ranking across all leaderboards
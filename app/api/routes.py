@@ -10,7 +10,6 @@ from app.api.endpoints import (
 )
 from app.api import leaderboards
 from app.api import admin_leaderboards
-from app.admin.routes.discussion_moderation import router as discussion_moderation_router
 api_router = APIRouter()
 
 # Include all endpoint routers
@@ -41,5 +40,5 @@ api_router.include_router(national_parks.router, prefix="/national-parks", tags=
 api_router.include_router(upload.router, prefix="/upload", tags=["File Upload"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
 api_router.include_router(videos.router, prefix="/videos", tags=["Videos"])
-# Admin API endpoints (JWT authenticated)
-api_router.include_router(discussion_moderation_router, prefix="/admin/discussions", tags=["Admin - Discussions"])
+# Admin API endpoints (JWT authenticated) for discussions are included lazily
+# by app.main under /api/v1/admin/discussions
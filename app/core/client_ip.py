@@ -0,0 +1,95 @@
+"""
+Client IP resolution behind reverse proxies
+
+X-Forwarded-For is written by whoever sends the request, so only the entries
+appended by our own proxies can be believed. The client is the rightmost entry
+that was not added by a trusted proxy: with TRUSTED_PROXIES the chain is walked
+from the right past every trusted address, with TRUSTED_PROXY_COUNT the entry
+that many hops from the right is used. With neither configured the header is
+ignored and the connecting peer is the client. Production defaults to one
+proxy, the platform's edge, so the peer is never mistaken for the client.
+"""
+
+import ipaddress
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=8)
+def _parse_networks(value: str) -> Tuple:
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if entry:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+    return tuple(networks)
+
+
+def _is_trusted(ip: str, networks: Tuple) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def _proxy_count(networks: Tuple) -> int:
+    if settings.TRUSTED_PROXY_COUNT is not None:
+        return settings.TRUSTED_PROXY_COUNT
+    return 1 if settings.ENVIRONMENT == "production" and not networks else 0
+
+
+def _peer(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def proxies_configured() -> bool:
+    """Whether X-Forwarded-For is read from any proxy at all"""
+    networks = _parse_networks(settings.TRUSTED_PROXIES)
+    return bool(networks) or _proxy_count(networks) > 0
+
+
+def from_trusted_proxy(scope: Scope) -> bool:
+    """Whether the connecting peer is one of the configured proxies"""
+    networks = _parse_networks(settings.TRUSTED_PROXIES)
+    if networks:
+        return _is_trusted(_peer(scope), networks)
+    return _proxy_count(networks) > 0
+
+
+def client_ip(scope: Scope, headers: Optional[Headers] = None) -> str:
+    """IP address of the client that sent the request"""
+    peer = _peer(scope)
+
+    networks = _parse_networks(settings.TRUSTED_PROXIES)
+    proxy_count = _proxy_count(networks)
+    if not networks and proxy_count <= 0:
+        return peer
+
+    if networks and not _is_trusted(peer, networks):
+        return peer
+
+    headers = headers if headers is not None else Headers(scope=scope)
+    hops = [
+        hop.strip()
+        for value in headers.getlist("x-forwarded-for")
+        for hop in value.split(",")
+        if hop.strip()
+    ]
+    if not hops:
+        return peer
+
+    if networks:
+        for hop in reversed(hops):
+            if not _is_trusted(hop, networks):
+                return hop
+        return hops[0]
+
+    # Each of the proxy_count proxies appended the address it received from
+    return hops[-proxy_count] if len(hops) >= proxy_count else hops[0]
@@ -34,9 +34,14 @@ async def content_error_handler(request: Request, exc: ContentError) -> JSONResp
         method=request.method
     )
     
+    headers = None
+    if "retry_after" in exc.details:
+        headers = {"Retry-After": str(exc.details["retry_after"])}
+    
     return JSONResponse(
         status_code=exc.status_code,
-        content=create_error_response(exc)
+        content=create_error_response(exc),
+        headers=headers
     )
 
 
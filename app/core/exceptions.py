@@ -166,6 +166,17 @@ class ContentLimitError(ContentError):
         )
 
 
+class DatabaseUnavailableError(ContentError):
+    """Exception raised when the database did not come back in time"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            message="Database is temporarily unavailable, please retry shortly",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"retry_after": retry_after}
+        )
+
+
 def create_error_response(error: ContentError) -> dict:
     """
     Create a standardized error response from ContentError
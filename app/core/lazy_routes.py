@@ -0,0 +1,115 @@
+"""
+Routers imported on first request
+
+The admin panel and admin-only APIs are large modules (thousands of lines of
+routes and embedded HTML) that most requests never touch. Importing them at
+startup makes every cold start pay for them. ``include_router_lazily`` adds a
+placeholder route that claims the router's prefix; the first request under
+the prefix imports the module in a worker thread, includes the router in
+place of the placeholder and re-dispatches the request, so later requests
+route normally.
+
+Routes loaded this way only appear in the OpenAPI schema once loaded; set
+LAZY_ROUTERS_ENABLED=false to include everything at startup.
+"""
+
+import asyncio
+import importlib
+import time
+from typing import Any, Dict, Optional
+
+import structlog
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+def _import_router(target: str):
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "router")
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder for a router that is imported on its first request"""
+
+    def __init__(self, app: FastAPI, prefix: str, target: str, include_kwargs: Optional[Dict[str, Any]] = None):
+        self.app = app
+        self.prefix = prefix.rstrip("/")
+        self.target = target
+        self.include_kwargs = include_kwargs or {}
+        self.loaded = False
+        self._lock = asyncio.Lock()
+
+    def matches(self, scope: Scope):
+        if scope["type"] != "http" or self.loaded:
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        from starlette.routing import NoMatchFound
+
+        raise NoMatchFound(name, path_params)
+
+    async def load(self):
+        """Import the router and put its routes where the placeholder was"""
+        async with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            router = await asyncio.to_thread(_import_router, self.target)
+            self.install(router)
+            logger.info(
+                "Lazy router loaded",
+                prefix=self.prefix,
+                target=self.target,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    def install(self, router):
+        routes = self.app.router.routes
+        existing = len(routes)
+        self.app.include_router(router, prefix=self.prefix, **self.include_kwargs)
+        added = routes[existing:]
+        del routes[existing:]
+        index = routes.index(self)
+        routes[index:index + 1] = added
+        self.loaded = True
+        # The cached schema predates these routes
+        self.app.openapi_schema = None
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.load()
+        await self.app.router(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"LazyRouter(prefix={self.prefix!r}, target={self.target!r}, loaded={self.loaded})"
+
+
+def include_router_lazily(app: FastAPI, prefix: str, target: str, **include_kwargs) -> Optional[LazyRouter]:
+    """
+    Include the router at ``target`` ("package.module:attribute") under
+    ``prefix`` on its first request, or right away when lazy loading is off
+    """
+    if not settings.LAZY_ROUTERS_ENABLED:
+        app.include_router(_import_router(target), prefix=prefix, **include_kwargs)
+        return None
+    placeholder = LazyRouter(app, prefix, target, include_kwargs)
+    app.router.routes.append(placeholder)
+    return placeholder
+
+
+def pending_lazy_routers(app: FastAPI):
+    return [route for route in app.router.routes if isinstance(route, LazyRouter) and not route.loaded]
+
+
+async def load_lazy_routers(app: FastAPI):
+    """Load every pending lazy router (schema export, warm-up)"""
+    for placeholder in pending_lazy_routers(app):
+        await placeholder.load()
@@ -0,0 +1,42 @@
+"""
+Fast JSON responses for large, pre-shaped payloads
+
+Endpoints that already build their response as plain dicts and lists can
+return ``FastJSONResponse`` instead of a Pydantic model or bare dict. FastAPI
+then skips ``response_model`` revalidation and ``jsonable_encoder``'s
+recursive walk, and the body is encoded by orjson in a single pass. Keep the
+``response_model`` on the route for the OpenAPI schema; only use this where
+the shape is built by the endpoint itself and therefore trusted.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not encode natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content the way FastJSONResponse does"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
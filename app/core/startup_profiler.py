@@ -0,0 +1,109 @@
+"""
+Startup time profiling
+
+Cold starts after the platform puts the app to sleep are user visible, so
+every boot is timed: ``startup_profiler.mark(step)`` records the time since
+the previous mark, from the first import of ``app.main`` through each
+lifespan step, and the lifespan logs the breakdown once startup completes
+(also served at /health/startup). ``profile_startup.py`` adds a per-module
+import-time breakdown using ``python -X importtime``.
+"""
+
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class StartupProfiler:
+    """Durations of consecutive startup steps"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.steps: List[Tuple[str, float]] = []
+        self.completed = False
+
+    def mark(self, step: str) -> float:
+        """Close the current step under ``step``; returns its duration in seconds"""
+        now = time.perf_counter()
+        duration = now - self._last
+        self._last = now
+        if not self.completed:
+            self.steps.append((step, duration))
+        return duration
+
+    def complete(self):
+        """Log the breakdown once the application is ready for requests"""
+        if self.completed:
+            return
+        self.completed = True
+        report = self.report()
+        logger.info(
+            "Startup profile",
+            total_ms=report["total_ms"],
+            steps={step["step"]: step["ms"] for step in report["steps"]},
+        )
+
+    def report(self) -> Dict:
+        total = sum(duration for _, duration in self.steps)
+        return {
+            "completed": self.completed,
+            "total_ms": round(total * 1000, 1),
+            "steps": [
+                {"step": step, "ms": round(duration * 1000, 1)}
+                for step, duration in self.steps
+            ],
+        }
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportTiming]:
+    """Parse ``python -X importtime`` output (stderr) into timings"""
+    timings = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        if not self_us.strip().isdigit():
+            continue  # Column header
+        module = name.rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def group_imports(timings: Iterable[ImportTiming], app_package: str = "app", app_depth: int = 3) -> List[Tuple[str, int]]:
+    """
+    Self import time summed per package, largest first
+
+    Application modules are grouped by their first ``app_depth`` name parts
+    (``app.admin.routes``), third-party ones by their top-level package.
+    """
+    totals: Dict[str, int] = {}
+    for timing in timings:
+        parts = timing.module.split(".")
+        group = ".".join(parts[:app_depth]) if parts[0] == app_package else parts[0]
+        totals[group] = totals.get(group, 0) + timing.self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def slowest_imports(timings: Iterable[ImportTiming], limit: int = 25, prefix: Optional[str] = None) -> List[ImportTiming]:
+    """Modules with the largest cumulative import time"""
+    selected = [t for t in timings if prefix is None or t.module.startswith(prefix)]
+    return sorted(selected, key=lambda timing: timing.cumulative_us, reverse=True)[:limit]
+
+
+# Created on first import of app.main, which starts the clock
+startup_profiler = StartupProfiler()
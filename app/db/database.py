@@ -1,10 +1,30 @@
 """
 Database configuration and connection management
+
+Three workloads get their own engine and pool so one cannot starve another:
+
+- primary: API writes and general request traffic (``get_db``)
+- read: heavy read paths such as leaderboards, analytics and catalog listings
+  (``get_read_db``). Sessions are spread round-robin over the configured read
+  replicas, or use a separate pool on the primary when there are none.
+- jobs: background workers (``get_jobs_db_session``)
+
+Pool sizes and asyncpg statement cache sizes come from settings. Instead of
+pinging on every checkout, pooled connections are pinged only after sitting
+idle; outages are tracked by the circuit breaker in ``app.db.health``.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import itertools
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request, UploadFile
+from fastapi.routing import APIRoute
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 from contextlib import asynccontextmanager
 import structlog
 
@@ -12,26 +32,125 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True if settings.ENVIRONMENT == "development" else False,
-    future=True,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=5,  # Reduced for Supabase Session Mode (max 15 connections in free tier)
-    max_overflow=5,  # Total max = 10 connections
-    pool_timeout=30,  # Seconds to wait before giving up on getting a connection
-)
-
-# Create async session factory
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+
+def _is_asyncpg(url: str) -> bool:
+    return make_url(url).drivername == "postgresql+asyncpg"
+
+
+def build_engine(url: str, role: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """Async engine for one workload, tagged with the role in pg_stat_activity"""
+    options = {}
+    if _is_asyncpg(url):
+        # SQLAlchemy's prepared statement cache is a dialect URL parameter;
+        # asyncpg's own statement cache is a connect() argument
+        url = make_url(url).update_query_dict({
+            "prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE),
+        })
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"application_name": f"junglore-{role}"},
+        }
+
+    pool_engine = create_async_engine(
+        url,
+        echo=True if settings.ENVIRONMENT == "development" else False,
+        future=True,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Seconds to wait before giving up on getting a connection
+        **options,
+    )
+    if not settings.DB_POOL_PRE_PING and settings.DB_POOL_PING_IDLE_SECONDS > 0:
+        _ping_idle_connections(pool_engine, settings.DB_POOL_PING_IDLE_SECONDS)
+    return pool_engine
+
+
+def _ping_idle_connections(pool_engine: AsyncEngine, idle_seconds: int):
+    """
+    Ping pooled connections only when they sat idle for idle_seconds
+
+    A failed ping raises DisconnectionError, which makes the pool discard the
+    connection and check out a fresh one. Connections reused within the window
+    (every hot request) skip the round trip that pool_pre_ping would cost.
+    """
+    pool = pool_engine.sync_engine.pool
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["returned_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        returned_at = connection_record.info.get("returned_at")
+        if returned_at is None or time.monotonic() - returned_at < idle_seconds:
+            return
+        try:
+            pool_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            raise DisconnectionError(f"Idle connection failed ping: {e}") from e
+
+
+def _session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Primary engine for writes and general request traffic
+engine = build_engine(settings.DATABASE_URL, "primary", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+async_session_factory = _session_factory(engine)
+
+# Read engines: one per replica, or a separate pool on the primary
+read_engines: List[AsyncEngine] = [
+    build_engine(url, "read", settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW)
+    for url in settings.read_database_urls or [settings.DATABASE_URL]
+]
+read_session_factories = [_session_factory(read_engine) for read_engine in read_engines]
+_read_factories = itertools.cycle(read_session_factories)
+
+# Background jobs get a small pool of their own
+jobs_engine = build_engine(settings.DATABASE_URL, "jobs", settings.DB_JOBS_POOL_SIZE, settings.DB_JOBS_MAX_OVERFLOW)
+jobs_session_factory = _session_factory(jobs_engine)
+
+
+def read_session_factory() -> async_sessionmaker:
+    """Next read session factory, round-robin over the read engines"""
+    return next(_read_factories)
+
+
+def all_engines() -> Dict[str, AsyncEngine]:
+    engines = {"primary": engine, "jobs": jobs_engine}
+    for index, read_engine in enumerate(read_engines):
+        engines[f"read-{index}"] = read_engine
+    return engines
+
+
+def pool_status() -> Dict[str, Dict[str, int]]:
+    """Connection counts per pool, for health checks and metrics"""
+    status = {}
+    for name, pool_engine in all_engines().items():
+        pool = pool_engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        status[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+        }
+    return status
+
+
+async def dispose_engines():
+    """Close every pooled connection (application shutdown)"""
+    for pool_engine in all_engines().values():
+        await pool_engine.dispose()
 
 # Create declarative base with naming convention for constraints
 metadata = MetaData(naming_convention={
@@ -89,60 +208,131 @@ async def get_db():
             await session.close()
 
 
-async def get_db_with_retry(max_retries: int = 5, backoff_seconds: int = 2):
+async def get_read_db():
+    """Database session dependency for heavy read-only routes (replica or read pool)"""
+    async with read_session_factory()() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+
+_RETRY_SESSION_ATTR = "retry_db_session"
+_COMMITTED_KEY = "committed"
+
+
+def _mark_committed(session):
+    session.info[_COMMITTED_KEY] = True
+
+
+async def get_db_with_retry(request: Request):
     """
-    Database session dependency with automatic retry for Railway cold starts.
-    
-    Railway's free tier puts the database to sleep after inactivity. This function
-    handles the wake-up delay gracefully with exponential backoff retry logic.
+    Database session dependency for critical paths that must survive cold starts.
     
-    Args:
-        max_retries: Maximum number of connection attempts (default: 5)
-        backoff_seconds: Initial backoff duration in seconds (default: 2)
+    Railway's free tier puts the database to sleep after inactivity. Rather than
+    pinging before every request, this consults the connection health circuit
+    breaker (see ``app.db.health``): while the database is healthy the session is
+    yielded with no extra round trip; while it is down the request waits for the
+    background probe to see it come back, then fails fast with 503. Connection
+    errors raised while the session is in use open the breaker, and routes using
+    ``DatabaseRetryRoute`` run the endpoint once more when the database is back.
     
     Yields:
         AsyncSession: Database session
         
     Raises:
-        Exception: If connection fails after all retry attempts
+        DatabaseUnavailableError: If the database did not recover within DB_WAKE_TIMEOUT
     """
-    import asyncio
-    from sqlalchemy.exc import OperationalError
-    from sqlalchemy import text
+    from app.db.health import database_health, is_connection_error
     
-    last_exception = None
+    await database_health.wait_until_available()
     
-    for attempt in range(max_retries):
+    async with async_session_factory() as session:
+        # Lets DatabaseRetryRoute tell whether anything was committed before a failure
+        event.listen(session.sync_session, "after_commit", _mark_committed)
+        setattr(request.state, _RETRY_SESSION_ATTR, session)
         try:
-            async with async_session_factory() as session:
-                # Test the connection with a simple query
-                await session.execute(text("SELECT 1"))
-                yield session
-                return
-                
-        except OperationalError as e:
-            last_exception = e
-            if attempt < max_retries - 1:
-                wait_time = backoff_seconds * (2 ** attempt)  # Exponential backoff
-                logger.warning(
-                    f"Database connection attempt {attempt + 1} failed, "
-                    f"retrying in {wait_time}s (Railway cold start recovery)",
-                    error=str(e)
-                )
-                await asyncio.sleep(wait_time)
-            else:
-                logger.error(
-                    f"Database connection failed after {max_retries} attempts",
-                    error=str(e)
-                )
-                raise
+            yield session
         except Exception as e:
-            logger.error("Unexpected database error", error=str(e))
-            await session.rollback()
+            if is_connection_error(e):
+                database_health.record_failure(e)
+            else:
+                logger.error("Unexpected database error", error=str(e))
+            try:
+                await session.rollback()
+            except Exception:
+                pass  # The connection may already be gone
             raise
+
+
+def connection_error_in(error: BaseException) -> Optional[BaseException]:
+    """The connection error behind an exception, following raise-from chains"""
+    from app.db.health import is_connection_error
     
-    if last_exception:
-        raise last_exception
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if is_connection_error(error):
+            return error
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def _uses_retry_session(dependant) -> bool:
+    return any(
+        dependency.call is get_db_with_retry or _uses_retry_session(dependency)
+        for dependency in dependant.dependencies
+    )
+
+
+class DatabaseRetryRoute(APIRoute):
+    """
+    Route that runs its endpoint once more after a dropped database connection
+    
+    Applies to endpoints using ``get_db_with_retry``. When one fails because
+    the connection went away (also when wrapped in an HTTPException) and its
+    session had not committed, the breaker is opened, the request waits in
+    ``wait_until_available()`` and the endpoint runs again with a new session.
+    The request body is cached on the Request, so the retry sees the same input.
+    """
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not _uses_retry_session(self.dependant):
+            return handler
+        
+        async def retry_after_reconnect(request: Request):
+            from app.db.health import database_health
+            
+            try:
+                return await handler(request)
+            except Exception as e:
+                session = getattr(request.state, _RETRY_SESSION_ATTR, None)
+                connection_error = connection_error_in(e)
+                if connection_error is None or session is None or session.info.get(_COMMITTED_KEY):
+                    raise
+                database_health.record_failure(connection_error)
+                logger.warning("Retrying request after database connection error", path=request.url.path)
+                await database_health.wait_until_available()
+                await _rewind_uploads(request)
+                return await handler(request)
+        
+        return retry_after_reconnect
+
+
+async def _rewind_uploads(request: Request):
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith(("multipart/form-data", "application/x-www-form-urlencoded")):
+        return
+    # Parsed once by the first attempt; request.form() returns the cached form
+    form = await request.form()
+    for value in form.values():
+        if isinstance(value, UploadFile):
+            await value.seek(0)
 
 
 @asynccontextmanager
@@ -156,3 +346,29 @@ async def get_db_session():
             raise
         finally:
             await session.close()
+
+
+@asynccontextmanager
+async def get_read_db_session():
+    """Read session for services and admin pages (replica or read pool)"""
+    async with read_session_factory()() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def get_jobs_db_session():
+    """Session from the background job pool"""
+    async with jobs_session_factory() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,171 @@
+"""
+Primary database health and circuit breaker
+
+Requests no longer check connectivity themselves. The breaker tracks whether
+the primary database is reachable instead:
+
+- closed: requests go straight to the database with no extra round trip. A
+  background probe runs ``SELECT 1`` every ``DB_HEALTH_INTERVAL`` seconds so
+  an outage is usually noticed before a user runs into it.
+- open: a probe or request hit a connection error. The probe retries with a
+  short backoff, and ``get_db_with_retry`` requests wait for it to succeed
+  for up to ``DB_WAKE_TIMEOUT`` seconds (a sleeping database waking up), then
+  fail fast with 503.
+
+The first probe runs at startup, so a cold start with a sleeping database
+opens the breaker before the first request arrives.
+"""
+
+import asyncio
+import math
+import socket
+import time
+from typing import Awaitable, Callable, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.core.exceptions import DatabaseUnavailableError
+
+logger = structlog.get_logger()
+
+CLOSED = "closed"
+OPEN = "open"
+
+PROBE_TIMEOUT_SECONDS = 5.0
+# Probe backoff while open: 0.5s doubling up to this cap
+MAX_PROBE_BACKOFF_SECONDS = 5.0
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """True for errors meaning the database is unreachable, not a bad query"""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    # Not every OSError: a failed file write must not open the breaker
+    return isinstance(
+        error, (OperationalError, InterfaceError, ConnectionError, socket.gaierror, asyncio.TimeoutError)
+    )
+
+
+async def _select_one():
+    from app.db.database import engine
+
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+class DatabaseHealth:
+    """Circuit breaker over primary database connectivity"""
+
+    def __init__(
+        self,
+        probe: Optional[Callable[[], Awaitable[None]]] = None,
+        interval: Optional[float] = None,
+        wake_timeout: Optional[float] = None,
+    ):
+        self._probe = probe or _select_one
+        self.interval = settings.DB_HEALTH_INTERVAL if interval is None else interval
+        self.wake_timeout = settings.DB_WAKE_TIMEOUT if wake_timeout is None else wake_timeout
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.is_running = False
+        self._recovered = asyncio.Event()
+        self._recovered.set()
+        self._tripped = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return self.state == CLOSED
+
+    def record_failure(self, error: BaseException):
+        """Open the breaker after a connection error"""
+        self.last_error = str(error)
+        if self.state == OPEN:
+            return
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._recovered.clear()
+        self._tripped.set()
+        logger.warning("Database unreachable, circuit opened", error=self.last_error)
+
+    def record_success(self):
+        if self.state == CLOSED:
+            return
+        downtime = time.monotonic() - (self.opened_at or time.monotonic())
+        self.state = CLOSED
+        self.opened_at = None
+        self._recovered.set()
+        logger.info("Database reachable again, circuit closed", downtime_seconds=round(downtime, 1))
+
+    async def wait_until_available(self):
+        """Return at once while healthy; otherwise wait for recovery or raise 503"""
+        if self.state == CLOSED or not self.is_running:
+            # Without the probe nobody would close the breaker; let the request try
+            return
+        try:
+            await asyncio.wait_for(self._recovered.wait(), timeout=self.wake_timeout)
+        except asyncio.TimeoutError:
+            raise DatabaseUnavailableError(retry_after=max(1, math.ceil(self.wake_timeout)))
+
+    async def probe(self) -> bool:
+        try:
+            await asyncio.wait_for(self._probe(), timeout=PROBE_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            return False
+        self.record_success()
+        return True
+
+    async def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("Database health monitor started")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._recovered.set()
+        # Python 3.11's wait_for() can swallow the cancel below when the probe
+        # finishes at the same moment; the loop then sees is_running or this event
+        self._tripped.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        failures = 0
+        while self.is_running:
+            try:
+                if await self.probe():
+                    failures = 0
+                    self._tripped.clear()
+                    if not self.is_running:
+                        break
+                    if self.interval > 0:
+                        await asyncio.wait_for(self._tripped.wait(), timeout=self.interval)
+                    else:
+                        await self._tripped.wait()
+                else:
+                    failures += 1
+                    await asyncio.sleep(min(MAX_PROBE_BACKOFF_SECONDS, 0.5 * 2 ** (failures - 1)))
+            except asyncio.TimeoutError:
+                continue
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Database health probe loop error", error=str(e))
+                await asyncio.sleep(MAX_PROBE_BACKOFF_SECONDS)
+
+
+# Global instance used by get_db_with_retry and the lifespan
+database_health = DatabaseHealth()
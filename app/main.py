@@ -2,63 +2,72 @@
 Main FastAPI application with Admin Panel
 """
 
+from app.core.startup_profiler import startup_profiler  # Imported first: starts the startup clock
+
+import hashlib
+import hmac
+import secrets
 import structlog
 from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.staticfiles import StaticFiles
-from starlette.responses import RedirectResponse
+from starlette.responses import PlainTextResponse, RedirectResponse
 
 from app.core.config import settings
+# Configures structlog and stdlib logging (once, at import)
+from app.core.logging_config import logging_config
 from app.core.security import get_password_hash, verify_password
 from app.core.error_handlers import register_error_handlers
 from app.db.database import create_tables, get_db_session
 from app.api.routes import api_router
-# Modern admin panel using FastAPI routes
+from app.core.lazy_routes import include_router_lazily
 from app.models.user import User
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
 logger = structlog.get_logger()
+startup_profiler.mark("import modules")
+
+# Settings key holding the fingerprint of the last verified admin bootstrap
+ADMIN_BOOTSTRAP_FINGERPRINT = "bootstrap_fingerprint"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting Junglore Backend API with Admin Panel...")
+    startup_profiler.mark("server boot")
     try:
-        # Initialize logging
-        from app.core.logging_config import logging_config
-        
         # Initialize cache
         from app.core.cache import cache_manager
         try:
             await cache_manager.initialize()
         except Exception as e:
             logger.warning(f"Cache initialization failed (non-critical): {e}")
+        startup_profiler.mark("cache")
+        
+        # Compile the admin shell once so the first admin request doesn't pay for it
+        try:
+            from app.admin.templates.base import compile_admin_shell
+            compile_admin_shell()
+        except Exception as e:
+            logger.warning(f"Admin shell compilation failed (non-critical): {e}")
+        startup_profiler.mark("admin shell")
+        
+        # Watch database connectivity so requests don't have to ping it
+        try:
+            from app.db.health import database_health
+            await database_health.start()
+        except Exception as e:
+            logger.warning(f"Database health monitor failed to start (non-critical): {e}")
+        startup_profiler.mark("database health")
         
         await create_tables()
+        startup_profiler.mark("create tables")
         await create_default_admin()
+        startup_profiler.mark("default admin")
         
         # Start leaderboard background jobs (disable for initial deployment)
         try:
@@ -67,8 +76,74 @@ async def lifespan(app: FastAPI):
             logger.info("Background jobs started")
         except Exception as e:
             logger.warning(f"Background jobs failed to start (non-critical): {e}")
+        startup_profiler.mark("leaderboard jobs")
+        
+        # Listen for settings changes made by other workers
+        try:
+            from app.services.settings_service import settings_registry
+            await settings_registry.start()
+        except Exception as e:
+            logger.warning(f"Settings invalidation listener failed to start (non-critical): {e}")
+        startup_profiler.mark("settings listener")
+        
+        # Start daily activity counter reconciliation
+        try:
+            from app.services.daily_activity_counters import daily_activity_counters
+            await daily_activity_counters.start()
+        except Exception as e:
+            logger.warning(f"Daily activity reconciler failed to start (non-critical): {e}")
+        startup_profiler.mark("daily activity counters")
+        
+        # Relay notification events to connected SSE streams
+        try:
+            from app.services.notification_events import notification_events
+            await notification_events.start()
+        except Exception as e:
+            logger.warning(f"Notification event listener failed to start (non-critical): {e}")
+        startup_profiler.mark("notification events")
+        
+        # Outbound email dispatcher draining the outbox
+        try:
+            from app.services.email_delivery import email_dispatcher
+            await email_dispatcher.start()
+        except Exception as e:
+            logger.warning(f"Email dispatcher failed to start (non-critical): {e}")
+        startup_profiler.mark("email dispatcher")
+        
+        # Periodic batch recommendation refresh
+        try:
+            from app.services.recommendation_engine import recommendation_engine
+            await recommendation_engine.start()
+        except Exception as e:
+            logger.warning(f"Recommendation engine failed to start (non-critical): {e}")
+        startup_profiler.mark("recommendation engine")
+        
+        # In-memory retrieval index for chatbot answers
+        try:
+            from app.services.chatbot_retrieval import chatbot_retrieval
+            await chatbot_retrieval.start()
+        except Exception as e:
+            logger.warning(f"Chatbot retrieval index failed to start (non-critical): {e}")
+        startup_profiler.mark("chatbot retrieval")
+        
+        # Background ffprobe/mutagen worker for uploaded media
+        try:
+            from app.services.media_probe import media_metadata_worker
+            await media_metadata_worker.start()
+        except Exception as e:
+            logger.warning(f"Media metadata worker failed to start (non-critical): {e}")
+        startup_profiler.mark("media metadata worker")
+        
+        # HLS packaging worker (no-op unless VIDEO_PACKAGING_ENABLED)
+        try:
+            from app.services.video_packaging import video_packaging_worker
+            await video_packaging_worker.start()
+        except Exception as e:
+            logger.warning(f"Video packaging worker failed to start (non-critical): {e}")
+        startup_profiler.mark("video packaging worker")
         
         logger.info("Junglore Backend API started successfully!")
+        startup_profiler.complete()
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
         raise
@@ -84,9 +159,88 @@ async def lifespan(app: FastAPI):
         logger.info("Background jobs stopped successfully")
     except Exception as e:
         logger.error(f"Error stopping background jobs: {e}")
+    
+    try:
+        from app.services.settings_service import settings_registry
+        await settings_registry.stop()
+    except Exception as e:
+        logger.error(f"Error stopping settings listener: {e}")
+    
+    try:
+        # Flush daily activity counters to the database
+        from app.services.daily_activity_counters import daily_activity_counters
+        await daily_activity_counters.stop()
+    except Exception as e:
+        logger.error(f"Error stopping daily activity reconciler: {e}")
+    
+    try:
+        from app.services.notification_events import notification_events
+        await notification_events.stop()
+    except Exception as e:
+        logger.error(f"Error stopping notification event listener: {e}")
+    
+    try:
+        from app.services.email_delivery import email_dispatcher
+        await email_dispatcher.stop()
+    except Exception as e:
+        logger.error(f"Error stopping email dispatcher: {e}")
+    
+    try:
+        from app.services.recommendation_engine import recommendation_engine
+        await recommendation_engine.stop()
+    except Exception as e:
+        logger.error(f"Error stopping recommendation engine: {e}")
+    
+    try:
+        from app.services.chatbot_retrieval import chatbot_retrieval
+        await chatbot_retrieval.stop()
+    except Exception as e:
+        logger.error(f"Error stopping chatbot retrieval index: {e}")
+    
+    try:
+        from app.services.media_probe import media_metadata_worker
+        await media_metadata_worker.stop()
+    except Exception as e:
+        logger.error(f"Error stopping media metadata worker: {e}")
+    
+    try:
+        from app.services.video_packaging import video_packaging_worker
+        await video_packaging_worker.stop()
+    except Exception as e:
+        logger.error(f"Error stopping video packaging worker: {e}")
+    
+    try:
+        from app.services.image_optimization import image_engine
+        image_engine.shutdown()
+    except Exception as e:
+        logger.error(f"Error stopping image engine: {e}")
+    
+    try:
+        from app.db.health import database_health
+        await database_health.stop()
+    except Exception as e:
+        logger.error(f"Error stopping database health monitor: {e}")
+    
+    try:
+        from app.db.database import dispose_engines
+        await dispose_engines()
+    except Exception as e:
+        logger.error(f"Error closing database pools: {e}")
+
+def admin_bootstrap_fingerprint(hashed_password: str) -> str:
+    """Keyed digest of the configured admin credentials and the stored hash"""
+    message = f"{settings.ADMIN_USERNAME}\0{settings.ADMIN_PASSWORD}\0{hashed_password}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
 
 async def create_default_admin():
-    """Create default admin user if not exists"""
+    """
+    Create default admin user if not exists
+    
+    bcrypt is deliberately slow, so the password check only runs when the
+    configured credentials or the stored hash changed since the last boot
+    (tracked by a fingerprint in the admin's preferences).
+    """
     try:
         from sqlalchemy import select
         async with get_db_session() as db:
@@ -104,20 +258,31 @@ async def create_default_admin():
                     hashed_password=hashed_password,
                     username="admin",
                     is_active=True,
-                    is_superuser=True
+                    is_superuser=True,
+                    preferences={ADMIN_BOOTSTRAP_FINGERPRINT: admin_bootstrap_fingerprint(hashed_password)}
                 )
                 db.add(admin)
                 await db.commit()
                 logger.info("Default admin user created")
+                return
+            
+            preferences = dict(admin_user.preferences or {})
+            stored_fingerprint = preferences.get(ADMIN_BOOTSTRAP_FINGERPRINT) or ""
+            if hmac.compare_digest(stored_fingerprint, admin_bootstrap_fingerprint(admin_user.hashed_password)):
+                logger.info("Admin user unchanged since last boot, skipping password check")
+                return
+            
+            # Check if admin password needs to be updated to match environment variable
+            if not verify_password(settings.ADMIN_PASSWORD, admin_user.hashed_password):
+                logger.info("Updating admin password to match environment variable")
+                admin_user.hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
+                logger.info("Admin password updated successfully")
             else:
-                # Check if admin password needs to be updated to match environment variable
-                if not verify_password(settings.ADMIN_PASSWORD, admin_user.hashed_password):
-                    logger.info("Updating admin password to match environment variable")
-                    admin_user.hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
-                    await db.commit()
-                    logger.info("Admin password updated successfully")
-                else:
-                    logger.info("Admin user already exists with correct password")
+                logger.info("Admin user already exists with correct password")
+            
+            preferences[ADMIN_BOOTSTRAP_FINGERPRINT] = admin_bootstrap_fingerprint(admin_user.hashed_password)
+            admin_user.preferences = preferences
+            await db.commit()
     except Exception as e:
         logger.error(f"Error creating default admin user: {e}")
 
@@ -163,10 +328,6 @@ if settings.ENVIRONMENT == "production":
 
 # Security middleware disabled for development - will implement later
 # from app.middleware.security import SecurityHeadersMiddleware, HTTPSRedirectMiddleware
-# from app.middleware.rate_limiting import RateLimitMiddleware
-
-# Add rate limiting (disabled for development)
-# app.add_middleware(RateLimitMiddleware, default_limit=100, default_window=60)
 
 # Add security headers (disabled for development)
 # app.add_middleware(SecurityHeadersMiddleware, force_https=False)
@@ -230,6 +391,55 @@ logger.info(f"CORS Origins configured: {cors_origins}")
 logger.info(f"Environment: {settings.ENVIRONMENT}")
 logger.info(f"Raw CORS_ORIGINS env var: {settings.CORS_ORIGINS}")
 
+# Add ETag/304 handling for public catalog endpoints (inside rate limiting and CORS)
+if settings.HTTP_CACHE_ENABLED:
+    from app.middleware.http_cache import ConditionalGetMiddleware
+    from app.services.http_cache import register_version_listeners
+    register_version_listeners()
+    app.add_middleware(ConditionalGetMiddleware)
+
+# Add rate limiting (inside CORS so 429 responses still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    from app.middleware.rate_limiting import RateLimitMiddleware, RateLimitPolicy
+    app.add_middleware(
+        RateLimitMiddleware,
+        default_policy=RateLimitPolicy(
+            "api_default",
+            limit=settings.RATE_LIMIT_PER_MINUTE,
+            period=60,
+            burst=settings.RATE_LIMIT_PER_MINUTE * 2,
+            scope="user",
+            local_batch=5
+        )
+    )
+    from app.core.client_ip import proxies_configured
+    if settings.ENVIRONMENT == "production" and not proxies_configured():
+        logger.warning(
+            "No trusted proxy configured: every request appears to come from the proxy, "
+            "so rate limits are shared by all clients. Set TRUSTED_PROXY_COUNT or TRUSTED_PROXIES."
+        )
+
+# Compress large text responses (inside CORS, outside the ETag/304 handling)
+if settings.COMPRESSION_ENABLED:
+    from app.middleware.compression import CompressionMiddleware
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+    )
+
+# Time requests and count their queries (outermost after CORS so it sees everything)
+if settings.METRICS_ENABLED:
+    from app.middleware.instrumentation import InstrumentationMiddleware
+    from app.services.instrumentation import register_query_listeners
+    register_query_listeners()
+    app.add_middleware(
+        InstrumentationMiddleware,
+        access_log=settings.ACCESS_LOG_ENABLED,
+        server_timing=settings.SERVER_TIMING_ENABLED
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -263,10 +473,6 @@ for name, path in [("static", STATIC_DIR), ("uploads", UPLOADS_DIR), ("templates
         path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Created {name} directory", path=str(path))
 
-# Include modern admin panel
-from app.admin import admin_router
-app.include_router(admin_router, prefix="/admin", tags=["admin"])
-
 # Mount static files for uploads
 # app.mount("/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
 # Conditional file serving: R2 or local
@@ -279,44 +485,34 @@ if USE_R2_STORAGE:
     # Serve files from R2 via redirect
     logger.info("R2 storage enabled - files will be served from Cloudflare R2")
     
-    import boto3
     from botocore.exceptions import ClientError
-    
+    from fastapi import HTTPException
+    from fastapi.responses import RedirectResponse
+    from app.services.media_urls import media_url_service
+
     @app.get("/uploads/{file_path:path}")
     async def serve_from_r2(file_path: str):
-        """Generate presigned URL for R2 file access"""
+        """Redirect to the public or presigned R2 URL for a file"""
+        key = media_url_service.normalize_key(file_path)
         try:
-            # Clean path (handle both "images/photo.jpg" and "/uploads/images/photo.jpg")
-            clean_path = file_path.lstrip('/')
-            if clean_path.startswith('uploads/'):
-                clean_path = clean_path[8:]  # Remove 'uploads/' prefix
-            
-            # Initialize R2 client
-            r2_client = boto3.client(
-                's3',
-                endpoint_url=settings.R2_ENDPOINT_URL,
-                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name='auto'
-            )
-            
-            # Generate presigned URL (valid for 1 hour)
-            presigned_url = r2_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': settings.R2_BUCKET_NAME,
-                    'Key': clean_path
-                },
-                ExpiresIn=3600
+            public_url = media_url_service.public_url(key)
+            if public_url:
+                return RedirectResponse(
+                    url=public_url,
+                    status_code=307,
+                    headers={"Cache-Control": "public, max-age=86400"}
+                )
+
+            # Reused until shortly before expiry, so browsers may cache the redirect too
+            presigned_url, max_age = media_url_service.presigned_url(key)
+            return RedirectResponse(
+                url=presigned_url,
+                status_code=307,
+                headers={"Cache-Control": f"private, max-age={max_age}"}
             )
-            
-            # 307 = Temporary Redirect (preserves HTTP method)
-            from fastapi.responses import RedirectResponse
-            return RedirectResponse(url=presigned_url, status_code=307)
-            
+
         except ClientError as e:
             logger.error(f"R2 file access error: {e}")
-            from fastapi import HTTPException
             raise HTTPException(status_code=404, detail="File not found")
 else:
     # Serve files from local disk (development mode)
@@ -334,9 +530,20 @@ app.mount("/admin/static", StaticFiles(directory=str(STATIC_DIR)), name="admin_s
 # Mount static files for admin templates
 app.mount("/admin/templates", StaticFiles(directory=str(TEMPLATES_DIR)), name="admin_templates")
 
+# Include modern admin panel (imported on the first /admin request)
+include_router_lazily(app, "/admin", "app.admin:admin_router", tags=["admin"])
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
+# Admin discussion moderation API (JWT authenticated), imported on first use
+include_router_lazily(
+    app,
+    "/api/v1/admin/discussions",
+    "app.admin.routes.discussion_moderation:router",
+    tags=["Admin - Discussions"]
+)
+
 # Search routes are already included in api_router
 
 # Include analytics routes
@@ -347,6 +554,11 @@ app.include_router(analytics_router, prefix="/api/v1/analytics", tags=["analytic
 from app.api.settings_api import router as settings_api_router
 app.include_router(settings_api_router, prefix="/api/v1", tags=["settings"])
 
+# On-demand resized images (/img/{key}?w=&fmt=)
+from app.api.endpoints.images import router as images_router
+app.include_router(images_router, tags=["Images"])
+startup_profiler.mark("configure app")
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -367,6 +579,40 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+def require_metrics_access(request: Request):
+    """Same access rule as /metrics: bearer METRICS_TOKEN, or development only"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not settings.METRICS_TOKEN:
+        # Route names, error rates and pool sizes are not for the public internet
+        if settings.ENVIRONMENT != "development":
+            raise HTTPException(status_code=404, detail="Not Found")
+    else:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+@app.get("/health/db-pools")
+async def database_pool_health(request: Request):
+    """Connection usage of the primary, read and job pools, and the circuit state"""
+    require_metrics_access(request)
+    from app.db.database import pool_status
+    from app.db.health import database_health
+    return {"pools": pool_status(), "circuit": database_health.state}
+
+@app.get("/health/startup")
+async def startup_profile(request: Request):
+    """Time spent in each startup step of this worker"""
+    require_metrics_access(request)
+    return startup_profiler.report()
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus scrape endpoint for this worker's request and database metrics"""
+    require_metrics_access(request)
+    from app.core.metrics import metrics
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/debug/cors")
 async def debug_cors():
     """Debug endpoint to check CORS configuration"""
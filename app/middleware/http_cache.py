@@ -0,0 +1,147 @@
+"""
+Conditional GET middleware for public catalog endpoints
+
+Cacheable routes get a strong ETag built from their resource's version token
+(see ``app.services.http_cache``) and the request URL, plus ``Cache-Control``
+with ``stale-while-revalidate`` so a CDN can serve them. A request whose
+``If-None-Match`` carries the current ETag is answered with 304 before the
+endpoint runs, so revalidation never touches the database. Responses pass
+through untouched while version tokens are not shared between workers.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.middleware.rate_limiting import _compile_route
+from app.services.http_cache import ResourceVersions, resource_versions
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class HTTPCachePolicy:
+    """How responses of one route are versioned and cached"""
+
+    resource: str
+    max_age: int = 0  # Browsers always revalidate; the 304 path is cheap
+    s_maxage: Optional[int] = None  # Defaults to settings.HTTP_CACHE_S_MAXAGE
+    stale_while_revalidate: Optional[int] = None
+    bypass_params: Tuple[str, ...] = ()  # Truthy query params that skip caching
+    bypass_headers: Tuple[str, ...] = ()  # Request headers that skip caching
+    vary: Tuple[str, ...] = ()
+
+    def cache_control(self) -> str:
+        s_maxage = settings.HTTP_CACHE_S_MAXAGE if self.s_maxage is None else self.s_maxage
+        swr = (
+            settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+            if self.stale_while_revalidate is None else self.stale_while_revalidate
+        )
+        return f"public, max-age={self.max_age}, s-maxage={s_maxage}, stale-while-revalidate={swr}"
+
+    def bypassed(self, headers: Headers, query: QueryParams) -> bool:
+        if any(query.get(param, "").lower() in _TRUTHY for param in self.bypass_params):
+            return True
+        return any(header in headers for header in self.bypass_headers)
+
+
+DEFAULT_POLICIES: List[Tuple[str, HTTPCachePolicy]] = [
+    ("/api/v1/content/resources/blogs", HTTPCachePolicy("content")),
+    ("/api/v1/content/resources/casestudies", HTTPCachePolicy("content")),
+    ("/api/v1/videos/tv_playlist", HTTPCachePolicy("videos")),
+    # Personalised when the caller identifies itself
+    ("/api/v1/videos/featured-series", HTTPCachePolicy(
+        "videos", bypass_headers=("x-user-id",), vary=("X-User-ID",)
+    )),
+    ("/api/v1/national-parks", HTTPCachePolicy("national_parks", bypass_params=("include_unapproved",))),
+    ("/api/v1/national-parks/{park_id}", HTTPCachePolicy("national_parks")),
+    ("/api/v1/animals/featured", HTTPCachePolicy("animals")),
+    ("/api/v1/myths-facts/resources/myths", HTTPCachePolicy("myths_facts")),
+]
+
+
+def parse_if_none_match(value: Optional[str]) -> List[str]:
+    """Entity tags listed in an If-None-Match header, weak prefixes removed"""
+    if not value:
+        return []
+    tags = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def build_etag(resource: str, version: str, path: str, query_string: str) -> str:
+    url = f"{path}?{query_string}" if query_string else path
+    return f'"{resource}-{version}-{hashlib.sha1(url.encode()).hexdigest()[:10]}"'
+
+
+class ConditionalGetMiddleware:
+    """Pure ASGI middleware adding ETags and answering matching revalidations with 304"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: Optional[Sequence[Tuple[str, HTTPCachePolicy]]] = None,
+        versions: Optional[ResourceVersions] = None,
+    ):
+        self.app = app
+        self.versions = versions or resource_versions
+        self.routes = [
+            (_compile_route(pattern), policy)
+            for pattern, policy in (DEFAULT_POLICIES if policies is None else policies)
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.get_policy(scope["path"])
+        if policy is None or not self.versions.shared:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        if policy.bypassed(headers, QueryParams(query_string)):
+            await self.app(scope, receive, send)
+            return
+
+        version = await self.versions.get(policy.resource)
+        etag = build_etag(policy.resource, version, scope["path"], query_string)
+        cache_headers = {"ETag": etag, "Cache-Control": policy.cache_control()}
+        if policy.vary:
+            cache_headers["Vary"] = ", ".join(policy.vary)
+
+        candidates = parse_if_none_match(headers.get("if-none-match"))
+        if etag in candidates or "*" in candidates:
+            response = Response(status_code=304, headers=cache_headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(scope=message)
+                for name, value in cache_headers.items():
+                    if name == "Vary":
+                        response_headers.add_vary_header(value)
+                    elif name not in response_headers:
+                        response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def get_policy(self, path: str) -> Optional[HTTPCachePolicy]:
+        for pattern, policy in self.routes:
+            if pattern.match(path):
+                return policy
+        return None
@@ -0,0 +1,126 @@
+"""
+Request timing middleware
+
+Times every HTTP request, labels it with its route template (so
+``/api/v1/quizzes/{quiz_id}`` rather than one series per quiz), records the
+metrics kept in ``app.services.instrumentation`` and writes the access log
+through ``RequestLogger``. Requests slower than ``SLOW_REQUEST_MS`` are logged
+with their query count and DB time.
+"""
+
+import time
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.client_ip import client_ip
+from app.core.config import settings
+from app.services.instrumentation import begin_request, current_request_stats, end_request
+
+logger = structlog.get_logger()
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope, root_path: str = "") -> str:
+    """Route template of a routed request, falling back to its mount point"""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        # Mounted apps (static files) only record where they were mounted
+        mounted = scope.get("root_path", "")[len(root_path):]
+        return f"{mounted}/{{path}}" if mounted else UNMATCHED_ROUTE
+
+    # Included routers may report the path without their prefix; take the
+    # prefix from the request path, putting placeholders back for its params
+    route_parts = [part for part in template.split("/") if part]
+    path_parts = [part for part in scope["path"].split("/") if part]
+    prefix_length = len(path_parts) - len(route_parts)
+    if prefix_length <= 0 or ":path}" in template:
+        return template
+
+    prefix_params = {
+        str(value): name
+        for name, value in scope.get("path_params", {}).items()
+        if "{" + name not in template
+    }
+    prefix = [
+        "{" + prefix_params[part] + "}" if part in prefix_params else part
+        for part in path_parts[:prefix_length]
+    ]
+    return "/" + "/".join(prefix + route_parts) + ("/" if template.endswith("/") and route_parts else "")
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware recording latency and database usage per route"""
+
+    def __init__(self, app: ASGIApp, access_log: bool = True, server_timing: bool = False):
+        self.app = app
+        self.access_log = access_log
+        self.server_timing = server_timing
+        self._request_logger = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        token = begin_request(scope["method"], scope["path"])
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                stats = current_request_stats()
+                if self.server_timing and stats is not None:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", app;dur={elapsed_ms:.1f}',
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - started
+            route = route_template(scope, root_path)
+            try:
+                stats = end_request(token, route, status_code, duration)
+                self._log(scope, route, status_code, duration, stats)
+            except Exception as e:
+                logger.error("Failed to record request metrics", error=str(e))
+
+    def _log(self, scope: Scope, route: str, status_code: int, duration: float, stats) -> None:
+        if settings.SLOW_REQUEST_MS > 0 and duration * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "Slow request",
+                method=scope["method"],
+                route=route,
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=round(duration * 1000, 1),
+                queries=stats.queries if stats else 0,
+                db_ms=round(stats.db_time * 1000, 1) if stats else 0,
+            )
+
+        if not self.access_log:
+            return
+        if self._request_logger is None:
+            from app.core.logging_config import request_logger
+            self._request_logger = request_logger
+
+        headers = Headers(scope=scope)
+        self._request_logger.log_request(
+            method=scope["method"],
+            path=scope["path"],
+            status_code=status_code,
+            response_time=duration,
+            ip_address=client_ip(scope, headers),
+            user_agent=headers.get("user-agent", ""),
+            request_id=headers.get("x-request-id", ""),
+        )
@@ -1,115 +1,307 @@
 """
 Rate limiting middleware for API protection
+
+Limits are enforced with GCRA (a token bucket expressed as a "theoretical
+arrival time"), stored in Redis so every worker shares the same budget. Each
+Redis round trip is a single Lua call, and policies can lease a small batch of
+tokens per call so busy keys are mostly served from process memory. Rejections
+are also cached locally until the retry time, so a client hammering an endpoint
+does not cost a Redis call per request. Without Redis the same algorithm runs
+per worker in memory.
 """
 
-import time
-from typing import Dict, Tuple
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-import asyncio
-from collections import defaultdict, deque
 import ipaddress
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from jose import JWTError, jwt
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import cache_manager
+from app.core.client_ip import client_ip, from_trusted_proxy
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Leased tokens must be spent quickly so one worker cannot hoard a budget
+LEASE_TTL_SECONDS = 1.0
+# Bound on locally tracked keys before expired entries are swept
+MAX_LOCAL_KEYS = 10000
+
+# GCRA with batch leasing. Grants up to ARGV[3] tokens (at least 1) and returns
+# {granted, retry_after_ms, remaining}.
+_GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local wanted = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local available = math.floor((now + tolerance - tat) / emission)
+if available < 1 then
+    return {0, math.ceil(tat + emission - tolerance - now), 0}
+end
+local granted = math.min(wanted, available)
+local new_tat = tat + emission * granted
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.max(1, math.ceil(new_tat - now)))
+return {granted, 0, available - granted}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A limit of ``limit`` requests per ``period`` seconds"""
+
+    name: str
+    limit: int
+    period: int
+    burst: Optional[int] = None  # Requests allowed at once; defaults to limit
+    scope: str = "ip"  # "ip" or "user" (anonymous requests fall back to IP)
+    methods: Optional[Tuple[str, ...]] = None
+    local_batch: int = 1  # Tokens leased per Redis call; keep 1 for strict limits
+
+    @property
+    def emission_interval_ms(self) -> float:
+        return self.period * 1000.0 / self.limit
+
+    @property
+    def tolerance_ms(self) -> float:
+        return self.emission_interval_ms * (self.burst or self.limit)
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    retry_after: int = 0
+    remaining: int = 0
+
+
+class LocalGCRA:
+    """In-process GCRA, same arithmetic as the Redis script"""
+
+    def __init__(self):
+        self.tats: Dict[str, float] = {}
+
+    def acquire(self, key: str, policy: RateLimitPolicy, wanted: int, now_ms: float) -> Tuple[int, float, int]:
+        emission = policy.emission_interval_ms
+        tolerance = policy.tolerance_ms
+        tat = max(self.tats.get(key, now_ms), now_ms)
+
+        available = math.floor((now_ms + tolerance - tat) / emission)
+        if available < 1:
+            return 0, tat + emission - tolerance - now_ms, 0
+
+        granted = min(wanted, available)
+        self.tats[key] = tat + emission * granted
+        return granted, 0.0, available - granted
+
+    def sweep(self, now_ms: float):
+        for key in [k for k, tat in self.tats.items() if tat < now_ms]:
+            del self.tats[key]
+
 
 class RateLimiter:
-    """In-memory rate limiter with sliding window"""
-    
+    """Distributed GCRA rate limiter with a local fast path"""
+
     def __init__(self):
-        # Store request timestamps for each IP
-        self.requests: Dict[str, deque] = defaultdict(lambda: deque())
-        # Store blocked IPs with unblock time
-        self.blocked_ips: Dict[str, float] = {}
-        
-    def is_allowed(self, ip: str, limit: int, window: int) -> Tuple[bool, int]:
-        """
-        Check if request is allowed based on rate limit
-        Returns (is_allowed, retry_after_seconds)
-        """
-        current_time = time.time()
-        
-        # Check if IP is currently blocked
-        if ip in self.blocked_ips:
-            if current_time < self.blocked_ips[ip]:
-                retry_after = int(self.blocked_ips[ip] - current_time)
-                return False, retry_after
-            else:
-                # Unblock IP
-                del self.blocked_ips[ip]
-        
-        # Clean old requests outside the window
-        requests = self.requests[ip]
-        while requests and requests[0] < current_time - window:
-            requests.popleft()
-        
-        # Check if limit exceeded
-        if len(requests) >= limit:
-            # Block IP for the window duration
-            self.blocked_ips[ip] = current_time + window
-            return False, window
-        
-        # Add current request
-        requests.append(current_time)
-        return True, 0
-    
-    def cleanup_old_entries(self):
-        """Clean up old entries to prevent memory leaks"""
-        current_time = time.time()
-        
-        # Clean up old request records (older than 1 hour)
-        for ip in list(self.requests.keys()):
-            requests = self.requests[ip]
-            while requests and requests[0] < current_time - 3600:
-                requests.popleft()
-            if not requests:
-                del self.requests[ip]
-        
-        # Clean up expired blocked IPs
-        for ip in list(self.blocked_ips.keys()):
-            if current_time >= self.blocked_ips[ip]:
-                del self.blocked_ips[ip]
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware with different limits for different endpoints"""
-    
-    def __init__(self, app, default_limit: int = 100, default_window: int = 60):
-        super().__init__(app)
-        self.rate_limiter = RateLimiter()
-        self.default_limit = default_limit
-        self.default_window = default_window
-        
-        # Different rate limits for different endpoint patterns
-        self.endpoint_limits = {
-            "/api/v1/auth/login": (5, 300),  # 5 requests per 5 minutes
-            "/api/v1/auth/register": (3, 300),  # 3 requests per 5 minutes
-            "/api/v1/media/upload": (10, 60),  # 10 uploads per minute
-            "/admin/login": (5, 300),  # 5 admin login attempts per 5 minutes
-        }
-        
-        # Whitelist for internal IPs
+        self.local = LocalGCRA()
+        self._leases: Dict[str, Tuple[int, float]] = {}
+        self._blocked: Dict[str, float] = {}
+        self._script = None
+
+    @property
+    def _redis(self):
+        if cache_manager.use_redis and cache_manager.redis_client:
+            return cache_manager.redis_client
+        return None
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Consume one request from ``key``'s budget"""
+        now = time.monotonic()
+
+        # Rejections are remembered until the retry time
+        blocked_until = self._blocked.get(key)
+        if blocked_until is not None:
+            if now < blocked_until:
+                return RateLimitResult(False, max(1, math.ceil(blocked_until - now)), 0)
+            del self._blocked[key]
+
+        # Spend a token leased by an earlier Redis call
+        lease = self._leases.get(key)
+        if lease is not None:
+            tokens, expires_at = lease
+            if tokens > 0 and now < expires_at:
+                self._leases[key] = (tokens - 1, expires_at)
+                return RateLimitResult(True, 0, tokens - 1)
+            del self._leases[key]
+
+        granted, retry_after_ms, remaining = await self._acquire(key, policy)
+
+        if len(self._leases) + len(self._blocked) > MAX_LOCAL_KEYS:
+            self._sweep(now)
+
+        if granted < 1:
+            retry_after = max(1, math.ceil(retry_after_ms / 1000))
+            self._blocked[key] = now + retry_after_ms / 1000
+            return RateLimitResult(False, retry_after, 0)
+
+        if granted > 1:
+            self._leases[key] = (granted - 1, now + LEASE_TTL_SECONDS)
+        return RateLimitResult(True, 0, remaining + granted - 1)
+
+    async def _acquire(self, key: str, policy: RateLimitPolicy) -> Tuple[int, float, int]:
+        redis_client = self._redis
+        if redis_client is not None:
+            try:
+                if self._script is None:
+                    self._script = redis_client.register_script(_GCRA_SCRIPT)
+                granted, retry_after_ms, remaining = await self._script(
+                    keys=[f"ratelimit:{key}"],
+                    args=[policy.emission_interval_ms, policy.tolerance_ms, max(1, policy.local_batch)],
+                )
+                return int(granted), float(retry_after_ms), int(remaining)
+            except Exception as e:
+                logger.warning("Redis rate limit check failed, using local limiter", error=str(e))
+
+        return self.local.acquire(key, policy, 1, time.time() * 1000)
+
+    def _sweep(self, now: float):
+        for key in [k for k, (_, expires_at) in self._leases.items() if expires_at <= now]:
+            del self._leases[key]
+        for key in [k for k, until in self._blocked.items() if until <= now]:
+            del self._blocked[key]
+        self.local.sweep(time.time() * 1000)
+
+
+# Route-specific policies; the first matching entry wins
+DEFAULT_POLICIES: List[Tuple[str, RateLimitPolicy]] = [
+    ("/api/v1/auth/login", RateLimitPolicy("auth_login", limit=5, period=300, methods=("POST",))),
+    ("/api/v1/auth/login-form", RateLimitPolicy("auth_login", limit=5, period=300, methods=("POST",))),
+    ("/api/v1/auth/signup", RateLimitPolicy("auth_signup", limit=3, period=300, methods=("POST",))),
+    ("/api/v1/auth/forgot-password", RateLimitPolicy("auth_reset", limit=3, period=300, methods=("POST",))),
+    ("/api/v1/auth/verify-reset-otp", RateLimitPolicy("auth_reset_verify", limit=10, period=300, methods=("POST",))),
+    ("/admin/login", RateLimitPolicy("admin_login", limit=5, period=300, methods=("POST",))),
+    ("/api/v1/quizzes/{quiz_id}/submit", RateLimitPolicy("quiz_submit", limit=10, period=60, scope="user", methods=("POST",))),
+    ("/api/v1/myths-facts/game/complete", RateLimitPolicy("mvf_complete", limit=10, period=60, scope="user", methods=("POST",))),
+    ("/api/v1/media/upload", RateLimitPolicy("media_upload", limit=10, period=60, scope="user", methods=("POST",))),
+]
+
+
+def _compile_route(pattern: str) -> re.Pattern:
+    """Turn '/api/v1/quizzes/{quiz_id}/submit' into an anchored regex"""
+    parts = re.split(r"(\{[^}]+\})", pattern)
+    regex = "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts)
+    return re.compile(f"^{regex}/?$")
+
+
+class RateLimitMiddleware:
+    """Pure ASGI rate limiting middleware with per-route and per-user policies"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: Optional[Sequence[Tuple[str, RateLimitPolicy]]] = None,
+        default_policy: Optional[RateLimitPolicy] = None,
+        default_prefix: str = "/api/",
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or RateLimiter()
+        self.routes = [
+            (_compile_route(pattern), policy)
+            for pattern, policy in (DEFAULT_POLICIES if policies is None else policies)
+        ]
+        self.default_policy = default_policy
+        self.default_prefix = default_prefix
+
+        # Whitelist for internal IPs; only for direct connections, since
+        # behind a proxy the peer is the proxy, not an internal caller
         self.whitelist = [
             ipaddress.ip_network("127.0.0.0/8"),  # Localhost
             ipaddress.ip_network("10.0.0.0/8"),   # Private network
             ipaddress.ip_network("172.16.0.0/12"), # Private network
             ipaddress.ip_network("192.168.0.0/16"), # Private network
         ]
-        
-        # Start cleanup task
-        asyncio.create_task(self._cleanup_task())
-    
-    def get_client_ip(self, request: Request) -> str:
-        """Get client IP address from request"""
-        # Check for forwarded headers (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fallback to direct connection
-        return request.client.host if request.client else "unknown"
-    
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.get_policy(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_ip = self.get_client_ip(scope, headers)
+        if not from_trusted_proxy(scope) and self.is_whitelisted(client_ip):
+            await self.app(scope, receive, send)
+            return
+
+        identity = None
+        if policy.scope == "user":
+            identity = self.get_user_id(headers)
+        key = f"{policy.name}:{'user:' + identity if identity else 'ip:' + client_ip}"
+
+        result = await self.limiter.hit(key, policy)
+
+        if not result.allowed:
+            logger.warning(
+                "Rate limit exceeded",
+                policy=policy.name,
+                path=scope["path"],
+                client_ip=client_ip,
+                retry_after=result.retry_after
+            )
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "message": f"Rate limit exceeded. Try again in {result.retry_after} seconds.",
+                    "status": False,
+                    "error_type": "RateLimitExceeded",
+                    "details": {"retry_after": result.retry_after},
+                },
+                headers={
+                    "Retry-After": str(result.retry_after),
+                    "X-RateLimit-Limit": str(policy.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-RateLimit-Limit"] = str(policy.limit)
+                response_headers["X-RateLimit-Remaining"] = str(result.remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def get_policy(self, method: str, path: str) -> Optional[RateLimitPolicy]:
+        """Get rate limit policy for a request"""
+        for pattern, policy in self.routes:
+            if pattern.match(path) and (policy.methods is None or method in policy.methods):
+                return policy
+        if self.default_policy and path.startswith(self.default_prefix):
+            return self.default_policy
+        return None
+
+    def get_client_ip(self, scope: Scope, headers: Headers) -> str:
+        """Get client IP address from request (forwarded headers only from trusted proxies)"""
+        return client_ip(scope, headers)
+
     def is_whitelisted(self, ip: str) -> bool:
         """Check if IP is in whitelist"""
         try:
@@ -117,50 +309,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return any(client_ip in network for network in self.whitelist)
         except ValueError:
             return False
-    
-    def get_rate_limit(self, path: str) -> Tuple[int, int]:
-        """Get rate limit for specific endpoint"""
-        for pattern, (limit, window) in self.endpoint_limits.items():
-            if path.startswith(pattern):
-                return limit, window
-        return self.default_limit, self.default_window
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Process request with rate limiting"""
-        client_ip = self.get_client_ip(request)
-        
-        # Skip rate limiting for whitelisted IPs
-        if self.is_whitelisted(client_ip):
-            return await call_next(request)
-        
-        # Get rate limit for this endpoint
-        limit, window = self.get_rate_limit(request.url.path)
-        
-        # Check rate limit
-        is_allowed, retry_after = self.rate_limiter.is_allowed(client_ip, limit, window)
-        
-        if not is_allowed:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
-                headers={"Retry-After": str(retry_after)}
-            )
-        
-        # Add rate limit headers to response
-        response = await call_next(request)
-        
-        # Get current request count
-        current_requests = len(self.rate_limiter.requests[client_ip])
-        remaining = max(0, limit - current_requests)
-        
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(time.time() + window))
-        
-        return response
-    
-    async def _cleanup_task(self):
-        """Background task to clean up old entries"""
-        while True:
-            await asyncio.sleep(300)  # Clean up every 5 minutes
-            self.rate_limiter.cleanup_old_entries()
\ No newline at end of file
+
+    @staticmethod
+    def get_user_id(headers: Headers) -> Optional[str]:
+        """User id from a valid bearer token, or None for anonymous requests"""
+        authorization = headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return None
+        user_id = payload.get("sub")
+        return str(user_id) if user_id else None
@@ -7,7 +7,7 @@ from .category import Category
 from .livestream import LiveStream
 from .content import Content
 from .media import Media
-from .chatbot import ChatbotConversation
+from .chatbot import ChatbotConversation, ChatbotMessage
 from .quiz_extended import Quiz, UserQuizResult
 from .myth_fact import MythFact
 from .conservation import ConservationEffort
@@ -36,6 +36,7 @@ from .tv_playlist import TVPlaylist
 from .video_channel import VideoChannel, GeneralKnowledgeVideo
 from .national_park import NationalPark
 from .temp_user import TempUserRegistration
+from .email_outbox import EmailOutbox
 
 __all__ = [
     "User",
@@ -44,6 +45,7 @@ __all__ = [
     "Content",
     "Media",
     "ChatbotConversation",
+    "ChatbotMessage",
     "Quiz",
     "UserQuizResult",
     "MythFact",
@@ -73,5 +75,6 @@ __all__ = [
     "VideoChannel",
     "GeneralKnowledgeVideo",
     "NationalPark",
-    "TempUserRegistration"
+    "TempUserRegistration",
+    "EmailOutbox"
 ]
\ No newline at end of file
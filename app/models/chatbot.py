@@ -2,7 +2,7 @@
 Chatbot conversation model for FaunaBot interactions
 """
 
-from sqlalchemy import Column, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, DateTime, JSON, ForeignKey, Integer, String, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -17,9 +17,10 @@ class ChatbotConversation(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Anonymous users allowed
     
-    # Store conversation as JSON array
-    # Format: [{"role": "user", "message": "...", "timestamp": "..."}, {"role": "bot", "message": "...", "timestamp": "..."}]
+    # Legacy JSON transcript; new messages are appended to chatbot_messages instead
+    # Format: [{"role": "user", "content": "...", "timestamp": "..."}, ...]
     messages = Column(JSON, default=list)
+    message_count = Column(Integer, default=0, nullable=False)
     
     # Conversation metadata
     conversation_metadata = Column(JSON, default=dict)  # Topics discussed, user satisfaction, etc.
@@ -32,4 +33,26 @@ class ChatbotConversation(Base):
     user = relationship("User", backref="chatbot_conversations")
 
     def __repr__(self):
-        return f"<ChatbotConversation(id={self.id}, user_id={self.user_id}, messages_count={len(self.messages) if self.messages else 0})>"
+        return f"<ChatbotConversation(id={self.id}, user_id={self.user_id}, messages_count={self.message_count})>"
+
+
+class ChatbotMessage(Base):
+    """One message of a conversation; rows are only ever appended"""
+    __tablename__ = "chatbot_messages"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    conversation_id = Column(
+        UUID(as_uuid=True), ForeignKey("chatbot_conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    role = Column(String(20), nullable=False)  # user, assistant
+    content = Column(Text, nullable=False)
+    sources = Column(JSON, nullable=True)  # Items the answer was retrieved from
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination of a conversation's history
+        Index('ix_chatbot_messages_conversation_created', 'conversation_id', 'created_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<ChatbotMessage(id={self.id}, conversation_id={self.conversation_id}, role={self.role})>"
@@ -0,0 +1,47 @@
+"""
+Durable outbox for outbound email
+"""
+
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from uuid import uuid4
+
+from app.db.database import Base
+
+
+class EmailOutbox(Base):
+    """
+    Outbound email waiting for (or done with) delivery
+
+    Rows are written in the same transaction as the change that triggers the
+    email and drained by the email dispatcher, so queued mail survives restarts.
+    Status moves pending -> sending -> sent, or back to pending with a later
+    next_attempt_at after a retryable failure, and to failed after the last try.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+
+    # Message
+    to_address = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    html_body = Column(Text, nullable=True)
+    text_body = Column(Text, nullable=True)
+    tag = Column(String(100), nullable=True)
+
+    # Delivery state
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(255), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Dispatcher claims due rows in this order
+        Index('ix_email_outbox_status_due', 'status', 'next_attempt_at'),
+    )
@@ -77,6 +77,8 @@ class Media(Base):
         Index('ix_media_photographer_park', 'photographer', 'national_park'),
         # Index for featured media
         Index('ix_media_featured', 'is_featured'),
+        # Index for admin keyset pagination
+        Index('ix_media_created_id', 'created_at', 'id'),
     )
 
     def __repr__(self):
@@ -2,7 +2,7 @@
 Recommendation system models for personalized content
 """
 
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, JSON, Enum, ForeignKey, Float
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, JSON, Enum, ForeignKey, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -39,9 +39,14 @@ class UserRecommendation(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Recommendation details
-    recommendation_type = Column(Enum(RecommendationTypeEnum), nullable=False)
+    # The database enums hold the lowercase values, not the member names
+    recommendation_type = Column(
+        Enum(RecommendationTypeEnum, values_callable=lambda e: [m.value for m in e]), nullable=False
+    )
     item_id = Column(UUID(as_uuid=True), nullable=False)  # ID of recommended item
-    source = Column(Enum(RecommendationSourceEnum), nullable=False)
+    source = Column(
+        Enum(RecommendationSourceEnum, values_callable=lambda e: [m.value for m in e]), nullable=False
+    )
     
     # Scoring
     relevance_score = Column(Float, nullable=False, default=0.0)  # 0.0 to 1.0
@@ -66,6 +71,11 @@ class UserRecommendation(Base):
     # Relationships
     user = relationship("User", backref="recommendations")
 
+    __table_args__ = (
+        # Endpoints read one user's best rows of one type
+        Index('ix_user_recommendations_lookup', 'user_id', 'recommendation_type', 'relevance_score'),
+    )
+
     def __repr__(self):
         return f"<UserRecommendation(id={self.id}, user_id={self.user_id}, type={self.recommendation_type}, score={self.relevance_score})>"
 
@@ -2,7 +2,7 @@
 Video Channel models for organizing general knowledge videos
 """
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, ForeignKey, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -73,6 +73,8 @@ class GeneralKnowledgeVideo(Base):
     video_url = Column(String(500), nullable=False)
     thumbnail_url = Column(String(500), nullable=True)
     duration = Column(Integer, nullable=True)  # in seconds
+    media_info = Column(JSON, nullable=True)  # resolution, codec, bitrate from ffprobe
+    streaming = Column(JSON, nullable=True)  # HLS manifest, poster and sprite from video packaging
     
     # Tags and hashtags (stored as comma-separated strings)
     tags = Column(Text, nullable=True)  # "wildlife,conservation,nature"
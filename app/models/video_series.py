@@ -76,6 +76,8 @@ class SeriesVideo(Base):
     video_url = Column(String(500), nullable=False)
     thumbnail_url = Column(String(500), nullable=True)
     duration = Column(Integer, nullable=True)  # in seconds
+    media_info = Column(JSON, nullable=True)  # resolution, codec, bitrate from ffprobe
+    streaming = Column(JSON, nullable=True)  # HLS manifest, poster and sprite from video packaging
     
     # Position in series
     position = Column(Integer, nullable=False)  # 1, 2, 3, etc.
@@ -0,0 +1,187 @@
+"""
+Shared listing engine for admin list views
+
+Admin lists page with a keyset cursor on (created_at, id) instead of
+OFFSET/LIMIT, so deep pages cost the same as the first one. Totals and facet
+counts (categories, difficulty, status) are cached for a short time and the
+category dropdown is cached until a category changes, so paging through a list
+does not re-count the table or reload every category on each request.
+"""
+
+import base64
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+
+from app.core.cache import cache_manager
+
+CACHE_PREFIX = "admin_list"
+COUNT_CACHE_TTL = 60
+FACET_CACHE_TTL = 300
+CATEGORY_CACHE_TTL = 3600
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Opaque cursor for a row's position in (created_at, id) order"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Position encoded in a cursor, or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _criteria_key(criteria) -> str:
+    """Stable cache key fragment for a WHERE clause and its bound values"""
+    if criteria is None:
+        return "all"
+    compiled = criteria.compile()
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return hashlib.sha1(f"{compiled}|{params}".encode()).hexdigest()[:16]
+
+
+@dataclass
+class ListPage:
+    """One page of a keyset-paginated admin list"""
+    items: List[Any]
+    total: int
+    limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def href(self, params: Dict[str, Any], direction: str) -> Optional[str]:
+        """Query string for the next/previous page, keeping the current filters"""
+        cursor = self.next_cursor if direction == "next" else self.prev_cursor
+        if cursor is None:
+            return None
+        query = {k: v for k, v in params.items() if v is not None and v != "" and v is not False}
+        query["limit"] = self.limit
+        query["after" if direction == "next" else "before"] = cursor
+        return "?" + urlencode(query)
+
+
+async def paginate(
+    db,
+    query,
+    model,
+    limit: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> ListPage:
+    """
+    Fetch one page of query in newest-first order
+
+    query carries the filters (and any loader options); after/before are
+    cursors from a previous page. The total is a cached count of the filtered
+    rows and may lag behind inserts by up to COUNT_CACHE_TTL seconds.
+    """
+    criteria = query.whereclause
+    position = tuple_(model.created_at, model.id)
+    before_pos = decode_cursor(before)
+    after_pos = None if before_pos else decode_cursor(after)
+
+    if before_pos:
+        # Walk backwards from the cursor, then restore newest-first order
+        rows = (await db.execute(
+            query.where(position > before_pos)
+            .order_by(model.created_at.asc(), model.id.asc())
+            .limit(limit + 1)
+        )).scalars().all()
+        items = list(rows[:limit])[::-1]
+        has_prev, has_next = len(rows) > limit, True
+    else:
+        if after_pos:
+            query = query.where(position < after_pos)
+        rows = (await db.execute(
+            query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+        )).scalars().all()
+        items = list(rows[:limit])
+        has_prev, has_next = after_pos is not None, len(rows) > limit
+
+    return ListPage(
+        items=items,
+        total=await cached_count(db, model, criteria),
+        limit=limit,
+        next_cursor=encode_cursor(items[-1].created_at, items[-1].id) if has_next and items else None,
+        prev_cursor=encode_cursor(items[0].created_at, items[0].id) if has_prev and items else None,
+    )
+
+
+async def cached_count(db, model, criteria=None) -> int:
+    """Row count for model under criteria, cached for COUNT_CACHE_TTL seconds"""
+    key = f"{CACHE_PREFIX}:count:{model.__tablename__}:{_criteria_key(criteria)}"
+    cached = await cache_manager.get(key)
+    if cached is not None:
+        return cached
+
+    query = select(func.count()).select_from(model)
+    if criteria is not None:
+        query = query.where(criteria)
+    total = (await db.execute(query)).scalar() or 0
+    await cache_manager.set(key, total, ttl=COUNT_CACHE_TTL)
+    return total
+
+
+async def facet_counts(db, model, column, criteria=None) -> Dict[Any, int]:
+    """Row counts grouped by column (e.g. difficulty or status), cached briefly"""
+    key = f"{CACHE_PREFIX}:facet:{model.__tablename__}:{column.key}:{_criteria_key(criteria)}"
+    cached = await cache_manager.get(key)
+    if cached is not None:
+        return cached
+
+    query = select(column, func.count()).group_by(column)
+    if criteria is not None:
+        query = query.where(criteria)
+    counts = {value: count for value, count in (await db.execute(query)).all()}
+    await cache_manager.set(key, counts, ttl=FACET_CACHE_TTL)
+    return counts
+
+
+@dataclass(frozen=True)
+class CategoryOption:
+    """Lightweight category entry for filter dropdowns"""
+    id: UUID
+    name: str
+
+
+async def category_options(db) -> List[CategoryOption]:
+    """Active categories ordered by name, cached until a category changes"""
+    key = f"{CACHE_PREFIX}:categories"
+    cached = await cache_manager.get(key)
+    if cached is not None:
+        return cached
+
+    from app.models.category import Category
+
+    rows = (await db.execute(
+        select(Category.id, Category.name).where(Category.is_active == True).order_by(Category.name)
+    )).all()
+    options = [CategoryOption(id=row.id, name=row.name) for row in rows]
+    await cache_manager.set(key, options, ttl=CATEGORY_CACHE_TTL)
+    return options
+
+
+async def invalidate_category_options():
+    """Drop the cached category dropdown after categories are edited"""
+    await cache_manager.delete(f"{CACHE_PREFIX}:categories")
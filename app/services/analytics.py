@@ -7,7 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc, text
-from app.db.database import get_db_session
+from app.db.database import get_db_session, get_read_db_session
 from app.models.content import Content
 from app.models.media import Media
 from app.models.user import User
@@ -115,7 +115,7 @@ class AnalyticsService:
             return cached_metrics
         
         try:
-            async with get_db_session() as db:
+            async with get_read_db_session() as db:
                 # Content metrics
                 total_content = await db.execute(select(func.count(Content.id)))
                 published_content = await db.execute(
@@ -208,7 +208,7 @@ class AnalyticsService:
             return cached_analytics
         
         try:
-            async with get_db_session() as db:
+            async with get_read_db_session() as db:
                 start_date = datetime.now(timezone.utc) - timedelta(days=days)
                 
                 # Content creation over time
@@ -324,7 +324,7 @@ class AnalyticsService:
             return cached_analytics
         
         try:
-            async with get_db_session() as db:
+            async with get_read_db_session() as db:
                 start_date = datetime.now(timezone.utc) - timedelta(days=days)
                 
                 # Media uploads over time
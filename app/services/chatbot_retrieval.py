@@ -0,0 +1,319 @@
+"""
+Retrieval-based answers for the wildlife chatbot
+
+FaunaBot answers from our own published content instead of canned keyword
+replies. A BM25 index over ``Content``, ``AnimalProfile``, ``MythFact`` and
+``NationalPark`` text is built in a background thread and held in memory as
+flat NumPy posting arrays; a query scores every matching document with a few
+vectorised adds per query term. The index is rebuilt periodically so new
+content shows up without a restart.
+"""
+
+import asyncio
+import html
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.db.database import get_jobs_db_session
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_SECONDS = 3600
+BM25_K1 = 1.5
+BM25_B = 0.75
+TITLE_BOOST = 3  # Title tokens are counted this many times
+MAX_ANSWER_SENTENCES = 2
+MAX_ANSWER_CHARS = 600
+RELATED_SOURCES = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers him his how i if in into is it its itself just me more most my no nor not now of off on once
+only or other our out over own same she should so some such than that the their them then there these they
+this those through to too under until up very was we were what when where which while who whom why will with
+would you your tell know please
+""".split())
+
+GREETING_WORDS = frozenset({"hello", "hi", "hey", "namaste", "greetings"})
+HELP_WORDS = frozenset({"help"})
+
+GREETING_RESPONSE = (
+    "Hello! Welcome to Junglore's wildlife chatbot! 🌿 I'm here to help you learn about wildlife, "
+    "conservation, and our amazing natural world. You can ask me about different animals, national parks, "
+    "conservation efforts, or common wildlife myths. What would you like to explore today?"
+)
+HELP_RESPONSE = (
+    "I can help you with information about: 🦁 Wildlife and animals, 🌱 Conservation efforts, "
+    "🏞️ National parks, 🔍 Wildlife myths and facts, 📚 Our articles and stories. "
+    "Just ask me about any animal or conservation topic you're curious about!"
+)
+FALLBACK_RESPONSE = (
+    "That's an interesting question about wildlife! I couldn't find anything in our library about it yet. "
+    "Try asking about a specific animal, national park or conservation topic, or explore our educational content."
+)
+
+
+def strip_html(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with plural 's' folded"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass
+class Document:
+    """One retrievable item"""
+    item_type: str
+    item_id: str
+    title: str
+    body: str
+    slug: Optional[str] = None
+
+    def source(self) -> dict:
+        return {"type": self.item_type, "id": self.item_id, "title": self.title, "slug": self.slug}
+
+
+@dataclass
+class ChatAnswer:
+    text: str
+    sources: List[dict] = field(default_factory=list)
+
+
+class BM25Index:
+    """Inverted BM25 index stored as flat posting arrays"""
+
+    def __init__(self, documents: Sequence[Document]):
+        self.documents = list(documents)
+        vocabulary: Dict[str, int] = {}
+        postings: List[Dict[int, int]] = []
+        lengths = np.zeros(len(self.documents), dtype=np.float32)
+
+        for doc_index, document in enumerate(self.documents):
+            tokens = tokenize(document.title) * TITLE_BOOST + tokenize(document.body)
+            lengths[doc_index] = len(tokens)
+            for token in tokens:
+                term = vocabulary.setdefault(token, len(vocabulary))
+                if term == len(postings):
+                    postings.append({})
+                postings[term][doc_index] = postings[term].get(doc_index, 0) + 1
+
+        self.vocabulary = vocabulary
+        self.offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(p) for p in postings])
+        self.doc_ids = np.fromiter(
+            (doc for p in postings for doc in p), dtype=np.int64, count=int(self.offsets[-1])
+        )
+        self.term_freqs = np.fromiter(
+            (tf for p in postings for tf in p.values()), dtype=np.float32, count=int(self.offsets[-1])
+        )
+
+        count = len(self.documents)
+        doc_freqs = np.diff(self.offsets).astype(np.float32)
+        self.idf = np.log1p((count - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        average = lengths.mean() if count else 1.0
+        # Per-document part of the BM25 denominator, precomputed once
+        self.length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(average, 1.0))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Document, float]]:
+        terms = {self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary}
+        if not terms or not self.documents:
+            return []
+
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in terms:
+            start, end = self.offsets[term], self.offsets[term + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            scores[docs] += self.idf[term] * tf * (BM25_K1 + 1) / (tf + self.length_norm[docs])
+
+        limit = min(limit, len(self.documents))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best])]
+        return [(self.documents[i], float(scores[i])) for i in best if scores[i] > 0]
+
+    def term_weight(self, token: str) -> float:
+        term = self.vocabulary.get(token)
+        return float(self.idf[term]) if term is not None else 0.0
+
+
+def best_sentences(index: BM25Index, document: Document, query: str) -> str:
+    """The body sentences that cover the query terms best, in document order"""
+    query_terms = set(tokenize(query))
+    sentences = [s for s in _SENTENCE_RE.split(document.body) if s.strip()]
+    scored = []
+    for position, sentence in enumerate(sentences):
+        overlap = query_terms.intersection(tokenize(sentence))
+        if overlap:
+            scored.append((sum(index.term_weight(t) for t in overlap), position))
+
+    if not scored:
+        picked = sentences[:MAX_ANSWER_SENTENCES]
+    else:
+        top = sorted(scored, reverse=True)[:MAX_ANSWER_SENTENCES]
+        picked = [sentences[position] for _, position in sorted(top, key=lambda item: item[1])]
+
+    text = " ".join(s.strip() for s in picked)
+    if len(text) > MAX_ANSWER_CHARS:
+        text = text[:MAX_ANSWER_CHARS].rsplit(" ", 1)[0] + "…"
+    return text
+
+
+def compose_answer(index: Optional[BM25Index], message: str) -> ChatAnswer:
+    """Answer a user message from the index, or with a greeting/help/fallback reply"""
+    words = set(_TOKEN_RE.findall(message.lower()))
+    if words & GREETING_WORDS and words <= GREETING_WORDS | STOPWORDS:
+        return ChatAnswer(GREETING_RESPONSE)
+    if not set(tokenize(message)) - HELP_WORDS or "what can you do" in message.lower():
+        return ChatAnswer(HELP_RESPONSE)
+
+    results = index.search(message, limit=RELATED_SOURCES + 1) if index is not None else []
+    if not results:
+        return ChatAnswer(FALLBACK_RESPONSE)
+
+    top, _ = results[0]
+    parts = [best_sentences(index, top, message) or top.title, f"You can read more in “{top.title}”."]
+    related = [document.title for document, _ in results[1:]]
+    if related:
+        parts.append("Related: " + ", ".join(related) + ".")
+    return ChatAnswer("\n\n".join(parts), [document.source() for document, _ in results])
+
+
+async def load_documents(db) -> List[Document]:
+    """Published, active items from every source the chatbot answers from"""
+    from app.models.animal_profile import AnimalProfile
+    from app.models.content import Content, ContentStatusEnum
+    from app.models.myth_fact import MythFact
+    from app.models.national_park import NationalPark
+
+    documents: List[Document] = []
+
+    rows = (await db.execute(
+        select(Content.id, Content.title, Content.excerpt, Content.content, Content.slug)
+        .where(Content.status == ContentStatusEnum.PUBLISHED)
+    )).all()
+    documents.extend(
+        Document("content", str(row.id), row.title, strip_html(f"{row.excerpt or ''} {row.content}"), row.slug)
+        for row in rows
+    )
+
+    rows = (await db.execute(
+        select(
+            AnimalProfile.id, AnimalProfile.common_name, AnimalProfile.scientific_name,
+            AnimalProfile.description, AnimalProfile.habitat_description, AnimalProfile.diet_description,
+            AnimalProfile.behavior_description, AnimalProfile.conservation_efforts, AnimalProfile.fun_facts,
+        ).where(AnimalProfile.is_active == True)
+    )).all()
+    for row in rows:
+        body = " ".join(strip_html(part) for part in (
+            row.description, row.habitat_description, row.diet_description,
+            row.behavior_description, row.conservation_efforts,
+        ) if part)
+        facts = " ".join(str(fact) for fact in row.fun_facts or [])
+        documents.append(Document(
+            "animal_profile", str(row.id), f"{row.common_name} ({row.scientific_name})",
+            f"{body} {facts}".strip(),
+        ))
+
+    rows = (await db.execute(select(MythFact.id, MythFact.title, MythFact.myth_content, MythFact.fact_content))).all()
+    documents.extend(
+        Document(
+            "myth_fact", str(row.id), row.title,
+            f"Myth: {strip_html(row.myth_content)} Fact: {strip_html(row.fact_content)}",
+        )
+        for row in rows
+    )
+
+    rows = (await db.execute(
+        select(
+            NationalPark.id, NationalPark.name, NationalPark.slug, NationalPark.state,
+            NationalPark.description, NationalPark.biodiversity, NationalPark.conservation,
+        ).where(NationalPark.is_active == True)
+    )).all()
+    documents.extend(
+        Document(
+            "national_park", str(row.id), row.name,
+            " ".join(strip_html(part) for part in (
+                f"{row.name} is in {row.state}." if row.state else None,
+                row.description, row.biodiversity, row.conservation,
+            ) if part),
+            row.slug,
+        )
+        for row in rows
+    )
+
+    return [document for document in documents if document.body]
+
+
+class ChatbotRetrieval:
+    """Holds the current index and rebuilds it in the background"""
+
+    def __init__(self):
+        self.index: Optional[BM25Index] = None
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+    def answer(self, message: str) -> ChatAnswer:
+        return compose_answer(self.index, message)
+
+    async def refresh(self) -> int:
+        """Rebuild the index from the database and swap it in"""
+        async with get_jobs_db_session() as db:
+            documents = await load_documents(db)
+        # Tokenising the library is CPU-bound; keep it off the event loop
+        self.index = await asyncio.to_thread(BM25Index, documents)
+        return len(self.index)
+
+    async def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._periodic_refresh())
+        logger.info("Chatbot retrieval index started")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _periodic_refresh(self):
+        while self.is_running:
+            try:
+                count = await self.refresh()
+                logger.info(f"Chatbot retrieval index built with {count} documents")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error building chatbot retrieval index: {e}")
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+
+
+# Global instance used by the chatbot endpoints
+chatbot_retrieval = ChatbotRetrieval()
@@ -0,0 +1,166 @@
+"""
+Collection availability for the Myths vs Facts hub
+
+Resolves the repeatability rules (``daily``, ``weekly``, ``unlimited``) for
+every active collection at once: the catalog of active collections with their
+card counts is cached until an admin edits a collection, and the user's plays
+for the current week come from one grouped query over
+``user_collection_progress``. Each collection is returned with whether it can
+be played on the target date and, if not, the date it opens up again.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func, and_
+
+from app.core.cache import cache_manager
+from app.models.myth_fact_collection import MythFactCollection, CollectionMythFact, UserCollectionProgress
+
+CATALOG_CACHE_KEY = "collections:active_catalog"
+CATALOG_CACHE_TTL = 6 * 3600
+
+
+@dataclass(frozen=True)
+class CollectionSummary:
+    """Cached catalog entry for an active collection"""
+    id: UUID
+    name: str
+    description: Optional[str]
+    cards_count: int
+    repeatability: str
+    category_id: Optional[UUID]
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "cards_count": self.cards_count,
+            "repeatability": self.repeatability,
+            "category_id": self.category_id,
+        }
+
+
+@dataclass
+class CollectionAvailability:
+    """Whether a collection can be played on a date, and when it reopens"""
+    collection: CollectionSummary
+    can_play: bool
+    next_available_date: Optional[date] = None
+    last_played_date: Optional[date] = None
+
+    def to_dict(self) -> dict:
+        return {
+            **self.collection.to_dict(),
+            "can_play": self.can_play,
+            "next_available_date": self.next_available_date,
+            "last_played_date": self.last_played_date,
+        }
+
+
+def week_bounds(target_date: date) -> Tuple[date, date]:
+    """Monday and Sunday of the week containing target_date"""
+    week_start = target_date - timedelta(days=target_date.weekday())
+    return week_start, week_start + timedelta(days=6)
+
+
+def resolve_rule(
+    repeatability: str,
+    target_date: date,
+    played_on_date: bool,
+    played_this_week: bool,
+) -> Tuple[bool, Optional[date]]:
+    """(can_play, next_available_date) for one collection under its rule"""
+    if repeatability == "daily" and played_on_date:
+        return False, target_date + timedelta(days=1)
+    if repeatability == "weekly" and played_this_week:
+        return False, week_bounds(target_date)[1] + timedelta(days=1)
+    # Unlimited and unknown rules are always playable
+    return True, None
+
+
+async def active_collections(db) -> List[CollectionSummary]:
+    """Active collections with live card counts, cached until an admin edit"""
+    cached = await cache_manager.get(CATALOG_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    card_counts = (
+        select(CollectionMythFact.collection_id, func.count().label("cards"))
+        .group_by(CollectionMythFact.collection_id)
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(
+            MythFactCollection.id,
+            MythFactCollection.name,
+            MythFactCollection.description,
+            MythFactCollection.repeatability,
+            MythFactCollection.category_id,
+            func.coalesce(card_counts.c.cards, 0).label("cards"),
+        )
+        .outerjoin(card_counts, card_counts.c.collection_id == MythFactCollection.id)
+        .where(MythFactCollection.is_active == True)
+        .order_by(MythFactCollection.created_at.desc())
+    )).all()
+
+    catalog = [
+        CollectionSummary(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            cards_count=row.cards,
+            repeatability=row.repeatability,
+            category_id=row.category_id,
+        )
+        for row in rows
+    ]
+    await cache_manager.set(CATALOG_CACHE_KEY, catalog, ttl=CATALOG_CACHE_TTL)
+    return catalog
+
+
+async def invalidate_collection_catalog():
+    """Drop the cached catalog after collections or their cards change"""
+    await cache_manager.delete(CATALOG_CACHE_KEY)
+
+
+async def resolve_availability(db, user_id: UUID, target_date: date) -> List[CollectionAvailability]:
+    """Availability of every active collection for a user on target_date"""
+    catalog = await active_collections(db)
+    if not catalog:
+        return []
+
+    week_start, week_end = week_bounds(target_date)
+    rows = (await db.execute(
+        select(
+            UserCollectionProgress.collection_id,
+            func.bool_or(UserCollectionProgress.play_date == target_date).label("played_on_date"),
+            func.max(UserCollectionProgress.play_date).label("last_played"),
+        )
+        .where(and_(
+            UserCollectionProgress.user_id == user_id,
+            UserCollectionProgress.play_date >= week_start,
+            UserCollectionProgress.play_date <= week_end,
+        ))
+        .group_by(UserCollectionProgress.collection_id)
+    )).all()
+    plays: Dict[UUID, Tuple[bool, date]] = {
+        row.collection_id: (bool(row.played_on_date), row.last_played) for row in rows
+    }
+
+    availability = []
+    for collection in catalog:
+        played_on_date, last_played = plays.get(collection.id, (False, None))
+        can_play, next_date = resolve_rule(
+            collection.repeatability, target_date, played_on_date, last_played is not None
+        )
+        availability.append(CollectionAvailability(
+            collection=collection,
+            can_play=can_play,
+            next_available_date=next_date,
+            last_played_date=last_played,
+        ))
+    return availability
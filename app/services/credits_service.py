@@ -4,17 +4,18 @@ Enhanced with leaderboard integration
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from typing import Optional, Tuple
-from sqlalchemy import select, func, and_, text
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from app.models.user import User
 from app.models.quiz_extended import Quiz, UserQuizResult
-from app.models.site_setting import SiteSetting
 from app.models.user_quiz_best_score import UserQuizBestScore
 from app.models.weekly_leaderboard_cache import WeeklyLeaderboardCache
+from app.services.daily_activity_counters import daily_activity_counters
+from app.services.settings_service import SettingsService
 
 logger = structlog.get_logger()
 
@@ -26,42 +27,19 @@ class CreditsService:
         self.db = db
     
     async def get_setting_value(self, key: str, default_value: int) -> int:
-        """Get a setting value from the database"""
+        """Get a setting value from the shared settings snapshot"""
         try:
-            result = await self.db.execute(
-                select(SiteSetting).where(SiteSetting.key == key)
-            )
-            setting = result.scalar_one_or_none()
-            
-            if setting and setting.parsed_value is not None:
-                return int(setting.parsed_value)
-            else:
-                return default_value
+            return await SettingsService(self.db).get_int(key, default_value)
                 
         except Exception as e:
             logger.error(f"Error getting setting {key}: {e}")
             return default_value
     
     async def get_daily_credits_earned_today(self, user_id: str) -> int:
-        """Get total credits earned by user today"""
+        """Get total credits earned by user today from quizzes"""
         try:
-            today = datetime.now(timezone.utc).date()
-            tomorrow = today + timedelta(days=1)
-            
-            result = await self.db.execute(
-                select(func.coalesce(func.sum(UserQuizResult.credits_earned), 0))
-                .where(
-                    and_(
-                        UserQuizResult.user_id == user_id,
-                        UserQuizResult.completed_at >= today,
-                        UserQuizResult.completed_at < tomorrow,
-                        UserQuizResult.credits_earned.isnot(None)
-                    )
-                )
-            )
-            
-            total_today = result.scalar() or 0
-            return int(total_today)
+            counters = await daily_activity_counters.get(self.db, user_id)
+            return counters["quiz_credits_earned"]
             
         except Exception as e:
             logger.error(f"Error getting daily credits for user {user_id}: {e}")
@@ -176,13 +154,15 @@ class CreditsService:
             # Calculate credits
             calculated_credits, breakdown = await self.calculate_quiz_credits(quiz, mock_result)
             
-            # Check daily cap
-            can_award, actual_credits, cap_message = await self.check_daily_credit_cap(
-                user_id, calculated_credits
+            # Reserve credits against the daily cap (partial awards allowed)
+            daily_cap = await self.get_setting_value('daily_credit_cap_quizzes', 60)
+            actual_credits, credits_today = await daily_activity_counters.consume(
+                self.db, user_id, "quiz_credits_earned", calculated_credits,
+                daily_cap, partial=True
             )
             
-            if not can_award:
-                logger.info(f"Credits capped for user {user_id}: {cap_message}")
+            if actual_credits == 0:
+                logger.info(f"Credits capped for user {user_id}: daily credit cap of {daily_cap} already reached")
                 return 0
             
             # Update leaderboard data
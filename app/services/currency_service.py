@@ -18,8 +18,9 @@ from app.models.rewards import (
     UserDailyActivity
 )
 from app.models.user import User
-from app.models.site_setting import SiteSetting
 from app.db.database import get_db_session
+from app.services.daily_activity_counters import daily_activity_counters
+from app.services.settings_service import SettingsService
 from app.core.rewards_config import DAILY_LIMITS
 
 logger = structlog.get_logger()
@@ -74,15 +75,17 @@ class CurrencyService:
             if not user:
                 raise ValueError(f"User {user_id} not found")
             
-            # Check daily limits
-            daily_activity = await self._get_or_create_daily_activity(db, user_id)
-            if not await self._check_daily_limits(daily_activity, currency_type, amount, activity_type, db):
+            # Check daily limits with a single atomic increment-and-compare
+            counter_field = "points_earned_today" if currency_type == CurrencyTypeEnum.POINTS else "credits_earned_today"
+            daily_limit = await self._get_daily_limit(db, currency_type, activity_type)
+            granted, current_earned = await daily_activity_counters.consume(
+                db, user_id, counter_field, amount, daily_limit
+            )
+            if not granted:
                 # Provide specific error message for MVF limits
                 if activity_type == ActivityTypeEnum.MYTHS_FACTS_GAME:
-                    mvf_limits = await self._get_mvf_daily_limits(db)
                     limit_type = "points" if currency_type == CurrencyTypeEnum.POINTS else "credits"
-                    current_earned = daily_activity.points_earned_today if currency_type == CurrencyTypeEnum.POINTS else daily_activity.credits_earned_today
-                    raise ValueError(f"Daily Myths vs Facts {limit_type} limit exceeded. Current: {current_earned}, Limit: {mvf_limits[limit_type]}, Attempting to add: {amount}")
+                    raise ValueError(f"Daily Myths vs Facts {limit_type} limit exceeded. Current: {current_earned}, Limit: {daily_limit}, Attempting to add: {amount}")
                 else:
                     raise ValueError("Daily currency limit exceeded")
             
@@ -91,13 +94,11 @@ class CurrencyService:
                 new_balance = user.points_balance + amount
                 user.points_balance = new_balance
                 user.total_points_earned += amount
-                daily_activity.points_earned_today += amount
                 transaction_type = TransactionTypeEnum.POINTS_EARNED
             else:  # CREDITS
                 new_balance = user.credits_balance + amount
                 user.credits_balance = new_balance  
                 user.total_credits_earned += amount
-                daily_activity.credits_earned_today += amount
                 transaction_type = TransactionTypeEnum.CREDITS_EARNED
             
             # Create transaction record
@@ -129,6 +130,7 @@ class CurrencyService:
             return transaction
             
         except Exception as e:
+            # Rolling back also releases the allowance consumed above
             await db.rollback()
             self.logger.error("Error adding currency", user_id=str(user_id), error=str(e))
             raise
@@ -229,19 +231,20 @@ class CurrencyService:
         
         try:
             daily_activity = await self._get_or_create_daily_activity(db, user_id)
+            counters = await daily_activity_counters.get(db, user_id)
             
             return {
-                "points_earned_today": daily_activity.points_earned_today,
-                "credits_earned_today": daily_activity.credits_earned_today,
-                "quiz_attempts": daily_activity.quiz_attempts,
-                "quiz_completions": daily_activity.quiz_completions,
-                "myths_facts_games": daily_activity.myths_facts_games,
+                "points_earned_today": counters["points_earned_today"],
+                "credits_earned_today": counters["credits_earned_today"],
+                "quiz_attempts": counters["quiz_attempts"],
+                "quiz_completions": counters["quiz_completions"],
+                "myths_facts_games": counters["myths_facts_games"],
                 "login_streak": daily_activity.login_streak,
                 "daily_limits": {
-                    "max_points_remaining": max(0, DAILY_LIMITS["max_total_points_per_day"] - daily_activity.points_earned_today),
-                    "max_credits_remaining": max(0, DAILY_LIMITS["max_credits_per_day"] - daily_activity.credits_earned_today),
-                    "quiz_attempts_remaining": max(0, DAILY_LIMITS["max_quiz_attempts"] - daily_activity.quiz_attempts),
-                    "myths_games_remaining": max(0, DAILY_LIMITS["max_myths_facts_games"] - daily_activity.myths_facts_games)
+                    "max_points_remaining": max(0, DAILY_LIMITS["max_total_points_per_day"] - counters["points_earned_today"]),
+                    "max_credits_remaining": max(0, DAILY_LIMITS["max_credits_per_day"] - counters["credits_earned_today"]),
+                    "quiz_attempts_remaining": max(0, DAILY_LIMITS["max_quiz_attempts"] - counters["quiz_attempts"]),
+                    "myths_games_remaining": max(0, DAILY_LIMITS["max_myths_facts_games"] - counters["myths_facts_games"])
                 }
             }
             
@@ -313,43 +316,33 @@ class CurrencyService:
             self.logger.error("Error calculating login streak", user_id=str(user_id), error=str(e))
             return 1
     
-    async def _check_daily_limits(
+    async def _get_daily_limit(
         self, 
-        daily_activity: UserDailyActivity, 
+        db: AsyncSession,
         currency_type: CurrencyTypeEnum, 
-        amount: int,
-        activity_type: Optional[ActivityTypeEnum] = None,
-        db: Optional[AsyncSession] = None
-    ) -> bool:
-        """Check if adding currency would exceed daily limits"""
+        activity_type: Optional[ActivityTypeEnum] = None
+    ) -> int:
+        """Get the daily earning limit that applies to this currency and activity"""
         
         # For MVF activities, use MVF-specific limits
-        if activity_type == ActivityTypeEnum.MYTHS_FACTS_GAME and db:
+        if activity_type == ActivityTypeEnum.MYTHS_FACTS_GAME:
             mvf_limits = await self._get_mvf_daily_limits(db)
-            if currency_type == CurrencyTypeEnum.POINTS:
-                return (daily_activity.points_earned_today + amount) <= mvf_limits['points']
-            else:  # CREDITS
-                return (daily_activity.credits_earned_today + amount) <= mvf_limits['credits']
+            return mvf_limits['points'] if currency_type == CurrencyTypeEnum.POINTS else mvf_limits['credits']
         
         # Use general limits for other activities
         if currency_type == CurrencyTypeEnum.POINTS:
-            return (daily_activity.points_earned_today + amount) <= DAILY_LIMITS["max_total_points_per_day"]
-        else:  # CREDITS
-            return (daily_activity.credits_earned_today + amount) <= DAILY_LIMITS["max_credits_per_day"]
+            return DAILY_LIMITS["max_total_points_per_day"]
+        return DAILY_LIMITS["max_credits_per_day"]
     
     async def _get_mvf_daily_limits(self, db: AsyncSession) -> Dict[str, int]:
         """Get MVF-specific daily limits from site settings"""
         try:
-            # Get MVF daily limits from database
-            result = await db.execute(
-                select(SiteSetting.key, SiteSetting.value)
-                .where(SiteSetting.key.in_(['mvf_daily_points_limit', 'mvf_daily_credits_limit']))
-            )
-            settings = dict(result.fetchall())
+            # Get MVF daily limits from the shared settings snapshot
+            settings = SettingsService(db)
             
             return {
-                'points': int(settings.get('mvf_daily_points_limit', '200')),
-                'credits': int(settings.get('mvf_daily_credits_limit', '50'))
+                'points': await settings.get_int('mvf_daily_points_limit', 200),
+                'credits': await settings.get_int('mvf_daily_credits_limit', 50)
             }
         except Exception as e:
             self.logger.warning("Failed to get MVF daily limits from database, using defaults", error=str(e))
@@ -0,0 +1,740 @@
+"""
+Daily Activity Counters for the Knowledge Engine Rewards System
+
+Holds today's per-user activity counters (quiz attempts, MVF games, points and
+credits earned) in Redis so every daily-limit check is a single atomic
+increment-and-compare instead of a read of ``user_daily_activity`` or an
+aggregate over ``user_quiz_results``.
+
+Counters live in one Redis hash per user per day and expire shortly after the
+day rolls over (days follow the UTC date used by the rest of the rewards code).
+A background reconciler persists touched counters to ``user_daily_activity`` so
+admin reports and streak calculations keep working. When Redis is unavailable
+the counters fall back to process memory, mirroring ``CacheManager``.
+
+Allowances are consumed before the work they pay for is committed. Each grant
+is remembered on the session that consumed it and given back if that session's
+transaction ends without committing, so a failed request does not use up the
+user's limits.
+"""
+
+import asyncio
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select, func, and_, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_manager
+from app.db.database import get_jobs_db_session
+from app.models.rewards import UserDailyActivity
+from app.models.quiz_extended import UserQuizResult
+
+logger = structlog.get_logger()
+
+
+# Counters mirrored onto user_daily_activity columns by the reconciler
+PERSISTED_FIELDS = (
+    "quiz_attempts",
+    "quiz_completions",
+    "myths_facts_games",
+    "points_earned_today",
+    "credits_earned_today",
+)
+
+# Quiz-only earnings used by the quiz credit/point caps. These are seeded from
+# user_quiz_results and are never written back (the results are the record).
+QUIZ_EARNING_FIELDS = (
+    "quiz_points_earned",
+    "quiz_credits_earned",
+)
+
+COUNTER_FIELDS = PERSISTED_FIELDS + QUIZ_EARNING_FIELDS
+
+# Counters of distinct members per day (quiz_attempts counts different quizzes,
+# so retaking a quiz does not use up the limit), updated with consume_member
+DISTINCT_FIELDS = ("quiz_attempts",)
+
+# Keep yesterday's hash around long enough for the reconciler to flush it
+EXPIRY_GRACE_SECONDS = 2 * 60 * 60
+RECONCILE_INTERVAL_SECONDS = 60
+RECONCILE_BATCH_SIZE = 500
+
+_SEEDED_FIELD = "_seeded"
+
+# Session.info key holding grants not yet covered by a commit
+_PENDING_GRANTS_KEY = "daily_activity_grants"
+
+# Atomic check-and-increment. Returns nil when the hash has not been seeded yet,
+# otherwise {granted, new_value}. With partial=1 the grant is clipped to the
+# remaining allowance instead of being refused outright.
+_CONSUME_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[6]) == 0 then
+    return nil
+end
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+local amount = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+if limit >= 0 and current + amount > limit then
+    if ARGV[4] == '1' and current < limit then
+        amount = limit - current
+    else
+        return {0, current}
+    end
+end
+local new_value = redis.call('HINCRBY', KEYS[1], ARGV[1], amount)
+redis.call('EXPIREAT', KEYS[1], ARGV[5])
+redis.call('SADD', KEYS[2], ARGV[7])
+redis.call('EXPIREAT', KEYS[2], ARGV[5])
+return {amount, new_value}
+"""
+
+# Counts ``ARGV[2]`` towards a distinct-member counter. Members are stored as
+# "<field>:<member>" in the same hash; a member already counted today is
+# allowed without incrementing. Returns nil when unseeded, otherwise
+# {allowed, added, value}.
+_CONSUME_MEMBER_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[5]) == 0 then
+    return nil
+end
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 1 then
+    return {1, 0, current}
+end
+local limit = tonumber(ARGV[3])
+if limit >= 0 and current + 1 > limit then
+    return {0, 0, current}
+end
+redis.call('HSET', KEYS[1], ARGV[2], 1)
+local new_value = redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+redis.call('EXPIREAT', KEYS[1], ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[6])
+redis.call('EXPIREAT', KEYS[2], ARGV[4])
+return {1, 1, new_value}
+"""
+
+# Gives back a grant. Only touches hashes that are still seeded: a cold hash is
+# re-seeded from Postgres, which never saw the rolled back work.
+_RELEASE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[4]) == 0 then
+    return 0
+end
+if ARGV[3] ~= '' and redis.call('HDEL', KEYS[1], ARGV[3]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], -tonumber(ARGV[2]))
+redis.call('SADD', KEYS[2], ARGV[5])
+return 1
+"""
+
+
+def current_activity_date() -> date:
+    """Activity date used for daily limits (UTC, matching CurrencyService)"""
+    return datetime.now(timezone.utc).date()
+
+
+def _member_field(field: str, member) -> str:
+    return f"{field}:{member}"
+
+
+def _expire_at(activity_date: date) -> int:
+    """Unix timestamp at which a day's counters may be discarded"""
+    next_midnight = datetime.combine(
+        activity_date + timedelta(days=1), dt_time.min, tzinfo=timezone.utc
+    )
+    return int(next_midnight.timestamp()) + EXPIRY_GRACE_SECONDS
+
+
+class DailyActivityCounters:
+    """Atomic per-user/per-day activity counters with periodic DB reconciliation"""
+
+    def __init__(self):
+        self.logger = logger.bind(service="DailyActivityCounters")
+        self._consume_script = None
+        self._consume_member_script = None
+        self._release_script = None
+        self._release_tasks: set = set()
+        # Memory fallback: {(date, user_id): {field: value}} and dirty sets per date
+        self._memory_counters: Dict[Tuple[date, str], Dict[str, int]] = {}
+        self._memory_dirty: Dict[date, set] = {}
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def counter_key(user_id, activity_date: date) -> str:
+        return f"daily_activity:{activity_date.isoformat()}:{user_id}"
+
+    @staticmethod
+    def dirty_key(activity_date: date) -> str:
+        return f"daily_activity:dirty:{activity_date.isoformat()}"
+
+    @property
+    def _redis(self):
+        if cache_manager.use_redis and cache_manager.redis_client:
+            return cache_manager.redis_client
+        return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> Dict[str, int]:
+        """Return today's counters for a user, seeding them on first access"""
+        activity_date = current_activity_date()
+        redis_client = self._redis
+
+        if redis_client is None:
+            counters = await self._memory_counters_for(db, user_id, activity_date)
+            return {field: counters.get(field, 0) for field in COUNTER_FIELDS}
+
+        key = self.counter_key(user_id, activity_date)
+        values = await redis_client.hmget(key, _SEEDED_FIELD, *COUNTER_FIELDS)
+        if values[0] is None:
+            await self._seed_redis(db, user_id, activity_date)
+            values = await redis_client.hmget(key, _SEEDED_FIELD, *COUNTER_FIELDS)
+
+        return {
+            field: int(value or 0)
+            for field, value in zip(COUNTER_FIELDS, values[1:])
+        }
+
+    async def increment(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        field: str,
+        amount: int = 1
+    ) -> int:
+        """Unconditionally add to a counter and return its new value"""
+        _, new_value = await self.consume(db, user_id, field, amount, limit=None)
+        return new_value
+
+    async def release(
+        self,
+        user_id: UUID,
+        field: str,
+        amount: int,
+        member: Optional[str] = None,
+        activity_date: Optional[date] = None
+    ):
+        """Give back an allowance consumed by an operation that was rolled back"""
+        activity_date = activity_date or current_activity_date()
+        redis_client = self._redis
+
+        if redis_client is not None:
+            try:
+                if self._release_script is None:
+                    self._release_script = redis_client.register_script(_RELEASE_SCRIPT)
+                await self._release_script(
+                    keys=[self.counter_key(user_id, activity_date), self.dirty_key(activity_date)],
+                    args=[
+                        field,
+                        amount,
+                        _member_field(field, member) if member is not None else "",
+                        _SEEDED_FIELD,
+                        str(user_id),
+                    ],
+                )
+                return
+            except Exception as e:
+                self.logger.error(
+                    "Redis counter release failed, using memory fallback",
+                    user_id=str(user_id), field=field, error=str(e)
+                )
+
+        counters = self._memory_counters.get((activity_date, str(user_id)))
+        if counters is None:
+            return
+        if member is not None and counters.pop(_member_field(field, member), None) is None:
+            return
+        counters[field] = counters.get(field, 0) - amount
+        self._memory_dirty.setdefault(activity_date, set()).add(str(user_id))
+
+    async def consume(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        field: str,
+        amount: int,
+        limit: Optional[int],
+        partial: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Atomically add ``amount`` to a counter if it stays within ``limit``.
+
+        Returns ``(granted, value)``. ``granted`` is 0 when the limit would be
+        exceeded; with ``partial=True`` it is clipped to the remaining
+        allowance instead. ``value`` is the counter after the operation.
+        The grant is released if ``db`` rolls back instead of committing.
+        """
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown daily activity counter: {field}")
+        if amount < 0:
+            raise ValueError("Amount must not be negative")
+
+        activity_date = current_activity_date()
+        redis_client = self._redis
+
+        if redis_client is None:
+            granted, value = await self._consume_memory(
+                db, user_id, activity_date, field, amount, limit, partial
+            )
+        else:
+            try:
+                result = await self._run_consume(
+                    redis_client, user_id, activity_date, field, amount, limit, partial
+                )
+                if result is None:
+                    await self._seed_redis(db, user_id, activity_date)
+                    result = await self._run_consume(
+                        redis_client, user_id, activity_date, field, amount, limit, partial
+                    )
+                granted, value = int(result[0]), int(result[1])
+            except Exception as e:
+                self.logger.error(
+                    "Redis counter update failed, using memory fallback",
+                    user_id=str(user_id), field=field, error=str(e)
+                )
+                granted, value = await self._consume_memory(
+                    db, user_id, activity_date, field, amount, limit, partial
+                )
+
+        if granted:
+            self._track(db, (activity_date, str(user_id), field, granted, None))
+        return granted, value
+
+    async def consume_member(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        field: str,
+        member,
+        limit: Optional[int]
+    ) -> Tuple[bool, int]:
+        """
+        Count ``member`` (e.g. a quiz id) once per day towards ``field``.
+
+        Returns ``(allowed, value)``: a member already counted today is always
+        allowed, a new one only while the count of distinct members stays
+        within ``limit``. The grant is released if ``db`` rolls back.
+        """
+        if field not in DISTINCT_FIELDS:
+            raise ValueError(f"Not a distinct daily activity counter: {field}")
+
+        member = str(member)
+        activity_date = current_activity_date()
+        redis_client = self._redis
+
+        if redis_client is None:
+            allowed, added, value = await self._consume_member_memory(
+                db, user_id, activity_date, field, member, limit
+            )
+        else:
+            try:
+                result = await self._run_consume_member(
+                    redis_client, user_id, activity_date, field, member, limit
+                )
+                if result is None:
+                    await self._seed_redis(db, user_id, activity_date)
+                    result = await self._run_consume_member(
+                        redis_client, user_id, activity_date, field, member, limit
+                    )
+                allowed, added, value = (int(item) for item in result)
+            except Exception as e:
+                self.logger.error(
+                    "Redis counter update failed, using memory fallback",
+                    user_id=str(user_id), field=field, error=str(e)
+                )
+                allowed, added, value = await self._consume_member_memory(
+                    db, user_id, activity_date, field, member, limit
+                )
+
+        if added:
+            self._track(db, (activity_date, str(user_id), field, 1, member))
+        return bool(allowed), value
+
+    async def reset(self):
+        """Discard all live counters (used by the admin data reset)"""
+        self._memory_counters.clear()
+        self._memory_dirty.clear()
+        await cache_manager.clear_pattern("daily_activity:*")
+
+    # ------------------------------------------------------------------
+    # Redis backend
+    # ------------------------------------------------------------------
+
+    async def _run_consume(
+        self,
+        redis_client,
+        user_id: UUID,
+        activity_date: date,
+        field: str,
+        amount: int,
+        limit: Optional[int],
+        partial: bool
+    ):
+        if self._consume_script is None:
+            self._consume_script = redis_client.register_script(_CONSUME_SCRIPT)
+
+        return await self._consume_script(
+            keys=[self.counter_key(user_id, activity_date), self.dirty_key(activity_date)],
+            args=[
+                field,
+                amount,
+                -1 if limit is None else limit,
+                "1" if partial else "0",
+                _expire_at(activity_date),
+                _SEEDED_FIELD,
+                str(user_id),
+            ],
+        )
+
+    async def _run_consume_member(
+        self,
+        redis_client,
+        user_id: UUID,
+        activity_date: date,
+        field: str,
+        member: str,
+        limit: Optional[int]
+    ):
+        if self._consume_member_script is None:
+            self._consume_member_script = redis_client.register_script(_CONSUME_MEMBER_SCRIPT)
+
+        return await self._consume_member_script(
+            keys=[self.counter_key(user_id, activity_date), self.dirty_key(activity_date)],
+            args=[
+                field,
+                _member_field(field, member),
+                -1 if limit is None else limit,
+                _expire_at(activity_date),
+                _SEEDED_FIELD,
+                str(user_id),
+            ],
+        )
+
+    async def _seed_redis(self, db: AsyncSession, user_id: UUID, activity_date: date):
+        """Load today's values from Postgres into a cold Redis hash"""
+        seed = await self._load_seed(db, user_id, activity_date)
+        key = self.counter_key(user_id, activity_date)
+
+        # HSETNX keeps any value another worker wrote while we were loading
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for field, value in seed.items():
+                pipe.hsetnx(key, field, value)
+            pipe.hsetnx(key, _SEEDED_FIELD, 1)
+            pipe.expireat(key, _expire_at(activity_date))
+            await pipe.execute()
+
+    # ------------------------------------------------------------------
+    # Memory backend
+    # ------------------------------------------------------------------
+
+    async def _memory_counters_for(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        activity_date: date
+    ) -> Dict[str, int]:
+        key = (activity_date, str(user_id))
+        counters = self._memory_counters.get(key)
+        if counters is None:
+            seed = await self._load_seed(db, user_id, activity_date)
+            # Another coroutine may have seeded while we awaited the DB
+            counters = self._memory_counters.setdefault(key, seed)
+            self._purge_stale_memory(activity_date)
+        return counters
+
+    async def _consume_memory(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        activity_date: date,
+        field: str,
+        amount: int,
+        limit: Optional[int],
+        partial: bool
+    ) -> Tuple[int, int]:
+        counters = await self._memory_counters_for(db, user_id, activity_date)
+
+        # No awaits below this point, so the check-and-add is atomic per process
+        current = counters.get(field, 0)
+        if limit is not None and current + amount > limit:
+            if partial and current < limit:
+                amount = limit - current
+            else:
+                return 0, current
+
+        counters[field] = current + amount
+        self._memory_dirty.setdefault(activity_date, set()).add(str(user_id))
+        return amount, counters[field]
+
+    async def _consume_member_memory(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        activity_date: date,
+        field: str,
+        member: str,
+        limit: Optional[int]
+    ) -> Tuple[int, int, int]:
+        counters = await self._memory_counters_for(db, user_id, activity_date)
+
+        current = counters.get(field, 0)
+        member_field = _member_field(field, member)
+        if member_field in counters:
+            return 1, 0, current
+        if limit is not None and current + 1 > limit:
+            return 0, 0, current
+
+        counters[member_field] = 1
+        counters[field] = current + 1
+        self._memory_dirty.setdefault(activity_date, set()).add(str(user_id))
+        return 1, 1, counters[field]
+
+    def _purge_stale_memory(self, activity_date: date):
+        """Drop counters from days that have already been reconciled away"""
+        cutoff = activity_date - timedelta(days=1)
+        stale = [key for key in self._memory_counters if key[0] < cutoff]
+        for key in stale:
+            del self._memory_counters[key]
+
+    # ------------------------------------------------------------------
+    # Seeding
+    # ------------------------------------------------------------------
+
+    async def _load_seed(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        activity_date: date
+    ) -> Dict[str, int]:
+        """Read the durable state for a user/day once, when counters are cold"""
+        # Creating the row here (with its login streak) keeps the one-off
+        # streak calculation off the per-reward path.
+        from app.services.currency_service import currency_service
+        daily_activity = await currency_service._get_or_create_daily_activity(db, user_id)
+
+        next_day = activity_date + timedelta(days=1)
+        quiz_totals = await db.execute(
+            select(
+                func.coalesce(func.sum(UserQuizResult.points_earned), 0),
+                func.coalesce(func.sum(UserQuizResult.credits_earned), 0),
+            ).where(and_(
+                UserQuizResult.user_id == user_id,
+                UserQuizResult.completed_at >= activity_date,
+                UserQuizResult.completed_at < next_day
+            ))
+        )
+        quiz_points, quiz_credits = quiz_totals.one()
+
+        quizzes_today = await db.execute(
+            select(UserQuizResult.quiz_id).distinct().where(and_(
+                UserQuizResult.user_id == user_id,
+                UserQuizResult.completed_at >= activity_date,
+                UserQuizResult.completed_at < next_day
+            ))
+        )
+        quiz_ids = [str(quiz_id) for quiz_id in quizzes_today.scalars()]
+
+        seed = {field: int(getattr(daily_activity, field) or 0) for field in PERSISTED_FIELDS}
+        seed["quiz_points_earned"] = int(quiz_points or 0)
+        seed["quiz_credits_earned"] = int(quiz_credits or 0)
+        seed["quiz_attempts"] = len(quiz_ids)
+        seed.update({_member_field("quiz_attempts", quiz_id): 1 for quiz_id in quiz_ids})
+        return seed
+
+    # ------------------------------------------------------------------
+    # Grants pending on a session
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _track(db, grant: Tuple):
+        if db is not None:
+            db.info.setdefault(_PENDING_GRANTS_KEY, []).append(grant)
+
+    def _release_grants(self, grants: List[Tuple]):
+        """Schedule the release of grants whose transaction did not commit"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.logger.warning("No event loop to release daily activity grants", grants=len(grants))
+            return
+        task = loop.create_task(self._release_all(grants))
+        self._release_tasks.add(task)
+        task.add_done_callback(self._release_tasks.discard)
+
+    async def _release_all(self, grants: List[Tuple]):
+        for activity_date, user_id, field, amount, member in grants:
+            try:
+                await self.release(user_id, field, amount, member=member, activity_date=activity_date)
+            except Exception as e:
+                self.logger.error(
+                    "Error releasing daily activity grant",
+                    user_id=user_id, field=field, error=str(e)
+                )
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start the periodic reconciler"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._periodic_reconcile())
+        self.logger.info("Daily activity reconciler started")
+
+    async def stop(self):
+        """Stop the reconciler after a final flush"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        try:
+            await self.reconcile()
+        except Exception as e:
+            self.logger.error("Final daily activity reconcile failed", error=str(e))
+        self.logger.info("Daily activity reconciler stopped")
+
+    async def _periodic_reconcile(self):
+        while self.is_running:
+            try:
+                await asyncio.sleep(RECONCILE_INTERVAL_SECONDS)
+                await self.reconcile()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error("Error reconciling daily activity", error=str(e))
+
+    async def reconcile(self) -> int:
+        """Persist touched counters to user_daily_activity; returns rows written"""
+        today = current_activity_date()
+        written = 0
+        for activity_date in (today - timedelta(days=1), today):
+            written += await self._reconcile_date(activity_date)
+        return written
+
+    async def _reconcile_date(self, activity_date: date) -> int:
+        written = 0
+        while True:
+            user_ids = await self._pop_dirty(activity_date)
+            if not user_ids:
+                return written
+
+            rows = await self._snapshot(activity_date, user_ids)
+            if not rows:
+                continue
+
+            try:
+                await self._upsert(activity_date, rows)
+                written += len(rows)
+            except Exception:
+                # Put the users back so the next cycle retries them
+                await self._mark_dirty(activity_date, [row["user_id"] for row in rows])
+                raise
+
+    async def _pop_dirty(self, activity_date: date) -> List[str]:
+        redis_client = self._redis
+        if redis_client is None:
+            dirty = self._memory_dirty.get(activity_date)
+            if not dirty:
+                return []
+            batch = [dirty.pop() for _ in range(min(len(dirty), RECONCILE_BATCH_SIZE))]
+            return batch
+
+        members = await redis_client.spop(self.dirty_key(activity_date), RECONCILE_BATCH_SIZE)
+        return [m.decode() if isinstance(m, bytes) else m for m in members or []]
+
+    async def _mark_dirty(self, activity_date: date, user_ids: List[str]):
+        redis_client = self._redis
+        if redis_client is None:
+            self._memory_dirty.setdefault(activity_date, set()).update(user_ids)
+            return
+        key = self.dirty_key(activity_date)
+        await redis_client.sadd(key, *user_ids)
+        await redis_client.expireat(key, _expire_at(activity_date))
+
+    async def _snapshot(self, activity_date: date, user_ids: List[str]) -> List[Dict]:
+        redis_client = self._redis
+        rows = []
+
+        if redis_client is None:
+            for user_id in user_ids:
+                counters = self._memory_counters.get((activity_date, user_id))
+                if counters:
+                    rows.append(self._row(user_id, counters))
+            return rows
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hmget(self.counter_key(user_id, activity_date), *PERSISTED_FIELDS)
+            results = await pipe.execute()
+
+        for user_id, values in zip(user_ids, results):
+            if any(value is not None for value in values):
+                rows.append(self._row(user_id, dict(zip(PERSISTED_FIELDS, values))))
+        return rows
+
+    @staticmethod
+    def _row(user_id: str, counters: Dict) -> Dict:
+        row = {"user_id": UUID(str(user_id))}
+        for field in PERSISTED_FIELDS:
+            row[field] = int(counters.get(field) or 0)
+        return row
+
+    async def _upsert(self, activity_date: date, rows: List[Dict]):
+        now = datetime.now(timezone.utc)
+        values = [dict(row, activity_date=activity_date) for row in rows]
+
+        stmt = pg_insert(UserDailyActivity).values(values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_user_daily_activity",
+            set_={
+                **{field: getattr(stmt.excluded, field) for field in PERSISTED_FIELDS},
+                "last_activity_time": now,
+                "updated_at": now,
+            },
+        )
+
+        async with get_jobs_db_session() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+        self.logger.info(
+            "Daily activity counters reconciled",
+            activity_date=activity_date.isoformat(),
+            rows=len(rows)
+        )
+
+
+# Global counters instance
+daily_activity_counters = DailyActivityCounters()
+
+
+@event.listens_for(Session, "after_commit")
+def _settle_grants(session):
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_GRANTS_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_uncommitted_grants(session, transaction):
+    # Reached with grants still pending only on rollback or close without commit
+    if transaction.parent is None:
+        grants = session.info.pop(_PENDING_GRANTS_KEY, None)
+        if grants:
+            daily_activity_counters._release_grants(grants)
@@ -0,0 +1,274 @@
+"""
+Outbound email delivery
+
+Request handlers never talk to the email provider. They write the message to
+the ``email_outbox`` table (in the same transaction as the OTP or token it
+carries) and return; a background dispatcher claims due rows, sends them
+through the provider's batch API off the event loop, and records the outcome.
+Retryable failures are rescheduled with exponential backoff, and rows left in
+``sending`` by a worker that died are picked up again once their claim lapses.
+
+The transport is chosen by ``EMAIL_TRANSPORT``: ``postmark`` for production and
+``fake`` to record messages in memory for tests and local development.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, or_, and_
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.models.email_outbox import EmailOutbox
+
+logger = get_logger(__name__)
+
+# How long a claimed batch may stay in "sending" before another worker retries it
+SENDING_TIMEOUT = timedelta(minutes=5)
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+IDLE_POLL_SECONDS = 30
+
+# Postmark error codes that will not succeed on a retry
+# (300: invalid email request, 406: inactive recipient)
+PERMANENT_ERROR_CODES = {300, 406}
+
+
+@dataclass
+class EmailMessage:
+    """A single outbound email"""
+    to: str
+    subject: str
+    html: Optional[str] = None
+    text: Optional[str] = None
+    tag: Optional[str] = None
+
+
+@dataclass
+class DeliveryResult:
+    """Provider outcome for one message of a batch"""
+    ok: bool
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = True
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next try after the given number of failed attempts"""
+    seconds = RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, RETRY_MAX_SECONDS))
+
+
+def parse_postmark_batch(responses: Sequence[Dict[str, Any]]) -> List[DeliveryResult]:
+    """Per-message results from a Postmark batch response"""
+    results = []
+    for response in responses:
+        code = int(response.get("ErrorCode", 0) or 0)
+        if code == 0:
+            results.append(DeliveryResult(ok=True, message_id=response.get("MessageID")))
+        else:
+            results.append(DeliveryResult(
+                ok=False,
+                error=f"{code}: {response.get('Message', '')}",
+                retryable=code not in PERMANENT_ERROR_CODES,
+            ))
+    return results
+
+
+class PostmarkTransport:
+    """Sends batches through Postmark's batch endpoint"""
+
+    # Postmark accepts at most 500 messages per batch call
+    max_batch_size = 500
+
+    def __init__(self, server_token: str, sender: str):
+        from postmarker.core import PostmarkClient
+
+        self.client = PostmarkClient(server_token=server_token)
+        self.sender = sender
+
+    def _payload(self, message: EmailMessage) -> Dict[str, Any]:
+        payload = {"From": self.sender, "To": message.to, "Subject": message.subject}
+        if message.html:
+            payload["HtmlBody"] = message.html
+        if message.text:
+            payload["TextBody"] = message.text
+        if message.tag:
+            payload["Tag"] = message.tag
+        return payload
+
+    async def send_batch(self, messages: Sequence[EmailMessage]) -> List[DeliveryResult]:
+        payloads = [self._payload(message) for message in messages]
+        # postmarker is synchronous; keep the HTTP round trip off the event loop
+        responses = await asyncio.to_thread(self.client.emails.send_batch, *payloads)
+        return parse_postmark_batch(responses)
+
+
+class FakeTransport:
+    """Records messages instead of sending them"""
+
+    max_batch_size = 500
+
+    def __init__(self):
+        self.sent: List[EmailMessage] = []
+
+    async def send_batch(self, messages: Sequence[EmailMessage]) -> List[DeliveryResult]:
+        self.sent.extend(messages)
+        return [
+            DeliveryResult(ok=True, message_id=f"fake-{len(self.sent) - len(messages) + i}")
+            for i in range(len(messages))
+        ]
+
+
+def build_transport():
+    """Transport selected by settings, or None when email is not configured"""
+    if settings.EMAIL_TRANSPORT == "fake":
+        return FakeTransport()
+    if not settings.POSTMARK_SERVER_TOKEN:
+        return None
+    return PostmarkTransport(settings.POSTMARK_SERVER_TOKEN, settings.SENDER_EMAIL)
+
+
+class EmailDispatcher:
+    """Drains the email outbox in batches"""
+
+    def __init__(self, transport=None):
+        self.transport = transport if transport is not None else build_transport()
+        self.batch_size = min(settings.EMAIL_BATCH_SIZE, getattr(self.transport, "max_batch_size", 500))
+        self.max_attempts = settings.EMAIL_MAX_ATTEMPTS
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def configured(self) -> bool:
+        return self.transport is not None
+
+    async def enqueue(self, db, message: EmailMessage) -> bool:
+        """
+        Queue a message and commit the session
+
+        Anything else pending on the session commits with it, so callers can
+        store an OTP and queue the email carrying it atomically. Returns False
+        when no transport is configured and nothing was queued.
+        """
+        if not self.configured:
+            logger.error("Email transport not configured")
+            return False
+
+        db.add(EmailOutbox(
+            to_address=message.to,
+            subject=message.subject,
+            html_body=message.html,
+            text_body=message.text,
+            tag=message.tag,
+        ))
+        await db.commit()
+        self._wake.set()
+        return True
+
+    async def start(self):
+        """Start draining the outbox"""
+        if self.is_running or not self.configured:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("Email dispatcher started")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._wake.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Email dispatcher stopped")
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                sent = await self.drain_once()
+                if sent >= self.batch_size:
+                    # A full batch means more is probably waiting
+                    continue
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Email dispatcher error: {e}")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_once(self) -> int:
+        """Claim, send and record one batch; returns how many rows were claimed"""
+        from app.db.database import get_jobs_db_session
+
+        async with get_jobs_db_session() as db:
+            rows = await self._claim(db)
+            if not rows:
+                return 0
+
+            messages = [
+                EmailMessage(to=row.to_address, subject=row.subject, html=row.html_body,
+                             text=row.text_body, tag=row.tag)
+                for row in rows
+            ]
+            try:
+                results = await self.transport.send_batch(messages)
+            except Exception as e:
+                logger.warning(f"Email batch of {len(rows)} failed: {e}")
+                results = [DeliveryResult(ok=False, error=str(e))] * len(rows)
+
+            self._record(rows, results)
+            await db.commit()
+            return len(rows)
+
+    async def _claim(self, db) -> List[EmailOutbox]:
+        now = datetime.now(timezone.utc)
+        rows = (await db.execute(
+            select(EmailOutbox)
+            .where(and_(
+                or_(EmailOutbox.status == "pending", EmailOutbox.status == "sending"),
+                EmailOutbox.next_attempt_at <= now,
+            ))
+            .order_by(EmailOutbox.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )).scalars().all()
+
+        for row in rows:
+            row.status = "sending"
+            row.attempts += 1
+            row.next_attempt_at = now + SENDING_TIMEOUT
+        if rows:
+            # Release the row locks before the provider call; the claim holds them
+            await db.commit()
+        return list(rows)
+
+    def _record(self, rows: Sequence[EmailOutbox], results: Sequence[DeliveryResult]):
+        now = datetime.now(timezone.utc)
+        for row, result in zip(rows, results):
+            if result.ok:
+                row.status = "sent"
+                row.sent_at = now
+                row.provider_message_id = result.message_id
+                row.last_error = None
+            elif not result.retryable or row.attempts >= self.max_attempts:
+                row.status = "failed"
+                row.last_error = result.error
+                logger.error(f"Email to {row.to_address} failed permanently: {result.error}")
+            else:
+                row.status = "pending"
+                row.last_error = result.error
+                row.next_attempt_at = now + retry_delay(row.attempts)
+
+
+# Global instance used by EmailService and started in the app lifespan
+email_dispatcher = EmailDispatcher()
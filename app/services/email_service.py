@@ -6,14 +6,13 @@ import random
 import string
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from postmarker.core import PostmarkClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 
-from app.core.config import settings
 from app.models.user import User
 from app.models.temp_user import TempUserRegistration
 from app.core.logging_config import get_logger
+from app.services.email_delivery import EmailMessage, email_dispatcher
 
 logger = get_logger(__name__)
 
@@ -22,12 +21,10 @@ class EmailService:
     """Service for handling email operations"""
     
     def __init__(self):
-        """Initialize email service with Postmark client"""
-        if not settings.POSTMARK_SERVER_TOKEN:
+        """Initialize email service on top of the outbox dispatcher"""
+        self.dispatcher = email_dispatcher
+        if not self.dispatcher.configured:
             logger.warning("POSTMARK_SERVER_TOKEN not configured - email functionality disabled")
-            self.client = None
-        else:
-            self.client = PostmarkClient(server_token=settings.POSTMARK_SERVER_TOKEN)
     
     def generate_otp(self, length: int = 6) -> str:
         """Generate a random OTP"""
@@ -45,24 +42,24 @@ class EmailService:
         temp_user: TempUserRegistration
     ) -> bool:
         """Send email verification OTP for temporary user registration"""
-        if not self.client:
+        if not self.dispatcher.configured:
             logger.error("Email client not configured")
             return False
         
         try:
-            # Send email
-            response = self.client.emails.send(
-                From=settings.SENDER_EMAIL,
-                To=temp_user.email,
-                Subject="Verify Your Junglore Account",
-                HtmlBody=self._get_verification_email_template(
+            # Queue email
+            await self.dispatcher.enqueue(db, EmailMessage(
+                to=temp_user.email,
+                subject="Verify Your Junglore Account",
+                html=self._get_verification_email_template(
                     temp_user.full_name or temp_user.username, 
                     temp_user.email_verification_token
                 ),
-                TextBody=f"Hello {temp_user.full_name or temp_user.username},\n\nYour verification code is: {temp_user.email_verification_token}\n\nThis code will expire in 15 minutes.\n\nBest regards,\nJunglore Team"
-            )
+                text=f"Hello {temp_user.full_name or temp_user.username},\n\nYour verification code is: {temp_user.email_verification_token}\n\nThis code will expire in 15 minutes.\n\nBest regards,\nJunglore Team",
+                tag="verification",
+            ))
             
-            logger.info(f"Verification email sent to {temp_user.email}")
+            logger.info(f"Verification email queued for {temp_user.email}")
             return True
             
         except Exception as e:
@@ -190,7 +187,7 @@ class EmailService:
         user_name: str
     ) -> bool:
         """Send password reset OTP"""
-        if not self.client:
+        if not self.dispatcher.configured:
             logger.error("Email client not configured")
             return False
         
@@ -209,20 +206,17 @@ class EmailService:
                 password_reset_expires=expires_at
             )
             await db.execute(stmt)
-            await db.commit()
-            
-            logger.info(f"Password reset token stored for {user_email}")
             
-            # Send email
-            response = self.client.emails.send(
-                From=settings.SENDER_EMAIL,
-                To=user_email,
-                Subject="Reset Your Junglore Password",
-                HtmlBody=self._get_password_reset_email_template(user_name, otp),
-                TextBody=f"Hello {user_name},\n\nYour password reset code is: {otp}\n\nThis code will expire in 15 minutes.\n\nIf you didn't request this, please ignore this email.\n\nBest regards,\nJunglore Team"
-            )
+            # Queue email; commits together with the reset token
+            await self.dispatcher.enqueue(db, EmailMessage(
+                to=user_email,
+                subject="Reset Your Junglore Password",
+                html=self._get_password_reset_email_template(user_name, otp),
+                text=f"Hello {user_name},\n\nYour password reset code is: {otp}\n\nThis code will expire in 15 minutes.\n\nIf you didn't request this, please ignore this email.\n\nBest regards,\nJunglore Team",
+                tag="password-reset",
+            ))
             
-            logger.info(f"Password reset email sent to {user_email}")
+            logger.info(f"Password reset token stored and email queued for {user_email}")
             return True
             
         except Exception as e:
@@ -236,7 +230,7 @@ class EmailService:
         user_name: str
     ) -> bool:
         """Send email verification OTP for existing users"""
-        if not self.client:
+        if not self.dispatcher.configured:
             logger.error("Email client not configured")
             return False
         
@@ -251,18 +245,17 @@ class EmailService:
                 email_verification_expires=expires_at
             )
             await db.execute(stmt)
-            await db.commit()
             
-            # Send email
-            response = self.client.emails.send(
-                From=settings.SENDER_EMAIL,
-                To=user_email,
-                Subject="Verify Your Junglore Account",
-                HtmlBody=self._get_verification_email_template(user_name, otp),
-                TextBody=f"Hello {user_name},\n\nYour verification code is: {otp}\n\nThis code will expire in 15 minutes.\n\nBest regards,\nJunglore Team"
-            )
+            # Queue email; commits together with the verification token
+            await self.dispatcher.enqueue(db, EmailMessage(
+                to=user_email,
+                subject="Verify Your Junglore Account",
+                html=self._get_verification_email_template(user_name, otp),
+                text=f"Hello {user_name},\n\nYour verification code is: {otp}\n\nThis code will expire in 15 minutes.\n\nBest regards,\nJunglore Team",
+                tag="verification",
+            ))
             
-            logger.info(f"Verification email sent to {user_email}")
+            logger.info(f"Verification email queued for {user_email}")
             return True
             
         except Exception as e:
@@ -12,8 +12,8 @@ import structlog
 from app.models.user import User
 from app.models.quiz_extended import Quiz, UserQuizResult
 from app.models.user_quiz_best_score import UserQuizBestScore
-from app.models.site_setting import SiteSetting
 from app.services.settings_service import SettingsService
+from app.services.daily_activity_counters import daily_activity_counters
 
 logger = structlog.get_logger()
 
@@ -222,10 +222,7 @@ class EnhancedRewardsService:
             # Get conservative credit tier multiplier
             credit_tier_key = f"credit_tier_multiplier_{user_tier}"
             try:
-                credit_tier_result = await self.db.execute(
-                    select(SiteSetting.value).where(SiteSetting.key == credit_tier_key)
-                )
-                credit_tier_value = credit_tier_result.scalar()
+                credit_tier_value = await self.settings.get(credit_tier_key)
                 if credit_tier_value:
                     credits_multiplier = float(credit_tier_value)
                 else:
@@ -286,46 +283,16 @@ class EnhancedRewardsService:
             daily_points_limit = daily_limits['points']
             daily_credits_limit = daily_limits['credits']
             
-            # Get points earned today
-            today = datetime.now(timezone.utc).date()
-            tomorrow = today + timedelta(days=1)
-            
-            # Points earned today
-            points_result = await self.db.execute(
-                select(func.coalesce(func.sum(UserQuizResult.points_earned), 0))
-                .where(
-                    UserQuizResult.user_id == user_id,
-                    UserQuizResult.completed_at >= today,
-                    UserQuizResult.completed_at < tomorrow
-                )
+            # Reserve today's allowance atomically; grants are clipped to what remains
+            final_points, _ = await daily_activity_counters.consume(
+                self.db, user_id, "quiz_points_earned", calculated_points,
+                daily_points_limit, partial=True
             )
-            points_today = points_result.scalar() or 0
-            
-            # Credits earned today (from quiz results)
-            credits_result = await self.db.execute(
-                select(func.coalesce(func.sum(UserQuizResult.credits_earned), 0))
-                .where(
-                    UserQuizResult.user_id == user_id,
-                    UserQuizResult.completed_at >= today,
-                    UserQuizResult.completed_at < tomorrow
-                )
+            final_credits, _ = await daily_activity_counters.consume(
+                self.db, user_id, "quiz_credits_earned", calculated_credits,
+                daily_credits_limit, partial=True
             )
-            credits_today = credits_result.scalar() or 0
-            
-            # Apply limits
-            was_limited = False
-            final_points = calculated_points
-            final_credits = calculated_credits
-            
-            # Check points limit
-            if points_today + calculated_points > daily_points_limit:
-                final_points = max(0, daily_points_limit - points_today)
-                was_limited = True
-            
-            # Check credits limit
-            if credits_today + calculated_credits > daily_credits_limit:
-                final_credits = max(0, daily_credits_limit - credits_today)
-                was_limited = True
+            was_limited = final_points < calculated_points or final_credits < calculated_credits
             
             return final_points, final_credits, was_limited
             
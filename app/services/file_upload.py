@@ -2,6 +2,7 @@
 Enhanced file upload service with comprehensive validation and security
 """
 
+import asyncio
 import os
 import aiofiles
 import hashlib
@@ -21,14 +22,13 @@ try:
 except ImportError:
     HAS_MUTAGEN = False
 from uuid import uuid4
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import UploadFile
 from PIL import Image
 import structlog
-import boto3
-from botocore.exceptions import ClientError
 
 from app.core.config import settings
+from app.services.media_urls import media_url_service
 from app.core.exceptions import (
     FileUploadError,
     FileSizeError,
@@ -37,6 +37,64 @@ from app.core.exceptions import (
 
 logger = structlog.get_logger()
 
+# Uploads are streamed in chunks of this size, never read whole into memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+# Bytes kept from the start of the file for MIME sniffing
+SNIFF_BYTES = 8192
+# R2 multipart part size / threshold
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+async def stream_upload_to_path(
+    file: UploadFile,
+    dest_path: Path,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Tuple[int, str, bytes]:
+    """
+    Stream an upload to disk chunk by chunk
+    
+    The size limit is enforced while streaming and the SHA-256 hash is
+    computed incrementally, so memory use stays at one chunk per upload.
+    A partially written file is removed if the limit is exceeded.
+    
+    Args:
+        file: FastAPI UploadFile object
+        dest_path: Where to write the file
+        max_size: Maximum allowed size in bytes
+        chunk_size: Read/write chunk size
+        
+    Returns:
+        Tuple of (size in bytes, SHA-256 hex digest, leading bytes for MIME sniffing)
+        
+    Raises:
+        FileSizeError: If the upload exceeds max_size
+    """
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        async with aiofiles.open(dest_path, 'wb') as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise FileSizeError(file.filename, size, max_size)
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        dest_path.unlink(missing_ok=True)
+        raise
+    
+    return size, digest.hexdigest(), head
+
+
 class FileUploadService:
     """Enhanced file upload service with security and validation"""
     
@@ -46,6 +104,9 @@ class FileUploadService:
     MAX_AUDIO_SIZE = 100 * 1024 * 1024  # 100MB for podcasts
     MAX_DOCUMENT_SIZE = 25 * 1024 * 1024  # 25MB
     
+    # Uploads processed at once per worker; further uploads wait their turn
+    MAX_CONCURRENT_UPLOADS = 4
+    
     # Allowed MIME types
     ALLOWED_IMAGE_TYPES = {
         "image/jpeg", "image/jpg", "image/png", "image/gif", 
@@ -118,43 +179,53 @@ class FileUploadService:
         self.r2_endpoint = settings.R2_ENDPOINT_URL
         self.r2_access_key = settings.R2_ACCESS_KEY_ID
         self.r2_secret_key = settings.R2_SECRET_ACCESS_KEY
+        
+        self._upload_slots = asyncio.Semaphore(self.MAX_CONCURRENT_UPLOADS)
     
     def _get_r2_client(self):
-        """Initialize R2 client using boto3 S3-compatible API"""
+        """Shared R2 client (boto3 S3-compatible API)"""
         if not all([self.r2_endpoint, self.r2_access_key, self.r2_secret_key]):
             raise FileUploadError("R2 credentials not configured")
         
-        return boto3.client(
-            's3',
-            endpoint_url=self.r2_endpoint,
-            aws_access_key_id=self.r2_access_key,
-            aws_secret_access_key=self.r2_secret_key,
-            region_name='auto'
-        )
+        return media_url_service.client
     
-    async def _upload_to_r2(self, file_content: bytes, file_key: str, mime_type: str) -> str:
+    async def _upload_to_r2(self, source_path: Path, file_key: str, mime_type: str) -> str:
         """
-        Upload file directly to R2
+        Stream a file from disk to R2
+        
+        Files above MULTIPART_CHUNK_SIZE go up as a multipart upload; the
+        transfer runs in a worker thread so the event loop is not blocked.
         
         Args:
-            file_content: File bytes
+            source_path: Local file to upload
             file_key: Object key (path) in R2 bucket
             mime_type: File MIME type
             
         Returns:
             File key (path) in R2
         """
+        from boto3.s3.transfer import TransferConfig
+        
+        transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=4
+        )
         try:
             r2_client = self._get_r2_client()
-            r2_client.put_object(
-                Bucket=self.r2_bucket,
-                Key=file_key,
-                Body=file_content,
-                ContentType=mime_type
+            await asyncio.to_thread(
+                r2_client.upload_file,
+                str(source_path),
+                self.r2_bucket,
+                file_key,
+                ExtraArgs={"ContentType": mime_type},
+                Config=transfer_config
             )
             logger.info("File uploaded to R2", file_key=file_key, bucket=self.r2_bucket)
             return file_key
-        except ClientError as e:
+        except FileUploadError:
+            raise
+        except Exception as e:
             logger.error("R2 upload failed", error=str(e), file_key=file_key)
             raise FileUploadError(f"R2 upload failed: {str(e)}")
     
@@ -255,13 +326,14 @@ class FileUploadService:
         }
         return size_limits.get(file_category, self.MAX_DOCUMENT_SIZE)
     
-    async def _validate_file_content(self, file_path: Path, mime_type: str) -> bool:
+    async def _validate_file_content(self, file_path: Path, mime_type: str, head: Optional[bytes] = None) -> bool:
         """
         Validate file content matches declared MIME type
         
         Args:
             file_path: Path to uploaded file
             mime_type: Declared MIME type
+            head: Leading bytes captured while streaming, sniffed instead of re-reading the file
             
         Returns:
             True if content is valid
@@ -269,7 +341,10 @@ class FileUploadService:
         try:
             # Use python-magic to detect actual file type if available
             if HAS_MAGIC:
-                actual_mime = magic.from_file(str(file_path), mime=True)
+                if head:
+                    actual_mime = magic.from_buffer(head, mime=True)
+                else:
+                    actual_mime = magic.from_file(str(file_path), mime=True)
             else:
                 # Fallback: basic validation without magic
                 actual_mime = mime_type
@@ -521,29 +596,44 @@ class FileUploadService:
         if not file or not file.filename:
             raise FileUploadError("No file provided")
         
+        # Detect MIME type
+        declared_mime = file.content_type
+        if not declared_mime:
+            raise FileTypeError(file.filename, "unknown", list(
+                self.ALLOWED_IMAGE_TYPES | 
+                self.ALLOWED_VIDEO_TYPES | 
+                self.ALLOWED_AUDIO_TYPES |
+                self.ALLOWED_DOCUMENT_TYPES
+            ))
+        
+        # Bound the number of uploads in flight; extra requests queue here
+        async with self._upload_slots:
+            return await self._process_upload(file, declared_mime, file_category, validate_content)
+    
+    async def stream_to_path(self, file: UploadFile, dest_path: Path, max_size: int) -> Tuple[int, str, bytes]:
+        """
+        Stream an upload to ``dest_path`` in one of this worker's upload slots
+        
+        For endpoints that store files themselves; see ``stream_upload_to_path``.
+        """
+        async with self._upload_slots:
+            return await stream_upload_to_path(file, dest_path, max_size)
+    
+    async def _process_upload(
+        self,
+        file: UploadFile,
+        declared_mime: str,
+        file_category: Optional[str],
+        validate_content: bool
+    ) -> Dict[str, Any]:
+        """Stream, validate and store a single upload"""
+        temp_path = None
         try:
-            # Read file content
-            content = await file.read()
-            file_size = len(content)
-            
-            # Detect MIME type
-            declared_mime = file.content_type
-            if not declared_mime:
-                raise FileTypeError(file.filename, "unknown", list(
-                    self.ALLOWED_IMAGE_TYPES | 
-                    self.ALLOWED_VIDEO_TYPES | 
-                    self.ALLOWED_AUDIO_TYPES |
-                    self.ALLOWED_DOCUMENT_TYPES
-                ))
-            
             # Determine file category
             if not file_category:
                 file_category = self._get_file_category(declared_mime)
             
-            # Validate file size
             max_size = self._get_max_size(file_category)
-            if file_size > max_size:
-                raise FileSizeError(file.filename, file_size, max_size)
             
             # Generate secure filename
             secure_filename = self._generate_secure_filename(file.filename, declared_mime)
@@ -552,61 +642,42 @@ class FileUploadService:
             file_key = f"{file_category}/{secure_filename}"
             file_path = self.upload_dir / file_category / secure_filename
             
-            # Ensure temp directory exists
-            temp_dir = self.upload_dir / "temp"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save file temporarily for content validation
-            temp_path = temp_dir / secure_filename
-            async with aiofiles.open(temp_path, 'wb') as f:
-                await f.write(content)
+            # Stream to a temp file, enforcing the size limit and hashing as we go
+            temp_path = self.upload_dir / "temp" / secure_filename
+            file_size, file_hash, head = await stream_upload_to_path(file, temp_path, max_size)
             
             # Validate file content if requested
             if validate_content:
                 # Use enhanced audio validation for audio files
                 if file_category == "audio":
-                    is_valid = self._validate_audio_file(temp_path, declared_mime)
+                    is_valid = await asyncio.to_thread(self._validate_audio_file, temp_path, declared_mime)
                 else:
-                    is_valid = await self._validate_file_content(temp_path, declared_mime)
+                    is_valid = await self._validate_file_content(temp_path, declared_mime, head)
                 
                 if not is_valid:
-                    # Clean up temp file
-                    temp_path.unlink(missing_ok=True)
                     raise FileTypeError(
                         file.filename, 
                         declared_mime, 
                         list(self.ALLOWED_IMAGE_TYPES | self.ALLOWED_VIDEO_TYPES | self.ALLOWED_AUDIO_TYPES | self.ALLOWED_DOCUMENT_TYPES)
                     )
             
+            # Extract metadata for audio files while the local copy still exists
+            audio_metadata = None
+            audio_thumbnail = None
+            if file_category == "audio":
+                audio_metadata = await asyncio.to_thread(self._extract_audio_metadata, temp_path)
+                audio_thumbnail = await asyncio.to_thread(self._create_audio_thumbnail, temp_path, audio_metadata)
+            
             # Upload to R2 or save locally based on configuration
             if self.use_r2:
-                # Upload to R2
-                await self._upload_to_r2(content, file_key, declared_mime)
-                # Clean up temp file
+                await self._upload_to_r2(temp_path, file_key, declared_mime)
                 temp_path.unlink(missing_ok=True)
-                logger.info("File uploaded to R2", file_key=file_key)
             else:
                 # Move file to final location on local disk
                 file_path.parent.mkdir(parents=True, exist_ok=True)
                 temp_path.rename(file_path)
                 logger.info("File uploaded locally", file_path=str(file_path))
             
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(content)
-            
-            # Extract metadata for audio files (from temp file if R2, or final file if local)
-            audio_metadata = None
-            audio_thumbnail = None
-            if file_category == "audio":
-                # For R2, use temp file (we'll clean it up after). For local, use final file
-                metadata_path = temp_path if self.use_r2 else file_path
-                if metadata_path.exists():
-                    audio_metadata = self._extract_audio_metadata(metadata_path)
-                    audio_thumbnail = self._create_audio_thumbnail(metadata_path, audio_metadata)
-                    # Clean up temp file if using R2
-                    if self.use_r2:
-                        temp_path.unlink(missing_ok=True)
-            
             # Generate file URL (relative path - works for both local and R2)
             file_url = file_key  # e.g., "images/abc123.jpg"
             
@@ -645,8 +716,12 @@ class FileUploadService:
             return result
             
         except (FileUploadError, FileSizeError, FileTypeError):
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
             raise
         except Exception as e:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
             logger.error("File upload failed", error=str(e), filename=file.filename)
             raise FileUploadError(f"Upload failed: {str(e)}", file.filename)
     
@@ -0,0 +1,195 @@
+"""
+Resource version counters for HTTP conditional GET
+
+Each cacheable public resource ("content", "videos", ...) has a version token
+shared through Redis. ETags for its responses are derived from the token, so
+answering ``If-None-Match`` only needs the token, not the database. Tokens are
+replaced whenever a model behind the resource is written: SQLAlchemy session
+events collect the touched models during flush and bump their resources after
+the transaction commits, so every write path (API, admin, jobs) is covered
+without per-route invalidation calls.
+
+Counter-only updates (view counts and timestamps) do not bump versions, or
+every page view would invalidate the catalog; those values may lag until the
+next real edit.
+
+Without Redis the tokens live in each worker's memory and a write only bumps
+the token of the worker that handled it, so other workers would keep
+answering 304 for changed data. ETags are therefore only issued when tokens
+are shared, unless ``HTTP_CACHE_LOCAL_VERSIONS`` declares a single worker.
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, Set, Tuple
+
+import structlog
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+VERSION_KEY_PREFIX = "http_cache:version:"
+# Tokens are memoised per worker this long, bounding cross-worker staleness
+VERSION_MEMO_SECONDS = 1.0
+
+# Model class name -> resources whose responses are built from it
+RESOURCE_MODELS: Dict[str, Tuple[str, ...]] = {
+    "Content": ("content",),
+    "Category": ("content", "animals", "myths_facts"),
+    "VideoSeries": ("videos",),
+    "SeriesVideo": ("videos",),
+    "VideoChannel": ("videos",),
+    "GeneralKnowledgeVideo": ("videos",),
+    "TVPlaylist": ("videos",),
+    "NationalPark": ("national_parks",),
+    "AnimalProfile": ("animals",),
+    "MythFact": ("myths_facts",),
+}
+
+# Columns whose changes alone do not change what catalog responses mean
+IGNORED_COLUMNS = frozenset({"view_count", "views", "total_views", "updated_at", "last_viewed_at"})
+
+_PENDING_KEY = "http_cache_resources"
+
+
+def _new_token() -> str:
+    return format(time.time_ns(), "x")
+
+
+class ResourceVersions:
+    """Version tokens per resource, in Redis with an in-memory fallback"""
+
+    def __init__(self):
+        self._memory: Dict[str, str] = {}
+        self._memo: Dict[str, Tuple[str, float]] = {}
+
+    @property
+    def _redis(self):
+        if cache_manager.use_redis and cache_manager.redis_client:
+            return cache_manager.redis_client
+        return None
+
+    @property
+    def shared(self) -> bool:
+        """Whether every worker sees the same tokens, so ETags built from them are safe"""
+        return self._redis is not None or settings.HTTP_CACHE_LOCAL_VERSIONS
+
+    async def get(self, resource: str) -> str:
+        """Current token for a resource, creating one on first use"""
+        memo = self._memo.get(resource)
+        now = time.monotonic()
+        if memo is not None and memo[1] > now:
+            return memo[0]
+
+        token = await self._load(resource)
+        self._memo[resource] = (token, now + VERSION_MEMO_SECONDS)
+        return token
+
+    async def bump(self, *resources: str):
+        """Give resources new tokens so previously issued ETags stop matching"""
+        for resource in resources:
+            token = _new_token()
+            self._memory[resource] = token
+            self._memo.pop(resource, None)
+            if self._redis is not None:
+                try:
+                    await self._redis.set(VERSION_KEY_PREFIX + resource, token)
+                except Exception as e:
+                    logger.error("Resource version bump failed", resource=resource, error=str(e))
+
+    async def _load(self, resource: str) -> str:
+        redis_client = self._redis
+        if redis_client is None:
+            return self._memory.setdefault(resource, _new_token())
+
+        key = VERSION_KEY_PREFIX + resource
+        try:
+            token = await redis_client.get(key)
+            if token is None:
+                # A fresh token (never a reset counter) so old ETags cannot match
+                await redis_client.set(key, _new_token(), nx=True)
+                token = await redis_client.get(key)
+            return token.decode() if isinstance(token, bytes) else str(token)
+        except Exception as e:
+            logger.error("Resource version read failed", resource=resource, error=str(e))
+            return self._memory.setdefault(resource, _new_token())
+
+
+resource_versions = ResourceVersions()
+
+
+def resources_for(class_name: str) -> Tuple[str, ...]:
+    return RESOURCE_MODELS.get(class_name, ())
+
+
+def _changed_meaningfully(instance) -> bool:
+    """True unless only ignored counter/timestamp columns changed"""
+    state = sa_inspect(instance)
+    for attr in state.attrs:
+        if attr.key in IGNORED_COLUMNS:
+            continue
+        if attr.history.has_changes():
+            return True
+    return False
+
+
+def _schedule_bump(resources: Iterable[str]):
+    resources = tuple(resources)
+    if not resources:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(resource_versions.bump(*resources))
+
+
+def _pending(session) -> Set[str]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _after_flush(session, flush_context):
+    pending = _pending(session)
+    for instance in list(session.new) + list(session.deleted):
+        pending.update(resources_for(type(instance).__name__))
+    for instance in session.dirty:
+        resources = resources_for(type(instance).__name__)
+        if resources and _changed_meaningfully(instance):
+            pending.update(resources)
+
+
+def _after_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _pending(orm_execute_state.session).update(resources_for(mapper.class_.__name__))
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _schedule_bump(pending)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+_registered = False
+
+
+def register_version_listeners():
+    """Hook version bumps into every ORM session (idempotent)"""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _after_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _registered = True
@@ -0,0 +1,321 @@
+"""
+On-demand image derivatives with a content-addressed cache
+
+A derivative is rendered the first time a (source, width, format) combination
+is requested and stored under a name derived from the source fingerprint and
+the parameters. The name therefore changes whenever the source changes, so
+every stored variant is immutable. The public /img URL is only immutable when
+it carries the source version (``versioned_url``); otherwise responses must be
+revalidated. Concurrent requests for the same variant share one render.
+"""
+
+import asyncio
+import hashlib
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+import structlog
+
+from app.core.config import settings
+from app.services.image_optimization import DerivativeSpec, ImageJob, image_engine, FORMAT_EXTENSIONS
+from app.services.media_urls import media_url_service
+
+logger = structlog.get_logger()
+
+# Requested widths are rounded up to one of these so the cache stays bounded
+ALLOWED_WIDTHS = (160, 240, 320, 480, 640, 768, 1024, 1280, 1440, 1920, 2560)
+
+FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg', 82),
+    'webp': ('WEBP', 'image/webp', 80),
+    'avif': ('AVIF', 'image/avif', 80),
+}
+
+# Bump to invalidate every stored variant after a rendering change
+RENDER_VERSION = 1
+
+# How long a bucket object's ETag is trusted before it is looked up again
+SOURCE_FINGERPRINT_TTL_SECONDS = 60
+# Bound on memoised fingerprints and known stored variants
+MEMO_SIZE = 10000
+
+
+class DerivativeError(Exception):
+    """Raised when a derivative cannot be produced"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class DerivativeRequest:
+    """A resolved variant: its content address, before anything is rendered"""
+    key: str
+    width: int
+    fmt: str
+    version: str
+    digest: str
+    name: str
+    pil_format: str
+    quality: int
+    content_type: str
+
+
+@dataclass
+class Derivative:
+    """A rendered variant, either on local disk or in the bucket"""
+    digest: str
+    content_type: str
+    path: Optional[Path] = None
+    object_key: Optional[str] = None
+
+
+def normalize_width(width: Optional[int]) -> int:
+    """Round a requested width up to the nearest allowed width"""
+    if not width:
+        return ALLOWED_WIDTHS[-1]
+    index = bisect_left(ALLOWED_WIDTHS, width)
+    return ALLOWED_WIDTHS[min(index, len(ALLOWED_WIDTHS) - 1)]
+
+
+def negotiate_format(fmt: Optional[str], accept: str) -> str:
+    """Explicit ?fmt= wins, otherwise the best format the client accepts"""
+    if fmt:
+        fmt = fmt.lower().replace('jpg', 'jpeg')
+        if fmt not in FORMATS:
+            raise DerivativeError(f"Unsupported format '{fmt}'")
+        return fmt
+    if 'image/webp' in accept:
+        return 'webp'
+    return 'jpeg'
+
+
+class ImageDerivativeService:
+    """Resolve, render and store image variants"""
+
+    def __init__(self, upload_dir: str = "uploads"):
+        self.upload_dir = Path(upload_dir)
+        self.cache_dir = self.upload_dir / "derived"
+        self.source_dir = self.upload_dir / "temp" / "sources"
+        self._fingerprints: Dict[Tuple[str, int, int], str] = {}
+        # R2 source key -> (fingerprint, looked up at) and stored variant names
+        self._remote_fingerprints: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._stored: "OrderedDict[str, None]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def resolve(self, key: str, width: Optional[int], fmt: str) -> DerivativeRequest:
+        """Content address of a variant; only looks at the source's fingerprint"""
+        key = media_url_service.normalize_key(key)
+        if '..' in Path(key).parts or not key:
+            raise DerivativeError("Invalid image key")
+
+        width = normalize_width(width)
+        pil_format, content_type, quality = FORMATS[fmt]
+
+        fingerprint = await self._fingerprint(key)
+        digest = hashlib.sha256(
+            f"{fingerprint}:{width}:{fmt}:{quality}:{RENDER_VERSION}".encode()
+        ).hexdigest()[:32]
+        return DerivativeRequest(
+            key=key,
+            width=width,
+            fmt=fmt,
+            version=source_version(fingerprint),
+            digest=digest,
+            name=f"{digest[:2]}/{digest}.{FORMAT_EXTENSIONS[pil_format]}",
+            pil_format=pil_format,
+            quality=quality,
+            content_type=content_type,
+        )
+
+    async def get(self, key: str, width: Optional[int], fmt: str) -> Derivative:
+        """Return the derivative for a source key, rendering it on first use"""
+        return await self.fetch(await self.resolve(key, width, fmt))
+
+    async def fetch(self, request: DerivativeRequest) -> Derivative:
+        """Return a resolved variant, rendering it on first use"""
+        existing = await self._lookup(request.name, request.digest, request.content_type)
+        if existing:
+            return existing
+
+        # Identical concurrent requests wait on the first render
+        inflight = self._inflight.get(request.digest)
+        if inflight:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[request.digest] = future
+        try:
+            derivative = await self._render(
+                request.key, request.name, request.digest, request.width,
+                request.pil_format, request.quality, request.content_type
+            )
+            future.set_result(derivative)
+            return derivative
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(request.digest, None)
+
+    async def versioned_url(self, key: str, width: Optional[int] = None, fmt: Optional[str] = None) -> str:
+        """/img URL pinned to the current source content, cacheable forever"""
+        key = media_url_service.normalize_key(key)
+        fingerprint = await self._fingerprint(key)
+        params = {}
+        if width:
+            params["w"] = normalize_width(width)
+        if fmt:
+            params["fmt"] = fmt
+        params["v"] = source_version(fingerprint)
+        return f"/img/{quote(key)}?{urlencode(params)}"
+
+    async def _fingerprint(self, key: str) -> str:
+        """Stable identifier for the current source content"""
+        if media_url_service.use_r2:
+            now = time.monotonic()
+            cached = self._remote_fingerprints.get(key)
+            if cached and now - cached[1] < SOURCE_FINGERPRINT_TTL_SECONDS:
+                return cached[0]
+            try:
+                head = await asyncio.to_thread(
+                    media_url_service.client.head_object,
+                    Bucket=settings.R2_BUCKET_NAME,
+                    Key=key
+                )
+            except Exception:
+                raise DerivativeError("Image not found", status_code=404)
+            fingerprint = f"r2:{key}:{head.get('ETag', '').strip(chr(34))}"
+            _remember(self._remote_fingerprints, key, (fingerprint, now))
+            return fingerprint
+
+        source = self.upload_dir / key
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            raise DerivativeError("Image not found", status_code=404)
+        if not source.is_file():
+            raise DerivativeError("Image not found", status_code=404)
+
+        cache_key = (key, stat.st_mtime_ns, stat.st_size)
+        fingerprint = self._fingerprints.get(cache_key)
+        if fingerprint is None:
+            fingerprint = await asyncio.to_thread(_hash_file, source)
+            if len(self._fingerprints) > MEMO_SIZE:
+                self._fingerprints.clear()
+            self._fingerprints[cache_key] = fingerprint
+        return fingerprint
+
+    async def _lookup(self, name: str, digest: str, content_type: str) -> Optional[Derivative]:
+        """Find an already stored variant"""
+        local = self.cache_dir / name
+        if local.exists():
+            return Derivative(digest=digest, content_type=content_type, path=local)
+
+        if media_url_service.use_r2:
+            object_key = f"derived/{name}"
+            # Variants are content-addressed, so one that existed still does
+            if name in self._stored:
+                self._stored.move_to_end(name)
+                return Derivative(digest=digest, content_type=content_type, object_key=object_key)
+            try:
+                await asyncio.to_thread(
+                    media_url_service.client.head_object,
+                    Bucket=settings.R2_BUCKET_NAME,
+                    Key=object_key
+                )
+            except Exception:
+                return None
+            _remember(self._stored, name, None)
+            return Derivative(digest=digest, content_type=content_type, object_key=object_key)
+        return None
+
+    async def _render(
+        self,
+        key: str,
+        name: str,
+        digest: str,
+        width: int,
+        pil_format: str,
+        quality: int,
+        content_type: str
+    ) -> Derivative:
+        """Render one variant through the image engine and store it"""
+        source = self.upload_dir / key
+        downloaded = None
+        if media_url_service.use_r2:
+            downloaded = self.source_dir / f"{digest}{Path(key).suffix}"
+            downloaded.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(
+                media_url_service.client.download_file,
+                settings.R2_BUCKET_NAME, key, str(downloaded)
+            )
+            source = downloaded
+
+        output = self.cache_dir / name
+        try:
+            result = await image_engine.run(ImageJob(
+                input_path=str(source),
+                output_dir=str(output.parent),
+                base_name=digest,
+                specs=[DerivativeSpec(name='w', box=(width, 1_000_000), quality=quality, always=True)],
+                formats=[pil_format],
+                filename_template="{base}.{ext}"
+            ))
+        except Exception as e:
+            logger.warning("Image derivative failed", key=key, error=str(e))
+            raise DerivativeError("Image could not be processed", status_code=422)
+        finally:
+            if downloaded is not None:
+                downloaded.unlink(missing_ok=True)
+
+        if not result['variants']:
+            raise DerivativeError(f"Format {pil_format} is not available", status_code=415)
+
+        if media_url_service.use_r2:
+            object_key = f"derived/{name}"
+            await asyncio.to_thread(
+                media_url_service.client.upload_file,
+                str(output), settings.R2_BUCKET_NAME, object_key,
+                ExtraArgs={
+                    "ContentType": content_type,
+                    "CacheControl": "public, max-age=31536000, immutable"
+                }
+            )
+            output.unlink(missing_ok=True)
+            _remember(self._stored, name, None)
+            return Derivative(digest=digest, content_type=content_type, object_key=object_key)
+
+        return Derivative(digest=digest, content_type=content_type, path=output)
+
+
+def source_version(fingerprint: str) -> str:
+    """Short version token for a source fingerprint, used as ?v= in /img URLs"""
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+
+def _remember(memo: OrderedDict, key, value):
+    memo[key] = value
+    memo.move_to_end(key)
+    while len(memo) > MEMO_SIZE:
+        memo.popitem(last=False)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Global derivative service instance
+image_derivative_service = ImageDerivativeService()
@@ -1,22 +1,215 @@
 """
 Image optimization service for better performance
+
+All Pillow work (decode, resize, encode) runs in a bounded process pool so
+large admin uploads never stall the event loop or hold the GIL of the API
+worker. Each job decodes the source once, reducing on load where the codec
+allows it, then resizes progressively from the largest derivative down and
+writes every requested format from the same resized frame.
 """
 
-import os
 import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 from PIL import Image, ImageOps
-import aiofiles
-from io import BytesIO
 import structlog
 
+from app.core.config import settings
+
 logger = structlog.get_logger()
 
+# Pillow save() format name -> file extension
+FORMAT_EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp', 'AVIF': 'avif', 'PNG': 'png'}
+
+
+@dataclass
+class DerivativeSpec:
+    """One output size; every requested format is written for it"""
+    name: str
+    box: Tuple[int, int]
+    quality: int = 85
+    always: bool = False  # Emit even if the source is already smaller than the box
+
+
+@dataclass
+class ImageJob:
+    """Picklable description of the work for one source image"""
+    input_path: str
+    output_dir: str
+    base_name: str
+    specs: List[DerivativeSpec]
+    formats: List[str] = field(default_factory=lambda: ['JPEG', 'WEBP'])
+    filename_template: str = "{base}_{name}.{ext}"
+
+
+def _encoder_available(fmt: str) -> bool:
+    Image.init()
+    return fmt in Image.SAVE
+
+
+def _save_kwargs(fmt: str, quality: int) -> Dict[str, Any]:
+    if fmt == 'JPEG':
+        return {'quality': quality, 'optimize': True, 'progressive': True}
+    if fmt == 'WEBP':
+        return {'quality': quality, 'method': 4}
+    if fmt == 'AVIF':
+        return {'quality': max(quality - 25, 30), 'speed': 6}
+    if fmt == 'PNG':
+        return {'optimize': True, 'compress_level': 9}
+    return {}
+
+
+def _fit(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """Largest size with the same aspect ratio that fits inside box"""
+    ratio = min(box[0] / size[0], box[1] / size[1], 1.0)
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Convert to RGB, compositing transparency onto white"""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def process_image_job(job: ImageJob) -> Dict[str, Any]:
+    """
+    Render all derivatives for one image (runs inside a pool process)
+
+    Returns variant metadata keyed "<spec>_<format>" plus per-stage timings.
+    """
+    started = time.perf_counter()
+    output_dir = Path(job.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = [fmt for fmt in job.formats if _encoder_available(fmt)]
+
+    with Image.open(job.input_path) as source:
+        original_size = source.size
+        largest = max((max(spec.box) for spec in job.specs), default=0)
+        if largest:
+            # JPEG can decode at 1/2, 1/4 or 1/8 scale directly; never below the largest box
+            source.draft('RGB', (largest, largest))
+        img = _flatten(ImageOps.exif_transpose(source))
+    decoded = time.perf_counter()
+
+    variants: Dict[str, Dict[str, Any]] = {}
+    resize_seconds = 0.0
+    encode_seconds = 0.0
+    current = img
+
+    # Largest first, so each resize starts from the previous (smaller) frame
+    for spec in sorted(job.specs, key=lambda s: s.box[0] * s.box[1], reverse=True):
+        if original_size[0] <= spec.box[0] and original_size[1] <= spec.box[1] and not spec.always:
+            continue
+
+        t0 = time.perf_counter()
+        target = _fit(current.size, spec.box)
+        if target != current.size:
+            current = current.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        t1 = time.perf_counter()
+        resize_seconds += t1 - t0
+
+        for fmt in formats:
+            path = output_dir / job.filename_template.format(
+                base=job.base_name, name=spec.name, ext=FORMAT_EXTENSIONS[fmt]
+            )
+            current.save(path, format=fmt, **_save_kwargs(fmt, spec.quality))
+            variants[f"{spec.name}_{fmt.lower()}"] = {
+                'path': str(path),
+                'size': current.size,
+                'format': fmt,
+                'file_size': path.stat().st_size
+            }
+        encode_seconds += time.perf_counter() - t1
+
+    return {
+        'original_size': original_size,
+        'variants': variants,
+        'timings_ms': {
+            'decode': round((decoded - started) * 1000, 1),
+            'resize': round(resize_seconds * 1000, 1),
+            'encode': round(encode_seconds * 1000, 1),
+            'total': round((time.perf_counter() - started) * 1000, 1)
+        }
+    }
+
+
+class ImageEngine:
+    """Bounded process pool for image jobs"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or settings.IMAGE_WORKERS or max(1, (os.cpu_count() or 2) // 2)
+        self.max_pending = max_pending or settings.IMAGE_MAX_PENDING_JOBS
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking a threaded asyncio server can copy held locks into the
+            # child; workers start from a clean forkserver process instead
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return self._pool
+
+    async def run(self, job: ImageJob) -> Dict[str, Any]:
+        """
+        Queue a job and wait for its result
+
+        At most max_pending jobs are queued or running per API worker;
+        further callers wait here instead of piling work onto the pool.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            queued = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(self._get_pool(), process_image_job, job)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM on a huge image); start a fresh pool for the next job
+                self._pool = None
+                raise
+
+        result['timings_ms']['wall'] = round((time.perf_counter() - queued) * 1000, 1)
+        logger.info(
+            "Image job completed",
+            source=job.input_path,
+            variants=len(result['variants']),
+            **{f"{stage}_ms": value for stage, value in result['timings_ms'].items()}
+        )
+        return result
+
+    def shutdown(self):
+        """Stop pool processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global image engine instance
+image_engine = ImageEngine()
+
+
 class ImageOptimizer:
     """Image optimization service"""
-    
-    def __init__(self):
+
+    def __init__(self, engine: Optional[ImageEngine] = None):
+        self.engine = engine or image_engine
         self.supported_formats = {'JPEG', 'PNG', 'WEBP', 'AVIF'}
         self.quality_settings = {
             'thumbnail': 85,
@@ -25,7 +218,7 @@ class ImageOptimizer:
             'large': 80,
             'original': 95
         }
-        
+
         # Size presets
         self.size_presets = {
             'thumbnail': (300, 300),
@@ -34,149 +227,90 @@ class ImageOptimizer:
             'large': (1920, 1280),
             'hero': (2560, 1440)
         }
-    
+
+        # Widths for responsive srcset images
+        self.responsive_widths = {
+            'xs': 480,   # Mobile
+            'sm': 768,   # Tablet
+            'md': 1024,  # Desktop
+            'lg': 1440,  # Large desktop
+            'xl': 1920   # Extra large
+        }
+
     async def optimize_image(
         self,
         input_path: Path,
         output_dir: Path,
         filename_base: str,
         generate_webp: bool = True,
-        generate_sizes: bool = True
+        generate_sizes: bool = True,
+        generate_avif: bool = False
     ) -> Dict[str, Any]:
         """
         Optimize image and generate multiple sizes and formats
         """
         try:
-            # Ensure output directory exists
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Open and process image
-            with Image.open(input_path) as img:
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background for transparency
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Auto-orient image based on EXIF data
-                img = ImageOps.exif_transpose(img)
-                
-                original_size = img.size
-                results = {
-                    'original_size': original_size,
-                    'optimized_images': {},
-                    'total_size_reduction': 0,
-                    'formats_generated': []
-                }
-                
-                # Generate different sizes
-                if generate_sizes:
-                    for size_name, target_size in self.size_presets.items():
-                        # Skip if original is smaller than target
-                        if original_size[0] <= target_size[0] and original_size[1] <= target_size[1]:
-                            if size_name == 'thumbnail':
-                                # Always generate thumbnail
-                                resized_img = img.copy()
-                            else:
-                                continue
-                        else:
-                            # Resize maintaining aspect ratio
-                            resized_img = img.copy()
-                            resized_img.thumbnail(target_size, Image.Resampling.LANCZOS)
-                        
-                        # Save JPEG version
-                        jpeg_path = output_dir / f"{filename_base}_{size_name}.jpg"
-                        await self._save_image_async(
-                            resized_img, jpeg_path, 'JPEG',
-                            quality=self.quality_settings.get(size_name, 85)
-                        )
-                        
-                        results['optimized_images'][f'{size_name}_jpeg'] = {
-                            'path': str(jpeg_path),
-                            'size': resized_img.size,
-                            'format': 'JPEG',
-                            'file_size': jpeg_path.stat().st_size if jpeg_path.exists() else 0
-                        }
-                        
-                        # Save WebP version if requested
-                        if generate_webp:
-                            webp_path = output_dir / f"{filename_base}_{size_name}.webp"
-                            await self._save_image_async(
-                                resized_img, webp_path, 'WEBP',
-                                quality=self.quality_settings.get(size_name, 85)
-                            )
-                            
-                            results['optimized_images'][f'{size_name}_webp'] = {
-                                'path': str(webp_path),
-                                'size': resized_img.size,
-                                'format': 'WEBP',
-                                'file_size': webp_path.stat().st_size if webp_path.exists() else 0
-                            }
-                
-                # Calculate total size reduction
-                original_file_size = input_path.stat().st_size
-                total_optimized_size = sum(
-                    img_info['file_size'] for img_info in results['optimized_images'].values()
-                )
-                
-                results['original_file_size'] = original_file_size
-                results['total_optimized_size'] = total_optimized_size
-                results['size_reduction_percent'] = (
-                    (original_file_size - total_optimized_size) / original_file_size * 100
-                    if original_file_size > 0 else 0
-                )
-                
-                logger.info(
-                    f"Image optimization completed",
-                    original_size=original_size,
-                    variants_generated=len(results['optimized_images']),
-                    size_reduction=f"{results['size_reduction_percent']:.1f}%"
-                )
-                
-                return results
-                
+            if generate_sizes:
+                specs = [
+                    DerivativeSpec(
+                        name=size_name,
+                        box=target_size,
+                        quality=self.quality_settings.get(size_name, 85),
+                        always=size_name == 'thumbnail'
+                    )
+                    for size_name, target_size in self.size_presets.items()
+                ]
+            else:
+                specs = []
+
+            formats = ['JPEG']
+            if generate_webp:
+                formats.append('WEBP')
+            if generate_avif:
+                formats.append('AVIF')
+
+            job_result = await self.engine.run(ImageJob(
+                input_path=str(input_path),
+                output_dir=str(output_dir),
+                base_name=filename_base,
+                specs=specs,
+                formats=formats
+            ))
+
+            results = {
+                'original_size': job_result['original_size'],
+                'optimized_images': job_result['variants'],
+                'formats_generated': sorted({v['format'] for v in job_result['variants'].values()}),
+                'timings_ms': job_result['timings_ms']
+            }
+
+            # Calculate total size reduction
+            original_file_size = input_path.stat().st_size
+            total_optimized_size = sum(
+                img_info['file_size'] for img_info in results['optimized_images'].values()
+            )
+
+            results['original_file_size'] = original_file_size
+            results['total_optimized_size'] = total_optimized_size
+            results['total_size_reduction'] = original_file_size - total_optimized_size
+            results['size_reduction_percent'] = (
+                (original_file_size - total_optimized_size) / original_file_size * 100
+                if original_file_size > 0 else 0
+            )
+
+            logger.info(
+                f"Image optimization completed",
+                original_size=results['original_size'],
+                variants_generated=len(results['optimized_images']),
+                size_reduction=f"{results['size_reduction_percent']:.1f}%"
+            )
+
+            return results
+
         except Exception as e:
             logger.error(f"Image optimization failed: {e}")
             raise
-    
-    async def _save_image_async(
-        self,
-        image: Image.Image,
-        output_path: Path,
-        format: str,
-        quality: int = 85
-    ):
-        """Save image asynchronously"""
-        def save_image():
-            save_kwargs = {'format': format, 'optimize': True}
-            
-            if format == 'JPEG':
-                save_kwargs.update({
-                    'quality': quality,
-                    'progressive': True
-                })
-            elif format == 'WEBP':
-                save_kwargs.update({
-                    'quality': quality,
-                    'method': 6  # Best compression
-                })
-            elif format == 'PNG':
-                save_kwargs.update({
-                    'optimize': True,
-                    'compress_level': 9
-                })
-            
-            image.save(output_path, **save_kwargs)
-        
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, save_image)
-    
+
     async def generate_responsive_images(
         self,
         input_path: Path,
@@ -184,54 +318,45 @@ class ImageOptimizer:
         base_name: str
     ) -> Dict[str, str]:
         """Generate responsive images for web use"""
-        
-        responsive_images = {}
-        
         try:
-            with Image.open(input_path) as img:
-                # Auto-orient
-                img = ImageOps.exif_transpose(img)
-                
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Generate different sizes for responsive design
-                sizes = {
-                    'xs': 480,   # Mobile
-                    'sm': 768,   # Tablet
-                    'md': 1024,  # Desktop
-                    'lg': 1440,  # Large desktop
-                    'xl': 1920   # Extra large
-                }
-                
-                for size_name, width in sizes.items():
-                    if img.width <= width:
-                        # Don't upscale
-                        continue
-                    
-                    # Calculate height maintaining aspect ratio
-                    height = int((width / img.width) * img.height)
-                    
-                    # Resize image
-                    resized = img.resize((width, height), Image.Resampling.LANCZOS)
-                    
-                    # Save WebP (modern format)
-                    webp_path = output_dir / f"{base_name}_{size_name}.webp"
-                    await self._save_image_async(resized, webp_path, 'WEBP', quality=85)
-                    responsive_images[f'{size_name}_webp'] = str(webp_path)
-                    
-                    # Save JPEG (fallback)
-                    jpeg_path = output_dir / f"{base_name}_{size_name}.jpg"
-                    await self._save_image_async(resized, jpeg_path, 'JPEG', quality=85)
-                    responsive_images[f'{size_name}_jpeg'] = str(jpeg_path)
-                
-                return responsive_images
-                
+            # Width-only boxes; sources narrower than a width are not upscaled
+            specs = [
+                DerivativeSpec(name=size_name, box=(width, 1_000_000), quality=85)
+                for size_name, width in self.responsive_widths.items()
+            ]
+            job_result = await self.engine.run(ImageJob(
+                input_path=str(input_path),
+                output_dir=str(output_dir),
+                base_name=base_name,
+                specs=specs,
+                formats=['WEBP', 'JPEG']
+            ))
+            return {key: info['path'] for key, info in job_result['variants'].items()}
+
         except Exception as e:
             logger.error(f"Responsive image generation failed: {e}")
             return {}
-    
+
+    async def create_thumbnail(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        base_name: str,
+        box: Tuple[int, int] = (300, 300),
+        quality: int = 85
+    ) -> Optional[Path]:
+        """Write a single JPEG thumbnail named <base_name>.jpg"""
+        job_result = await self.engine.run(ImageJob(
+            input_path=str(input_path),
+            output_dir=str(output_dir),
+            base_name=base_name,
+            specs=[DerivativeSpec(name='thumbnail', box=box, quality=quality, always=True)],
+            formats=['JPEG'],
+            filename_template="{base}.{ext}"
+        ))
+        variant = job_result['variants'].get('thumbnail_jpeg')
+        return Path(variant['path']) if variant else None
+
     def get_image_info(self, image_path: Path) -> Dict[str, Any]:
         """Get image information"""
         try:
@@ -248,4 +373,4 @@ class ImageOptimizer:
             return {}
 
 # Global image optimizer instance
-image_optimizer = ImageOptimizer()
\ No newline at end of file
+image_optimizer = ImageOptimizer()
@@ -0,0 +1,206 @@
+"""
+Request and database instrumentation
+
+``InstrumentationMiddleware`` opens a ``RequestStats`` for every HTTP request
+in a context variable. Cursor-level SQLAlchemy events on every engine add the
+query count and database time to it, so each request knows how many queries
+it ran and how long it spent waiting on the database. When the request ends:
+
+- latency, query count and DB time are recorded per route template,
+- the same statement repeated ``N_PLUS_ONE_THRESHOLD`` times in one request
+  is logged as a likely N+1,
+- statements slower than ``SLOW_QUERY_MS`` are logged as they finish, with
+  bind parameter values redacted to their types.
+
+Queries outside a request (background jobs) still count towards the global
+query metrics and slow-query log.
+"""
+
+import re
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import QUERY_COUNT_BUCKETS, metrics
+
+logger = structlog.get_logger()
+
+# Longest statement text kept in logs
+MAX_LOGGED_STATEMENT = 1000
+
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+REQUEST_QUERIES = metrics.histogram(
+    "http_request_db_queries", "Database queries issued per request", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = metrics.histogram(
+    "http_request_db_seconds", "Time spent in database queries per request", ("method", "route")
+)
+QUERIES = metrics.counter("db_queries_total", "Database statements executed", ("engine",))
+QUERY_TIME = metrics.counter("db_query_seconds_total", "Time spent executing database statements", ("engine",))
+SLOW_QUERIES = metrics.counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS", ("engine",))
+N_PLUS_ONE = metrics.counter(
+    "http_request_n_plus_one_total", "Requests that repeated one statement past the N+1 threshold", ("method", "route")
+)
+
+
+@dataclass
+class RequestStats:
+    """Database usage of the request being served"""
+
+    method: str
+    path: str
+    queries: int = 0
+    db_time: float = 0.0
+    statements: StatementCounter = field(default_factory=StatementCounter)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def begin_request(method: str, path: str):
+    """Start collecting stats for this request; returns a token for end_request"""
+    return _current.set(RequestStats(method=method, path=path))
+
+
+def end_request(token, route: str, status_code: int, duration: float) -> Optional[RequestStats]:
+    """Record the finished request's metrics and warn about repeated statements"""
+    stats = _current.get()
+    _current.reset(token)
+    if stats is None:
+        return None
+
+    labels = {"method": stats.method, "route": route}
+    REQUEST_DURATION.observe(duration, **labels)
+    REQUESTS.inc(status=str(status_code), **labels)
+    REQUEST_QUERIES.observe(stats.queries, **labels)
+    REQUEST_DB_TIME.observe(stats.db_time, **labels)
+
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if threshold > 0 and stats.statements:
+        statement, repeats = stats.statements.most_common(1)[0]
+        if repeats >= threshold:
+            N_PLUS_ONE.inc(**labels)
+            logger.warning(
+                "Possible N+1 query pattern",
+                method=stats.method,
+                route=route,
+                path=stats.path,
+                repeats=repeats,
+                queries=stats.queries,
+                statement=_truncate(statement),
+            )
+    return stats
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _truncate(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    if len(statement) > MAX_LOGGED_STATEMENT:
+        return statement[:MAX_LOGGED_STATEMENT] + "..."
+    return statement
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bind values with their type names so logs never carry user data"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: describe the first row and how many there were
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    if parameters is None:
+        return None
+    return type(parameters).__name__
+
+
+def _instrument_engine(name: str, sync_engine):
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+
+        QUERIES.inc(engine=name)
+        QUERY_TIME.inc(elapsed, engine=name)
+
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+            stats.statements[statement] += 1
+
+        if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            SLOW_QUERIES.inc(engine=name)
+            logger.warning(
+                "Slow query",
+                engine=name,
+                duration_ms=round(elapsed * 1000, 1),
+                path=stats.path if stats else None,
+                statement=_truncate(statement),
+                parameters=redact_parameters(parameters),
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+_instrumented: Dict[int, str] = {}
+
+
+def register_query_listeners(engines: Optional[Dict[str, AsyncEngine]] = None):
+    """Attach the query hooks to every engine (idempotent)"""
+    if engines is None:
+        from app.db.database import all_engines
+        engines = all_engines()
+
+    for name, async_engine in engines.items():
+        sync_engine = getattr(async_engine, "sync_engine", async_engine)
+        if id(sync_engine) in _instrumented:
+            continue
+        _instrument_engine(name, sync_engine)
+        _instrumented[id(sync_engine)] = name
+
+
+def _pool_samples():
+    from app.db.database import pool_status
+
+    for name, status in pool_status().items():
+        for state in ("checked_in", "checked_out", "overflow"):
+            yield (name, state), status[state]
+
+
+def _circuit_samples():
+    from app.db.health import OPEN, database_health
+
+    yield (), 1 if database_health.state == OPEN else 0
+
+
+metrics.gauge("db_pool_connections", "Pooled connections by engine and state", ("engine", "state"), collect=_pool_samples)
+metrics.gauge("db_circuit_open", "1 while the database circuit breaker is open", collect=_circuit_samples)
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, text, select, delete
 from contextlib import asynccontextmanager
 
-from app.db.database import get_db_session
+from app.db.database import get_jobs_db_session
 from app.models.user import User
 from app.models.quiz_extended import UserQuizResult
 from app.models.user_quiz_best_score import UserQuizBestScore
@@ -138,8 +138,8 @@ class LeaderboardJobManager:
 
     @asynccontextmanager
     async def get_db_session(self):
-        """Get async database session"""
-        async with get_db_session() as db:
+        """Get async database session from the background job pool"""
+        async with get_jobs_db_session() as db:
             yield db
 
     async def refresh_all_caches(self):
@@ -0,0 +1,257 @@
+"""
+Media probing and metadata backfill
+
+ffprobe runs as a bounded set of subprocesses with a hard timeout, never in
+the request path. Upload handlers enqueue a job after the row is committed;
+a small pool of background workers probes the file, caches the result by
+file fingerprint and fills duration, resolution, codec and bitrate onto the
+row.
+"""
+
+import asyncio
+import json
+import shutil
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.services.media_urls import media_url_service
+
+logger = structlog.get_logger()
+
+PROBE_TIMEOUT_SECONDS = 60
+PROBE_CACHE_TTL = 30 * 24 * 3600
+MAX_CONCURRENT_PROBES = 2
+QUEUE_SIZE = 1000
+
+
+def parse_frame_rate(value: Optional[str]) -> float:
+    """Parse an ffprobe rate such as "30000/1001" without eval"""
+    try:
+        rate = Fraction(value or "0/1")
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return round(float(rate), 3)
+
+
+def parse_probe(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce raw ffprobe JSON to the fields we store"""
+    fmt = data.get('format') or {}
+    streams = data.get('streams') or []
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+
+    duration = fmt.get('duration') or (video or audio or {}).get('duration')
+    bitrate = fmt.get('bit_rate')
+
+    info: Dict[str, Any] = {
+        'duration': int(round(float(duration))) if duration else None,
+        'bitrate': int(bitrate) if bitrate else None,
+        'format': fmt.get('format_name'),
+    }
+    if video:
+        info.update({
+            'width': video.get('width'),
+            'height': video.get('height'),
+            'codec': video.get('codec_name'),
+            'fps': parse_frame_rate(video.get('avg_frame_rate') or video.get('r_frame_rate')),
+        })
+    if audio:
+        info.update({
+            'audio_codec': audio.get('codec_name'),
+            'sample_rate': int(audio['sample_rate']) if audio.get('sample_rate') else None,
+            'channels': audio.get('channels'),
+        })
+    return info
+
+
+async def run_ffprobe(source: str, timeout: float = PROBE_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    Probe a local path or URL with ffprobe in a subprocess
+
+    The process is killed if it runs past the timeout.
+    """
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        raise RuntimeError("ffprobe is not installed")
+
+    process = await asyncio.create_subprocess_exec(
+        ffprobe, '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', source,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException as e:
+        # Timed out or the caller was cancelled; do not leave ffprobe running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise TimeoutError(f"ffprobe timed out after {timeout}s")
+        raise
+
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors='replace').strip() or "ffprobe failed")
+    return parse_probe(json.loads(stdout))
+
+
+def _mutagen_probe(path: str) -> Dict[str, Any]:
+    """Audio-only fallback when ffprobe is unavailable"""
+    from mutagen import File as MutagenFile
+
+    audio = MutagenFile(path)
+    if audio is None or not getattr(audio, 'info', None):
+        raise RuntimeError("Unrecognised audio file")
+    info = audio.info
+    return {
+        'duration': int(round(info.length)) if getattr(info, 'length', None) else None,
+        'bitrate': getattr(info, 'bitrate', None),
+        'sample_rate': getattr(info, 'sample_rate', None),
+        'channels': getattr(info, 'channels', None),
+    }
+
+
+class MediaProbe:
+    """Probe media with bounded concurrency and a fingerprint-keyed cache"""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_PROBES):
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def probe(self, file_url: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Metadata for a stored media path ("videos/abc.mp4" or "/uploads/...")"""
+        key = media_url_service.normalize_key(file_url)
+        source, default_fingerprint = await self._resolve(key)
+        if source is None:
+            return None
+
+        cache_key = f"media_probe:{fingerprint or default_fingerprint}"
+        cached = await cache_manager.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._slots:
+            if shutil.which('ffprobe') or media_url_service.use_r2:
+                info = await run_ffprobe(source)
+            else:
+                # Local audio can still be read with mutagen
+                info = await asyncio.wait_for(
+                    asyncio.to_thread(_mutagen_probe, source), PROBE_TIMEOUT_SECONDS
+                )
+
+        await cache_manager.set(cache_key, info, ttl=PROBE_CACHE_TTL)
+        return info
+
+    async def _resolve(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Where ffprobe should read from, plus a fingerprint for caching"""
+        if media_url_service.use_r2:
+            try:
+                head = await asyncio.to_thread(
+                    media_url_service.client.head_object,
+                    Bucket=settings.R2_BUCKET_NAME,
+                    Key=key
+                )
+            except Exception:
+                return None, None
+            # ffprobe reads over HTTP with range requests, no full download needed
+            url, _ = media_url_service.presigned_url(key)
+            return url, f"r2:{key}:{head.get('ETag', '').strip(chr(34))}"
+
+        path = Path("uploads") / key
+        if not path.is_file():
+            return None, None
+        stat = path.stat()
+        return str(path), f"local:{key}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class MediaMetadataWorker:
+    """Background queue that backfills probe results onto media rows"""
+
+    def __init__(self, workers: int = MAX_CONCURRENT_PROBES):
+        self.workers = workers
+        self.probe = MediaProbe(max_concurrent=workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def enqueue(self, model: Optional[str], row_id: Any, file_url: Optional[str], fingerprint: Optional[str] = None):
+        """
+        Schedule a probe for a committed row
+
+        model is one of "series_video", "gk_video" or "media"; None only
+        caches the result by fingerprint. Dropped with a warning if the
+        worker is not running or the queue is full.
+        """
+        if not file_url or self._queue is None:
+            return
+        try:
+            self._queue.put_nowait((model, str(row_id), file_url, fingerprint))
+        except asyncio.QueueFull:
+            logger.warning("Media probe queue full, skipping", model=model, row_id=str(row_id))
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        logger.info("Media metadata worker started", workers=self.workers)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _run(self):
+        while True:
+            model, row_id, file_url, fingerprint = await self._queue.get()
+            try:
+                info = await self.probe.probe(file_url, fingerprint)
+                if info and model is not None:
+                    await self.apply(model, row_id, info)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Media probe failed", model=model, row_id=row_id, file_url=file_url, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def apply(self, model: str, row_id: str, info: Dict[str, Any]):
+        """Write probe results onto the row, keeping values already set"""
+        from app.db.database import get_jobs_db_session
+        from app.models.media import Media
+        from app.models.video_channel import GeneralKnowledgeVideo
+        from app.models.video_series import SeriesVideo
+
+        models = {'series_video': SeriesVideo, 'gk_video': GeneralKnowledgeVideo, 'media': Media}
+        model_class = models[model]
+
+        async with get_jobs_db_session() as session:
+            row = (await session.execute(
+                select(model_class).where(model_class.id == UUID(row_id))
+            )).scalar_one_or_none()
+            if row is None:
+                return
+
+            if info.get('duration') and not row.duration:
+                row.duration = info['duration']
+
+            if model_class is Media:
+                if info.get('width') and not row.width:
+                    row.width = info['width']
+                    row.height = info.get('height')
+                row.file_metadata = {**(row.file_metadata or {}), 'probe': info}
+            else:
+                row.media_info = info
+
+            await session.commit()
+
+
+# Global worker instance
+media_metadata_worker = MediaMetadataWorker()
@@ -0,0 +1,148 @@
+"""
+Media URL service - one shared R2 client and reusable presigned URLs
+
+Building a boto3 client costs tens of milliseconds, while signing a URL is a
+cheap local HMAC. The client is created once per process, and presigned URLs
+are kept in a small LRU until shortly before they expire so repeated requests
+for the same thumbnail get the same URL (and browsers can cache the redirect).
+
+When ``MEDIA_PUBLIC_BASE_URL`` points at a public bucket or CDN, listing
+endpoints emit final URLs directly and no redirect is needed at all.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Stop handing out a cached URL this long before it expires
+REFRESH_MARGIN_SECONDS = 300
+
+
+class MediaURLService:
+    """Resolve stored media keys to URLs the browser can fetch"""
+
+    def __init__(
+        self,
+        expires_in: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        public_base_url: Optional[str] = None,
+    ):
+        self.expires_in = expires_in or settings.MEDIA_URL_EXPIRES
+        self.cache_size = cache_size or settings.MEDIA_URL_CACHE_SIZE
+        base = public_base_url if public_base_url is not None else settings.MEDIA_PUBLIC_BASE_URL
+        self.public_base_url = base.rstrip("/") if base else None
+        self.use_r2 = settings.USE_R2_STORAGE.lower() == "true"
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._urls: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._urls_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Shared S3-compatible client for the R2 bucket"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import boto3
+                    from botocore.config import Config
+
+                    self._client = boto3.client(
+                        "s3",
+                        endpoint_url=settings.R2_ENDPOINT_URL,
+                        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+                        region_name="auto",
+                        config=Config(max_pool_connections=50, retries={"max_attempts": 3}),
+                    )
+        return self._client
+
+    @staticmethod
+    def normalize_key(path: str) -> str:
+        """Turn "/uploads/images/a.jpg" or "images/a.jpg" into the bucket key"""
+        key = path.lstrip("/")
+        if key.startswith("uploads/"):
+            key = key[len("uploads/"):]
+        return key
+
+    def presigned_url(self, key: str) -> Tuple[str, int]:
+        """
+        Presigned GET URL for a bucket key
+
+        Returns the URL and the number of seconds it can still be reused,
+        which callers use as the redirect's max-age.
+        """
+        now = time.time()
+        with self._urls_lock:
+            cached = self._urls.get(key)
+            if cached and cached[1] - REFRESH_MARGIN_SECONDS > now:
+                self._urls.move_to_end(key)
+                return cached[0], int(cached[1] - REFRESH_MARGIN_SECONDS - now)
+
+        url = self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.R2_BUCKET_NAME, "Key": key},
+            ExpiresIn=self.expires_in,
+        )
+        expires_at = now + self.expires_in
+
+        with self._urls_lock:
+            self._urls[key] = (url, expires_at)
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.cache_size:
+                self._urls.popitem(last=False)
+
+        return url, max(0, self.expires_in - REFRESH_MARGIN_SECONDS)
+
+    def public_url(self, key: str) -> Optional[str]:
+        """Direct public bucket/CDN URL, if one is configured"""
+        if not self.public_base_url:
+            return None
+        return f"{self.public_base_url}/{key}"
+
+    def url_for(self, stored: Optional[str]) -> Optional[str]:
+        """
+        URL to emit in API responses for a stored media path
+
+        Absolute URLs are passed through. With a public base configured the
+        final CDN URL is returned; otherwise the ``/uploads/...`` path served
+        by the app (local disk or the R2 redirect).
+        """
+        if not stored:
+            return None
+        if stored.startswith(("http://", "https://")):
+            return stored
+
+        key = self.normalize_key(stored)
+        if self.use_r2 and self.public_base_url:
+            return self.public_url(key)
+        return f"/uploads/{key}"
+
+    def direct_url(self, stored: Optional[str]) -> Optional[str]:
+        """
+        Rewrite a stored media path to its CDN URL when one is configured
+
+        Unlike ``url_for`` this leaves the value untouched otherwise, for
+        endpoints whose clients already prefix raw keys themselves.
+        """
+        if not stored or stored.startswith(("http://", "https://")):
+            return stored
+        if self.use_r2 and self.public_base_url:
+            return self.public_url(self.normalize_key(stored))
+        return stored
+
+    def clear(self):
+        """Drop cached presigned URLs"""
+        with self._urls_lock:
+            self._urls.clear()
+
+
+# Global instance
+media_url_service = MediaURLService()
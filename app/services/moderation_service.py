@@ -4,11 +4,13 @@ Handles approval workflow, reports, pin/lock, etc.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc, update
+from sqlalchemy import select, func, and_, desc, update, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 from sqlalchemy.orm import joinedload
 from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
+import structlog
 
 from app.models.discussion import Discussion
 from app.models.discussion_comment import DiscussionComment
@@ -22,6 +24,8 @@ from app.schemas.discussion import (
     PaginationParams
 )
 
+logger = structlog.get_logger()
+
 
 class ModerationService:
     """Service for moderation and admin operations"""
@@ -58,7 +62,7 @@ class ModerationService:
             )
         except Exception as e:
             # Don't fail the approval if notification fails
-            print(f"Failed to create notification: {e}")
+            logger.error("Failed to create moderation notification", error=str(e))
         
         return discussion
     
@@ -94,7 +98,7 @@ class ModerationService:
             )
         except Exception as e:
             # Don't fail the rejection if notification fails
-            print(f"Failed to create notification: {e}")
+            logger.error("Failed to create moderation notification", error=str(e))
         
         return discussion
     
@@ -412,17 +416,36 @@ class ModerationService:
         discussion_ids: List[UUID],
         admin_id: UUID
     ) -> int:
-        """Bulk approve multiple discussions"""
-        count = 0
+        """
+        Bulk approve multiple pending discussions in one transaction
+        
+        A single UPDATE ... RETURNING moves every still-pending discussion and
+        one multi-row INSERT notifies their authors.
+        """
+        if not discussion_ids:
+            return 0
+        
+        now = datetime.utcnow()
+        rows = await ModerationService._bulk_review(
+            db,
+            discussion_ids,
+            status='approved',
+            reviewed_by=admin_id,
+            reviewed_at=now,
+            published_at=now,
+            rejection_reason=None
+        )
         
-        for discussion_id in discussion_ids:
-            discussion = await ModerationService.approve_discussion(
-                db, discussion_id, admin_id
+        notified = await ModerationService._notify_bulk(db, [
+            NotificationService.discussion_approved_values(
+                row.author_id, row.id, row.title, row.slug
             )
-            if discussion:
-                count += 1
+            for row in rows
+        ])
         
-        return count
+        await db.commit()
+        await NotificationService.announce_created(notified)
+        return len(rows)
     
     @staticmethod
     async def bulk_reject_discussions(
@@ -431,14 +454,56 @@ class ModerationService:
         admin_id: UUID,
         rejection_data: AdminApprovalRequest
     ) -> int:
-        """Bulk reject multiple discussions"""
-        count = 0
+        """
+        Bulk reject multiple pending discussions in one transaction
+        
+        Same rejection reason applied to all.
+        """
+        if not discussion_ids:
+            return 0
+        
+        rows = await ModerationService._bulk_review(
+            db,
+            discussion_ids,
+            status='rejected',
+            reviewed_by=admin_id,
+            reviewed_at=datetime.utcnow(),
+            rejection_reason=rejection_data.rejection_reason
+        )
         
-        for discussion_id in discussion_ids:
-            discussion = await ModerationService.reject_discussion(
-                db, discussion_id, admin_id, rejection_data
+        notified = await ModerationService._notify_bulk(db, [
+            NotificationService.discussion_rejected_values(
+                row.author_id, row.id, row.title, rejection_data.rejection_reason
             )
-            if discussion:
-                count += 1
+            for row in rows
+        ])
         
-        return count
\ No newline at end of file
+        await db.commit()
+        await NotificationService.announce_created(notified)
+        return len(rows)
+    
+    @staticmethod
+    async def _bulk_review(db: AsyncSession, discussion_ids: List[UUID], **values) -> list:
+        """Move pending discussions to a reviewed state, returning the rows changed"""
+        ids = bindparam("ids", value=list(set(discussion_ids)), type_=ARRAY(PGUUID(as_uuid=True)))
+        result = await db.execute(
+            update(Discussion)
+            .where(Discussion.id == any_(ids), Discussion.status == 'pending')
+            .values(**values)
+            .returning(Discussion.id, Discussion.author_id, Discussion.title, Discussion.slug)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def _notify_bulk(db: AsyncSession, notifications: List[dict]) -> List[dict]:
+        """Insert notifications in a savepoint so a failure keeps the moderation"""
+        if not notifications:
+            return []
+        try:
+            async with db.begin_nested():
+                return await NotificationService.create_notifications_bulk(db, notifications)
+        except Exception as e:
+            # Don't fail the moderation if notifications fail
+            logger.error("Failed to create moderation notifications", count=len(notifications), error=str(e))
+            return []
@@ -0,0 +1,337 @@
+"""
+Unread notification counters and live notification push
+
+Unread counts are kept per user in Redis and adjusted when notifications are
+created, read or deleted, so the badge count is a single GET instead of a
+COUNT(*) over ``notifications`` on every page. A counter is seeded from the
+database on first read and expires after a day without writes, so any drift
+heals itself. Without Redis the counters live in process memory, mirroring
+``CacheManager``; each worker then only sees its own changes, so memory
+counters are recounted a few minutes after they were seeded.
+
+Every change is also published on a Redis pub/sub channel. Each worker runs a
+single listener that fans events out to the Server-Sent Events streams of the
+users connected to it, which replaces polling ``/notifications/unread-count``.
+``EventSource`` cannot send an Authorization header, so a stream is opened
+with a single-use ticket that expires after a minute instead of putting the
+JWT in the URL, where it would end up in access logs.
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_manager
+from app.models.notification import Notification
+
+logger = structlog.get_logger()
+
+UNREAD_KEY_PREFIX = "notifications:unread:"
+UNREAD_TTL_SECONDS = 24 * 3600
+MEMORY_UNREAD_TTL_SECONDS = 300
+STREAM_TICKET_PREFIX = "notifications:ticket:"
+STREAM_TICKET_TTL_SECONDS = 60
+EVENTS_CHANNEL = "notifications:events"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Adjust a seeded counter, never going below zero. Returns nil when the counter
+# has not been seeded (or has expired) so the next read recounts instead.
+_ADJUST_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return nil
+end
+local new_value = tonumber(value) + tonumber(ARGV[1])
+if new_value < 0 then
+    new_value = 0
+end
+redis.call('SET', KEYS[1], new_value, 'EX', ARGV[2])
+return new_value
+"""
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events frame"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class NotificationEvents:
+    """Per-user unread counters plus pub/sub fan-out to connected streams"""
+
+    def __init__(self):
+        self._adjust_script = None
+        # user id -> (count, monotonic expiry)
+        self._memory_counts: Dict[str, Tuple[int, float]] = {}
+        # ticket -> (user id, monotonic expiry)
+        self._memory_tickets: Dict[str, Tuple[str, float]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self.is_running = False
+
+    @property
+    def _redis(self):
+        if cache_manager.use_redis and cache_manager.redis_client:
+            return cache_manager.redis_client
+        return None
+
+    # ------------------------------------------------------------------
+    # Unread counters
+    # ------------------------------------------------------------------
+
+    async def unread_count(self, db: AsyncSession, user_id: UUID) -> int:
+        """Unread notifications for a user, seeding the counter if needed"""
+        key = str(user_id)
+        redis_client = self._redis
+
+        if redis_client is None:
+            count = self._memory_count(key)
+            if count is None:
+                count = await self._count_unread(db, user_id)
+                # Keep a value seeded by a concurrent request while we were counting
+                if self._memory_count(key) is None:
+                    self._memory_counts[key] = (count, time.monotonic() + MEMORY_UNREAD_TTL_SECONDS)
+                count = self._memory_count(key)
+            return count
+
+        try:
+            value = await redis_client.get(UNREAD_KEY_PREFIX + key)
+            if value is not None:
+                return int(value)
+            count = await self._count_unread(db, user_id)
+            # NX keeps a value another worker seeded while we were counting
+            await redis_client.set(UNREAD_KEY_PREFIX + key, count, ex=UNREAD_TTL_SECONDS, nx=True)
+            return count
+        except Exception as e:
+            logger.error("Unread counter read failed, counting in database", user_id=key, error=str(e))
+            return await self._count_unread(db, user_id)
+
+    async def adjust_unread(self, user_id: UUID, delta: int) -> Optional[int]:
+        """
+        Add delta to a user's counter and return the new value
+
+        Returns None when the counter is not seeded; it is left for the next
+        read to count from the database.
+        """
+        key = str(user_id)
+        redis_client = self._redis
+
+        if redis_client is None:
+            count = self._memory_count(key)
+            if count is None:
+                return None
+            count = max(0, count + delta)
+            # Adjusting keeps the seed's expiry: other workers' changes are not seen here
+            self._memory_counts[key] = (count, self._memory_counts[key][1])
+            return count
+
+        try:
+            if self._adjust_script is None:
+                self._adjust_script = redis_client.register_script(_ADJUST_SCRIPT)
+            value = await self._adjust_script(
+                keys=[UNREAD_KEY_PREFIX + key], args=[delta, UNREAD_TTL_SECONDS]
+            )
+            return None if value is None else int(value)
+        except Exception as e:
+            logger.error("Unread counter update failed, dropping counter", user_id=key, error=str(e))
+            await self.forget_unread(user_id)
+            return None
+
+    async def set_unread(self, user_id: UUID, value: int) -> int:
+        """Overwrite a user's counter with a known value"""
+        key = str(user_id)
+        redis_client = self._redis
+
+        if redis_client is None:
+            self._memory_counts[key] = (value, time.monotonic() + MEMORY_UNREAD_TTL_SECONDS)
+            return value
+
+        try:
+            await redis_client.set(UNREAD_KEY_PREFIX + key, value, ex=UNREAD_TTL_SECONDS)
+        except Exception as e:
+            logger.error("Unread counter write failed", user_id=key, error=str(e))
+        return value
+
+    async def forget_unread(self, user_id: UUID):
+        """Drop a counter so the next read recounts it"""
+        key = str(user_id)
+        self._memory_counts.pop(key, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(UNREAD_KEY_PREFIX + key)
+            except Exception as e:
+                logger.error("Unread counter delete failed", user_id=key, error=str(e))
+
+    def _memory_count(self, key: str) -> Optional[int]:
+        entry = self._memory_counts.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._memory_counts[key]
+            return None
+        return entry[0]
+
+    @staticmethod
+    async def _count_unread(db: AsyncSession, user_id: UUID) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(Notification).where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.is_read == False
+                )
+            )
+        )
+        return result.scalar() or 0
+
+    # ------------------------------------------------------------------
+    # Stream tickets
+    # ------------------------------------------------------------------
+
+    async def issue_stream_ticket(self, user_id: UUID) -> str:
+        """Single-use ticket that opens one stream for this user"""
+        ticket = secrets.token_urlsafe(32)
+        redis_client = self._redis
+
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    STREAM_TICKET_PREFIX + ticket, str(user_id), ex=STREAM_TICKET_TTL_SECONDS
+                )
+                return ticket
+            except Exception as e:
+                logger.error("Stream ticket write failed, keeping it in memory", error=str(e))
+
+        now = time.monotonic()
+        for stale in [t for t, (_, expires) in self._memory_tickets.items() if expires <= now]:
+            del self._memory_tickets[stale]
+        self._memory_tickets[ticket] = (str(user_id), now + STREAM_TICKET_TTL_SECONDS)
+        return ticket
+
+    async def redeem_stream_ticket(self, ticket: str) -> Optional[UUID]:
+        """User id for a ticket, which is used up; None if unknown or expired"""
+        entry = self._memory_tickets.pop(ticket, None)
+        if entry is not None:
+            return UUID(entry[0]) if entry[1] > time.monotonic() else None
+
+        redis_client = self._redis
+        if redis_client is None:
+            return None
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.get(STREAM_TICKET_PREFIX + ticket)
+                pipe.delete(STREAM_TICKET_PREFIX + ticket)
+                value, _ = await pipe.execute()
+        except Exception as e:
+            logger.error("Stream ticket read failed", error=str(e))
+            return None
+        if value is None:
+            return None
+        return UUID(value.decode() if isinstance(value, bytes) else value)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    async def notification_created(self, user_id: UUID, payload: Dict[str, Any]):
+        """Count a committed notification and push it to the user's streams"""
+        count = await self.adjust_unread(user_id, 1)
+        event = {"type": "notification", "notification": payload}
+        if count is not None:
+            event["unread_count"] = count
+        await self.publish(user_id, event)
+
+    async def unread_changed(self, user_id: UUID, count: Optional[int]):
+        """Push a new unread count to the user's streams"""
+        if count is not None:
+            await self.publish(user_id, {"type": "unread_count", "unread_count": count})
+
+    async def publish(self, user_id: UUID, event: Dict[str, Any]):
+        """Deliver an event to every worker's streams for this user"""
+        redis_client = self._redis
+        if redis_client is not None and self.is_running:
+            try:
+                message = json.dumps({"user_id": str(user_id), "event": event}, default=str)
+                await redis_client.publish(EVENTS_CHANNEL, message)
+                return
+            except Exception as e:
+                logger.error("Notification publish failed, delivering locally", error=str(e))
+        self._dispatch(str(user_id), event)
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, user_id: UUID) -> asyncio.Queue:
+        """Register a stream for a user; pair with unsubscribe()"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: UUID, queue: asyncio.Queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+
+    def _dispatch(self, user_id: str, event: Dict[str, Any]):
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client misses events; its next count event resyncs it
+                pass
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start relaying pub/sub events to this worker's streams"""
+        if self.is_running or self._redis is None:
+            return
+        self.is_running = True
+        self._listener_task = asyncio.create_task(self._listen())
+        logger.info("Notification event listener started")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+        self._listener_task = None
+
+    async def _listen(self):
+        while self.is_running:
+            pubsub = cache_manager.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                while self.is_running:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30)
+                    if message is None:
+                        continue
+                    data = json.loads(message["data"])
+                    if data["user_id"] in self._subscribers:
+                        self._dispatch(data["user_id"], data["event"])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Notification event listener error: {e}")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+# Global instance shared by NotificationService and the stream endpoint
+notification_events = NotificationEvents()
@@ -4,13 +4,14 @@ Handles creation and management of user notifications
 """
 
 from typing import List, Optional, Dict, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import select, and_, desc, func, insert, update
 
 from app.models.notification import Notification, NotificationTypeEnum
 from app.models.user import User
+from app.services.notification_events import notification_events
 
 
 class NotificationService:
@@ -61,8 +62,118 @@ class NotificationService:
         await db.commit()
         await db.refresh(notification)
         
+        await notification_events.notification_created(
+            user_id, NotificationService.event_payload(notification)
+        )
+        
         return notification
     
+    @staticmethod
+    def event_payload(notification) -> Dict[str, Any]:
+        """Notification fields pushed to live streams (same shape as the API)"""
+        fields = ("id", "type", "title", "message", "resource_type", "resource_id",
+                  "resource_url", "is_read", "extra_data", "created_at")
+        if not isinstance(notification, dict):
+            notification = {name: getattr(notification, name) for name in fields}
+        resource_id = notification.get("resource_id")
+        return {
+            "id": str(notification["id"]),
+            "type": notification["type"],
+            "title": notification["title"],
+            "message": notification["message"],
+            "resource_type": notification.get("resource_type"),
+            "resource_id": str(resource_id) if resource_id else None,
+            "resource_url": notification.get("resource_url"),
+            "is_read": bool(notification.get("is_read")),
+            "metadata": notification.get("extra_data") or {},
+            "created_at": notification.get("created_at") or datetime.utcnow(),
+        }
+    
+    @staticmethod
+    async def create_notifications_bulk(
+        db: AsyncSession,
+        notifications: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert many notifications with a single multi-row INSERT
+        
+        Each entry takes the same keyword arguments as create_notification
+        (without db). Nothing is committed; the caller owns the transaction
+        and passes the returned rows to announce_created() after committing.
+        
+        Returns:
+            The inserted rows
+        """
+        if not notifications:
+            return []
+        
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": n["user_id"],
+                "type": n["notification_type"],
+                "title": n["title"],
+                "message": n["message"],
+                "resource_type": n.get("resource_type"),
+                "resource_id": n.get("resource_id"),
+                "resource_url": n.get("resource_url"),
+                "extra_data": n.get("extra_data") or {},
+                "is_read": False,
+            }
+            for n in notifications
+        ]
+        await db.execute(insert(Notification).values(rows))
+        return rows
+    
+    @staticmethod
+    async def announce_created(rows: List[Dict[str, Any]]):
+        """Update unread counters and push notifications inserted in bulk"""
+        for row in rows:
+            await notification_events.notification_created(
+                row["user_id"], NotificationService.event_payload(row)
+            )
+    
+    @staticmethod
+    def discussion_approved_values(
+        user_id: UUID,
+        discussion_id: UUID,
+        discussion_title: str,
+        discussion_slug: str
+    ) -> Dict[str, Any]:
+        """Notification fields for a discussion approval"""
+        return {
+            "user_id": user_id,
+            "notification_type": NotificationTypeEnum.DISCUSSION_APPROVED.value,
+            "title": "Discussion Approved! 🎉",
+            "message": f'Your discussion "{discussion_title}" has been approved and is now visible to the community.',
+            "resource_type": "discussion",
+            "resource_id": discussion_id,
+            "resource_url": f"/community/discussions/{discussion_slug}",
+            "extra_data": {"discussion_title": discussion_title, "discussion_slug": discussion_slug}
+        }
+    
+    @staticmethod
+    def discussion_rejected_values(
+        user_id: UUID,
+        discussion_id: UUID,
+        discussion_title: str,
+        rejection_reason: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Notification fields for a discussion rejection"""
+        message = f'Your discussion "{discussion_title}" was not approved.'
+        if rejection_reason:
+            message += f" Reason: {rejection_reason}"
+        
+        return {
+            "user_id": user_id,
+            "notification_type": NotificationTypeEnum.DISCUSSION_REJECTED.value,
+            "title": "Discussion Not Approved",
+            "message": message,
+            "resource_type": "discussion",
+            "resource_id": discussion_id,
+            "extra_data": {"discussion_title": discussion_title, "rejection_reason": rejection_reason}
+        }
+    
     @staticmethod
     async def create_discussion_approved_notification(
         db: AsyncSession,
@@ -74,14 +185,9 @@ class NotificationService:
         """Create notification for discussion approval"""
         return await NotificationService.create_notification(
             db=db,
-            user_id=user_id,
-            notification_type=NotificationTypeEnum.DISCUSSION_APPROVED.value,
-            title="Discussion Approved! 🎉",
-            message=f'Your discussion "{discussion_title}" has been approved and is now visible to the community.',
-            resource_type="discussion",
-            resource_id=discussion_id,
-            resource_url=f"/community/discussions/{discussion_slug}",
-            extra_data={"discussion_title": discussion_title, "discussion_slug": discussion_slug}
+            **NotificationService.discussion_approved_values(
+                user_id, discussion_id, discussion_title, discussion_slug
+            )
         )
     
     @staticmethod
@@ -93,19 +199,11 @@ class NotificationService:
         rejection_reason: Optional[str] = None
     ) -> Notification:
         """Create notification for discussion rejection"""
-        message = f'Your discussion "{discussion_title}" was not approved.'
-        if rejection_reason:
-            message += f" Reason: {rejection_reason}"
-        
         return await NotificationService.create_notification(
             db=db,
-            user_id=user_id,
-            notification_type=NotificationTypeEnum.DISCUSSION_REJECTED.value,
-            title="Discussion Not Approved",
-            message=message,
-            resource_type="discussion",
-            resource_id=discussion_id,
-            extra_data={"discussion_title": discussion_title, "rejection_reason": rejection_reason}
+            **NotificationService.discussion_rejected_values(
+                user_id, discussion_id, discussion_title, rejection_reason
+            )
         )
     
     @staticmethod
@@ -193,15 +291,8 @@ class NotificationService:
     
     @staticmethod
     async def get_unread_count(db: AsyncSession, user_id: UUID) -> int:
-        """Get count of unread notifications for a user"""
-        query = select(func.count()).select_from(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            )
-        )
-        result = await db.execute(query)
-        return result.scalar() or 0
+        """Get count of unread notifications for a user (from the live counter)"""
+        return await notification_events.unread_count(db, user_id)
     
     @staticmethod
     async def mark_as_read(
@@ -224,29 +315,31 @@ class NotificationService:
             notification.read_at = datetime.utcnow()
             await db.commit()
             await db.refresh(notification)
+            
+            count = await notification_events.adjust_unread(user_id, -1)
+            await notification_events.unread_changed(user_id, count)
         
         return notification
     
     @staticmethod
     async def mark_all_as_read(db: AsyncSession, user_id: UUID) -> int:
         """Mark all notifications as read for a user"""
-        query = select(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
+        result = await db.execute(
+            update(Notification)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.is_read == False
+                )
             )
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
         )
-        result = await db.execute(query)
-        notifications = result.scalars().all()
-        
-        count = 0
-        for notification in notifications:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
-            count += 1
+        count = result.rowcount or 0
+        await db.commit()
         
-        if count > 0:
-            await db.commit()
+        await notification_events.set_unread(user_id, 0)
+        await notification_events.unread_changed(user_id, 0)
         
         return count
     
@@ -267,8 +360,13 @@ class NotificationService:
         notification = result.scalar_one_or_none()
         
         if notification:
+            was_unread = not notification.is_read
             await db.delete(notification)
             await db.commit()
+            
+            if was_unread:
+                count = await notification_events.adjust_unread(user_id, -1)
+                await notification_events.unread_changed(user_id, count)
             return True
         
         return False
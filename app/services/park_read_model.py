@@ -0,0 +1,138 @@
+"""
+National park read model
+
+Public park endpoints serve a cached snapshot of every park, projected once:
+only approved photos and videos are kept and every upload path is resolved to
+its ``/uploads/`` URL, with datetimes and ids already in JSON form. Requests
+filter and page the snapshot in memory instead of loading and re-filtering the
+JSONB media arrays on every call.
+
+The snapshot is cached under the "national_parks" HTTP cache version. Writes
+never patch it: they bump the version, which retires the old snapshot and the
+ETags issued for it, and the next read rebuilds from the database. A reader
+that loaded pre-commit rows can only store them under the retired version, so
+concurrent writes cannot be lost.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.cache import cache_manager
+from app.models.national_park import NationalPark
+from app.services.http_cache import resource_versions
+
+SNAPSHOT_KEY_PREFIX = "parks:read_model:"
+SNAPSHOT_TTL = 24 * 3600
+UPLOADS_PREFIX = "/uploads/"
+
+
+def resolve_upload_url(url: Optional[str]) -> Optional[str]:
+    """Upload key as a /uploads/ URL (used for presigned URL generation)"""
+    if not url:
+        return url
+    return url if url.startswith(UPLOADS_PREFIX) else f"{UPLOADS_PREFIX}{url}"
+
+
+def resolve_media(items: Optional[Iterable[Any]], approved_only: bool = True) -> List[str]:
+    """
+    URLs from a park media array
+
+    Items are either legacy plain strings (always shown) or
+    {"url", "approved", ...} objects, shown when approved or when
+    approved_only is False.
+    """
+    urls = []
+    for item in items or []:
+        if isinstance(item, dict):
+            if approved_only and not item.get("approved", False):
+                continue
+            url = item.get("url")
+        else:
+            url = item
+        if url:
+            urls.append(resolve_upload_url(url))
+    return urls
+
+
+def project_park(park: NationalPark, approved_only: bool = True) -> Dict[str, Any]:
+    """JSON-ready public view of a park"""
+    return {
+        "id": str(park.id),
+        "name": park.name,
+        "state": park.state,
+        "slug": park.slug,
+        "description": park.description,
+        "biodiversity": park.biodiversity,
+        "conservation": park.conservation,
+        "media_urls": resolve_media(park.media_urls, approved_only),
+        "video_urls": resolve_media(park.video_urls, approved_only),
+        "banner_media_url": resolve_upload_url(park.banner_media_url),
+        "expedition_slugs": park.expedition_slugs or [],
+        "banner_media_type": park.banner_media_type,
+        "is_active": park.is_active,
+        "created_at": park.created_at.isoformat() if park.created_at else None,
+        "updated_at": park.updated_at.isoformat() if park.updated_at else None,
+    }
+
+
+def _snapshot(parks: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    ordered = sorted(parks.values(), key=lambda park: park["name"].lower())
+    digest = hashlib.sha1(json.dumps(ordered, sort_keys=True).encode()).hexdigest()[:20]
+    return {"version": digest, "parks": ordered}
+
+
+class ParkReadModel:
+    """Builds and serves the park snapshot, rebuilding it after writes"""
+
+    async def snapshot(self, db) -> Dict[str, Any]:
+        """Current snapshot: {"version": str, "parks": [park, ...] ordered by name}"""
+        key = SNAPSHOT_KEY_PREFIX + await resource_versions.get("national_parks")
+        cached = await cache_manager.get(key)
+        if cached is not None:
+            return cached
+
+        parks = (await db.execute(select(NationalPark))).scalars().all()
+        snapshot = _snapshot({str(park.id): project_park(park) for park in parks})
+        await cache_manager.set(key, snapshot, ttl=SNAPSHOT_TTL)
+        return snapshot
+
+    async def invalidate(self):
+        """Retire the snapshot after a park was created, changed or deleted"""
+        # Called after commit; a snapshot stored under the current token may
+        # have been built from rows read before it
+        previous = await resource_versions.get("national_parks")
+        await resource_versions.bump("national_parks")
+        await cache_manager.delete(SNAPSHOT_KEY_PREFIX + previous)
+
+    @staticmethod
+    def select(
+        snapshot: Dict[str, Any],
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Filter and page snapshot parks like the original name/state ILIKE query"""
+        parks = snapshot["parks"]
+        if is_active is not None:
+            parks = [park for park in parks if park["is_active"] == is_active]
+        if search:
+            term = search.lower()
+            parks = [
+                park for park in parks
+                if term in park["name"].lower() or term in (park["state"] or "").lower()
+            ]
+        return parks[skip:skip + limit]
+
+    @staticmethod
+    def find(snapshot: Dict[str, Any], park_id: UUID) -> Optional[Dict[str, Any]]:
+        key = str(park_id)
+        return next((park for park in snapshot["parks"] if park["id"] == key), None)
+
+
+# Global instance shared by the public and admin park routes
+park_read_model = ParkReadModel()
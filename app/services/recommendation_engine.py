@@ -0,0 +1,495 @@
+"""
+Batch recommendation engine
+
+Recommendations are computed offline and stored in ``user_recommendations`` so
+the recommendation endpoints are a single indexed read. Each run loads the
+interaction signals once and scores every user with dense NumPy matrices:
+
+- item-item co-occurrence between animals viewed or favorited by the same users
+- content similarity between animals (category, habitat, conservation status,
+  diet and taxonomic class)
+- category affinity from viewed animals and quiz results
+- user-user similarity over watched videos, borrowing neighbours' animals
+
+Animal and content top-K lists are written per user with an ``expires_at`` a
+little beyond the next scheduled run, so a missed run degrades gracefully.
+That timestamp also tells a restarted process when the last run happened, and
+a PostgreSQL advisory lock keeps workers from refreshing at the same time.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, delete, insert, and_, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import jobs_engine
+from app.models.animal_profile import AnimalProfile, UserAnimalInteraction
+from app.models.content import Content, ContentStatusEnum
+from app.models.quiz_extended import Quiz, UserQuizResult
+from app.models.recommendation import (
+    UserRecommendation, RecommendationTypeEnum, RecommendationSourceEnum
+)
+from app.models.video_progress import VideoWatchProgress
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 20
+USER_CHUNK_SIZE = 512
+REFRESH_INTERVAL = timedelta(hours=6)
+# Rows outlive one missed run before endpoints fall back
+RECOMMENDATION_TTL = REFRESH_INTERVAL * 2
+# pg_advisory_lock key shared by every process running the engine
+REFRESH_LOCK_KEY = 7_341_002
+
+FAVORITE_WEIGHT = 2.0
+# Blend of the normalised animal score components
+COOCCURRENCE_WEIGHT = 0.4
+CONTENT_WEIGHT = 0.25
+CATEGORY_WEIGHT = 0.2
+VIDEO_NEIGHBOUR_WEIGHT = 0.15
+
+_COMPONENT_SOURCES = (
+    RecommendationSourceEnum.COLLABORATIVE_FILTERING,
+    RecommendationSourceEnum.CONTENT_BASED,
+    RecommendationSourceEnum.CATEGORY_BASED,
+    RecommendationSourceEnum.COLLABORATIVE_FILTERING,
+)
+
+
+# ----------------------------------------------------------------------
+# Matrix helpers
+# ----------------------------------------------------------------------
+
+def build_index(keys: Iterable) -> Dict:
+    """Dense 0..n-1 positions for keys in first-seen order"""
+    index: Dict = {}
+    for key in keys:
+        if key not in index:
+            index[key] = len(index)
+    return index
+
+
+def sparse_to_dense(
+    triples: Sequence[Tuple[int, int, float]], shape: Tuple[int, int]
+) -> np.ndarray:
+    """Dense float32 matrix from (row, col, value) triples, summing duplicates"""
+    matrix = np.zeros(shape, dtype=np.float32)
+    if triples:
+        rows, cols, values = zip(*triples)
+        np.add.at(matrix, (np.asarray(rows), np.asarray(cols)), np.asarray(values, dtype=np.float32))
+    return matrix
+
+
+def l2_normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def max_normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row into [0, 1] by its maximum"""
+    peaks = matrix.max(axis=1, keepdims=True) if matrix.size else np.zeros((matrix.shape[0], 1))
+    return np.divide(matrix, peaks, out=np.zeros_like(matrix), where=peaks > 0)
+
+
+def cooccurrence_similarity(interactions: np.ndarray) -> np.ndarray:
+    """Cosine similarity between items' user sets (items x items, zero diagonal)"""
+    seen = (interactions > 0).astype(np.float32)
+    columns = l2_normalise_rows(seen.T)
+    similarity = columns @ columns.T
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def content_similarity(features: np.ndarray) -> np.ndarray:
+    """Cosine similarity between item feature rows (zero diagonal)"""
+    normalised = l2_normalise_rows(features)
+    similarity = normalised @ normalised.T
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def top_k(scores: np.ndarray, k: int) -> List[np.ndarray]:
+    """Column indices of the k best positive scores per row, best first"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [np.empty(0, dtype=np.int64) for _ in range(scores.shape[0])]
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    picked = []
+    for row, columns in zip(scores, candidates):
+        columns = columns[np.argsort(-row[columns])]
+        picked.append(columns[row[columns] > 0])
+    return picked
+
+
+@dataclass
+class SignalMatrices:
+    """Everything one run scores against, indexed by the dicts it carries"""
+    users: Dict[UUID, int]
+    animals: Dict[UUID, int]
+    contents: Dict[UUID, int]
+    animal_interactions: np.ndarray   # users x animals
+    video_progress: np.ndarray        # users x videos
+    quiz_categories: np.ndarray       # users x categories
+    animal_features: np.ndarray       # animals x features
+    animal_categories: np.ndarray     # animals x categories
+    content_categories: np.ndarray    # contents x categories
+    content_popularity: np.ndarray    # contents
+
+
+def score_animals(signals: SignalMatrices, cooccurrence: np.ndarray, similarity: np.ndarray,
+                  video_users: np.ndarray, seen: np.ndarray, rows: slice) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Blended animal scores for a slice of users
+
+    ``seen`` is the 0/1 users x animals matrix, computed once per run.
+
+    Returns the blended (users x animals) scores, with already-seen animals
+    zeroed, and the stacked per-component scores used to label the source.
+    """
+    interactions = signals.animal_interactions[rows]
+    affinity = category_affinity(signals, rows)
+
+    neighbours = video_users[rows] @ video_users.T
+    neighbours[np.arange(neighbours.shape[0]), np.arange(rows.start, rows.start + neighbours.shape[0])] = 0.0
+
+    components = np.stack([
+        max_normalise_rows(interactions @ cooccurrence),
+        max_normalise_rows(interactions @ similarity),
+        max_normalise_rows(affinity @ signals.animal_categories.T),
+        max_normalise_rows(neighbours @ seen),
+    ])
+    weights = np.array(
+        [COOCCURRENCE_WEIGHT, CONTENT_WEIGHT, CATEGORY_WEIGHT, VIDEO_NEIGHBOUR_WEIGHT], dtype=np.float32
+    )
+    blended = np.tensordot(weights, components, axes=1)
+    blended[interactions > 0] = 0.0
+    return blended, components
+
+
+def category_affinity(signals: SignalMatrices, rows: slice) -> np.ndarray:
+    """Per-user category weights from viewed animals and quiz results"""
+    from_animals = signals.animal_interactions[rows] @ signals.animal_categories
+    return max_normalise_rows(from_animals) + max_normalise_rows(signals.quiz_categories[rows])
+
+
+def score_contents(signals: SignalMatrices, rows: slice) -> np.ndarray:
+    """Content scores for a slice of users: category affinity times popularity"""
+    affinity = category_affinity(signals, rows)
+    return max_normalise_rows(affinity @ signals.content_categories.T) * signals.content_popularity
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+
+class RecommendationEngine:
+    """Loads signals, scores all users and stores their top-K lists"""
+
+    def __init__(self):
+        self.is_running = False
+        self._task = None
+
+    async def start(self):
+        """Refresh recommendations when due and then every REFRESH_INTERVAL"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._periodic_refresh())
+        logger.info("Recommendation engine started")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Recommendation engine stopped")
+
+    async def _periodic_refresh(self):
+        while self.is_running:
+            delay = REFRESH_INTERVAL.total_seconds()
+            try:
+                delay = await self.refresh_if_due()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error refreshing recommendations: {e}")
+            await asyncio.sleep(delay)
+
+    async def refresh_if_due(self) -> float:
+        """
+        Refresh unless the stored rows are fresh or another process is refreshing
+
+        Returns the seconds until the next refresh is due, so a restart does
+        not recompute recommendations written minutes ago.
+        """
+        async with self._locked_session() as db:
+            if db is None:
+                logger.info("Recommendations are being refreshed by another process")
+                return REFRESH_INTERVAL.total_seconds()
+
+            last_refreshed = await self._last_refreshed(db)
+            if last_refreshed is not None:
+                due_in = (last_refreshed + REFRESH_INTERVAL - datetime.now(timezone.utc)).total_seconds()
+                if due_in > 0:
+                    logger.info(f"Recommendations are fresh, next refresh in {due_in:.0f}s")
+                    return due_in
+
+            written = await self._refresh(db)
+            logger.info(f"Recommendations refreshed: {written} rows written")
+            return REFRESH_INTERVAL.total_seconds()
+
+    async def refresh_all(self) -> int:
+        """Recompute and store recommendations for every user with any signal"""
+        async with self._locked_session() as db:
+            if db is None:
+                logger.info("Recommendations are being refreshed by another process")
+                return 0
+            return await self._refresh(db)
+
+    @asynccontextmanager
+    async def _locked_session(self):
+        """
+        Jobs session whose connection holds the refresh advisory lock
+
+        Yields None when another process holds the lock. The lock is taken at
+        session level on one dedicated connection, so it survives the per-chunk
+        commits and no second pool connection is needed.
+        """
+        async with jobs_engine.connect() as connection:
+            locked = await connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+            )
+            await connection.commit()
+            if not locked:
+                yield None
+                return
+            try:
+                async with AsyncSession(bind=connection, expire_on_commit=False) as db:
+                    yield db
+            finally:
+                try:
+                    await connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY}
+                    )
+                    await connection.commit()
+                except Exception as e:
+                    # A broken connection is discarded, which releases the lock too
+                    logger.warning(f"Could not release recommendation refresh lock: {e}")
+
+    @staticmethod
+    async def _last_refreshed(db) -> Optional[datetime]:
+        """When the newest stored rows were written, from their expiry"""
+        latest = (await db.execute(
+            select(func.max(UserRecommendation.expires_at)).where(
+                UserRecommendation.recommendation_type.in_([
+                    RecommendationTypeEnum.ANIMAL_PROFILE, RecommendationTypeEnum.CONTENT
+                ])
+            )
+        )).scalar()
+        return latest - RECOMMENDATION_TTL if latest is not None else None
+
+    async def _refresh(self, db) -> int:
+        signals = await self._load_signals(db)
+        if not signals.users or not signals.animals:
+            return 0
+
+        # Scoring is CPU-bound; keep it off the event loop
+        matrices = await asyncio.to_thread(self._item_matrices, signals)
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + RECOMMENDATION_TTL
+        await db.execute(delete(UserRecommendation).where(UserRecommendation.expires_at < now))
+
+        user_ids = list(signals.users)
+        written = 0
+        for start in range(0, len(user_ids), USER_CHUNK_SIZE):
+            rows = slice(start, min(start + USER_CHUNK_SIZE, len(user_ids)))
+            records = await asyncio.to_thread(
+                self._chunk_records, signals, matrices, rows, user_ids, expires_at
+            )
+            await db.execute(
+                delete(UserRecommendation).where(and_(
+                    UserRecommendation.user_id.in_(user_ids[rows]),
+                    UserRecommendation.recommendation_type.in_([
+                        RecommendationTypeEnum.ANIMAL_PROFILE, RecommendationTypeEnum.CONTENT
+                    ]),
+                ))
+            )
+            if records:
+                await db.execute(insert(UserRecommendation), records)
+            await db.commit()
+            written += len(records)
+        return written
+
+    @staticmethod
+    def _item_matrices(signals: SignalMatrices):
+        """Per-run matrices shared by every user chunk"""
+        return (
+            cooccurrence_similarity(signals.animal_interactions),
+            content_similarity(signals.animal_features),
+            l2_normalise_rows(signals.video_progress),
+            (signals.animal_interactions > 0).astype(np.float32),
+        )
+
+    @staticmethod
+    def _chunk_records(signals: SignalMatrices, matrices, rows: slice,
+                       user_ids: List[UUID], expires_at: datetime) -> List[dict]:
+        animal_ids = list(signals.animals)
+        content_ids = list(signals.contents)
+
+        animal_scores, components = score_animals(signals, *matrices, rows)
+        content_scores = score_contents(signals, rows) if content_ids else None
+
+        signal_counts = (
+            (signals.animal_interactions[rows] > 0).sum(axis=1)
+            + (signals.video_progress[rows] > 0).sum(axis=1)
+            + (signals.quiz_categories[rows] > 0).sum(axis=1)
+        )
+
+        records = []
+        for offset, columns in enumerate(top_k(animal_scores, TOP_K)):
+            user_id = user_ids[rows.start + offset]
+            confidence = float(min(1.0, signal_counts[offset] / TOP_K))
+            for column in columns:
+                source = _COMPONENT_SOURCES[int(components[:, offset, column].argmax())]
+                records.append({
+                    "user_id": user_id,
+                    "recommendation_type": RecommendationTypeEnum.ANIMAL_PROFILE,
+                    "item_id": animal_ids[column],
+                    "source": source,
+                    "relevance_score": float(animal_scores[offset, column]),
+                    "confidence_score": confidence,
+                    "expires_at": expires_at,
+                })
+
+            if content_scores is not None:
+                for column in top_k(content_scores[offset:offset + 1], TOP_K)[0]:
+                    records.append({
+                        "user_id": user_id,
+                        "recommendation_type": RecommendationTypeEnum.CONTENT,
+                        "item_id": content_ids[column],
+                        "source": RecommendationSourceEnum.CATEGORY_BASED,
+                        "relevance_score": float(content_scores[offset, column]),
+                        "confidence_score": confidence,
+                        "expires_at": expires_at,
+                    })
+        return records
+
+    async def _load_signals(self, db) -> SignalMatrices:
+        animal_rows = (await db.execute(
+            select(
+                AnimalProfile.id, AnimalProfile.category_id, AnimalProfile.habitat_types,
+                AnimalProfile.conservation_status, AnimalProfile.diet_type, AnimalProfile.class_name,
+            ).where(AnimalProfile.is_active == True)
+        )).all()
+        interaction_rows = (await db.execute(
+            select(
+                UserAnimalInteraction.user_id, UserAnimalInteraction.animal_profile_id,
+                UserAnimalInteraction.view_count, UserAnimalInteraction.is_favorite,
+            )
+        )).all()
+        video_rows = (await db.execute(
+            select(VideoWatchProgress.user_id, VideoWatchProgress.video_slug, VideoWatchProgress.progress_percentage)
+        )).all()
+        quiz_rows = (await db.execute(
+            select(UserQuizResult.user_id, Quiz.category_id)
+            .join(Quiz, Quiz.id == UserQuizResult.quiz_id)
+            .where(Quiz.category_id.isnot(None))
+        )).all()
+        content_rows = (await db.execute(
+            select(Content.id, Content.category_id, Content.view_count)
+            .where(and_(Content.status == ContentStatusEnum.PUBLISHED, Content.category_id.isnot(None)))
+        )).all()
+
+        animals = build_index(row.id for row in animal_rows)
+        interaction_rows = [row for row in interaction_rows if row.animal_profile_id in animals]
+        users = build_index(
+            [row.user_id for row in interaction_rows]
+            + [row.user_id for row in video_rows]
+            + [row.user_id for row in quiz_rows]
+        )
+        videos = build_index(row.video_slug for row in video_rows)
+        categories = build_index(
+            [row.category_id for row in animal_rows if row.category_id]
+            + [row.category_id for row in quiz_rows]
+            + [row.category_id for row in content_rows]
+        )
+        contents = build_index(row.id for row in content_rows)
+
+        features = build_index(
+            feature for row in animal_rows for feature in self._animal_features(row)
+        )
+        animal_features = sparse_to_dense(
+            [(animals[row.id], features[f], 1.0) for row in animal_rows for f in self._animal_features(row)],
+            (len(animals), len(features)),
+        )
+        animal_categories = sparse_to_dense(
+            [(animals[row.id], categories[row.category_id], 1.0) for row in animal_rows if row.category_id],
+            (len(animals), len(categories)),
+        )
+        views = np.asarray([row.view_count or 0 for row in content_rows], dtype=np.float32)
+        popularity = np.log1p(views)
+        if popularity.size and popularity.max() > 0:
+            popularity = 0.5 + 0.5 * popularity / popularity.max()
+        else:
+            popularity = np.ones_like(popularity)
+
+        return SignalMatrices(
+            users=users,
+            animals=animals,
+            contents=contents,
+            animal_interactions=sparse_to_dense(
+                [
+                    (users[row.user_id], animals[row.animal_profile_id],
+                     float(np.log1p(row.view_count or 1)) + (FAVORITE_WEIGHT if row.is_favorite else 0.0))
+                    for row in interaction_rows
+                ],
+                (len(users), len(animals)),
+            ),
+            video_progress=sparse_to_dense(
+                [(users[row.user_id], videos[row.video_slug], (row.progress_percentage or 0) / 100.0)
+                 for row in video_rows],
+                (len(users), len(videos)),
+            ),
+            quiz_categories=sparse_to_dense(
+                [(users[row.user_id], categories[row.category_id], 1.0) for row in quiz_rows],
+                (len(users), len(categories)),
+            ),
+            animal_features=animal_features,
+            animal_categories=animal_categories,
+            content_categories=sparse_to_dense(
+                [(contents[row.id], categories[row.category_id], 1.0) for row in content_rows],
+                (len(contents), len(categories)),
+            ),
+            content_popularity=popularity,
+        )
+
+    @staticmethod
+    def _animal_features(row) -> List[str]:
+        features = []
+        if row.category_id:
+            features.append(f"category:{row.category_id}")
+        for habitat in row.habitat_types or []:
+            features.append(f"habitat:{habitat}")
+        if row.conservation_status:
+            status = getattr(row.conservation_status, "value", row.conservation_status)
+            features.append(f"status:{status}")
+        if row.diet_type:
+            features.append(f"diet:{row.diet_type.lower()}")
+        if row.class_name:
+            features.append(f"class:{row.class_name.lower()}")
+        return features
+
+
+# Global instance started in the app lifespan
+recommendation_engine = RecommendationEngine()
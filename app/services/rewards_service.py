@@ -18,8 +18,9 @@ from app.models.rewards import (
 )
 from app.models import UserQuizResult
 from app.models.user import User
-from app.models.site_setting import SiteSetting
 from app.services.currency_service import currency_service, CurrencyTypeEnum
+from app.services.daily_activity_counters import daily_activity_counters
+from app.services.settings_service import SettingsService
 from app.core.rewards_config import ANTI_GAMING_CONFIG  # Only use non-deprecated configs
 
 logger = structlog.get_logger()
@@ -34,13 +35,8 @@ class RewardsService:
     async def _check_pure_scoring_mode(self, db: AsyncSession) -> bool:
         """Check if pure scoring mode is enabled (no multipliers/bonuses)"""
         try:
-            result = await db.execute(
-                select(SiteSetting).where(SiteSetting.key == 'pure_scoring_mode')
-            )
-            setting = result.scalar_one_or_none()
-            if setting:
-                return setting.parsed_value
-            return False  # Default to False if setting not found
+            # Default to False if setting not found
+            return await SettingsService(db).get_bool('pure_scoring_mode', False)
         except Exception as e:
             self.logger.warning("Error checking pure scoring mode", error=str(e))
             return False
@@ -72,8 +68,8 @@ class RewardsService:
                 return {"points_earned": 0, "credits_earned": 0, "reward_tier": reward_tier.value}
             
             # Check if user has reached daily limits
-            daily_activity = await self._get_daily_activity(db, user_id)
-            if not await self._check_daily_reward_limits(daily_activity, rewards_config):
+            daily_counters = await daily_activity_counters.get(db, user_id)
+            if not await self._check_daily_reward_limits(daily_counters, rewards_config):
                 return {"points_earned": 0, "credits_earned": 0, "reward_tier": reward_tier.value, "reason": "daily_limit_reached"}
             
             # Calculate base rewards
@@ -140,7 +136,7 @@ class RewardsService:
                 )
             
             # Update daily activity
-            daily_activity.quiz_completions += 1
+            await daily_activity_counters.increment(db, user_id, "quiz_completions")
             
             # Update quiz result with reward info
             quiz_result = await db.get(UserQuizResult, quiz_result_id)
@@ -198,8 +194,8 @@ class RewardsService:
                 return {"points_earned": 0, "credits_earned": 0, "reward_tier": reward_tier.value}
             
             # Check daily limits
-            daily_activity = await self._get_daily_activity(db, user_id)
-            if not await self._check_daily_reward_limits(daily_activity, rewards_config):
+            daily_counters = await daily_activity_counters.get(db, user_id)
+            if not await self._check_daily_reward_limits(daily_counters, rewards_config):
                 return {"points_earned": 0, "credits_earned": 0, "reward_tier": reward_tier.value, "reason": "daily_limit_reached"}
             
             # Calculate rewards
@@ -279,7 +275,7 @@ class RewardsService:
                 )
             
             # Update daily activity
-            daily_activity.myths_facts_games += 1
+            await daily_activity_counters.increment(db, user_id, "myths_facts_games")
             
             result = {
                 "points_earned": points_earned,
@@ -424,7 +420,7 @@ class RewardsService:
     
     async def _check_daily_reward_limits(
         self, 
-        daily_activity: UserDailyActivity, 
+        daily_counters: Dict[str, int], 
         rewards_config: RewardsConfiguration
     ) -> bool:
         """Check if user has reached daily reward limits"""
@@ -434,9 +430,9 @@ class RewardsService:
         
         # Check if adding this reward would exceed the daily cap
         if rewards_config.activity_type == ActivityTypeEnum.QUIZ_COMPLETION:
-            return daily_activity.points_earned_today < rewards_config.daily_cap
+            return daily_counters["points_earned_today"] < rewards_config.daily_cap
         elif rewards_config.activity_type == ActivityTypeEnum.MYTHS_FACTS_GAME:
-            return daily_activity.points_earned_today < rewards_config.daily_cap
+            return daily_counters["points_earned_today"] < rewards_config.daily_cap
         
         return True
     
@@ -445,6 +441,7 @@ class RewardsService:
         
         try:
             daily_activity = await self._get_daily_activity(db, user_id)
+            daily_counters = await daily_activity_counters.get(db, user_id)
             
             # Get all active reward configurations
             result = await db.execute(
@@ -473,10 +470,10 @@ class RewardsService:
             return {
                 "rewards_structure": rewards_summary,
                 "daily_progress": {
-                    "points_earned_today": daily_activity.points_earned_today,
-                    "credits_earned_today": daily_activity.credits_earned_today,
-                    "quiz_completions": daily_activity.quiz_completions,
-                    "myths_facts_games": daily_activity.myths_facts_games,
+                    "points_earned_today": daily_counters["points_earned_today"],
+                    "credits_earned_today": daily_counters["credits_earned_today"],
+                    "quiz_completions": daily_counters["quiz_completions"],
+                    "myths_facts_games": daily_counters["myths_facts_games"],
                     "login_streak": daily_activity.login_streak
                 }
             }
@@ -1,49 +1,190 @@
 """
 Settings Service - Centralized settings management with caching
+
+Site settings are read on nearly every gameplay request but change only a few
+times a week, so they are held in a process-wide ``SettingsRegistry`` snapshot.
+``SettingsService`` instances are cheap per-request views over that snapshot:
+the hot path never touches the database.
+
+Writers call ``settings_registry.publish_change()`` after committing. That bumps
+a version counter in Redis and publishes on a pub/sub channel so every worker
+marks its snapshot stale and reloads it once on next use. A periodic version
+check covers missed pub/sub messages; without Redis only the local worker is
+invalidated.
 """
 
+import asyncio
 from typing import Any, Dict, Optional, Union
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 import json
 
+from app.core.cache import cache_manager
 from app.models.site_setting import SiteSetting
 
 logger = structlog.get_logger()
 
+SETTINGS_VERSION_KEY = "site_settings:version"
+SETTINGS_CHANNEL = "site_settings:invalidate"
+VERSION_POLL_INTERVAL_SECONDS = 30
+
+
+class SettingsRegistry:
+    """Process-wide, versioned snapshot of all site settings"""
+    
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._stale = True
+        # Bumped by mark_stale so a reload can tell it raced an invalidation
+        self._generation = 0
+        self._version: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._listener_task: Optional[asyncio.Task] = None
+        self.is_running = False
+    
+    @property
+    def is_loaded(self) -> bool:
+        return not self._stale
+    
+    async def snapshot(self, db: AsyncSession) -> Dict[str, Any]:
+        """Return the current settings, loading them with ``db`` only when stale"""
+        if not self._stale:
+            return self._values
+        
+        async with self._lock:
+            if self._stale:
+                await self.reload(db)
+        return self._values
+    
+    async def reload(self, db: AsyncSession) -> None:
+        """Load every setting from the database into a fresh snapshot"""
+        generation = self._generation
+        version = await self._read_version()
+        try:
+            result = await db.execute(select(SiteSetting))
+            rows = result.scalars().all()
+        except Exception as e:
+            logger.error(f"Error loading settings: {e}")
+            # Keep serving the previous snapshot; retry on next access
+            return
+        
+        values = {}
+        for setting in rows:
+            try:
+                values[setting.key] = setting.parsed_value
+            except (ValueError, TypeError, AttributeError) as e:
+                # A malformed row falls back to the caller's default
+                logger.warning(
+                    "Ignoring invalid setting value",
+                    key=setting.key, data_type=setting.data_type, error=str(e)
+                )
+        
+        # Swap the whole dict so concurrent readers never see a partial load
+        self._values = values
+        self._version = version
+        # Stay stale if the settings changed while we were loading
+        self._stale = self._generation != generation
+        logger.info(f"Loaded {len(values)} settings into cache", version=version)
+    
+    def mark_stale(self) -> None:
+        """Force a reload on next access in this process"""
+        self._generation += 1
+        self._stale = True
+    
+    async def publish_change(self) -> None:
+        """Invalidate the snapshot in this and every other worker"""
+        self.mark_stale()
+        if not (cache_manager.use_redis and cache_manager.redis_client):
+            return
+        try:
+            version = await cache_manager.redis_client.incr(SETTINGS_VERSION_KEY)
+            await cache_manager.redis_client.publish(SETTINGS_CHANNEL, str(version))
+        except Exception as e:
+            logger.error(f"Error publishing settings change: {e}")
+    
+    async def _read_version(self) -> Optional[int]:
+        if not (cache_manager.use_redis and cache_manager.redis_client):
+            return None
+        try:
+            value = await cache_manager.redis_client.get(SETTINGS_VERSION_KEY)
+            return int(value) if value is not None else 0
+        except Exception as e:
+            logger.warning(f"Error reading settings version: {e}")
+            return None
+    
+    async def start(self) -> None:
+        """Start listening for settings changes from other workers"""
+        if self.is_running or not (cache_manager.use_redis and cache_manager.redis_client):
+            return
+        self.is_running = True
+        self._listener_task = asyncio.create_task(self._listen())
+        logger.info("Settings invalidation listener started")
+    
+    async def stop(self) -> None:
+        """Stop the invalidation listener"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+        self._listener_task = None
+    
+    async def _listen(self) -> None:
+        while self.is_running:
+            pubsub = cache_manager.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(SETTINGS_CHANNEL)
+                while self.is_running:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=VERSION_POLL_INTERVAL_SECONDS
+                    )
+                    if message is not None:
+                        self.mark_stale()
+                        continue
+                    
+                    # Quiet period: make sure no message was missed
+                    version = await self._read_version()
+                    if version is not None and self._version is not None and version != self._version:
+                        self.mark_stale()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Settings invalidation listener error: {e}")
+                self.mark_stale()
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+# Global registry instance shared by every SettingsService
+settings_registry = SettingsRegistry()
+
 
 class SettingsService:
     """Service for managing site settings with caching"""
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self._cache: Dict[str, Any] = {}
-        self._cache_loaded = False
+    
+    @property
+    def _cache(self) -> Dict[str, Any]:
+        """Current snapshot (empty until first loaded)"""
+        return settings_registry._values
     
     async def load_all_settings(self) -> None:
-        """Load all settings into cache"""
-        try:
-            result = await self.db.execute(select(SiteSetting))
-            settings = result.scalars().all()
-            
-            self._cache = {}
-            for setting in settings:
-                self._cache[setting.key] = setting.parsed_value
-            
-            self._cache_loaded = True
-            logger.info(f"Loaded {len(self._cache)} settings into cache")
-            
-        except Exception as e:
-            logger.error(f"Error loading settings: {e}")
-            self._cache = {}
+        """Reload all settings into the shared cache"""
+        await settings_registry.reload(self.db)
     
     async def get(self, key: str, default: Any = None) -> Any:
         """Get a setting value"""
-        if not self._cache_loaded:
-            await self.load_all_settings()
-        
-        return self._cache.get(key, default)
+        values = await settings_registry.snapshot(self.db)
+        return values.get(key, default)
     
     async def get_bool(self, key: str, default: bool = False) -> bool:
         """Get a boolean setting"""
@@ -86,9 +227,6 @@ class SettingsService:
     async def set(self, key: str, value: Any) -> None:
         """Set a setting value"""
         try:
-            # Update cache
-            self._cache[key] = value
-            
             # Update database
             result = await self.db.execute(
                 select(SiteSetting).where(SiteSetting.key == key)
@@ -111,14 +249,16 @@ class SettingsService:
             
             await self.db.commit()
             
+            # Invalidate every worker's snapshot
+            await settings_registry.publish_change()
+            
         except Exception as e:
             logger.error(f"Error setting {key}: {e}")
             raise
     
     async def invalidate_cache(self) -> None:
         """Invalidate the cache"""
-        self._cache = {}
-        self._cache_loaded = False
+        await settings_registry.publish_change()
     
     # Convenience methods for specific settings
     
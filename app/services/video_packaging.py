@@ -0,0 +1,379 @@
+"""
+Adaptive-bitrate video packaging
+
+Transcodes an uploaded video into an HLS ladder with ffmpeg, plus a poster
+frame and a sprite sheet with a WebVTT index for scrub previews. Jobs run in
+a small background queue (each job drives ffmpeg subprocesses, so the API
+process only waits on them) and the resulting manifest is recorded on the
+video row's ``streaming`` column.
+
+HLS playlists reference their segments relatively, so on R2 the packaged
+output is only exposed when MEDIA_PUBLIC_BASE_URL serves the bucket publicly;
+presigned redirects cannot sign the segment requests.
+
+Every packaging run writes to a fresh ``hls/<row id>/<version>`` prefix, so
+output can be cached as immutable and re-packaging a replaced file never
+serves segments from the previous one. The previous prefix is deleted once
+the new manifest is recorded.
+
+Local usage, without a database:
+
+    python -m app.services.video_packaging input.mp4 out_dir/
+"""
+
+import asyncio
+import math
+import mimetypes
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+import structlog
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.services.media_probe import run_ffprobe
+from app.services.media_urls import media_url_service
+
+logger = structlog.get_logger()
+
+SEGMENT_SECONDS = 6
+SPRITE_THUMB_WIDTH = 160
+SPRITE_COLUMNS = 10
+SPRITE_MAX_FRAMES = 100
+QUEUE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    height: int
+    video_bitrate_k: int
+    audio_bitrate_k: int
+
+
+LADDER = (
+    Rendition("1080p", 1080, 5000, 128),
+    Rendition("720p", 720, 2800, 128),
+    Rendition("480p", 480, 1400, 96),
+    Rendition("360p", 360, 800, 96),
+)
+
+
+def build_ladder(source_height: Optional[int]) -> List[Rendition]:
+    """Renditions at or below the source height (always at least the smallest)"""
+    if not source_height:
+        return list(LADDER[1:])
+    ladder = [r for r in LADDER if r.height <= source_height]
+    return ladder or [LADDER[-1]]
+
+
+def hls_command(source: str, output_dir: Path, ladder: List[Rendition], has_audio: bool) -> List[str]:
+    """Single-pass ffmpeg invocation producing every rendition and the master playlist"""
+    count = len(ladder)
+    split = f"[0:v]split={count}" + "".join(f"[v{i}]" for i in range(count))
+    scales = [f"[v{i}]scale=-2:{r.height}[v{i}out]" for i, r in enumerate(ladder)]
+
+    cmd = ['ffmpeg', '-y', '-v', 'error', '-i', source, '-filter_complex', ";".join([split] + scales)]
+    for i, r in enumerate(ladder):
+        cmd += [
+            '-map', f'[v{i}out]',
+            f'-b:v:{i}', f'{r.video_bitrate_k}k',
+            f'-maxrate:v:{i}', f'{int(r.video_bitrate_k * 1.07)}k',
+            f'-bufsize:v:{i}', f'{int(r.video_bitrate_k * 1.5)}k',
+        ]
+        if has_audio:
+            cmd += ['-map', 'a:0', f'-b:a:{i}', f'{r.audio_bitrate_k}k']
+
+    # Keyframes at every segment boundary, by timestamp so any frame rate works,
+    # and no others so every rendition switches cleanly
+    cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main']
+    if has_audio:
+        cmd += ['-c:a', 'aac', '-ac', '2']
+    stream_map = " ".join(
+        f"v:{i},a:{i},name:{r.name}" if has_audio else f"v:{i},name:{r.name}"
+        for i, r in enumerate(ladder)
+    )
+    cmd += [
+        '-force_key_frames', f'expr:gte(t,n_forced*{SEGMENT_SECONDS})', '-sc_threshold', '0',
+        '-f', 'hls',
+        '-hls_time', str(SEGMENT_SECONDS),
+        '-hls_playlist_type', 'vod',
+        '-hls_flags', 'independent_segments',
+        '-hls_segment_filename', str(output_dir / '%v' / 'seg_%04d.ts'),
+        '-master_pl_name', 'master.m3u8',
+        '-var_stream_map', stream_map,
+        str(output_dir / '%v' / 'index.m3u8'),
+    ]
+    return cmd
+
+
+def _vtt_time(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def sprite_vtt(duration: float, interval: float, thumb_height: int, sprite_name: str = "sprite.jpg") -> str:
+    """WebVTT cues pointing at tiles of the sprite sheet"""
+    frames = min(SPRITE_MAX_FRAMES, max(1, math.ceil(duration / interval)))
+    lines = ["WEBVTT", ""]
+    for index in range(frames):
+        start = index * interval
+        end = min(duration, start + interval)
+        x = (index % SPRITE_COLUMNS) * SPRITE_THUMB_WIDTH
+        y = (index // SPRITE_COLUMNS) * thumb_height
+        lines += [
+            f"{_vtt_time(start)} --> {_vtt_time(end)}",
+            f"{sprite_name}#xywh={x},{y},{SPRITE_THUMB_WIDTH},{thumb_height}",
+            ""
+        ]
+    return "\n".join(lines)
+
+
+async def _run(cmd: List[str], timeout: float):
+    """Run an ffmpeg command, killing it on timeout or cancellation"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors='replace').strip()[-2000:] or f"{cmd[0]} failed")
+
+
+async def package_video(source: str, output_dir: Path) -> Dict[str, Any]:
+    """
+    Produce HLS renditions, a poster and a scrub sprite for one video
+
+    Returns the manifest with paths relative to output_dir.
+    """
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("ffmpeg is not installed")
+
+    info = await run_ffprobe(source)
+    duration = float(info.get('duration') or 0)
+    width, height = info.get('width'), info.get('height')
+    if not width or not height:
+        raise RuntimeError("Source has no video stream")
+
+    ladder = build_ladder(height)
+    timeout = max(600, duration * 3)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for rendition in ladder:
+        (output_dir / rendition.name).mkdir(exist_ok=True)
+
+    await _run(hls_command(source, output_dir, ladder, bool(info.get('audio_codec'))), timeout)
+
+    poster_at = min(duration * 0.1, 10) if duration else 0
+    await _run([
+        'ffmpeg', '-y', '-v', 'error', '-ss', f"{poster_at:.2f}", '-i', source,
+        '-frames:v', '1', '-vf', f"scale=-2:{min(height, 720)}", '-q:v', '3',
+        str(output_dir / 'poster.jpg')
+    ], 120)
+
+    interval = max(2.0, duration / SPRITE_MAX_FRAMES) if duration else 2.0
+    thumb_height = int(round(SPRITE_THUMB_WIDTH * height / width / 2) * 2)
+    rows = math.ceil(min(SPRITE_MAX_FRAMES, max(1, math.ceil(duration / interval))) / SPRITE_COLUMNS)
+    await _run([
+        'ffmpeg', '-y', '-v', 'error', '-i', source,
+        '-vf', f"fps=1/{interval:.3f},scale={SPRITE_THUMB_WIDTH}:{thumb_height},tile={SPRITE_COLUMNS}x{max(rows, 1)}",
+        '-frames:v', '1', '-q:v', '5',
+        str(output_dir / 'sprite.jpg')
+    ], timeout)
+    (output_dir / 'thumbnails.vtt').write_text(sprite_vtt(duration, interval, thumb_height))
+
+    return {
+        'status': 'ready',
+        'hls': 'master.m3u8',
+        'poster': 'poster.jpg',
+        'sprite': 'sprite.jpg',
+        'thumbnails_vtt': 'thumbnails.vtt',
+        'renditions': [
+            {'name': r.name, 'height': r.height, 'bitrate': (r.video_bitrate_k + r.audio_bitrate_k) * 1000}
+            for r in ladder
+        ],
+        'segment_seconds': SEGMENT_SECONDS,
+    }
+
+
+def public_manifest(streaming: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Manifest with browser-usable URLs, or None when packaging is not usable"""
+    if not streaming or streaming.get('status') != 'ready':
+        return None
+    if media_url_service.use_r2 and not media_url_service.public_base_url:
+        return None
+
+    prefix = streaming['prefix']
+    return {
+        'hls_url': media_url_service.url_for(f"{prefix}/{streaming['hls']}"),
+        'poster_url': media_url_service.url_for(f"{prefix}/{streaming['poster']}"),
+        'sprite_url': media_url_service.url_for(f"{prefix}/{streaming['sprite']}"),
+        'thumbnails_vtt_url': media_url_service.url_for(f"{prefix}/{streaming['thumbnails_vtt']}"),
+        'renditions': streaming.get('renditions', []),
+    }
+
+
+class VideoPackagingWorker:
+    """Background queue that packages uploaded videos and records the manifest"""
+
+    def __init__(self, workers: Optional[int] = None, upload_dir: str = "uploads"):
+        self.workers = workers or settings.VIDEO_PACKAGING_WORKERS
+        self.upload_dir = Path(upload_dir)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    @property
+    def enabled(self) -> bool:
+        return settings.VIDEO_PACKAGING_ENABLED
+
+    def enqueue(self, model: str, row_id: Any, file_url: Optional[str]):
+        """Schedule packaging for a committed row ("series_video", "gk_video" or "media")"""
+        if not file_url or self._queue is None:
+            return
+        try:
+            self._queue.put_nowait((model, str(row_id), file_url))
+        except asyncio.QueueFull:
+            logger.warning("Video packaging queue full, skipping", model=model, row_id=str(row_id))
+
+    async def start(self):
+        if self._tasks or not self.enabled:
+            return
+        if not shutil.which('ffmpeg'):
+            logger.warning("ffmpeg not found, video packaging disabled")
+            return
+        self._queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        logger.info("Video packaging worker started", workers=self.workers)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _run(self):
+        while True:
+            model, row_id, file_url = await self._queue.get()
+            try:
+                await self.process(model, row_id, file_url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Video packaging failed", model=model, row_id=row_id, error=str(e))
+                await self.record(model, row_id, {'status': 'failed', 'error': str(e)[:500]})
+            finally:
+                self._queue.task_done()
+
+    async def process(self, model: str, row_id: str, file_url: str):
+        """Package one video and store the result next to the source"""
+        key = media_url_service.normalize_key(file_url)
+        prefix = f"hls/{row_id}/{uuid4().hex[:12]}"
+        output_dir = self.upload_dir / prefix
+
+        if media_url_service.use_r2:
+            # ffmpeg reads the presigned URL directly
+            source, _ = media_url_service.presigned_url(key)
+        else:
+            source = str(self.upload_dir / key)
+
+        previous = await self.record(model, row_id, {'status': 'processing'})
+        try:
+            manifest = await package_video(source, output_dir)
+            if media_url_service.use_r2:
+                await asyncio.to_thread(_upload_tree, output_dir, prefix)
+        except BaseException:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise
+        if media_url_service.use_r2:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        manifest['prefix'] = prefix
+        await self.record(model, row_id, manifest)
+        logger.info("Video packaged", model=model, row_id=row_id, renditions=len(manifest['renditions']))
+
+        old_prefix = (previous or {}).get('prefix')
+        if old_prefix and old_prefix != prefix:
+            await self.remove(old_prefix)
+
+    async def remove(self, prefix: str):
+        """Delete a previous package, locally and in the bucket"""
+        shutil.rmtree(self.upload_dir / prefix, ignore_errors=True)
+        if media_url_service.use_r2:
+            try:
+                await asyncio.to_thread(_delete_tree, prefix)
+            except Exception as e:
+                logger.warning("Could not delete old video package", prefix=prefix, error=str(e))
+
+    async def record(self, model: str, row_id: str, streaming: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Store the streaming manifest on the row; returns the one it replaced"""
+        from app.db.database import get_jobs_db_session
+        from app.models.media import Media
+        from app.models.video_channel import GeneralKnowledgeVideo
+        from app.models.video_series import SeriesVideo
+
+        models = {'series_video': SeriesVideo, 'gk_video': GeneralKnowledgeVideo, 'media': Media}
+        model_class = models[model]
+
+        async with get_jobs_db_session() as session:
+            row = (await session.execute(
+                select(model_class).where(model_class.id == UUID(row_id))
+            )).scalar_one_or_none()
+            if row is None:
+                return None
+            if model_class is Media:
+                previous = (row.file_metadata or {}).get('streaming')
+                row.file_metadata = {**(row.file_metadata or {}), 'streaming': streaming}
+            else:
+                previous = row.streaming
+                row.streaming = streaming
+            await session.commit()
+            return previous
+
+
+def _upload_tree(local_dir: Path, prefix: str):
+    """Upload packaged output to R2 under prefix"""
+    client = media_url_service.client
+    for path in local_dir.rglob('*'):
+        if not path.is_file():
+            continue
+        content_type = {
+            '.m3u8': 'application/vnd.apple.mpegurl',
+            '.ts': 'video/mp2t',
+            '.vtt': 'text/vtt',
+        }.get(path.suffix) or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        client.upload_file(
+            str(path), settings.R2_BUCKET_NAME, f"{prefix}/{path.relative_to(local_dir).as_posix()}",
+            ExtraArgs={'ContentType': content_type, 'CacheControl': 'public, max-age=31536000, immutable'}
+        )
+
+
+def _delete_tree(prefix: str):
+    """Delete every object under prefix from R2"""
+    client = media_url_service.client
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=settings.R2_BUCKET_NAME, Prefix=f"{prefix}/"):
+        objects = [{'Key': item['Key']} for item in page.get('Contents', [])]
+        if objects:
+            client.delete_objects(Bucket=settings.R2_BUCKET_NAME, Delete={'Objects': objects})
+
+
+# Global worker instance
+video_packaging_worker = VideoPackagingWorker()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m app.services.video_packaging <input video> <output dir>")
+        sys.exit(1)
+    result = asyncio.run(package_video(sys.argv[1], Path(sys.argv[2])))
+    print(result)
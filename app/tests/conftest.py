@@ -13,7 +13,7 @@ import os
 from pathlib import Path
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_read_db
 from app.core.config import settings
 from app.models.user import User
 from app.models.category import Category
@@ -74,8 +74,9 @@ async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield test_db
     
-    # Override both database dependencies
+    # Override every database dependency
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_db_session] = override_get_db
     
     transport = ASGITransport(app=app)
@@ -0,0 +1,34 @@
+"""
+Tests for the admin listing engine
+"""
+
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from app.services.admin_listing import ListPage, decode_cursor, encode_cursor
+
+
+class TestCursors:
+    """Test keyset cursor encoding and page links"""
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        row_id = uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    def test_malformed_cursor_starts_from_first_page(self):
+        assert decode_cursor(None) is None
+        assert decode_cursor("") is None
+        assert decode_cursor("not-a-cursor") is None
+        assert decode_cursor(encode_cursor(datetime.now(timezone.utc), "nope")) is None
+
+    def test_href_keeps_filters_and_drops_empty_ones(self):
+        page = ListPage(items=[], total=42, limit=10, next_cursor="abc", prev_cursor=None)
+
+        query = parse_qs(page.href({"search": "tiger", "category_id": "", "active_only": False}, "next")[1:])
+
+        assert query == {"search": ["tiger"], "limit": ["10"], "after": ["abc"]}
+        assert page.href({}, "prev") is None
+        assert page.has_next and not page.has_prev
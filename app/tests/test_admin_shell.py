@@ -0,0 +1,40 @@
+"""
+Tests for the compiled admin shell
+"""
+
+from app.admin.templates.base import (
+    admin_asset_url,
+    compile_admin_shell,
+    create_html_page,
+    get_admin_asset,
+    get_admin_css,
+)
+
+
+class TestAdminShell:
+    """Test fingerprinted assets and the cached layout"""
+
+    def test_assets_are_fingerprinted(self):
+        css_url = admin_asset_url("css")
+        js_url = admin_asset_url("js")
+
+        assert css_url.startswith("/admin/assets/admin.") and css_url.endswith(".css")
+        assert js_url.startswith("/admin/assets/admin.") and js_url.endswith(".js")
+
+        body, media_type = get_admin_asset(css_url.rsplit("/", 1)[1])
+        assert body == get_admin_css().encode("utf-8")
+        assert media_type.startswith("text/css")
+        assert get_admin_asset("admin.unknown.css") is None
+
+    def test_page_links_assets_instead_of_inlining(self):
+        html = create_html_page("Blog", "<p>hello</p>", "blog")
+
+        assert "<title>Blog - Junglore Admin</title>" in html
+        assert "<p>hello</p>" in html
+        assert admin_asset_url("css") in html and admin_asset_url("js") in html
+        assert "<style>" not in html
+        assert 'class="nav-link active" data-page="blog"' in html
+        assert 'class="nav-link active" data-page="dashboard"' not in html
+
+    def test_shell_is_compiled_once(self):
+        assert compile_admin_shell() is compile_admin_shell()
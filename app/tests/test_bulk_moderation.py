@@ -0,0 +1,161 @@
+"""
+Tests for bulk discussion moderation
+"""
+
+from collections import namedtuple
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.discussion import AdminApprovalRequest
+from app.services import moderation_service
+from app.services.moderation_service import ModerationService
+from app.services.notification_service import NotificationService
+
+ReviewedRow = namedtuple("ReviewedRow", "id author_id title slug")
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _Savepoint:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _FakeSession:
+    """Records statements; UPDATEs return the given reviewed rows"""
+
+    def __init__(self, reviewed_rows=(), fail_inserts=False):
+        self.reviewed_rows = list(reviewed_rows)
+        self.fail_inserts = fail_inserts
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if statement.is_insert and self.fail_inserts:
+            raise RuntimeError("insert failed")
+        return _FakeResult(self.reviewed_rows if statement.is_update else [])
+
+    def begin_nested(self):
+        return _Savepoint()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _compiled(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.fixture
+def announced(monkeypatch):
+    rows = []
+
+    async def announce_created(created):
+        rows.extend(created)
+
+    monkeypatch.setattr(NotificationService, "announce_created", staticmethod(announce_created))
+    return rows
+
+
+def _rows(count):
+    return [ReviewedRow(uuid4(), uuid4(), f"Discussion {i}", f"discussion-{i}") for i in range(count)]
+
+
+class TestBulkModeration:
+    """Test one UPDATE and one notification INSERT per bulk action"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_approve(self, announced):
+        rows = _rows(3)
+        db = _FakeSession(rows)
+        ids = [row.id for row in rows]
+
+        approved = await ModerationService.bulk_approve_discussions(db, ids + ids[:1], uuid4())
+
+        assert approved == 3
+        update, insert = db.statements
+        assert update.is_update and insert.is_insert
+        compiled = _compiled(update)
+        assert compiled.params["status"] == "approved"
+        assert sorted(compiled.params["ids"]) == sorted(ids)
+        assert "discussions.status = %(status_1)s" in str(compiled)
+        assert db.commits == 1
+        assert [row["user_id"] for row in announced] == [row.author_id for row in rows]
+        assert announced[0]["resource_url"] == "/community/discussions/discussion-0"
+
+    @pytest.mark.asyncio
+    async def test_bulk_reject_uses_reason(self, announced):
+        rows = _rows(2)
+        db = _FakeSession(rows)
+
+        rejected = await ModerationService.bulk_reject_discussions(
+            db, [row.id for row in rows], uuid4(),
+            AdminApprovalRequest(action="reject", rejection_reason="Off topic")
+        )
+
+        assert rejected == 2
+        assert _compiled(db.statements[0]).params["rejection_reason"] == "Off topic"
+        assert all(row["message"].endswith("Reason: Off topic") for row in announced)
+
+    @pytest.mark.asyncio
+    async def test_nothing_pending_sends_nothing(self, announced):
+        db = _FakeSession([])
+
+        assert await ModerationService.bulk_approve_discussions(db, [uuid4()], uuid4()) == 0
+        assert len(db.statements) == 1
+        assert announced == []
+        assert await ModerationService.bulk_approve_discussions(db, [], uuid4()) == 0
+
+    @pytest.mark.asyncio
+    async def test_notification_failure_keeps_moderation(self, announced, monkeypatch):
+        errors = []
+        monkeypatch.setattr(
+            moderation_service.logger, "error",
+            lambda event, **kwargs: errors.append((event, kwargs)),
+        )
+        db = _FakeSession(_rows(2), fail_inserts=True)
+
+        assert await ModerationService.bulk_approve_discussions(db, [uuid4()], uuid4()) == 2
+        assert db.commits == 1
+        assert announced == []
+        assert errors[0][1]["count"] == 2
+
+
+class TestCreateNotificationsBulk:
+    """Test the multi-row notification INSERT"""
+
+    @pytest.mark.asyncio
+    async def test_single_multi_row_insert(self):
+        db = _FakeSession()
+        users = [uuid4(), uuid4()]
+
+        rows = await NotificationService.create_notifications_bulk(db, [
+            NotificationService.discussion_approved_values(user, uuid4(), "Title", "slug")
+            for user in users
+        ])
+
+        assert len(db.statements) == 1
+        params = _compiled(db.statements[0]).params
+        assert [params["user_id_m0"], params["user_id_m1"]] == users
+        assert params["is_read_m0"] is False
+        assert [row["user_id"] for row in rows] == users
+        assert rows[0]["id"] != rows[1]["id"]
+        assert rows[0]["type"] == "discussion_approved"
+
+    @pytest.mark.asyncio
+    async def test_empty_is_a_no_op(self):
+        db = _FakeSession()
+        assert await NotificationService.create_notifications_bulk(db, []) == []
+        assert db.statements == []
@@ -0,0 +1,50 @@
+"""
+Tests for the chatbot retrieval engine
+"""
+
+from app.services.chatbot_retrieval import (
+    BM25Index, Document, FALLBACK_RESPONSE, GREETING_RESPONSE, HELP_RESPONSE,
+    compose_answer, strip_html, tokenize,
+)
+
+
+def _index():
+    return BM25Index([
+        Document("animal_profile", "1", "Bengal Tiger (Panthera tigris)",
+                 "Tigers are strong swimmers. They hunt deer and wild boar at night."),
+        Document("national_park", "2", "Kaziranga National Park",
+                 "Kaziranga is home to two thirds of the world's one-horned rhinoceroses. Tigers also live here."),
+        Document("myth_fact", "3", "Do elephants fear mice?",
+                 "Myth: Elephants are afraid of mice. Fact: Elephants are wary of sudden movement, not mice."),
+    ])
+
+
+class TestChatbotRetrieval:
+    """Test tokenising, BM25 ranking and answer composition"""
+
+    def test_tokenize_drops_stopwords_and_plurals(self):
+        assert tokenize("Where do the Tigers live?") == ["tiger", "live"]
+        assert strip_html("<p>Tigers &amp; lions</p>") == "Tigers & lions"
+
+    def test_search_ranks_title_match_first(self):
+        results = _index().search("tiger swimming", limit=3)
+
+        assert [document.item_id for document, _ in results][:2] == ["1", "2"]
+        assert results[0][1] > results[1][1]
+
+    def test_search_without_known_terms(self):
+        assert _index().search("quantum chromodynamics") == []
+
+    def test_answer_quotes_best_sentence_and_sources(self):
+        answer = compose_answer(_index(), "Are elephants afraid of mice?")
+
+        assert "afraid of mice" in answer.text
+        assert "Do elephants fear mice?" in answer.text
+        assert answer.sources[0] == {"type": "myth_fact", "id": "3", "title": "Do elephants fear mice?", "slug": None}
+
+    def test_greeting_help_and_fallback(self):
+        index = _index()
+        assert compose_answer(index, "Hi there!").text == GREETING_RESPONSE
+        assert compose_answer(index, "help").text == HELP_RESPONSE
+        assert compose_answer(index, "quantum chromodynamics").text == FALLBACK_RESPONSE
+        assert compose_answer(None, "tigers").text == FALLBACK_RESPONSE
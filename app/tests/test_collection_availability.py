@@ -0,0 +1,35 @@
+"""
+Tests for collection repeatability rules
+"""
+
+from datetime import date
+
+from app.services.collection_availability import resolve_rule, week_bounds
+
+
+class TestCollectionAvailability:
+    """Test availability and next-play dates per repeatability rule"""
+
+    def test_week_bounds(self):
+        # 2025-01-15 is a Wednesday
+        assert week_bounds(date(2025, 1, 15)) == (date(2025, 1, 13), date(2025, 1, 19))
+        assert week_bounds(date(2025, 1, 13)) == (date(2025, 1, 13), date(2025, 1, 19))
+
+    def test_daily(self):
+        today = date(2025, 1, 15)
+        assert resolve_rule("daily", today, played_on_date=False, played_this_week=True) == (True, None)
+        assert resolve_rule("daily", today, played_on_date=True, played_this_week=True) == (
+            False, date(2025, 1, 16)
+        )
+
+    def test_weekly_reopens_next_monday(self):
+        today = date(2025, 1, 15)
+        assert resolve_rule("weekly", today, played_on_date=False, played_this_week=False) == (True, None)
+        assert resolve_rule("weekly", today, played_on_date=False, played_this_week=True) == (
+            False, date(2025, 1, 20)
+        )
+
+    def test_unlimited_and_unknown_always_playable(self):
+        today = date(2025, 1, 15)
+        assert resolve_rule("unlimited", today, True, True) == (True, None)
+        assert resolve_rule("monthly", today, True, True) == (True, None)
@@ -0,0 +1,181 @@
+"""
+Tests for the daily activity counters (memory backend)
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import daily_activity_counters as counters_module
+from app.services.daily_activity_counters import DailyActivityCounters, current_activity_date
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    """Fresh counters using process memory, seeded with zeros"""
+    monkeypatch.setattr(counters_module.cache_manager, "use_redis", False)
+    fresh = DailyActivityCounters()
+    seeds = {}
+
+    async def load_seed(db, user_id, activity_date):
+        return dict(seeds.get(str(user_id), {}))
+
+    monkeypatch.setattr(fresh, "_load_seed", load_seed)
+    monkeypatch.setattr(counters_module, "daily_activity_counters", fresh)
+    fresh.seeds = seeds
+    return fresh
+
+
+@pytest.fixture
+def session():
+    """Real (sync) SQLAlchemy session so commit/rollback events fire"""
+    engine = create_engine("sqlite://")
+    db = Session(engine)
+    db.execute(text("SELECT 1"))
+    yield db
+    db.close()
+    engine.dispose()
+
+
+async def _released():
+    """Let scheduled release tasks run"""
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+class TestConsume:
+    """Test limit checks on plain counters"""
+
+    @pytest.mark.asyncio
+    async def test_consume_within_and_over_limit(self, counters):
+        user_id = uuid4()
+        assert await counters.consume(None, user_id, "points_earned_today", 300, 500) == (300, 300)
+        assert await counters.consume(None, user_id, "points_earned_today", 300, 500) == (0, 300)
+        assert (await counters.get(None, user_id))["points_earned_today"] == 300
+
+    @pytest.mark.asyncio
+    async def test_partial_grant_is_clipped(self, counters):
+        user_id = uuid4()
+        await counters.consume(None, user_id, "quiz_points_earned", 80, 100)
+        assert await counters.consume(None, user_id, "quiz_points_earned", 50, 100, partial=True) == (20, 100)
+        assert await counters.consume(None, user_id, "quiz_points_earned", 50, 100, partial=True) == (0, 100)
+
+    @pytest.mark.asyncio
+    async def test_seeded_from_durable_state(self, counters):
+        user_id = uuid4()
+        counters.seeds[str(user_id)] = {"credits_earned_today": 40}
+        assert await counters.consume(None, user_id, "credits_earned_today", 20, 50) == (0, 40)
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_field_and_negative_amount(self, counters):
+        with pytest.raises(ValueError):
+            await counters.consume(None, uuid4(), "unknown", 1, None)
+        with pytest.raises(ValueError):
+            await counters.consume(None, uuid4(), "points_earned_today", -1, None)
+
+
+class TestConsumeMember:
+    """Test the distinct-quiz daily limit"""
+
+    @pytest.mark.asyncio
+    async def test_retake_does_not_use_up_limit(self, counters):
+        user_id, quiz_id = uuid4(), uuid4()
+        assert await counters.consume_member(None, user_id, "quiz_attempts", quiz_id, 2) == (True, 1)
+        assert await counters.consume_member(None, user_id, "quiz_attempts", quiz_id, 2) == (True, 1)
+        assert await counters.consume_member(None, user_id, "quiz_attempts", uuid4(), 2) == (True, 2)
+
+    @pytest.mark.asyncio
+    async def test_new_quiz_refused_at_limit(self, counters):
+        user_id, first = uuid4(), uuid4()
+        await counters.consume_member(None, user_id, "quiz_attempts", first, 1)
+        assert await counters.consume_member(None, user_id, "quiz_attempts", uuid4(), 1) == (False, 1)
+        # A quiz already counted today is still allowed
+        assert await counters.consume_member(None, user_id, "quiz_attempts", first, 1) == (True, 1)
+
+    @pytest.mark.asyncio
+    async def test_quizzes_from_seed_are_counted_once(self, counters):
+        user_id, quiz_id = uuid4(), uuid4()
+        counters.seeds[str(user_id)] = {"quiz_attempts": 1, f"quiz_attempts:{quiz_id}": 1}
+        assert await counters.consume_member(None, user_id, "quiz_attempts", quiz_id, 1) == (True, 1)
+        assert (await counters.get(None, user_id))["quiz_attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_distinct_fields(self, counters):
+        with pytest.raises(ValueError):
+            await counters.consume_member(None, uuid4(), "points_earned_today", "x", 1)
+
+
+class TestGrantsFollowTransaction:
+    """Test that grants are given back when the session does not commit"""
+
+    @pytest.mark.asyncio
+    async def test_rollback_releases_grants(self, counters, session):
+        user_id, quiz_id = uuid4(), uuid4()
+        await counters.consume_member(session, user_id, "quiz_attempts", quiz_id, 1)
+        await counters.consume(session, user_id, "quiz_points_earned", 30, 100)
+
+        session.rollback()
+        await _released()
+
+        values = await counters.get(None, user_id)
+        assert values["quiz_attempts"] == 0
+        assert values["quiz_points_earned"] == 0
+        assert await counters.consume_member(None, user_id, "quiz_attempts", uuid4(), 1) == (True, 1)
+
+    @pytest.mark.asyncio
+    async def test_close_without_commit_releases_grants(self, counters, session):
+        user_id = uuid4()
+        await counters.increment(session, user_id, "myths_facts_games")
+
+        session.close()
+        await _released()
+
+        assert (await counters.get(None, user_id))["myths_facts_games"] == 0
+
+    @pytest.mark.asyncio
+    async def test_commit_keeps_grants(self, counters, session):
+        user_id, quiz_id = uuid4(), uuid4()
+        await counters.consume_member(session, user_id, "quiz_attempts", quiz_id, 5)
+
+        session.commit()
+        session.execute(text("SELECT 1"))
+        session.rollback()
+        await _released()
+
+        assert (await counters.get(None, user_id))["quiz_attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retake_rollback_keeps_first_attempt(self, counters, session):
+        """Rolling back a retake must not uncount the committed first attempt"""
+        user_id, quiz_id = uuid4(), uuid4()
+        await counters.consume_member(session, user_id, "quiz_attempts", quiz_id, 5)
+        session.commit()
+
+        session.execute(text("SELECT 1"))
+        await counters.consume_member(session, user_id, "quiz_attempts", quiz_id, 5)
+        session.rollback()
+        await _released()
+
+        assert (await counters.get(None, user_id))["quiz_attempts"] == 1
+
+
+class TestReconcileSnapshot:
+    """Test what the reconciler persists"""
+
+    @pytest.mark.asyncio
+    async def test_dirty_users_are_snapshotted_once(self, counters):
+        user_id = uuid4()
+        await counters.consume_member(None, user_id, "quiz_attempts", uuid4(), None)
+        await counters.increment(None, user_id, "quiz_completions")
+
+        today = current_activity_date()
+        dirty = await counters._pop_dirty(today)
+        assert dirty == [str(user_id)]
+        rows = await counters._snapshot(today, dirty)
+        assert rows[0]["quiz_attempts"] == 1
+        assert rows[0]["quiz_completions"] == 1
+        assert set(rows[0]) == {"user_id", *counters_module.PERSISTED_FIELDS}
+        assert await counters._pop_dirty(today) == []
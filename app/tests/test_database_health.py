@@ -0,0 +1,187 @@
+"""
+Tests for the database health circuit breaker
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.core.exceptions import DatabaseUnavailableError
+from app.db import health as health_module
+from app.db.database import DatabaseRetryRoute, get_db_with_retry
+from app.db.health import CLOSED, OPEN, DatabaseHealth, is_connection_error
+
+
+class FakeProbe:
+    """Probe that fails until told the database is back"""
+
+    def __init__(self, up=True):
+        self.up = up
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if not self.up:
+            raise ConnectionRefusedError("connection refused")
+
+
+class TestConnectionErrors:
+    """Test which errors open the breaker"""
+
+    def test_classification(self):
+        assert is_connection_error(OperationalError("SELECT 1", {}, Exception("gone")))
+        assert is_connection_error(ConnectionResetError())
+        assert not is_connection_error(ProgrammingError("SELECT nope", {}, Exception("syntax")))
+        assert not is_connection_error(ValueError("bad input"))
+        assert not is_connection_error(FileNotFoundError("uploads/missing.jpg"))
+
+
+class TestDatabaseHealth:
+    """Test breaker transitions and request waiting"""
+
+    @pytest.mark.asyncio
+    async def test_closed_breaker_does_not_wait(self):
+        probe = FakeProbe()
+        health = DatabaseHealth(probe=probe, interval=60, wake_timeout=1)
+        await health.start()
+        try:
+            await asyncio.sleep(0)
+            calls = probe.calls
+            await health.wait_until_available()
+            assert health.state == CLOSED
+            assert probe.calls == calls
+        finally:
+            await health.stop()
+
+    @pytest.mark.asyncio
+    async def test_requests_wait_for_recovery(self):
+        probe = FakeProbe(up=False)
+        health = DatabaseHealth(probe=probe, interval=60, wake_timeout=5)
+        await health.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert health.state == OPEN
+
+            waiter = asyncio.create_task(health.wait_until_available())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            probe.up = True
+            await asyncio.wait_for(waiter, timeout=2)
+            assert health.state == CLOSED
+        finally:
+            await health.stop()
+
+    @pytest.mark.asyncio
+    async def test_request_failure_wakes_probe(self):
+        probe = FakeProbe()
+        health = DatabaseHealth(probe=probe, interval=60, wake_timeout=1)
+        await health.start()
+        try:
+            await asyncio.sleep(0.05)
+            calls = probe.calls
+            health.record_failure(ConnectionResetError("reset"))
+            await asyncio.sleep(0.05)
+            assert probe.calls > calls
+            assert health.state == CLOSED
+        finally:
+            await health.stop()
+
+    @pytest.mark.asyncio
+    async def test_times_out_with_503(self):
+        health = DatabaseHealth(probe=FakeProbe(up=False), interval=60, wake_timeout=0.1)
+        await health.start()
+        try:
+            await asyncio.sleep(0.05)
+            with pytest.raises(DatabaseUnavailableError) as exc_info:
+                await health.wait_until_available()
+            assert exc_info.value.status_code == 503
+            assert exc_info.value.details["retry_after"] == 1
+        finally:
+            await health.stop()
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_ignored_without_monitor(self):
+        health = DatabaseHealth(probe=FakeProbe(), interval=60, wake_timeout=0.1)
+        health.record_failure(ConnectionResetError("reset"))
+        await health.wait_until_available()
+        assert health.state == OPEN
+
+
+def _retry_app(endpoint):
+    router = APIRouter(route_class=DatabaseRetryRoute)
+    router.add_api_route("/submit", endpoint, methods=["POST"])
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def _post(app, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/submit", **kwargs)
+
+
+@pytest.fixture
+def health(monkeypatch):
+    health = DatabaseHealth(probe=FakeProbe(), interval=60, wake_timeout=1)
+    monkeypatch.setattr(health_module, "database_health", health)
+    return health
+
+
+class TestDatabaseRetryRoute:
+    """Test that a dropped connection gets the request one more try"""
+
+    @pytest.mark.asyncio
+    async def test_connection_error_is_retried_once(self, health):
+        attempts = []
+
+        async def submit(payload: dict, db=Depends(get_db_with_retry)):
+            attempts.append((payload, db))
+            if len(attempts) == 1:
+                try:
+                    raise OperationalError("INSERT", {}, ConnectionResetError("reset"))
+                except OperationalError as e:
+                    raise HTTPException(status_code=500, detail="Failed") from e
+            return {"attempts": len(attempts)}
+
+        response = await _post(_retry_app(submit), json={"answers": [1, 2]})
+
+        assert response.status_code == 200
+        assert response.json() == {"attempts": 2}
+        assert attempts[0][0] == attempts[1][0] == {"answers": [1, 2]}
+        assert attempts[0][1] is not attempts[1][1]
+        assert health.state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_second_failure_is_returned(self, health):
+        attempts = []
+
+        async def submit(db=Depends(get_db_with_retry)):
+            attempts.append(db)
+            raise ConnectionResetError("reset")
+
+        with pytest.raises(ConnectionResetError):
+            await _post(_retry_app(submit))
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_committed_work_and_other_errors_are_not_retried(self, health):
+        attempts = []
+
+        async def committed(db=Depends(get_db_with_retry)):
+            attempts.append(db)
+            db.sync_session.dispatch.after_commit(db.sync_session)
+            raise HTTPException(status_code=500) from ConnectionResetError("reset")
+
+        async def bad_query(db=Depends(get_db_with_retry)):
+            attempts.append(db)
+            raise HTTPException(status_code=400) from ProgrammingError("SELECT", {}, Exception("syntax"))
+
+        assert (await _post(_retry_app(committed))).status_code == 500
+        assert (await _post(_retry_app(bad_query))).status_code == 400
+        assert len(attempts) == 2
+        assert health.state == CLOSED
@@ -0,0 +1,36 @@
+"""
+Tests for the per-workload database engines
+"""
+
+from app.core.config import Settings
+from app.db import database
+from app.db.database import build_engine, pool_status, read_session_factory
+
+
+class TestDatabaseEngines:
+    """Test engine options, read routing and pool metrics"""
+
+    def test_asyncpg_engine_options(self):
+        engine = build_engine("postgresql+asyncpg://u:p@db:5432/app", "read", pool_size=3, max_overflow=1)
+        assert engine.url.query["prepared_statement_cache_size"] == str(
+            database.settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        )
+        assert engine.pool.size() == 3
+
+    def test_read_urls_are_normalised(self):
+        settings = Settings(DATABASE_READ_URLS=" postgresql://u:p@replica-1/app, ,postgresql+asyncpg://u:p@replica-2/app")
+        assert settings.read_database_urls == [
+            "postgresql+asyncpg://u:p@replica-1/app",
+            "postgresql+asyncpg://u:p@replica-2/app",
+        ]
+
+    def test_read_sessions_round_robin(self):
+        count = len(database.read_session_factories)
+        picked = [read_session_factory() for _ in range(count * 2)]
+        assert picked[:count] == picked[count:]
+        assert set(map(id, picked)) == set(map(id, database.read_session_factories))
+
+    def test_pool_status_lists_every_pool(self):
+        status = pool_status()
+        assert {"primary", "jobs", "read-0"} <= set(status)
+        assert status["primary"]["size"] == database.settings.DB_POOL_SIZE
@@ -0,0 +1,67 @@
+"""
+Tests for outbound email delivery helpers
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.email_delivery import (
+    DeliveryResult, EmailDispatcher, EmailMessage, FakeTransport,
+    parse_postmark_batch, retry_delay, RETRY_MAX_SECONDS,
+)
+
+
+class TestEmailDelivery:
+    """Test backoff, provider response parsing and outcome recording"""
+
+    def test_retry_delay_backs_off_and_caps(self):
+        assert retry_delay(1) == timedelta(seconds=30)
+        assert retry_delay(2) == timedelta(seconds=60)
+        assert retry_delay(3) == timedelta(seconds=120)
+        assert retry_delay(20) == timedelta(seconds=RETRY_MAX_SECONDS)
+
+    def test_parse_postmark_batch(self):
+        results = parse_postmark_batch([
+            {"ErrorCode": 0, "Message": "OK", "MessageID": "abc"},
+            {"ErrorCode": 406, "Message": "Inactive recipient"},
+            {"ErrorCode": 429, "Message": "Rate limit"},
+        ])
+
+        assert results[0].ok and results[0].message_id == "abc"
+        assert not results[1].ok and not results[1].retryable
+        assert not results[2].ok and results[2].retryable
+
+    @pytest.mark.asyncio
+    async def test_fake_transport_records_messages(self):
+        transport = FakeTransport()
+        results = await transport.send_batch([EmailMessage(to="a@x.test", subject="Hi")])
+
+        assert [m.to for m in transport.sent] == ["a@x.test"]
+        assert results[0].ok
+
+    def test_record_outcomes(self):
+        dispatcher = EmailDispatcher(transport=FakeTransport())
+        dispatcher.max_attempts = 3
+
+        def row(attempts):
+            return SimpleNamespace(status="sending", attempts=attempts, to_address="a@x.test",
+                                   sent_at=None, provider_message_id=None, last_error=None,
+                                   next_attempt_at=None)
+
+        sent, retry, exhausted, bounced = row(1), row(1), row(3), row(1)
+        dispatcher._record(
+            [sent, retry, exhausted, bounced],
+            [
+                DeliveryResult(ok=True, message_id="m1"),
+                DeliveryResult(ok=False, error="timeout"),
+                DeliveryResult(ok=False, error="timeout"),
+                DeliveryResult(ok=False, error="406", retryable=False),
+            ],
+        )
+
+        assert sent.status == "sent" and sent.provider_message_id == "m1"
+        assert retry.status == "pending" and retry.next_attempt_at is not None
+        assert exhausted.status == "failed"
+        assert bounced.status == "failed"
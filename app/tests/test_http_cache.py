@@ -0,0 +1,136 @@
+"""
+Tests for conditional GET handling of public catalog endpoints
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.middleware.http_cache import (
+    ConditionalGetMiddleware,
+    HTTPCachePolicy,
+    parse_if_none_match,
+)
+from app.services.http_cache import ResourceVersions
+
+
+class _CountingApp:
+    """Endpoint stand-in that records how often it was reached"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def _call(middleware, path, method="GET", query="", headers=None):
+    """Run one request through the middleware and collect the response"""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    return start["status"], {k.decode().lower(): v.decode() for k, v in start["headers"]}
+
+
+@pytest.fixture(autouse=True)
+def local_versions(monkeypatch):
+    """Tests run in one process, where in-memory tokens are authoritative"""
+    monkeypatch.setattr(settings, "HTTP_CACHE_LOCAL_VERSIONS", True)
+
+
+def _middleware(app, *routes):
+    return ConditionalGetMiddleware(app, policies=list(routes), versions=ResourceVersions())
+
+
+class TestParseIfNoneMatch:
+    """Test If-None-Match parsing"""
+
+    def test_lists_and_weak_tags(self):
+        assert parse_if_none_match('"a", W/"b" ,"c"') == ['"a"', '"b"', '"c"']
+        assert parse_if_none_match("*") == ["*"]
+        assert parse_if_none_match(None) == []
+
+
+class TestConditionalGetMiddleware:
+    """Test ETag issuing, 304 revalidation and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_revalidation_skips_endpoint(self):
+        """A matching If-None-Match is answered with 304 without calling the app"""
+        app = _CountingApp()
+        middleware = _middleware(app, ("/api/v1/animals/featured", HTTPCachePolicy("animals")))
+
+        status, headers = await _call(middleware, "/api/v1/animals/featured", query="limit=5")
+        assert status == 200
+        assert "stale-while-revalidate" in headers["cache-control"]
+        etag = headers["etag"]
+
+        status, headers = await _call(
+            middleware, "/api/v1/animals/featured", query="limit=5", headers={"If-None-Match": etag}
+        )
+        assert status == 304
+        assert headers["etag"] == etag
+        assert app.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_query_and_version_change_etag(self):
+        """Other query strings and bumped versions get new tags"""
+        app = _CountingApp()
+        middleware = _middleware(app, ("/api/v1/animals/featured", HTTPCachePolicy("animals")))
+
+        _, first = await _call(middleware, "/api/v1/animals/featured", query="limit=5")
+        _, other = await _call(middleware, "/api/v1/animals/featured", query="limit=10")
+        assert first["etag"] != other["etag"]
+
+        await middleware.versions.bump("animals")
+        status, _ = await _call(
+            middleware, "/api/v1/animals/featured", query="limit=5", headers={"If-None-Match": first["etag"]}
+        )
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_unmatched_requests(self):
+        """Personalised, admin and non-GET requests are passed through untouched"""
+        app = _CountingApp()
+        middleware = _middleware(
+            app,
+            ("/api/v1/national-parks", HTTPCachePolicy("national_parks", bypass_params=("include_unapproved",))),
+            ("/api/v1/videos/featured-series", HTTPCachePolicy("videos", bypass_headers=("x-user-id",))),
+        )
+
+        _, headers = await _call(middleware, "/api/v1/national-parks/", query="include_unapproved=true")
+        assert "etag" not in headers
+        _, headers = await _call(middleware, "/api/v1/videos/featured-series", headers={"X-User-ID": "u1"})
+        assert "etag" not in headers
+        _, headers = await _call(middleware, "/api/v1/national-parks/", method="POST")
+        assert "etag" not in headers
+        _, headers = await _call(middleware, "/api/v1/national-parks/")
+        assert headers["etag"].startswith('"national_parks-')
+
+    @pytest.mark.asyncio
+    async def test_no_etags_from_per_worker_tokens(self, monkeypatch):
+        """Without Redis each worker has its own tokens, so nothing is cached"""
+        monkeypatch.setattr(settings, "HTTP_CACHE_LOCAL_VERSIONS", False)
+        app = _CountingApp()
+        middleware = _middleware(app, ("/api/v1/animals/featured", HTTPCachePolicy("animals")))
+        assert not middleware.versions.shared
+
+        status, headers = await _call(middleware, "/api/v1/animals/featured", headers={"If-None-Match": "*"})
+        assert status == 200
+        assert "etag" not in headers
+        assert app.calls == 1
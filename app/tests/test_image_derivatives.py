@@ -0,0 +1,181 @@
+"""
+Tests for on-demand image derivatives
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+from starlette.testclient import TestClient
+
+from app.api.endpoints import images
+from app.services import image_derivatives
+from app.services.image_derivatives import (
+    DerivativeError,
+    ImageDerivativeService,
+    negotiate_format,
+    normalize_width,
+)
+
+
+class _FakeBucket:
+    """head_object against a dict of key -> ETag, counting calls"""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.heads = []
+
+    def head_object(self, Bucket, Key):
+        self.heads.append(Key)
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {"ETag": f'"{self.objects[Key]}"'}
+
+
+class TestParameters:
+    """Test width rounding and format negotiation"""
+
+    def test_width_rounds_up_to_allowed(self):
+        assert normalize_width(300) == 320
+        assert normalize_width(320) == 320
+        assert normalize_width(10000) == 2560
+        assert normalize_width(None) == 2560
+
+    def test_format_negotiation(self):
+        assert negotiate_format("JPG", "") == "jpeg"
+        assert negotiate_format(None, "image/avif,image/webp,*/*") == "webp"
+        assert negotiate_format(None, "*/*") == "jpeg"
+        with pytest.raises(DerivativeError):
+            negotiate_format("gif", "")
+
+
+class TestImageDerivativeService:
+    """Test local rendering, caching and request coalescing"""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_derivatives.media_url_service, "use_r2", False)
+        (tmp_path / "images").mkdir()
+        Image.new("RGB", (1200, 600), (10, 90, 30)).save(tmp_path / "images" / "park.jpg")
+        yield ImageDerivativeService(upload_dir=str(tmp_path))
+        image_derivatives.image_engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_renders_once_and_reuses(self, service, monkeypatch):
+        """Concurrent identical requests share one render; later ones hit the cache"""
+        renders = []
+        original_render = service._render
+
+        async def counting_render(*args, **kwargs):
+            renders.append(args)
+            return await original_render(*args, **kwargs)
+
+        monkeypatch.setattr(service, "_render", counting_render)
+
+        results = await asyncio.gather(*[
+            service.get("/uploads/images/park.jpg", 600, "jpeg") for _ in range(4)
+        ])
+        again = await service.get("images/park.jpg", 640, "jpeg")
+
+        assert len(renders) == 1
+        assert len({r.digest for r in results}) == 1
+        assert again.digest == results[0].digest
+        with Image.open(again.path) as img:
+            assert img.size == (640, 320)
+
+    @pytest.mark.asyncio
+    async def test_source_change_changes_digest(self, service, tmp_path):
+        """Replacing the source yields a new content address"""
+        first = await service.get("images/park.jpg", 320, "jpeg")
+        Image.new("RGB", (1000, 500), (200, 40, 40)).save(tmp_path / "images" / "park.jpg")
+        second = await service.get("images/park.jpg", 320, "jpeg")
+
+        assert first.digest != second.digest
+
+    @pytest.mark.asyncio
+    async def test_missing_and_traversal(self, service):
+        with pytest.raises(DerivativeError) as missing:
+            await service.get("images/nope.jpg", 320, "jpeg")
+        assert missing.value.status_code == 404
+
+        with pytest.raises(DerivativeError):
+            await service.get("../secrets.jpg", 320, "jpeg")
+
+
+class TestRemoteLookups:
+    """Test that bucket HEAD requests are memoised"""
+
+    @pytest.fixture
+    def bucket(self, monkeypatch):
+        bucket = _FakeBucket({"images/park.jpg": "etag-1"})
+        monkeypatch.setattr(image_derivatives.media_url_service, "use_r2", True)
+        monkeypatch.setattr(image_derivatives.media_url_service, "_client", bucket)
+        return bucket
+
+    @pytest.mark.asyncio
+    async def test_source_and_variant_heads_are_memoised(self, bucket, tmp_path):
+        service = ImageDerivativeService(upload_dir=str(tmp_path))
+        resolved = await service.resolve("images/park.jpg", 320, "webp")
+        bucket.objects[f"derived/{resolved.name}"] = "variant"
+
+        for _ in range(3):
+            derivative = await service.get("images/park.jpg", 320, "webp")
+            assert derivative.object_key == f"derived/{resolved.name}"
+
+        assert bucket.heads == ["images/park.jpg", f"derived/{resolved.name}"]
+
+    @pytest.mark.asyncio
+    async def test_source_etag_rechecked_after_ttl(self, bucket, tmp_path, monkeypatch):
+        service = ImageDerivativeService(upload_dir=str(tmp_path))
+        first = await service.resolve("images/park.jpg", 320, "webp")
+
+        bucket.objects["images/park.jpg"] = "etag-2"
+        assert (await service.resolve("images/park.jpg", 320, "webp")).digest == first.digest
+
+        later = image_derivatives.time.monotonic() + image_derivatives.SOURCE_FINGERPRINT_TTL_SECONDS
+        monkeypatch.setattr(image_derivatives.time, "monotonic", lambda: later)
+        assert (await service.resolve("images/park.jpg", 320, "webp")).digest != first.digest
+
+
+class TestImageEndpoint:
+    """Test caching headers and conditional requests on /img"""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_derivatives.media_url_service, "use_r2", False)
+        (tmp_path / "images").mkdir()
+        Image.new("RGB", (800, 400), (10, 90, 30)).save(tmp_path / "images" / "park.jpg")
+        service = ImageDerivativeService(upload_dir=str(tmp_path))
+        monkeypatch.setattr(images, "image_derivative_service", service)
+
+        app = FastAPI()
+        app.include_router(images.router)
+        with TestClient(app) as client:
+            client.service = service
+            yield client
+        image_derivatives.image_engine.shutdown()
+
+    def test_unversioned_url_must_revalidate(self, client):
+        response = client.get("/img/images/park.jpg?w=320&fmt=jpeg")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == images.REVALIDATE
+
+    def test_versioned_url_is_immutable(self, client):
+        url = asyncio.run(client.service.versioned_url("images/park.jpg", 320, "jpeg"))
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == images.IMMUTABLE
+
+        stale = client.get("/img/images/park.jpg?w=320&fmt=jpeg&v=0000000000000000")
+        assert stale.headers["cache-control"] == images.REVALIDATE
+
+    def test_not_modified_without_rendering(self, client, monkeypatch):
+        etag = client.get("/img/images/park.jpg?w=320&fmt=jpeg").headers["etag"]
+
+        async def fail_fetch(request):
+            raise AssertionError("variant fetched for a 304")
+
+        monkeypatch.setattr(client.service, "fetch", fail_fetch)
+        response = client.get("/img/images/park.jpg?w=320&fmt=jpeg", headers={"If-None-Match": etag})
+        assert response.status_code == 304
@@ -0,0 +1,94 @@
+"""
+Tests for the image derivative engine
+"""
+
+import pytest
+from PIL import Image
+
+from app.services.image_optimization import (
+    DerivativeSpec,
+    ImageEngine,
+    ImageJob,
+    ImageOptimizer,
+    process_image_job,
+)
+
+
+def _make_image(path, size=(2000, 1000), mode="RGB"):
+    Image.new(mode, size, (40, 120, 60) if mode == "RGB" else (40, 120, 60, 128)).save(path)
+    return path
+
+
+class TestProcessImageJob:
+    """Test derivative rendering inside a single job"""
+
+    def test_sizes_formats_and_skips(self, tmp_path):
+        """Each size fits its box, small sources are not upscaled except forced ones"""
+        source = _make_image(tmp_path / "source.jpg")
+        job = ImageJob(
+            input_path=str(source),
+            output_dir=str(tmp_path / "out"),
+            base_name="photo",
+            specs=[
+                DerivativeSpec("thumbnail", (300, 300), always=True),
+                DerivativeSpec("medium", (1200, 800)),
+                DerivativeSpec("hero", (2560, 1440)),
+            ],
+            formats=["JPEG", "WEBP"],
+        )
+
+        result = process_image_job(job)
+
+        assert result["original_size"] == (2000, 1000)
+        assert result["variants"]["medium_jpeg"]["size"] == (1200, 600)
+        assert result["variants"]["thumbnail_webp"]["size"] == (300, 150)
+        assert "hero_jpeg" not in result["variants"]
+        assert (tmp_path / "out" / "photo_medium.webp").exists()
+        assert set(result["timings_ms"]) >= {"decode", "resize", "encode", "total"}
+
+    def test_transparency_flattened_for_jpeg(self, tmp_path):
+        """RGBA sources are composited so JPEG output succeeds"""
+        source = _make_image(tmp_path / "source.png", size=(400, 400), mode="RGBA")
+        job = ImageJob(
+            input_path=str(source),
+            output_dir=str(tmp_path),
+            base_name="thumb_source",
+            specs=[DerivativeSpec("thumbnail", (300, 300), always=True)],
+            formats=["JPEG"],
+            filename_template="{base}.{ext}",
+        )
+
+        result = process_image_job(job)
+
+        with Image.open(result["variants"]["thumbnail_jpeg"]["path"]) as img:
+            assert img.mode == "RGB"
+            assert img.size == (300, 300)
+
+
+class TestImageOptimizer:
+    """Test the async API running through the process pool"""
+
+    @pytest.mark.asyncio
+    async def test_optimize_image_via_pool(self, tmp_path):
+        """optimize_image keeps its result shape when run in the pool"""
+        engine = ImageEngine(max_workers=1, max_pending=2)
+        optimizer = ImageOptimizer(engine=engine)
+        source = _make_image(tmp_path / "source.jpg", size=(1000, 700))
+        try:
+            results = await optimizer.optimize_image(source, tmp_path / "out", "photo")
+        finally:
+            engine.shutdown()
+
+        assert results["original_size"] == (1000, 700)
+        assert set(results["optimized_images"]) == {
+            "thumbnail_jpeg", "thumbnail_webp", "small_jpeg", "small_webp"
+        }
+        assert results["formats_generated"] == ["JPEG", "WEBP"]
+
+    def test_pool_does_not_fork_the_server(self):
+        """Workers start from a forkserver, not a fork of the threaded API process"""
+        engine = ImageEngine(max_workers=1, max_pending=1)
+        try:
+            assert engine._get_pool()._mp_context.get_start_method() == "forkserver"
+        finally:
+            engine.shutdown()
@@ -0,0 +1,209 @@
+"""
+Tests for request timing, query counting and the metrics registry
+"""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import create_engine, text
+from starlette.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+from app.middleware.instrumentation import InstrumentationMiddleware
+from app.services import instrumentation
+from app.services.instrumentation import redact_parameters, register_query_listeners
+
+engine = create_engine("sqlite://")
+register_query_listeners({"test": engine})
+
+
+def _build_app(queries_per_request=1):
+    router = APIRouter()
+
+    @router.get("/parks/{park_id}/animals")
+    async def park_animals(park_id: int):
+        with engine.connect() as connection:
+            for index in range(queries_per_request):
+                connection.execute(text("SELECT :index"), {"index": index})
+        return {"park_id": park_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.add_middleware(InstrumentationMiddleware, access_log=False, server_timing=True)
+    return app
+
+
+class TestMetricsRegistry:
+    """Test Prometheus text rendering"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, route="/a")
+
+        lines = registry.render().splitlines()
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+
+    def test_counter_labels_are_escaped(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits", ("path",))
+        counter.inc(path='/"quoted"')
+        assert 'hits_total{path="/\\"quoted\\""} 1' in registry.render()
+
+    def test_failing_gauge_is_skipped(self):
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("pool gone")
+
+        registry.gauge("broken", "Broken", collect=broken)
+        registry.counter("ok_total", "Ok").inc()
+        output = registry.render()
+        assert "broken" not in output
+        assert "ok_total 1" in output
+
+    def test_same_name_different_kind_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("things", "Things")
+        with pytest.raises(ValueError):
+            registry.histogram("things", "Things")
+
+
+class TestRedaction:
+    """Test that bind values never reach the logs"""
+
+    def test_values_become_type_names(self):
+        assert redact_parameters({"email": "a@b.c", "id": 3}) == {"email": "str", "id": "int"}
+        assert redact_parameters(("secret", 1.5)) == ["str", "float"]
+        assert redact_parameters([{"x": "y"}, {"x": "z"}]) == {"rows": 2, "first": {"x": "str"}}
+
+
+class TestInstrumentationMiddleware:
+    """Test per-route metrics and query counting end to end"""
+
+    def test_records_route_template_and_queries(self):
+        client = TestClient(_build_app(queries_per_request=2))
+        before = instrumentation.REQUEST_DURATION.count(method="GET", route="/api/v1/parks/{park_id}/animals")
+
+        response = client.get("/api/v1/parks/7/animals")
+
+        assert response.status_code == 200
+        assert 'desc="2 queries"' in response.headers["server-timing"]
+        labels = {"method": "GET", "route": "/api/v1/parks/{park_id}/animals"}
+        assert instrumentation.REQUEST_DURATION.count(**labels) == before + 1
+        assert instrumentation.REQUESTS.value(status="200", **labels) >= 1
+
+    def test_unmatched_routes_share_one_label(self):
+        client = TestClient(_build_app())
+        before = instrumentation.REQUESTS.value(method="GET", route="<unmatched>", status="404")
+        client.get("/api/v1/nope/123")
+        client.get("/api/v1/nope/456")
+        assert instrumentation.REQUESTS.value(method="GET", route="<unmatched>", status="404") == before + 2
+
+    def test_repeated_statement_flags_n_plus_one(self, monkeypatch):
+        monkeypatch.setattr(instrumentation.settings, "N_PLUS_ONE_THRESHOLD", 5)
+        client = TestClient(_build_app(queries_per_request=6))
+        labels = {"method": "GET", "route": "/api/v1/parks/{park_id}/animals"}
+        before = instrumentation.N_PLUS_ONE.value(**labels)
+
+        client.get("/api/v1/parks/1/animals")
+
+        assert instrumentation.N_PLUS_ONE.value(**labels) == before + 1
+
+    def test_slow_queries_are_counted(self, monkeypatch):
+        monkeypatch.setattr(instrumentation.settings, "SLOW_QUERY_MS", 0.000001)
+        before = instrumentation.SLOW_QUERIES.value(engine="test")
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert instrumentation.SLOW_QUERIES.value(engine="test") == before + 1
+
+
+class _RecordingRequestLogger:
+    def __init__(self):
+        self.requests = []
+
+    def log_request(self, **fields):
+        self.requests.append(fields)
+
+
+class TestAccessLog:
+    """Test the access log entry written per request"""
+
+    @pytest.mark.asyncio
+    async def test_forwarded_for_is_not_trusted_by_default(self, monkeypatch):
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", "")
+        monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 0)
+
+        async def endpoint(scope, receive, send):
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = InstrumentationMiddleware(endpoint, access_log=True)
+        middleware._request_logger = _RecordingRequestLogger()
+        scope = {
+            "type": "http", "method": "GET", "path": "/api/v1/ping", "root_path": "",
+            "client": ("10.0.0.5", 4321), "headers": [(b"x-forwarded-for", b"1.2.3.4")],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            pass
+
+        await middleware(scope, receive, send)
+
+        assert middleware._request_logger.requests[0]["ip_address"] == "10.0.0.5"
+
+
+class TestMetricsEndpoint:
+    """Test who may scrape /metrics"""
+
+    @pytest.fixture
+    def client(self):
+        from app.main import app
+        return TestClient(app, base_url="http://localhost")
+
+    def test_hidden_without_token_outside_development(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        assert client.get("/metrics").status_code == 404
+
+        monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+        assert client.get("/metrics").status_code == 200
+
+    def test_token_is_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_db_pool_health_is_gated_like_metrics(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        assert client.get("/health/db-pools").status_code == 404
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+        assert client.get("/health/db-pools").status_code == 401
+        response = client.get("/health/db-pools", headers={"Authorization": "Bearer scrape-me"})
+        assert response.status_code == 200
+        assert "pools" in response.json()
+
+    def test_startup_profile_is_gated_like_metrics(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        assert client.get("/health/startup").status_code == 404
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+        assert client.get("/health/startup").status_code == 401
+        response = client.get("/health/startup", headers={"Authorization": "Bearer scrape-me"})
+        assert response.status_code == 200
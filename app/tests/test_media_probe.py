@@ -0,0 +1,103 @@
+"""
+Tests for media probe parsing and upload-time scheduling
+"""
+
+from io import BytesIO
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.api.endpoints import upload
+from app.services.media_probe import MediaMetadataWorker, parse_frame_rate, parse_probe
+
+
+class TestParseProbe:
+    """Test reduction of ffprobe output"""
+
+    def test_video_fields(self):
+        data = {
+            "format": {"duration": "125.48", "bit_rate": "2500000", "format_name": "mov,mp4"},
+            "streams": [
+                {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+                 "avg_frame_rate": "30000/1001"},
+                {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2},
+            ],
+        }
+
+        info = parse_probe(data)
+
+        assert info["duration"] == 125
+        assert info["bitrate"] == 2500000
+        assert (info["width"], info["height"], info["codec"]) == (1920, 1080, "h264")
+        assert info["fps"] == 29.97
+        assert info["audio_codec"] == "aac"
+        assert info["sample_rate"] == 48000
+
+    def test_audio_only_uses_stream_duration(self):
+        data = {
+            "format": {"format_name": "mp3"},
+            "streams": [{"codec_type": "audio", "codec_name": "mp3", "duration": "61.2"}],
+        }
+
+        info = parse_probe(data)
+
+        assert info["duration"] == 61
+        assert "width" not in info
+
+    def test_frame_rate_is_not_evaluated(self):
+        """Malformed or hostile rate strings never reach eval"""
+        assert parse_frame_rate("25/1") == 25.0
+        assert parse_frame_rate("0/0") == 0.0
+        assert parse_frame_rate("__import__('os')") == 0.0
+        assert parse_frame_rate(None) == 0.0
+
+
+class TestVideoUpload:
+    """Test that the parks video upload hands probing to the worker"""
+
+    @pytest.mark.asyncio
+    async def test_upload_enqueues_probe_without_catalog_row(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(upload.settings, "USE_R2_STORAGE", "false")
+        monkeypatch.setattr(upload, "VIDEOS_DIR", tmp_path)
+        enqueued = []
+
+        async def no_inline_probe(*args, **kwargs):
+            raise AssertionError("probed inside the request")
+
+        monkeypatch.setattr(upload.media_metadata_worker.probe, "probe", no_inline_probe)
+        monkeypatch.setattr(
+            upload.media_metadata_worker, "enqueue",
+            lambda *args, **kwargs: enqueued.append(args),
+        )
+        file = UploadFile(BytesIO(b"\x00" * 64), filename="clip.mp4", headers=Headers({"content-type": "video/mp4"}))
+
+        result = await upload.upload_video_file(file=file, current_user=SimpleNamespace(id=uuid4()))
+
+        assert "media_id" not in result
+        assert (tmp_path / result["filename"]).exists()
+        assert enqueued == [(None, None, f"/uploads/{result['url']}")]
+
+    @pytest.mark.asyncio
+    async def test_cache_only_probe_writes_no_row(self, monkeypatch):
+        worker = MediaMetadataWorker()
+        applied = []
+
+        async def fake_probe(file_url, fingerprint=None):
+            return {"duration": 12}
+
+        async def fake_apply(*args):
+            applied.append(args)
+
+        monkeypatch.setattr(worker.probe, "probe", fake_probe)
+        monkeypatch.setattr(worker, "apply", fake_apply)
+        await worker.start()
+        try:
+            worker.enqueue(None, None, "/uploads/videos/clip.mp4")
+            await worker._queue.join()
+        finally:
+            await worker.stop()
+
+        assert applied == []
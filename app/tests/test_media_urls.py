@@ -0,0 +1,114 @@
+"""
+Tests for media URL resolution and presigned URL reuse
+"""
+
+import pytest
+
+from app.services import media_urls
+from app.services.media_urls import REFRESH_MARGIN_SECONDS, MediaURLService
+
+
+class _FakeS3Client:
+    """Signs URLs locally and counts how often it was asked to"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.calls += 1
+        return f"https://r2.example/{Params['Key']}?sig={self.calls}&expires={ExpiresIn}"
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(media_urls.time, "time", clock)
+    return clock
+
+
+def _service(expires_in=3600, cache_size=2, public_base_url=""):
+    service = MediaURLService(expires_in=expires_in, cache_size=cache_size, public_base_url=public_base_url)
+    service._client = _FakeS3Client()
+    return service
+
+
+class TestKeysAndPublicUrls:
+    """Test key normalisation and URLs for API responses"""
+
+    @pytest.mark.parametrize("stored, key", [
+        ("/uploads/images/a.jpg", "images/a.jpg"),
+        ("uploads/images/a.jpg", "images/a.jpg"),
+        ("images/a.jpg", "images/a.jpg"),
+        ("/images/uploads/a.jpg", "images/uploads/a.jpg"),
+    ])
+    def test_normalize_key(self, stored, key):
+        assert MediaURLService.normalize_key(stored) == key
+
+    def test_public_url_needs_a_base(self):
+        assert _service().public_url("images/a.jpg") is None
+        service = _service(public_base_url="https://cdn.example/")
+        assert service.public_url("images/a.jpg") == "https://cdn.example/images/a.jpg"
+
+    def test_url_for(self):
+        service = _service(public_base_url="https://cdn.example")
+        service.use_r2 = True
+        assert service.url_for(None) is None
+        assert service.url_for("https://elsewhere.example/a.jpg") == "https://elsewhere.example/a.jpg"
+        assert service.url_for("/uploads/images/a.jpg") == "https://cdn.example/images/a.jpg"
+
+        service.use_r2 = False
+        assert service.url_for("images/a.jpg") == "/uploads/images/a.jpg"
+        assert service.direct_url("images/a.jpg") == "images/a.jpg"
+
+
+class TestPresignedUrls:
+    """Test reuse, refresh and eviction of presigned URLs"""
+
+    def test_reused_until_refresh_margin(self, clock):
+        service = _service(expires_in=3600)
+        url, max_age = service.presigned_url("images/a.jpg")
+        assert max_age == 3600 - REFRESH_MARGIN_SECONDS
+
+        clock.now += 1000
+        again, max_age = service.presigned_url("images/a.jpg")
+        assert again == url
+        assert max_age == 3600 - REFRESH_MARGIN_SECONDS - 1000
+        assert service.client.calls == 1
+
+    def test_resigned_near_expiry(self, clock):
+        service = _service(expires_in=3600)
+        url, _ = service.presigned_url("images/a.jpg")
+
+        clock.now += 3600 - REFRESH_MARGIN_SECONDS
+        fresh, max_age = service.presigned_url("images/a.jpg")
+        assert fresh != url
+        assert max_age == 3600 - REFRESH_MARGIN_SECONDS
+        assert service.client.calls == 2
+
+    def test_least_recently_used_is_evicted(self, clock):
+        service = _service(cache_size=2)
+        service.presigned_url("a.jpg")
+        service.presigned_url("b.jpg")
+        service.presigned_url("a.jpg")  # a is now the most recently used
+        service.presigned_url("c.jpg")
+        assert list(service._urls) == ["a.jpg", "c.jpg"]
+
+        service.presigned_url("a.jpg")
+        assert service.client.calls == 3
+        service.presigned_url("b.jpg")
+        assert service.client.calls == 4
+
+    def test_clear(self, clock):
+        service = _service()
+        service.presigned_url("a.jpg")
+        service.clear()
+        service.presigned_url("a.jpg")
+        assert service.client.calls == 2
@@ -0,0 +1,128 @@
+"""
+Tests for unread notification counters and local event fan-out
+"""
+
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.services import notification_events as events_module
+from app.services.notification_events import (
+    MEMORY_UNREAD_TTL_SECONDS, STREAM_TICKET_TTL_SECONDS, NotificationEvents, format_sse
+)
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(events_module.time, "monotonic", clock)
+    monkeypatch.setattr(events_module.cache_manager, "use_redis", False)
+    return clock
+
+
+class TestNotificationEvents:
+    """Test the in-memory counter backend and stream dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_unseeded_counter_is_left_for_next_read(self):
+        events = NotificationEvents()
+        assert await events.adjust_unread(uuid4(), 1) is None
+
+    @pytest.mark.asyncio
+    async def test_counter_never_goes_negative(self):
+        events = NotificationEvents()
+        user_id = uuid4()
+
+        await events.set_unread(user_id, 1)
+        assert await events.adjust_unread(user_id, 2) == 3
+        assert await events.adjust_unread(user_id, -5) == 0
+
+    @pytest.mark.asyncio
+    async def test_events_reach_only_that_users_streams(self):
+        events = NotificationEvents()
+        user_id, other_id = uuid4(), uuid4()
+        queue = events.subscribe(user_id)
+        other_queue = events.subscribe(other_id)
+
+        await events.set_unread(user_id, 0)
+        await events.notification_created(user_id, {"id": "n1", "title": "Hi"})
+
+        event = queue.get_nowait()
+        assert event["type"] == "notification"
+        assert event["unread_count"] == 1
+        assert other_queue.empty()
+
+        events.unsubscribe(user_id, queue)
+        await events.unread_changed(user_id, 0)
+        assert queue.empty()
+
+    def test_format_sse(self):
+        frame = format_sse({"type": "unread_count", "unread_count": 3})
+
+        assert frame.startswith("event: unread_count\ndata: ")
+        assert frame.endswith("\n\n")
+        assert json.loads(frame.split("data: ", 1)[1]) == {"type": "unread_count", "unread_count": 3}
+
+
+class TestMemoryCounterExpiry:
+    """Test that memory counters are recounted instead of drifting forever"""
+
+    @pytest.mark.asyncio
+    async def test_counter_is_recounted_after_ttl(self, clock, monkeypatch):
+        events = NotificationEvents()
+        user_id = uuid4()
+        counts = iter([2, 7])
+
+        async def count_unread(db, user_id):
+            return next(counts)
+
+        monkeypatch.setattr(events, "_count_unread", count_unread)
+
+        assert await events.unread_count(None, user_id) == 2
+        assert await events.adjust_unread(user_id, 1) == 3
+
+        # Writes do not extend the seed: other workers' changes are not seen here
+        clock.now += MEMORY_UNREAD_TTL_SECONDS
+        assert await events.adjust_unread(user_id, 1) is None
+        assert await events.unread_count(None, user_id) == 7
+
+
+class TestStreamTickets:
+    """Test single-use stream tickets (memory backend)"""
+
+    @pytest.mark.asyncio
+    async def test_ticket_is_single_use(self, clock):
+        events = NotificationEvents()
+        user_id = uuid4()
+
+        ticket = await events.issue_stream_ticket(user_id)
+
+        assert await events.redeem_stream_ticket(ticket) == user_id
+        assert await events.redeem_stream_ticket(ticket) is None
+
+    @pytest.mark.asyncio
+    async def test_ticket_expires(self, clock):
+        events = NotificationEvents()
+        ticket = await events.issue_stream_ticket(uuid4())
+
+        clock.now += STREAM_TICKET_TTL_SECONDS
+        assert await events.redeem_stream_ticket(ticket) is None
+        assert await events.redeem_stream_ticket("unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_tickets_are_pruned(self, clock):
+        events = NotificationEvents()
+        await events.issue_stream_ticket(uuid4())
+
+        clock.now += STREAM_TICKET_TTL_SECONDS
+        await events.issue_stream_ticket(uuid4())
+        assert len(events._memory_tickets) == 1
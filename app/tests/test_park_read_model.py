@@ -0,0 +1,143 @@
+"""
+Tests for the national park read model projection
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import park_read_model as read_model_module
+from app.services.http_cache import ResourceVersions
+from app.services.park_read_model import ParkReadModel, _snapshot, project_park, resolve_media
+
+
+def _park(name, state=None, is_active=True, media=None):
+    return SimpleNamespace(
+        id=uuid4(), name=name, state=state, slug=name.lower().replace(" ", "-"),
+        description=None, biodiversity=None, conservation=None,
+        media_urls=media or [], video_urls=[], banner_media_url="parks/banner.jpg",
+        expedition_slugs=None, banner_media_type="image", is_active=is_active,
+        created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 2),
+    )
+
+
+class _Result:
+    def __init__(self, parks):
+        self._parks = parks
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._parks
+
+
+class _FakeDb:
+    """Returns the current park rows and counts the loads"""
+
+    def __init__(self, parks):
+        self.parks = parks
+        self.loads = 0
+
+    async def execute(self, statement):
+        self.loads += 1
+        return _Result(list(self.parks))
+
+
+@pytest.fixture
+def read_model(monkeypatch):
+    monkeypatch.setattr(read_model_module.cache_manager, "use_redis", False)
+    monkeypatch.setattr(read_model_module.cache_manager, "memory_cache", {})
+    monkeypatch.setattr(read_model_module.cache_manager, "memory_cache_ttl", {})
+    monkeypatch.setattr(read_model_module, "resource_versions", ResourceVersions())
+    return ParkReadModel()
+
+
+class TestParkReadModel:
+    """Test media filtering, snapshot selection and versioning"""
+
+    def test_resolve_media_keeps_approved_and_legacy(self):
+        items = [
+            {"url": "parks/a.jpg", "approved": True},
+            {"url": "parks/b.jpg", "approved": False},
+            "/uploads/parks/c.jpg",
+        ]
+
+        assert resolve_media(items) == ["/uploads/parks/a.jpg", "/uploads/parks/c.jpg"]
+        assert len(resolve_media(items, approved_only=False)) == 3
+
+    def test_projection_is_json_ready(self):
+        park = project_park(_park("Kaziranga"))
+
+        assert park["banner_media_url"] == "/uploads/parks/banner.jpg"
+        assert park["created_at"] == "2025-01-01T00:00:00"
+        assert park["expedition_slugs"] == []
+        assert isinstance(park["id"], str)
+
+    def test_select_filters_like_the_query(self):
+        parks = [project_park(_park(n, s, a)) for n, s, a in [
+            ("Ranthambore", "Rajasthan", True),
+            ("Kaziranga", "Assam", True),
+            ("Sariska", "Rajasthan", False),
+        ]]
+        snapshot = _snapshot({p["id"]: p for p in parks})
+
+        assert [p["name"] for p in snapshot["parks"]] == ["Kaziranga", "Ranthambore", "Sariska"]
+        assert [p["name"] for p in ParkReadModel.select(snapshot, search="rajas")] == ["Ranthambore", "Sariska"]
+        assert [p["name"] for p in ParkReadModel.select(snapshot, is_active=True, skip=1)] == ["Ranthambore"]
+
+    def test_version_changes_with_content(self):
+        park = project_park(_park("Kaziranga"))
+        before = _snapshot({park["id"]: park})
+        park = dict(park, media_urls=["/uploads/parks/new.jpg"])
+        after = _snapshot({park["id"]: park})
+
+        assert before["version"] != after["version"]
+
+
+class TestSnapshotInvalidation:
+    """Test that writes retire the snapshot instead of patching it"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_cached_until_a_write(self, read_model):
+        db = _FakeDb([_park("Kaziranga")])
+
+        first = await read_model.snapshot(db)
+        assert await read_model.snapshot(db) == first
+        assert db.loads == 1
+
+        db.parks.append(_park("Ranthambore"))
+        await read_model.invalidate()
+
+        names = [park["name"] for park in (await read_model.snapshot(db))["parks"]]
+        assert names == ["Kaziranga", "Ranthambore"]
+        assert db.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_are_not_lost(self, read_model):
+        """Two writers that each saw the old snapshot both end up visible"""
+        kaziranga, sariska = _park("Kaziranga"), _park("Sariska")
+        db = _FakeDb([kaziranga, sariska])
+        await read_model.snapshot(db)
+
+        # One writer edits Kaziranga while another deletes Sariska
+        kaziranga.state = "Assam"
+        db.parks = [kaziranga]
+        await read_model.invalidate()
+        await read_model.invalidate()
+
+        parks = (await read_model.snapshot(db))["parks"]
+        assert [(park["name"], park["state"]) for park in parks] == [("Kaziranga", "Assam")]
+
+    @pytest.mark.asyncio
+    async def test_stale_rebuild_lands_under_the_retired_version(self, read_model):
+        """A reader that loaded rows before a write cannot overwrite the next snapshot"""
+        db = _FakeDb([_park("Kaziranga")])
+        key = read_model_module.SNAPSHOT_KEY_PREFIX + await read_model_module.resource_versions.get("national_parks")
+
+        await read_model.invalidate()
+        await read_model_module.cache_manager.set(key, _snapshot({}), ttl=60)
+
+        assert [park["name"] for park in (await read_model.snapshot(db))["parks"]] == ["Kaziranga"]
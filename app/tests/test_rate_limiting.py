@@ -0,0 +1,222 @@
+"""
+Tests for the GCRA rate limiting middleware
+"""
+
+import json
+
+import pytest
+from starlette.datastructures import Headers
+
+from app.core import client_ip as client_ip_module
+from app.core.client_ip import client_ip
+from app.middleware.rate_limiting import (
+    LocalGCRA,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+)
+
+
+LOGIN_POLICY = RateLimitPolicy("test_login", limit=5, period=300, methods=("POST",))
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _call(middleware, path, method="POST", client_ip="203.0.113.7", headers=None):
+    """Run one request through the middleware and collect the response"""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": (client_ip, 12345),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    response_headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+    return start["status"], response_headers, body
+
+
+class TestLocalGCRA:
+    """Test the in-process GCRA arithmetic"""
+
+    def test_allows_burst_then_blocks(self):
+        """A full burst is allowed at once, the next request must wait"""
+        gcra = LocalGCRA()
+        now = 1_000_000.0
+
+        for _ in range(LOGIN_POLICY.limit):
+            granted, _, _ = gcra.acquire("k", LOGIN_POLICY, 1, now)
+            assert granted == 1
+
+        granted, retry_after_ms, _ = gcra.acquire("k", LOGIN_POLICY, 1, now)
+        assert granted == 0
+        assert retry_after_ms == pytest.approx(LOGIN_POLICY.emission_interval_ms)
+
+    def test_tokens_replenish_over_time(self):
+        """One emission interval later exactly one more request is allowed"""
+        gcra = LocalGCRA()
+        now = 1_000_000.0
+        for _ in range(LOGIN_POLICY.limit):
+            gcra.acquire("k", LOGIN_POLICY, 1, now)
+
+        later = now + LOGIN_POLICY.emission_interval_ms
+        assert gcra.acquire("k", LOGIN_POLICY, 1, later)[0] == 1
+        assert gcra.acquire("k", LOGIN_POLICY, 1, later)[0] == 0
+
+    def test_batch_grant_is_clipped_to_available(self):
+        """Leasing never grants more than the remaining burst"""
+        gcra = LocalGCRA()
+        granted, _, remaining = gcra.acquire("k", LOGIN_POLICY, 10, 0.0)
+        assert granted == LOGIN_POLICY.limit
+        assert remaining == 0
+
+
+class TestRateLimitMiddleware:
+    """Test policy matching and 429 responses"""
+
+    @pytest.mark.asyncio
+    async def test_login_limited_with_proper_429(self):
+        """Exceeding the login policy returns a JSON 429 with Retry-After"""
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/auth/login", LOGIN_POLICY)], limiter=RateLimiter()
+        )
+
+        for _ in range(LOGIN_POLICY.limit):
+            status, headers, _ = await _call(middleware, "/api/v1/auth/login")
+            assert status == 200
+            assert headers["x-ratelimit-limit"] == str(LOGIN_POLICY.limit)
+
+        status, headers, body = await _call(middleware, "/api/v1/auth/login")
+        assert status == 429
+        assert int(headers["retry-after"]) > 0
+        payload = json.loads(body)
+        assert payload["status"] is False
+        assert payload["error_type"] == "RateLimitExceeded"
+
+    @pytest.mark.asyncio
+    async def test_limits_are_per_client(self):
+        """Another IP has its own budget"""
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/auth/login", LOGIN_POLICY)], limiter=RateLimiter()
+        )
+        for _ in range(LOGIN_POLICY.limit + 1):
+            await _call(middleware, "/api/v1/auth/login", client_ip="203.0.113.7")
+
+        status, _, _ = await _call(middleware, "/api/v1/auth/login", client_ip="198.51.100.2")
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_path_parameters_and_methods(self):
+        """Templated routes match, other methods and paths are not limited"""
+        policy = RateLimitPolicy("test_submit", limit=1, period=60, methods=("POST",))
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/quizzes/{quiz_id}/submit", policy)], limiter=RateLimiter()
+        )
+
+        assert (await _call(middleware, "/api/v1/quizzes/abc/submit"))[0] == 200
+        assert (await _call(middleware, "/api/v1/quizzes/abc/submit"))[0] == 429
+        assert (await _call(middleware, "/api/v1/quizzes/abc/submit", method="GET"))[0] == 200
+        assert (await _call(middleware, "/api/v1/quizzes/abc"))[0] == 200
+
+    @pytest.mark.asyncio
+    async def test_whitelisted_ips_skip_limits(self):
+        """Internal traffic is never limited"""
+        policy = RateLimitPolicy("test_internal", limit=1, period=60)
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/auth/login", policy)], limiter=RateLimiter()
+        )
+        for _ in range(3):
+            status, _, _ = await _call(middleware, "/api/v1/auth/login", client_ip="127.0.0.1")
+            assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_private_proxy_peer_is_not_whitelisted(self, monkeypatch):
+        """Behind a proxy on a private address, clients still get limited"""
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 1)
+        policy = RateLimitPolicy("test_proxied", limit=1, period=60)
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/auth/login", policy)], limiter=RateLimiter()
+        )
+        for forwarded_for, expected in (("203.0.113.7", 200), ("203.0.113.7", 429), ("10.9.9.9", 200),
+                                        ("10.9.9.9", 429)):
+            status, _, _ = await _call(
+                middleware, "/api/v1/auth/login", client_ip="10.0.0.2",
+                headers={"X-Forwarded-For": forwarded_for},
+            )
+            assert status == expected
+
+    @pytest.mark.asyncio
+    async def test_spoofed_forwarded_for_does_not_change_key(self):
+        """Without trusted proxies a client cannot pick its own limit key"""
+        middleware = RateLimitMiddleware(
+            _ok_app, policies=[("/api/v1/auth/login", LOGIN_POLICY)], limiter=RateLimiter()
+        )
+        for index in range(LOGIN_POLICY.limit):
+            spoofed = {"X-Forwarded-For": f"198.51.100.{index}", "X-Real-IP": f"192.0.2.{index}"}
+            assert (await _call(middleware, "/api/v1/auth/login", headers=spoofed))[0] == 200
+
+        status, _, _ = await _call(
+            middleware, "/api/v1/auth/login", headers={"X-Forwarded-For": "127.0.0.1"}
+        )
+        assert status == 429
+
+
+def _scope(peer, forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return {"type": "http", "headers": headers, "client": (peer, 12345)}
+
+
+class TestClientIp:
+    """Test which X-Forwarded-For entry is trusted"""
+
+    def test_header_ignored_without_trusted_proxies(self, monkeypatch):
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 0)
+        assert client_ip(_scope("203.0.113.7", "127.0.0.1")) == "203.0.113.7"
+
+    def test_rightmost_untrusted_hop(self, monkeypatch):
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "10.0.0.0/8, 100.64.0.1")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 0)
+        scope = _scope("10.1.2.3", "127.0.0.1, 203.0.113.7, 100.64.0.1")
+        assert client_ip(scope) == "203.0.113.7"
+        assert client_ip(scope, Headers(scope=scope)) == "203.0.113.7"
+
+    def test_untrusted_peer_is_the_client(self, monkeypatch):
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "10.0.0.0/8")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 0)
+        assert client_ip(_scope("203.0.113.7", "127.0.0.1")) == "203.0.113.7"
+
+    def test_proxy_count(self, monkeypatch):
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 1)
+        assert client_ip(_scope("10.1.2.3", "127.0.0.1, 203.0.113.7")) == "203.0.113.7"
+        assert client_ip(_scope("10.1.2.3")) == "10.1.2.3"
+
+    def test_production_defaults_to_one_proxy(self, monkeypatch):
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXIES", "")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", None)
+        monkeypatch.setattr(client_ip_module.settings, "ENVIRONMENT", "production")
+        assert client_ip_module.proxies_configured()
+        assert client_ip(_scope("100.64.0.3", "127.0.0.1, 203.0.113.7")) == "203.0.113.7"
+
+        monkeypatch.setattr(client_ip_module.settings, "ENVIRONMENT", "development")
+        assert not client_ip_module.proxies_configured()
+        assert client_ip(_scope("100.64.0.3", "203.0.113.7")) == "100.64.0.3"
+
+        monkeypatch.setattr(client_ip_module.settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(client_ip_module.settings, "TRUSTED_PROXY_COUNT", 0)
+        assert not client_ip_module.proxies_configured()
@@ -0,0 +1,143 @@
+"""
+Tests for recommendation engine scoring
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.recommendation_engine import (
+    REFRESH_INTERVAL, RecommendationEngine, SignalMatrices, build_index, content_similarity,
+    cooccurrence_similarity, score_animals, score_contents, sparse_to_dense, top_k,
+)
+
+
+def _signals(interactions, videos=None, quiz=None, features=None, animal_categories=None,
+             content_categories=None):
+    interactions = np.asarray(interactions, dtype=np.float32)
+    users, animals = interactions.shape
+    content_categories = np.asarray(content_categories if content_categories is not None else np.zeros((0, 1)),
+                                    dtype=np.float32)
+    return SignalMatrices(
+        users=build_index(uuid4() for _ in range(users)),
+        animals=build_index(uuid4() for _ in range(animals)),
+        contents=build_index(uuid4() for _ in range(content_categories.shape[0])),
+        animal_interactions=interactions,
+        video_progress=np.asarray(videos if videos is not None else np.zeros((users, 0)), dtype=np.float32),
+        quiz_categories=np.asarray(quiz if quiz is not None else np.zeros((users, 1)), dtype=np.float32),
+        animal_features=np.asarray(features if features is not None else np.eye(animals), dtype=np.float32),
+        animal_categories=np.asarray(
+            animal_categories if animal_categories is not None else np.zeros((animals, 1)), dtype=np.float32
+        ),
+        content_categories=content_categories,
+        content_popularity=np.ones(content_categories.shape[0], dtype=np.float32),
+    )
+
+
+class TestRecommendationEngine:
+    """Test the vectorised scoring helpers"""
+
+    def test_sparse_to_dense_sums_duplicates(self):
+        matrix = sparse_to_dense([(0, 1, 1.0), (0, 1, 2.0), (1, 0, 0.5)], (2, 2))
+        assert matrix.tolist() == [[0.0, 3.0], [0.5, 0.0]]
+
+    def test_similarities_have_zero_diagonal(self):
+        cooccurrence = cooccurrence_similarity(np.array([[1, 1, 0], [1, 1, 0], [0, 0, 1]], dtype=np.float32))
+        assert np.allclose(np.diag(cooccurrence), 0)
+        assert np.isclose(cooccurrence[0, 1], 1.0)
+        assert cooccurrence[0, 2] == 0
+
+        similarity = content_similarity(np.array([[1, 0], [1, 1], [0, 0]], dtype=np.float32))
+        assert np.allclose(np.diag(similarity), 0)
+        assert similarity[2].sum() == 0
+
+    def test_top_k_orders_and_drops_non_positive(self):
+        picked = top_k(np.array([[0.1, 0.9, 0.0, 0.5]]), 3)
+        assert picked[0].tolist() == [1, 3, 0]
+
+        picked = top_k(np.array([[0.0, 0.2]]), 5)
+        assert picked[0].tolist() == [1]
+
+    def test_cooccurring_animal_is_recommended_and_seen_is_excluded(self):
+        # Users 0 and 1 both viewed animals 0 and 1; user 2 only viewed animal 0
+        signals = _signals([[1, 1, 0], [1, 1, 0], [1, 0, 0]])
+        matrices = RecommendationEngine._item_matrices(signals)
+
+        scores, components = score_animals(signals, *matrices, slice(2, 3))
+
+        assert scores[0, 0] == 0
+        assert top_k(scores, 1)[0].tolist() == [1]
+        assert components.shape == (4, 1, 3)
+
+    def test_content_scores_follow_quiz_categories(self):
+        signals = _signals(
+            [[0, 0]],
+            quiz=[[0, 3]],
+            animal_categories=[[1, 0], [0, 1]],
+            content_categories=[[1, 0], [0, 1]],
+        )
+
+        scores = score_contents(signals, slice(0, 1))
+
+        assert top_k(scores, 2)[0].tolist() == [1]
+
+
+def _engine(monkeypatch, locked=True, last_refreshed=None):
+    """Engine with a fake lock and last-run time that records refreshes"""
+    engine = RecommendationEngine()
+    engine.refreshes = 0
+
+    @asynccontextmanager
+    async def locked_session():
+        yield object() if locked else None
+
+    async def last(db):
+        return last_refreshed
+
+    async def refresh(db):
+        engine.refreshes += 1
+        return 5
+
+    monkeypatch.setattr(engine, "_locked_session", locked_session)
+    monkeypatch.setattr(engine, "_last_refreshed", last)
+    monkeypatch.setattr(engine, "_refresh", refresh)
+    return engine
+
+
+class TestRefreshScheduling:
+    """Test that restarts and concurrent processes do not recompute"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_rows_skip_the_run(self, monkeypatch):
+        engine = _engine(monkeypatch, last_refreshed=datetime.now(timezone.utc) - timedelta(hours=1))
+
+        due_in = await engine.refresh_if_due()
+
+        assert engine.refreshes == 0
+        assert REFRESH_INTERVAL.total_seconds() - 3700 < due_in <= REFRESH_INTERVAL.total_seconds() - 3600
+
+    @pytest.mark.asyncio
+    async def test_stale_or_missing_rows_are_refreshed(self, monkeypatch):
+        stale = _engine(monkeypatch, last_refreshed=datetime.now(timezone.utc) - REFRESH_INTERVAL)
+        assert await stale.refresh_if_due() == REFRESH_INTERVAL.total_seconds()
+        assert stale.refreshes == 1
+
+        empty = _engine(monkeypatch)
+        await empty.refresh_if_due()
+        assert empty.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_lock_held_elsewhere_skips_the_run(self, monkeypatch):
+        engine = _engine(monkeypatch, locked=False)
+
+        assert await engine.refresh_if_due() == REFRESH_INTERVAL.total_seconds()
+        assert await engine.refresh_all() == 0
+        assert engine.refreshes == 0
+
+    def test_seen_is_part_of_the_item_matrices(self):
+        signals = _signals([[2, 0], [0, 1]])
+        seen = RecommendationEngine._item_matrices(signals)[-1]
+        assert seen.tolist() == [[1.0, 0.0], [0.0, 1.0]]
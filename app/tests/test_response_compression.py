@@ -0,0 +1,137 @@
+"""
+Tests for the orjson response path and response compression
+"""
+
+import gzip
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from app.core.responses import FastJSONResponse
+from app.middleware.compression import HAS_BROTLI, CompressionMiddleware, negotiate_encoding
+
+PAYLOAD = json.dumps({"videos": [{"title": f"Tiger {i}", "views": i} for i in range(200)]}).encode()
+
+
+def _app(body=PAYLOAD, chunks=1, content_type="application/json", headers=()):
+    """Endpoint stand-in sending body in a number of chunks"""
+
+    async def app(scope, receive, send):
+        start_headers = [(b"content-type", content_type.encode()), *headers]
+        if chunks == 1:
+            start_headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": start_headers})
+        size = -(-len(body) // chunks)
+        for index in range(chunks):
+            await send({
+                "type": "http.response.body",
+                "body": body[index * size:(index + 1) * size],
+                "more_body": index < chunks - 1,
+            })
+
+    return app
+
+
+async def _call(middleware, accept_encoding="gzip"):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/videos",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return {k.decode().lower(): v.decode() for k, v in start["headers"]}, body
+
+
+class TestFastJSONResponse:
+    """Test orjson rendering of pre-shaped payloads"""
+
+    def test_renders_common_types(self):
+        response = FastJSONResponse({
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "at": datetime(2025, 1, 2, 3, 4, 5),
+            "score": Decimal("4.5"),
+            "tags": ["a"],
+        })
+        assert json.loads(response.body) == {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "at": "2025-01-02T03:04:05",
+            "score": 4.5,
+            "tags": ["a"],
+        }
+        assert response.media_type == "application/json"
+
+    def test_unknown_types_raise(self):
+        with pytest.raises(TypeError):
+            FastJSONResponse({"value": object()})
+
+
+class TestNegotiateEncoding:
+    """Test Accept-Encoding negotiation"""
+
+    def test_prefers_brotli_when_available(self):
+        assert negotiate_encoding("gzip, deflate, br", brotli_available=True) == "br"
+        assert negotiate_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+
+    def test_respects_quality_values(self):
+        assert negotiate_encoding("br;q=0, gzip;q=0.5", brotli_available=True) == "gzip"
+        assert negotiate_encoding("gzip;q=0", brotli_available=False) is None
+        assert negotiate_encoding("identity", brotli_available=True) is None
+        assert negotiate_encoding("*", brotli_available=False) == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test compression of single and streamed bodies"""
+
+    @pytest.mark.asyncio
+    async def test_gzip_single_body(self):
+        headers, body = await _call(CompressionMiddleware(_app()))
+        assert headers["content-encoding"] == "gzip"
+        assert headers["content-length"] == str(len(body))
+        assert "accept-encoding" in headers["vary"].lower()
+        assert gzip.decompress(body) == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_gzip_streamed_body(self):
+        headers, body = await _call(CompressionMiddleware(_app(chunks=4)))
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        assert gzip.decompress(body) == PAYLOAD
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not HAS_BROTLI, reason="brotli not installed")
+    async def test_brotli(self):
+        import brotli
+
+        headers, body = await _call(CompressionMiddleware(_app()), accept_encoding="br, gzip")
+        assert headers["content-encoding"] == "br"
+        assert brotli.decompress(body) == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_small_and_binary_bodies_pass_through(self):
+        headers, body = await _call(CompressionMiddleware(_app(body=b"{}")))
+        assert "content-encoding" not in headers
+        assert body == b"{}"
+
+        headers, body = await _call(CompressionMiddleware(_app(content_type="video/mp4")))
+        assert "content-encoding" not in headers
+        assert body == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_compressed_etag_is_weak(self):
+        app = _app(headers=[(b"etag", b'"videos-1-abc"')])
+        headers, _ = await _call(CompressionMiddleware(app))
+        assert headers["etag"] == 'W/"videos-1-abc"'
@@ -0,0 +1,106 @@
+"""
+Tests for the process-wide settings registry
+"""
+
+import pytest
+
+from app.models.site_setting import SiteSetting
+from app.services.settings_service import SettingsRegistry, SettingsService
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _FakeSession:
+    """Minimal stand-in for AsyncSession that counts settings reads"""
+
+    def __init__(self, rows, on_execute=None):
+        self.rows = rows
+        self.executions = 0
+        self.on_execute = on_execute
+
+    async def execute(self, statement):
+        self.executions += 1
+        rows = self.rows
+        if self.on_execute:
+            self.on_execute()
+        return _FakeResult(rows)
+
+
+def _setting(key, value, data_type):
+    return SiteSetting(key=key, value=value, data_type=data_type, category="test", label=key)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Fresh registry swapped in for the global one"""
+    fresh = SettingsRegistry()
+    monkeypatch.setattr("app.services.settings_service.settings_registry", fresh)
+    return fresh
+
+
+class TestSettingsRegistry:
+    """Test settings snapshot loading and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_settings_loaded_once_per_process(self, registry):
+        """Repeated reads across service instances hit the database once"""
+        db = _FakeSession([_setting("daily_points_limit", "750", "int")])
+
+        for _ in range(5):
+            service = SettingsService(db)
+            assert await service.get_int("daily_points_limit", 500) == 750
+
+        assert db.executions == 1
+
+    @pytest.mark.asyncio
+    async def test_mark_stale_triggers_reload(self, registry):
+        """Invalidation makes the next read pick up new values"""
+        db = _FakeSession([_setting("rewards_system_enabled", "true", "bool")])
+        service = SettingsService(db)
+        assert await service.is_rewards_system_enabled() is True
+
+        db.rows = [_setting("rewards_system_enabled", "false", "bool")]
+        assert await service.is_rewards_system_enabled() is True
+
+        await registry.publish_change()
+        assert await service.is_rewards_system_enabled() is False
+        assert db.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_values_fall_back_to_defaults(self, registry):
+        """A malformed row does not break the rest of the snapshot"""
+        db = _FakeSession([
+            _setting("leaderboard_max_entries", "not-a-number", "int"),
+            _setting("min_time_between_attempts", "120", "int"),
+        ])
+        service = SettingsService(db)
+
+        assert await service.get_int("leaderboard_max_entries", 100) == 100
+        assert await service.get_int("min_time_between_attempts", 300) == 120
+
+    @pytest.mark.asyncio
+    async def test_change_during_reload_is_not_lost(self, registry):
+        """An invalidation that lands mid-load forces another reload"""
+        db = _FakeSession([_setting("daily_points_limit", "500", "int")])
+
+        def settings_changed():
+            db.rows = [_setting("daily_points_limit", "800", "int")]
+            db.on_execute = None
+            registry.mark_stale()
+
+        db.on_execute = settings_changed
+        service = SettingsService(db)
+
+        assert await service.get_int("daily_points_limit", 0) == 500
+        assert not registry.is_loaded
+        assert await service.get_int("daily_points_limit", 0) == 800
+        assert db.executions == 2
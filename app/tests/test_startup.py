@@ -0,0 +1,124 @@
+"""
+Tests for lazily included routers and startup profiling
+"""
+
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from starlette.testclient import TestClient
+
+from app.core import lazy_routes
+from app.core.lazy_routes import LazyRouter, include_router_lazily, load_lazy_routers, pending_lazy_routers
+from app.core.startup_profiler import StartupProfiler, group_imports, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       5000 |     app.admin.routes.videos
+import time:      1000 |       6000 |   app.admin.routes
+import time:       500 |       9500 | app.main
+import time:      2000 |       2000 |     sqlalchemy.orm
+"""
+
+
+@pytest.fixture
+def admin_module():
+    """A fake admin module registered only for the duration of the test"""
+    module = types.ModuleType("fake_lazy_admin")
+    router = APIRouter()
+
+    @router.get("")
+    async def dashboard():
+        return {"page": "dashboard"}
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id}
+
+    module.router = router
+    sys.modules[module.__name__] = module
+    yield module
+    del sys.modules[module.__name__]
+
+
+def _build_app():
+    app = FastAPI()
+
+    @app.get("/admin/static/app.css")
+    async def stylesheet():
+        return {"asset": "css"}
+
+    placeholder = include_router_lazily(app, "/admin", "fake_lazy_admin:router", tags=["admin"])
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app, placeholder
+
+
+class TestLazyRouter:
+    """Test first-hit loading of routers"""
+
+    def test_other_routes_do_not_load_router(self, admin_module):
+        app, placeholder = _build_app()
+        client = TestClient(app)
+        assert client.get("/health").json() == {"status": "healthy"}
+        assert client.get("/admin/static/app.css").json() == {"asset": "css"}
+        assert isinstance(placeholder, LazyRouter)
+        assert not placeholder.loaded
+
+    def test_first_request_loads_and_routes(self, admin_module):
+        app, placeholder = _build_app()
+        client = TestClient(app)
+
+        assert client.get("/admin/items/7").json() == {"item_id": 7}
+        assert placeholder.loaded
+        assert placeholder not in app.router.routes
+        assert client.get("/admin").json() == {"page": "dashboard"}
+        assert client.get("/admin/missing").status_code == 404
+        assert "/admin/items/{item_id}" in app.openapi()["paths"]
+
+    @pytest.mark.asyncio
+    async def test_load_all_pending(self, admin_module):
+        app, _ = _build_app()
+        assert len(pending_lazy_routers(app)) == 1
+        await load_lazy_routers(app)
+        assert pending_lazy_routers(app) == []
+
+    def test_disabled_includes_eagerly(self, admin_module, monkeypatch):
+        monkeypatch.setattr(lazy_routes.settings, "LAZY_ROUTERS_ENABLED", False)
+        app, placeholder = _build_app()
+        assert placeholder is None
+        assert TestClient(app).get("/admin/items/3").json() == {"item_id": 3}
+
+
+class TestStartupProfiler:
+    """Test step timing and import-time parsing"""
+
+    def test_marks_record_consecutive_steps(self):
+        profiler = StartupProfiler()
+        profiler.mark("imports")
+        profiler.mark("cache")
+        profiler.complete()
+        profiler.mark("after startup")
+
+        report = profiler.report()
+        assert report["completed"]
+        assert [step["step"] for step in report["steps"]] == ["imports", "cache"]
+
+    def test_parse_importtime(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT.splitlines())
+        assert [t.module for t in timings] == [
+            "_io", "app.admin.routes.videos", "app.admin.routes", "app.main", "sqlalchemy.orm"
+        ]
+        assert timings[1].depth == 2
+        assert timings[3].cumulative_us == 9500
+
+    def test_group_imports(self):
+        groups = dict(group_imports(parse_importtime(IMPORTTIME_OUTPUT.splitlines())))
+        assert groups["app.admin.routes"] == 4000
+        assert groups["sqlalchemy"] == 2000
+        assert groups["app.main"] == 500
@@ -0,0 +1,128 @@
+"""
+Tests for chunked upload streaming
+"""
+
+import asyncio
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.core.exceptions import FileSizeError
+from app.services import file_upload
+from app.services.file_upload import SNIFF_BYTES, FileUploadService, stream_upload_to_path
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+class _RecordingUpload(UploadFile):
+    """UploadFile that records the size of every read"""
+
+    def __init__(self, content: bytes, filename="upload.bin", content_type="application/octet-stream"):
+        super().__init__(
+            BytesIO(content),
+            filename=filename,
+            headers=Headers({"content-type": content_type}),
+        )
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return await super().read(size)
+
+
+class TestStreamUploadToPath:
+    """Test streaming to disk with incremental hashing and size limits"""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_chunks(self, tmp_path):
+        content = bytes(range(256)) * 40  # 10240 bytes
+        upload = _RecordingUpload(content)
+        dest = tmp_path / "nested" / "file.bin"
+
+        size, digest, head = await stream_upload_to_path(upload, dest, max_size=len(content), chunk_size=4096)
+
+        assert size == len(content)
+        assert digest == hashlib.sha256(content).hexdigest()
+        assert head == content[:SNIFF_BYTES]
+        assert dest.read_bytes() == content
+        # Three chunks plus the empty read that ends the stream, never the whole file
+        assert upload.reads == [4096] * 4
+
+    @pytest.mark.asyncio
+    async def test_size_limit_aborts_and_removes_partial_file(self, tmp_path):
+        upload = _RecordingUpload(b"x" * 10000)
+        dest = tmp_path / "too-big.bin"
+
+        with pytest.raises(FileSizeError):
+            await stream_upload_to_path(upload, dest, max_size=5000, chunk_size=4096)
+
+        assert not dest.exists()
+        # Stopped at the chunk that crossed the limit
+        assert upload.reads == [4096, 4096]
+
+
+class TestContentSniffing:
+    """Test that content is checked against the declared type"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        return FileUploadService(upload_dir=str(tmp_path / "uploads"))
+
+    @pytest.mark.asyncio
+    async def test_head_is_sniffed_not_the_whole_file(self, service, tmp_path, monkeypatch):
+        if not file_upload.HAS_MAGIC:
+            pytest.skip("python-magic is not available")
+        sniffed = []
+        monkeypatch.setattr(
+            file_upload.magic, "from_buffer",
+            lambda buffer, mime: sniffed.append(buffer) or "application/pdf",
+        )
+        monkeypatch.setattr(
+            file_upload.magic, "from_file",
+            lambda *args, **kwargs: pytest.fail("file re-read for sniffing"),
+        )
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.4\n" + b"0" * 20000)
+
+        assert await service._validate_file_content(path, "application/pdf", b"%PDF-1.4\n")
+        assert sniffed == [b"%PDF-1.4\n"]
+
+    @pytest.mark.asyncio
+    async def test_mislabelled_content_is_rejected(self, service, tmp_path):
+        path = tmp_path / "fake.png"
+        path.write_bytes(b"<html>not an image</html>")
+
+        assert not await service._validate_file_content(path, "image/png", path.read_bytes())
+
+    @pytest.mark.asyncio
+    async def test_upload_rejects_mislabelled_file_and_cleans_up(self, service):
+        upload = _RecordingUpload(PNG_HEADER + b"\x00" * 32, filename="x.png", content_type="image/png")
+
+        with pytest.raises(file_upload.FileTypeError):
+            await service.upload_file(upload)
+
+        assert list((service.upload_dir / "temp").iterdir()) == []
+        assert list((service.upload_dir / "images").iterdir()) == []
+
+
+class TestUploadSlots:
+    """Test that helper uploads share the service's concurrency limit"""
+
+    @pytest.mark.asyncio
+    async def test_stream_to_path_waits_for_a_slot(self, tmp_path):
+        service = FileUploadService(upload_dir=str(tmp_path / "uploads"))
+        for _ in range(service.MAX_CONCURRENT_UPLOADS):
+            await service._upload_slots.acquire()
+
+        task = asyncio.create_task(
+            service.stream_to_path(_RecordingUpload(b"data"), tmp_path / "out.bin", max_size=100)
+        )
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        service._upload_slots.release()
+        assert (await task)[0] == 4
+        assert (tmp_path / "out.bin").read_bytes() == b"data"
@@ -0,0 +1,80 @@
+"""
+Tests for HLS packaging helpers
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.services import video_packaging
+from app.services.video_packaging import VideoPackagingWorker, build_ladder, hls_command, sprite_vtt
+
+
+class TestVideoPackaging:
+    """Test ladder selection and generated ffmpeg/VTT output"""
+
+    def test_ladder_never_upscales(self):
+        assert [r.name for r in build_ladder(1080)] == ["1080p", "720p", "480p", "360p"]
+        assert [r.name for r in build_ladder(720)] == ["720p", "480p", "360p"]
+        assert [r.name for r in build_ladder(240)] == ["360p"]
+
+    def test_hls_command_maps_every_rendition(self):
+        ladder = build_ladder(720)
+        cmd = hls_command("in.mp4", Path("out"), ladder, has_audio=True)
+
+        assert cmd[cmd.index("-var_stream_map") + 1] == "v:0,a:0,name:720p v:1,a:1,name:480p v:2,a:2,name:360p"
+        assert cmd.count("a:0") == len(ladder)
+        assert "master.m3u8" in cmd
+
+        silent = hls_command("in.mp4", Path("out"), ladder, has_audio=False)
+        assert "a:0" not in silent
+        assert "-c:a" not in silent
+
+    def test_keyframes_follow_segment_time_not_frame_count(self):
+        cmd = hls_command("in.mp4", Path("out"), build_ladder(720), has_audio=False)
+
+        assert cmd[cmd.index("-force_key_frames") + 1] == "expr:gte(t,n_forced*6)"
+        assert "-g" not in cmd
+
+    def test_sprite_vtt_tiles(self):
+        vtt = sprite_vtt(duration=25, interval=2, thumb_height=90)
+        lines = vtt.splitlines()
+
+        assert lines[0] == "WEBVTT"
+        assert "00:00:00.000 --> 00:00:02.000" in lines
+        # 11th frame wraps to the second row of the 10-column sheet
+        assert "sprite.jpg#xywh=0,90,160,90" in lines
+        assert "00:00:24.000 --> 00:00:25.000" in lines
+
+
+class TestPackagingWorker:
+    """Test that each packaging run gets its own output prefix"""
+
+    @pytest.mark.asyncio
+    async def test_repackaging_uses_new_prefix_and_removes_old(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(video_packaging.media_url_service, "use_r2", False)
+        worker = VideoPackagingWorker(workers=1, upload_dir=str(tmp_path))
+        stored = {}
+
+        async def record(model, row_id, streaming):
+            previous = stored.get(row_id)
+            stored[row_id] = streaming
+            return previous
+
+        async def fake_package(source, output_dir):
+            output_dir.mkdir(parents=True)
+            (output_dir / "master.m3u8").write_text("#EXTM3U")
+            return {"status": "ready", "renditions": []}
+
+        monkeypatch.setattr(worker, "record", record)
+        monkeypatch.setattr(video_packaging, "package_video", fake_package)
+
+        await worker.process("series_video", "row-1", "videos/a.mp4")
+        first = stored["row-1"]["prefix"]
+        await worker.process("series_video", "row-1", "videos/b.mp4")
+        second = stored["row-1"]["prefix"]
+
+        assert first != second
+        assert first.startswith("hls/row-1/") and second.startswith("hls/row-1/")
+        assert not (tmp_path / first).exists()
+        assert (tmp_path / second / "master.m3u8").exists()
@@ -6,6 +6,8 @@ from pathlib import Path
 import os
 import shutil
 
+from app.services.media_probe import parse_frame_rate
+
 # Set ffmpeg executable path for Windows
 if os.name == 'nt':  # Windows
     # Try to find ffmpeg in PATH
@@ -19,6 +21,8 @@ def get_video_duration(video_path: str) -> int:
     """
     Extract video duration in seconds using ffmpeg
     
+    Blocking; request handlers should rely on media_metadata_worker instead.
+    
     Args:
         video_path: Path to the video file
         
@@ -53,7 +57,7 @@ def get_video_info(video_path: str) -> dict:
             'width': int(video_info['width']),
             'height': int(video_info['height']),
             'codec': video_info['codec_name'],
-            'fps': eval(video_info.get('r_frame_rate', '0/1'))
+            'fps': parse_frame_rate(video_info.get('r_frame_rate', '0/1'))
         }
     except Exception as e:
         print(f"Error getting video info: {e}")
@@ -0,0 +1,329 @@
+"""
+Benchmark the hot API endpoints in-process
+
+Drives the ASGI app directly (no network, no uvicorn) with concurrent clients
+against the configured database, and reports p50/p95/p99 latency, throughput
+and database queries per request for each scenario. Query counts and DB time
+come from the Server-Timing header added by the instrumentation middleware.
+Any non-2xx response counts as an error and is left out of the latency, query
+and DB time figures, so a failing endpoint cannot look fast.
+
+Results are written as JSON under benchmarks/results/ so runs can be compared
+across commits:
+
+    python populate_test_data.py --benchmark --scale medium
+    python benchmark_endpoints.py --requests 300 --concurrency 16
+    python benchmark_endpoints.py --compare benchmarks/results/<earlier run>.json
+
+Use a local Postgres; never point this at production (quiz submissions write).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Query counts are read from Server-Timing; set before the app is imported
+os.environ.setdefault("SERVER_TIMING_ENABLED", "true")
+os.environ.setdefault("METRICS_ENABLED", "true")
+
+sys.path.append(str(Path(__file__).parent))
+
+RESULTS_DIR = Path(__file__).parent / "benchmarks" / "results"
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+@dataclass
+class Scenario:
+    """One endpoint call pattern; build() returns (method, path, json body, headers)"""
+
+    name: str
+    build: Callable[[int], tuple]
+
+
+@dataclass
+class Sample:
+    status: int
+    latency: float
+    queries: Optional[int] = None
+    db_time: Optional[float] = None
+
+
+@dataclass
+class Fixtures:
+    quiz_ids: List[str] = field(default_factory=list)
+    quiz_questions: Dict[str, int] = field(default_factory=dict)
+    discussion_ids: List[str] = field(default_factory=list)
+    user_tokens: List[str] = field(default_factory=list)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of values (pct in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def load_fixtures() -> Fixtures:
+    """Ids and tokens from the benchmark seed in populate_test_data.py"""
+    from sqlalchemy import select
+    from app.core.security import create_access_token
+    from app.db.database import get_db_session
+    from app.models.discussion import Discussion
+    from app.models.quiz_extended import Quiz
+    from app.models.user import User
+    from populate_test_data import BENCHMARK_EMAIL_DOMAIN, BENCHMARK_SLUG_PREFIX
+
+    fixtures = Fixtures()
+    async with get_db_session() as db:
+        quizzes = (await db.execute(
+            select(Quiz.id, Quiz.questions).where(Quiz.title.like("[bench]%"), Quiz.is_active == True)
+        )).all()
+        fixtures.quiz_ids = [str(quiz_id) for quiz_id, _ in quizzes]
+        fixtures.quiz_questions = {str(quiz_id): len(questions or []) for quiz_id, questions in quizzes}
+
+        fixtures.discussion_ids = [str(discussion_id) for discussion_id in (await db.execute(
+            select(Discussion.id)
+            .where(Discussion.slug.like(f"{BENCHMARK_SLUG_PREFIX}%"))
+            .order_by(Discussion.comment_count.desc())
+            .limit(50)
+        )).scalars()]
+
+        user_ids = (await db.execute(
+            select(User.id).where(User.email.like(f"%@{BENCHMARK_EMAIL_DOMAIN}")).order_by(User.username)
+        )).scalars().all()
+        fixtures.user_tokens = [create_access_token({"sub": str(user_id)}) for user_id in user_ids]
+
+    if not (fixtures.quiz_ids and fixtures.discussion_ids and fixtures.user_tokens):
+        raise SystemExit("No benchmark data found; run: python populate_test_data.py --benchmark")
+    return fixtures
+
+
+def build_scenarios(fixtures: Fixtures) -> List[Scenario]:
+    # Each submission uses the next user so the per-user cooldown and rate
+    # limit are not what gets measured
+    submitters = count()
+
+    def quiz_submit(index):
+        quiz_id = fixtures.quiz_ids[index % len(fixtures.quiz_ids)]
+        token = fixtures.user_tokens[next(submitters) % len(fixtures.user_tokens)]
+        body = {
+            "answers": [
+                {"question_index": n, "selected_answer": (index + n) % 4, "time_taken": 20}
+                for n in range(fixtures.quiz_questions[quiz_id])
+            ],
+            "total_time_taken": 240,
+        }
+        return "POST", f"/api/v1/quizzes/{quiz_id}/submit", body, {"Authorization": f"Bearer {token}"}
+
+    def discussion(index):
+        return "GET", f"/api/v1/discussions/{fixtures.discussion_ids[index % len(fixtures.discussion_ids)]}", None, {}
+
+    def discussion_comments(index):
+        discussion_id = fixtures.discussion_ids[index % len(fixtures.discussion_ids)]
+        return "GET", f"/api/v1/discussions/{discussion_id}/comments", None, {}
+
+    search_terms = ["tiger", "elephant habitat", "mangrove", "poaching census", "ranger"]
+
+    return [
+        Scenario("leaderboard_weekly", lambda i: ("GET", "/api/v1/leaderboards/weekly", None, {})),
+        Scenario("leaderboard_monthly", lambda i: ("GET", "/api/v1/leaderboards/monthly", None, {})),
+        Scenario("leaderboard_alltime", lambda i: ("GET", "/api/v1/leaderboards/alltime", None, {})),
+        Scenario("videos", lambda i: ("GET", "/api/v1/videos", None, {})),
+        Scenario("quiz_submit", quiz_submit),
+        Scenario("discussions_list", lambda i: ("GET", f"/api/v1/discussions/?page={i % 5 + 1}", None, {})),
+        Scenario("discussion_detail", discussion),
+        Scenario("discussion_comments", discussion_comments),
+        Scenario("search", lambda i: ("GET", f"/api/v1/search/content?q={search_terms[i % len(search_terms)]}", None, {})),
+    ]
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    for index in range(warmup):
+        method, path, body, headers = scenario.build(index)
+        await client.request(method, path, json=body, headers=headers)
+
+    samples: List[Sample] = []
+    next_index = count(warmup)
+
+    async def worker():
+        while True:
+            index = next(next_index)
+            if index >= warmup + requests:
+                return
+            method, path, body, headers = scenario.build(index)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            sample = Sample(status=response.status_code, latency=time.perf_counter() - started)
+            match = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+            if match:
+                sample.db_time = float(match.group(1)) / 1000
+                sample.queries = int(match.group(2))
+            samples.append(sample)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = [sample for sample in samples if 200 <= sample.status < 300]
+    latencies = [sample.latency * 1000 for sample in succeeded]
+    queries = [sample.queries for sample in succeeded if sample.queries is not None]
+    db_times = [sample.db_time * 1000 for sample in succeeded if sample.db_time is not None]
+    status_counts: Dict[str, int] = {}
+    for sample in samples:
+        status_counts[str(sample.status)] = status_counts.get(str(sample.status), 0) + 1
+
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(succeeded),
+        "status_counts": status_counts,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        },
+        "queries_per_request": {
+            "mean": round(statistics.fmean(queries), 2) if queries else None,
+            "p95": percentile(queries, 95) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+        "db_ms": {
+            "mean": round(statistics.fmean(db_times), 2) if db_times else None,
+            "p95": round(percentile(db_times, 95), 2) if db_times else None,
+        },
+    }
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_report(results: dict, baseline: Optional[dict] = None):
+    header = f"{'scenario':<22}{'req':>6}{'err':>5}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'q/req':>7}{'db ms':>8}"
+    if baseline:
+        header += f"{'Δp50':>9}{'Δp95':>9}{'Δq/req':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results["scenarios"].items():
+        latency = result["latency_ms"]
+        queries = result["queries_per_request"]["mean"]
+        db_ms = result["db_ms"]["mean"]
+        line = (
+            f"{name:<22}{result['requests']:>6}{result['errors']:>5}{result['throughput_rps']:>9.1f}"
+            f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+            f"{queries if queries is not None else '-':>7}{db_ms if db_ms is not None else '-':>8}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous:
+            def change(new, old):
+                if not old:
+                    return "-"
+                return f"{(new - old) / old * 100:+.0f}%"
+
+            previous_queries = previous["queries_per_request"]["mean"]
+            query_delta = "-" if queries is None or previous_queries is None else f"{queries - previous_queries:+.1f}"
+            line += (
+                f"{change(latency['p50'], previous['latency_ms']['p50']):>9}"
+                f"{change(latency['p95'], previous['latency_ms']['p95']):>9}"
+                f"{query_delta:>8}"
+            )
+        print(line)
+
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app
+
+    selected = set(args.scenarios or [])
+    async with app.router.lifespan_context(app) if args.lifespan else _no_lifespan():
+        fixtures = await load_fixtures()
+        scenarios = [s for s in build_scenarios(fixtures) if not selected or s.name in selected]
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=60) as client:
+            results = {}
+            for scenario in scenarios:
+                print(f"Running {scenario.name}...")
+                results[scenario.name] = await run_scenario(
+                    client, scenario, args.requests, args.concurrency, args.warmup
+                )
+
+    return {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "lifespan": args.lifespan,
+        },
+        "scenarios": results,
+    }
+
+
+class _no_lifespan:
+    async def __aenter__(self):
+        from app.core.cache import cache_manager
+        await cache_manager.initialize()
+
+    async def __aexit__(self, *exc_info):
+        from app.db.database import dispose_engines
+        await dispose_engines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot API endpoints in-process")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each scenario")
+    parser.add_argument("--scenario", dest="scenarios", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--no-lifespan", dest="lifespan", action="store_false",
+                        help="Skip app startup (background jobs off); only the cache is initialised")
+    parser.add_argument("--label", default="", help="Free-form note stored with the results")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{stamp}-{results['git']['commit'] or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print()
+    print_report(results, baseline)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
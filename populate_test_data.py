@@ -3,11 +3,12 @@ Script to populate test data for admin panel testing
 This will create sample content for all content types to test the admin forms
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
 from uuid import uuid4
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import random
 
 # Add the app directory to the path
@@ -1059,6 +1060,359 @@ async def create_test_user():
         return test_user.id
 
 
+# Row counts per benchmark scale; "medium" and "large" multiply "small"
+BENCHMARK_SCALES = {"small": 1, "medium": 5, "large": 25}
+BENCHMARK_BASE_COUNTS = {
+    "users": 200,
+    "quizzes": 20,
+    "quiz_results": 5000,
+    "series": 10,
+    "videos_per_series": 10,
+    "channels": 5,
+    "videos_per_channel": 20,
+    "articles": 300,
+    "discussions": 200,
+    "comments": 4000,
+    "transactions": 5000,
+}
+# Every benchmark row is tagged so it can be removed before reseeding
+BENCHMARK_EMAIL_DOMAIN = "bench.junglore.test"
+BENCHMARK_SLUG_PREFIX = "bench-"
+BENCHMARK_PASSWORD = "bench-password"
+
+BENCHMARK_WORDS = [
+    "tiger", "elephant", "leopard", "rhino", "hornbill", "mangrove", "wetland", "corridor",
+    "poaching", "habitat", "migration", "monsoon", "grassland", "reserve", "ranger", "census",
+]
+
+
+def benchmark_counts(scale: str) -> dict:
+    multiplier = BENCHMARK_SCALES[scale]
+    counts = {name: count * multiplier for name, count in BENCHMARK_BASE_COUNTS.items()}
+    # Catalog sizes grow slower than user activity
+    for name in ("quizzes", "series", "channels"):
+        counts[name] = BENCHMARK_BASE_COUNTS[name] * max(1, multiplier // 5 + 1)
+    return counts
+
+
+async def _insert_batches(db, model, rows, batch_size=1000):
+    from sqlalchemy import insert
+
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(model), rows[start:start + batch_size])
+
+
+async def clear_benchmark_data():
+    """Remove rows created by a previous benchmark seed"""
+    from sqlalchemy import delete
+    from app.models.video_series import VideoSeries
+    from app.models.video_channel import VideoChannel
+    from app.models.quiz_extended import Quiz
+
+    async with get_db_session() as db:
+        # Users cascade to their results, best scores, transactions, discussions and comments
+        await db.execute(delete(User).where(User.email.like(f"%@{BENCHMARK_EMAIL_DOMAIN}")))
+        await db.execute(delete(Quiz).where(Quiz.title.like("[bench]%")))
+        await db.execute(delete(VideoSeries).where(VideoSeries.slug.like(f"{BENCHMARK_SLUG_PREFIX}%")))
+        await db.execute(delete(VideoChannel).where(VideoChannel.slug.like(f"{BENCHMARK_SLUG_PREFIX}%")))
+        await db.commit()
+
+
+async def create_benchmark_data(scale: str = "small", seed: int = 42):
+    """
+    Seed a realistic, reproducible dataset for benchmark_endpoints.py
+
+    Creates users with quiz results spread over the last 60 days (so weekly,
+    monthly and all-time leaderboards all have data), currency transactions,
+    video series and channels, published articles for search, and approved
+    discussions with comment threads. Rows are bulk inserted; any previous
+    benchmark seed is removed first.
+    """
+    from app.core.security import get_password_hash
+    from app.models.quiz_extended import Quiz, UserQuizResult
+    from app.models.user_quiz_best_score import UserQuizBestScore
+    from app.models.rewards import (
+        UserCurrencyTransaction, TransactionTypeEnum, CurrencyTypeEnum, ActivityTypeEnum
+    )
+    from app.models.video_series import VideoSeries, SeriesVideo
+    from app.models.video_channel import VideoChannel, GeneralKnowledgeVideo
+    from app.models.discussion import Discussion, DiscussionStatusEnum, DiscussionTypeEnum
+    from app.models.discussion_comment import DiscussionComment
+
+    rng = random.Random(seed)
+    counts = benchmark_counts(scale)
+    now = datetime.now(timezone.utc)
+
+    def words(count):
+        return " ".join(rng.choice(BENCHMARK_WORDS) for _ in range(count))
+
+    def recent(days):
+        return now - timedelta(seconds=rng.randint(0, days * 24 * 3600))
+
+    print(f"Seeding benchmark data at '{scale}' scale: {counts}")
+    await clear_benchmark_data()
+    categories = await create_categories()
+    category_ids = [category.id for category in categories]
+
+    # bcrypt is slow on purpose; every benchmark user shares one hash
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+    users = []
+    for index in range(counts["users"]):
+        users.append({
+            "id": uuid4(),
+            "username": f"bench_user_{index}",
+            "email": f"user{index}@{BENCHMARK_EMAIL_DOMAIN}",
+            "hashed_password": hashed_password,
+            "full_name": f"Bench User {index}",
+            "is_active": True,
+            "is_email_verified": True,
+            "preferences": {},
+        })
+
+    quizzes = []
+    for index in range(counts["quizzes"]):
+        questions = [
+            {
+                "question": f"Which {words(2)} fact is correct? ({n + 1})",
+                "options": [words(2) for _ in range(4)],
+                "correct_answer": rng.randrange(4),
+                "explanation": words(12),
+                "points": 10,
+            }
+            for n in range(10)
+        ]
+        quizzes.append({
+            "id": uuid4(),
+            "category_id": rng.choice(category_ids) if category_ids else None,
+            "title": f"[bench] {words(3).title()} Quiz {index}",
+            "description": words(20),
+            "questions": questions,
+            "difficulty_level": rng.randint(1, 3),
+            "is_active": True,
+            "base_points_reward": 10,
+            "credits_on_completion": 10,
+            "perfect_score_bonus": 5,
+        })
+
+    # Activity is skewed: a few keen users account for most results
+    weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(users))]
+    results = []
+    best_scores = {}
+    transactions = []
+    balances = {user["id"]: 0 for user in users}
+    for _ in range(counts["quiz_results"]):
+        user = rng.choices(users, weights=weights)[0]
+        quiz = rng.choice(quizzes)
+        correct = rng.randint(2, 10)
+        percentage = correct * 10
+        points = quiz["base_points_reward"] + correct * 2
+        completed_at = recent(60)
+        result_id = uuid4()
+        results.append({
+            "id": result_id,
+            "user_id": user["id"],
+            "quiz_id": quiz["id"],
+            "score": correct * 10,
+            "max_score": 100,
+            "percentage": percentage,
+            "answers": [
+                {"question_id": n, "selected_answer": rng.randrange(4), "is_correct": n < correct, "points_earned": 10 if n < correct else 0}
+                for n in range(10)
+            ],
+            "time_taken": rng.randint(40, 600),
+            "points_earned": points,
+            "credits_earned": 10,
+            "reward_tier": UserQuizResult.calculate_reward_tier(percentage),
+            "time_bonus_applied": False,
+            "completed_at": completed_at,
+        })
+
+        key = (user["id"], quiz["id"])
+        best = best_scores.get(key)
+        if best is None or percentage > best["best_percentage"]:
+            best_scores[key] = {
+                "id": uuid4(),
+                "user_id": user["id"],
+                "quiz_id": quiz["id"],
+                "best_score": correct * 10,
+                "best_percentage": percentage,
+                "best_time": results[-1]["time_taken"],
+                "credits_earned": 10,
+                "points_earned": points,
+                "reward_tier": UserQuizResult.calculate_reward_tier(percentage).value,
+                "achieved_at": completed_at.replace(tzinfo=None),
+                "updated_at": completed_at.replace(tzinfo=None),
+            }
+
+        if len(transactions) < counts["transactions"]:
+            balances[user["id"]] += points
+            transactions.append({
+                "id": uuid4(),
+                "user_id": user["id"],
+                "transaction_type": TransactionTypeEnum.POINTS_EARNED,
+                "currency_type": CurrencyTypeEnum.POINTS,
+                "amount": points,
+                "balance_after": balances[user["id"]],
+                "activity_type": ActivityTypeEnum.QUIZ_COMPLETION,
+                "activity_reference_id": result_id,
+                "transaction_metadata": {"percentage": percentage},
+                "created_at": completed_at,
+                "is_processed": True,
+            })
+
+    totals = {}
+    for result in results:
+        totals[result["user_id"]] = totals.get(result["user_id"], 0) + result["points_earned"]
+    for user in users:
+        user["points_balance"] = user["total_points_earned"] = totals.get(user["id"], 0)
+
+    series_rows, series_videos = [], []
+    for index in range(counts["series"]):
+        series_id = uuid4()
+        series_rows.append({
+            "id": series_id,
+            "title": f"{words(2).title()} Series {index}",
+            "slug": f"{BENCHMARK_SLUG_PREFIX}series-{index}",
+            "description": words(30),
+            "thumbnail_url": f"/uploads/bench/series-{index}.jpg",
+            "total_videos": counts["videos_per_series"],
+            "is_published": 1,
+        })
+        for position in range(counts["videos_per_series"]):
+            series_videos.append({
+                "id": uuid4(),
+                "series_id": series_id,
+                "title": f"{words(3).title()} Part {position + 1}",
+                "slug": f"{BENCHMARK_SLUG_PREFIX}series-{index}-part-{position + 1}",
+                "description": words(40),
+                "video_url": f"/uploads/bench/series-{index}-{position + 1}.mp4",
+                "thumbnail_url": f"/uploads/bench/series-{index}-{position + 1}.jpg",
+                "duration": rng.randint(120, 1800),
+                "position": position + 1,
+                "publish_date": recent(365),
+                "tags": rng.sample(BENCHMARK_WORDS, 3),
+                "views": rng.randint(0, 50000),
+            })
+
+    channel_rows, channel_videos = [], []
+    for index in range(counts["channels"]):
+        channel_id = uuid4()
+        channel_rows.append({
+            "id": channel_id,
+            "name": f"{words(2).title()} Channel {index}",
+            "slug": f"{BENCHMARK_SLUG_PREFIX}channel-{index}",
+            "description": words(30),
+            "total_videos": counts["videos_per_channel"],
+            "is_active": True,
+        })
+        for position in range(counts["videos_per_channel"]):
+            channel_videos.append({
+                "id": uuid4(),
+                "channel_id": channel_id,
+                "title": f"{words(3).title()} Explained",
+                "slug": f"{BENCHMARK_SLUG_PREFIX}channel-{index}-video-{position}",
+                "description": words(40),
+                "video_url": f"/uploads/bench/channel-{index}-{position}.mp4",
+                "duration": rng.randint(60, 900),
+                "tags": ",".join(rng.sample(BENCHMARK_WORDS, 3)),
+                "views": rng.randint(0, 20000),
+                "likes": rng.randint(0, 2000),
+                "is_published": True,
+                "publish_date": recent(365),
+            })
+
+    articles = []
+    for index in range(counts["articles"]):
+        published_at = recent(365)
+        articles.append({
+            "id": uuid4(),
+            "author_id": rng.choice(users)["id"],
+            "category_id": rng.choice(category_ids) if category_ids else None,
+            "type": rng.choice([ContentTypeEnum.BLOG, ContentTypeEnum.NEWS, ContentTypeEnum.CASE_STUDY]),
+            "title": f"{words(5).title()} {index}",
+            "content": "<p>" + words(400) + "</p>",
+            "excerpt": words(30),
+            "slug": f"{BENCHMARK_SLUG_PREFIX}article-{index}",
+            "content_metadata": {},
+            "status": ContentStatusEnum.PUBLISHED,
+            "published_at": published_at,
+            "view_count": rng.randint(0, 10000),
+        })
+
+    discussions, comments = [], []
+    for index in range(counts["discussions"]):
+        created_at = recent(90)
+        discussions.append({
+            "id": uuid4(),
+            "author_id": rng.choice(users)["id"],
+            "category_id": rng.choice(category_ids) if category_ids else None,
+            "type": DiscussionTypeEnum.THREAD.value,
+            "title": f"{words(6).capitalize()}?",
+            "slug": f"{BENCHMARK_SLUG_PREFIX}discussion-{index}",
+            "content": "<p>" + words(150) + "</p>",
+            "excerpt": words(40),
+            "tags": rng.sample(BENCHMARK_WORDS, 2),
+            "status": DiscussionStatusEnum.APPROVED.value,
+            "view_count": rng.randint(0, 5000),
+            "published_at": created_at,
+            "created_at": created_at,
+            "last_activity_at": created_at,
+            "content_metadata": {},
+        })
+    # Comment counts follow a long tail too; a third of comments are replies
+    discussion_weights = [1.0 / (rank + 1) ** 0.7 for rank in range(len(discussions))]
+    top_level = {}
+    for _ in range(counts["comments"]):
+        discussion = rng.choices(discussions, weights=discussion_weights)[0]
+        parents = top_level.setdefault(discussion["id"], [])
+        parent = rng.choice(parents) if parents and rng.random() < 0.33 else None
+        comment = {
+            "id": uuid4(),
+            "discussion_id": discussion["id"],
+            "author_id": rng.choice(users)["id"],
+            "parent_comment_id": parent["id"] if parent else None,
+            "content": words(rng.randint(10, 80)),
+            "depth_level": 1 if parent else 0,
+            "like_count": rng.randint(0, 50),
+            "created_at": min(now, discussion["created_at"] + timedelta(minutes=rng.randint(1, 60 * 24 * 30))),
+        }
+        comments.append(comment)
+        discussion["comment_count"] = discussion.get("comment_count", 0) + 1
+        if parent:
+            parent["reply_count"] = parent.get("reply_count", 0) + 1
+            discussion["reply_count"] = discussion.get("reply_count", 0) + 1
+        else:
+            parents.append(comment)
+    for discussion in discussions:
+        discussion.setdefault("comment_count", 0)
+        discussion.setdefault("reply_count", 0)
+    for comment in comments:
+        comment.setdefault("reply_count", 0)
+    # Parents must exist before replies
+    comments.sort(key=lambda comment: comment["depth_level"])
+
+    async with get_db_session() as db:
+        for label, model, rows in [
+            ("users", User, users),
+            ("quizzes", Quiz, quizzes),
+            ("quiz results", UserQuizResult, results),
+            ("best scores", UserQuizBestScore, list(best_scores.values())),
+            ("transactions", UserCurrencyTransaction, transactions),
+            ("video series", VideoSeries, series_rows),
+            ("series videos", SeriesVideo, series_videos),
+            ("video channels", VideoChannel, channel_rows),
+            ("channel videos", GeneralKnowledgeVideo, channel_videos),
+            ("articles", Content, articles),
+            ("discussions", Discussion, discussions),
+            ("comments", DiscussionComment, comments),
+        ]:
+            await _insert_batches(db, model, rows)
+            print(f"  {label}: {len(rows)}")
+        await db.commit()
+
+    print("Benchmark data seeded")
+
+
 async def main():
     """Main function to populate all test data"""
     try:
@@ -1105,4 +1459,13 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Populate test data")
+    parser.add_argument("--benchmark", action="store_true", help="Seed the benchmark dataset instead of admin samples")
+    parser.add_argument("--scale", choices=sorted(BENCHMARK_SCALES), default="small", help="Benchmark dataset size")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the benchmark dataset")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        asyncio.run(create_benchmark_data(args.scale, args.seed))
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Profile application startup
+
+Prints where a cold start spends its time:
+
+1. Import time per package and the slowest modules, from a fresh interpreter
+   running ``python -X importtime -c "import app.main"``.
+2. Lifespan step timings, by running the application's startup and shutdown
+   in-process (needs the database and Redis the app is configured for).
+
+    python profile_startup.py                # both
+    python profile_startup.py --imports-only
+    python profile_startup.py --json startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from app.core.startup_profiler import group_imports, parse_importtime, slowest_imports
+
+
+def profile_imports(module: str = "app.main"):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:])
+        raise SystemExit(f"Importing {module} failed")
+    return parse_importtime(completed.stderr.splitlines())
+
+
+async def profile_lifespan():
+    from app.main import app
+    from app.core.startup_profiler import startup_profiler
+
+    async with app.router.lifespan_context(app):
+        pass
+    return startup_profiler.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile application startup")
+    parser.add_argument("--imports-only", action="store_true", help="Skip running the lifespan")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules/packages to list")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    timings = profile_imports()
+    total_us = max((timing.cumulative_us for timing in timings if timing.depth == 0), default=0)
+    app_main = next((timing for timing in timings if timing.module == "app.main"), None)
+
+    print(f"Import time for app.main: {(app_main.cumulative_us if app_main else total_us) / 1000:.0f} ms\n")
+    print("Self import time by package")
+    packages = group_imports(timings)[:args.top]
+    for package, self_us in packages:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    print("\nSlowest application modules (cumulative)")
+    slowest = slowest_imports(timings, args.top, prefix="app.")
+    for timing in slowest:
+        print(f"  {timing.cumulative_us / 1000:8.1f} ms  {timing.module}")
+
+    results = {
+        "imports": {
+            "app_main_ms": round((app_main.cumulative_us if app_main else total_us) / 1000, 1),
+            "packages": [{"package": package, "self_ms": round(us / 1000, 1)} for package, us in packages],
+            "modules": [
+                {"module": timing.module, "cumulative_ms": round(timing.cumulative_us / 1000, 1)}
+                for timing in slowest
+            ],
+        }
+    }
+
+    if not args.imports_only:
+        report = asyncio.run(profile_lifespan())
+        print(f"\nStartup steps (total {report['total_ms']:.0f} ms)")
+        for step in report["steps"]:
+            print(f"  {step['ms']:8.1f} ms  {step['step']}")
+        results["lifespan"] = report
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
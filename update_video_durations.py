@@ -1,117 +1,59 @@
 """
-Script to update video durations for all existing videos
-Run this once to extract and save durations for videos that don't have them
+Script to backfill video durations and media info for existing videos
+Only rows missing a duration or media info are probed; results are cached by
+file fingerprint, so re-running the script is cheap. New uploads are handled
+automatically by the media metadata worker.
 """
 import asyncio
-from pathlib import Path
-from sqlalchemy import select
+from sqlalchemy import select, or_
 from app.db.database import get_db_session
 from app.models.video_series import SeriesVideo
 from app.models.video_channel import GeneralKnowledgeVideo
-from app.utils.video_utils import get_video_duration
+from app.services.media_probe import media_metadata_worker
+
+
+async def backfill(model_name: str, model_class) -> tuple:
+    """Probe and update all rows of one video model that are missing metadata"""
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(model_class.id, model_class.title, model_class.video_url).where(
+                or_(model_class.duration == None, model_class.duration == 0, model_class.media_info == None)
+            )
+        )
+        rows = result.all()
+
+    print(f"Found {len(rows)} {model_name} rows to probe")
+
+    async def probe_one(row):
+        video_id, title, video_url = row
+        if not video_url:
+            print(f"  ✗ {title} - no video URL")
+            return False
+        try:
+            info = await media_metadata_worker.probe.probe(video_url)
+            if not info:
+                print(f"  ✗ {title} - file not found: {video_url}")
+                return False
+            await media_metadata_worker.apply(model_name, str(video_id), info)
+            print(f"  ✓ {title} - {info.get('duration')}s {info.get('width')}x{info.get('height')} {info.get('codec')}")
+            return True
+        except Exception as e:
+            print(f"  ✗ {title} - error: {e}")
+            return False
+
+    # Concurrency is bounded by the probe's own semaphore
+    results = await asyncio.gather(*[probe_one(row) for row in rows])
+    return results.count(True), results.count(False)
 
 
 async def update_all_video_durations():
     """Update durations for all videos in the database"""
-    
-    updated_count = 0
-    error_count = 0
-    
-    async with get_db_session() as session:
-        print("Fetching all series videos...")
-        
-        # Get all series videos
-        series_result = await session.execute(select(SeriesVideo))
-        series_videos = series_result.scalars().all()
-        
-        print(f"Found {len(series_videos)} series videos")
-        
-        for video in series_videos:
-            try:
-                # Skip if already has duration
-                if video.duration and video.duration > 0:
-                    print(f"  ✓ {video.title} - already has duration ({video.duration}s)")
-                    continue
-                
-                # Get video file path
-                if not video.video_url:
-                    print(f"  ✗ {video.title} - no video URL")
-                    error_count += 1
-                    continue
-                
-                # Remove leading slash and construct full path
-                video_path = Path(video.video_url.lstrip('/'))
-                
-                if not video_path.exists():
-                    print(f"  ✗ {video.title} - file not found: {video_path}")
-                    error_count += 1
-                    continue
-                
-                # Extract duration
-                duration = get_video_duration(str(video_path))
-                
-                if duration > 0:
-                    video.duration = duration
-                    print(f"  ✓ {video.title} - updated duration: {duration}s ({duration//60}m {duration%60}s)")
-                    updated_count += 1
-                else:
-                    print(f"  ✗ {video.title} - could not extract duration")
-                    error_count += 1
-                    
-            except Exception as e:
-                print(f"  ✗ {video.title} - error: {e}")
-                error_count += 1
-        
-        print("\nFetching all general knowledge videos...")
-        
-        # Get all general knowledge videos
-        gk_result = await session.execute(select(GeneralKnowledgeVideo))
-        gk_videos = gk_result.scalars().all()
-        
-        print(f"Found {len(gk_videos)} general knowledge videos")
-        
-        for video in gk_videos:
-            try:
-                # Skip if already has duration
-                if video.duration and video.duration > 0:
-                    print(f"  ✓ {video.title} - already has duration ({video.duration}s)")
-                    continue
-                
-                # Get video file path
-                if not video.video_url:
-                    print(f"  ✗ {video.title} - no video URL")
-                    error_count += 1
-                    continue
-                
-                # Remove leading slash and construct full path
-                video_path = Path(video.video_url.lstrip('/'))
-                
-                if not video_path.exists():
-                    print(f"  ✗ {video.title} - file not found: {video_path}")
-                    error_count += 1
-                    continue
-                
-                # Extract duration
-                duration = get_video_duration(str(video_path))
-                
-                if duration > 0:
-                    video.duration = duration
-                    print(f"  ✓ {video.title} - updated duration: {duration}s ({duration//60}m {duration%60}s)")
-                    updated_count += 1
-                else:
-                    print(f"  ✗ {video.title} - could not extract duration")
-                    error_count += 1
-                    
-            except Exception as e:
-                print(f"  ✗ {video.title} - error: {e}")
-                error_count += 1
-        
-        # Commit all changes
-        await session.commit()
-        
+    series_ok, series_failed = await backfill("series_video", SeriesVideo)
+    gk_ok, gk_failed = await backfill("gk_video", GeneralKnowledgeVideo)
+
     print("\n" + "="*60)
-    print(f"✅ Successfully updated {updated_count} videos")
-    print(f"❌ Failed to update {error_count} videos")
+    print(f"✅ Successfully updated {series_ok + gk_ok} videos")
+    print(f"❌ Failed to update {series_failed + gk_failed} videos")
     print("="*60)
 
 
@@ -119,4 +61,4 @@ if __name__ == "__main__":
     print("Starting video duration update...")
     print("="*60)
     asyncio.run(update_all_video_durations())
-    print("\nDone! You can now refresh your frontend to see the durations.")
\ No newline at end of file
+    print("\nDone! You can now refresh your frontend to see the durations.")